@@ -10,7 +10,11 @@ This module provides:
 - Query/LLM interaction logging with full details
 - Data upload tracking
 - API request logging
+- Cursor-paginated, full-text indexed log search
+- Batched background writes for high-volume events
+- Hourly/daily rollups behind the statistics and dashboard
 - Integrity checksums for tamper detection
+- Hash-chained records with parallel, resumable whole-trail verification
 - Electronic signature support
 - Excel/PDF export capabilities
 """
@@ -22,11 +26,16 @@ from .models import (
     QueryAuditDetails,
     AuditLog,
     AuditFilters,
+    AuditLogPage,
     AuditStatistics,
     ElectronicSignature,
     IntegrityCheckResult,
+    ChainVerificationResult,
 )
 from .database import AuditDB
+from .writer import AuditWriter
+from .verifier import verify_chain
+from .rollups import RollupTotal
 from .service import AuditService, get_audit_service
 
 __all__ = [
@@ -37,11 +46,16 @@ __all__ = [
     "QueryAuditDetails",
     "AuditLog",
     "AuditFilters",
+    "AuditLogPage",
     "AuditStatistics",
     "ElectronicSignature",
     "IntegrityCheckResult",
+    "ChainVerificationResult",
     # Database
     "AuditDB",
+    "AuditWriter",
+    "verify_chain",
+    "RollupTotal",
     # Service
     "AuditService",
     "get_audit_service",
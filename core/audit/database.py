@@ -8,28 +8,81 @@ Provides immutable, 21 CFR Part 11 compliant audit trail.
 
 import sqlite3
 import json
+import time
+import base64
 import hashlib
 import hmac
 import os
+import logging
+import threading
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, List, Dict, Any, Tuple
 from contextlib import contextmanager
 
+from . import rollups
 from .models import (
     AuditEvent,
     QueryAuditDetails,
     AuditLog,
     AuditFilters,
+    AuditLogPage,
     AuditStatistics,
     ElectronicSignature,
     IntegrityCheckResult,
 )
 
+logger = logging.getLogger(__name__)
 
 # Secret key for HMAC signatures (should be set via environment variable)
 AUDIT_SECRET_KEY = os.getenv("AUDIT_SECRET_KEY", "sage-audit-secret-key-change-in-production")
 
+# Chain hash before the first audit log
+GENESIS_HASH = "0" * 64
+
+# Columns covered by a row's checksum
+CHECKSUM_FIELDS = (
+    'timestamp', 'user_id', 'username', 'action', 'resource_type',
+    'resource_id', 'status', 'request_method', 'request_path',
+)
+
+
+def compute_checksum(data: Dict[str, Any]) -> str:
+    """Compute SHA-256 checksum for audit record integrity."""
+    # Sort keys for consistent hashing
+    serialized = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+
+def chain_link(previous_hash: str, checksum: str) -> str:
+    """Chain hash of a row: covers the previous row's chain hash and its own checksum."""
+    return hashlib.sha256(f"{previous_hash}{checksum}".encode('utf-8')).hexdigest()
+
+
+# Filtered searches stop counting here and report "at least" this many
+COUNT_LIMIT = int(os.getenv("AUDIT_COUNT_LIMIT", "100000"))
+
+# Search counts kept for incremental updates
+MAX_CACHED_COUNTS = 256
+
+# Full-text search matches trigrams, so shorter text falls back to LIKE
+MIN_FTS_LENGTH = 3
+
+
+def encode_cursor(timestamp: str, log_id: int) -> str:
+    """Opaque search cursor for the position after a log (timestamp, id)."""
+    return base64.urlsafe_b64encode(f"{timestamp}|{log_id}".encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """(timestamp, id) of a cursor; raises ValueError if malformed."""
+    try:
+        timestamp, log_id = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8').rsplit('|', 1)
+        return timestamp, int(log_id)
+    except (ValueError, UnicodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
 
 class AuditDB:
     """
@@ -38,6 +91,8 @@ class AuditDB:
     Implements 21 CFR Part 11 requirements:
     - Immutable records (no UPDATE/DELETE on audit_logs)
     - SHA-256 checksums for integrity verification
+    - Hash chain: each row's chain_hash covers the previous row's, so
+      changed, removed or reordered rows break the chain
     - Electronic signatures with HMAC
     - Complete audit trail with timestamps
     """
@@ -59,15 +114,28 @@ class AuditDB:
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
+        # Search counts: {(where, params): (max id counted, count, exact)}
+        self._counts: "OrderedDict[Tuple, Tuple[int, int, bool]]" = OrderedDict()
+        self._counts_lock = threading.Lock()
+        self._fts_enabled = False
+
         # Initialize database schema
         self._init_schema()
 
     @contextmanager
-    def _get_connection(self):
-        """Context manager for database connections."""
+    def _get_connection(self, immediate: bool = False):
+        """
+        Context manager for database connections.
+
+        Args:
+            immediate: Take the write lock at the start (BEGIN IMMEDIATE), for
+                writes that read the chain head first.
+        """
         conn = sqlite3.connect(str(self.db_path))
         conn.row_factory = sqlite3.Row
         try:
+            if immediate:
+                conn.execute('BEGIN IMMEDIATE')
             yield conn
             conn.commit()
         except Exception:
@@ -76,9 +144,26 @@ class AuditDB:
         finally:
             conn.close()
 
+    def open_writer_connection(self) -> sqlite3.Connection:
+        """
+        Open a long-lived connection for the background audit writer.
+
+        The connection is in autocommit mode; the caller groups inserts
+        with insert_batch, one transaction (and one fsync) per batch.
+        """
+        conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA busy_timeout=5000")
+        conn.execute("PRAGMA synchronous=FULL")
+        return conn
+
     def _init_schema(self):
         """Initialize the database schema."""
         with self._get_connection() as conn:
+            # WAL lets readers run while the writer commits (persists in the file)
+            conn.execute('PRAGMA journal_mode=WAL')
+
+        with self._get_connection(immediate=True) as conn:
             cursor = conn.cursor()
 
             # Main audit log table
@@ -103,10 +188,25 @@ class AuditDB:
                     error_message TEXT,
                     details TEXT,
                     checksum TEXT NOT NULL,
+                    chain_hash TEXT,
                     created_at TEXT DEFAULT CURRENT_TIMESTAMP
                 )
             ''')
 
+            # Verified segments of the hash chain (see verifier.py)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS audit_checkpoints (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    start_id INTEGER NOT NULL UNIQUE,
+                    end_id INTEGER NOT NULL,
+                    last_id INTEGER NOT NULL,
+                    row_count INTEGER NOT NULL,
+                    merkle_root TEXT NOT NULL,
+                    chain_hash TEXT NOT NULL,
+                    created_at TEXT NOT NULL
+                )
+            ''')
+
             # Query audit details table (for LLM interactions)
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS query_audit_details (
@@ -147,19 +247,97 @@ class AuditDB:
 
             # Create indexes for efficient querying
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_audit_timestamp ON audit_logs(timestamp)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_audit_user ON audit_logs(user_id)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_audit_action ON audit_logs(action)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_audit_status ON audit_logs(status)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_audit_resource ON audit_logs(resource_type)')
+            # Filter columns are indexed with the timestamp, so a filtered page is
+            # read in order from the index instead of sorting every match
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_audit_user_time ON audit_logs(user_id, timestamp)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_audit_action_time ON audit_logs(action, timestamp)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_audit_status_time ON audit_logs(status, timestamp)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_audit_resource_time ON audit_logs(resource_type, timestamp)')
+            for index in ('idx_audit_user', 'idx_audit_action', 'idx_audit_status', 'idx_audit_resource'):
+                cursor.execute(f'DROP INDEX IF EXISTS {index}')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_audit_created ON audit_logs(created_at)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_query_audit_log ON query_audit_details(audit_log_id)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_signature_audit_log ON electronic_signatures(audit_log_id)')
 
+            self._migrate_chain(cursor)
+            self._fts_enabled = self._init_search_index(cursor)
+            rollups.install(cursor)
+
+    def _migrate_chain(self, cursor):
+        """Add the chain_hash column to older databases and chain their rows."""
+        columns = {row['name'] for row in cursor.execute('PRAGMA table_info(audit_logs)')}
+        if 'chain_hash' not in columns:
+            cursor.execute('ALTER TABLE audit_logs ADD COLUMN chain_hash TEXT')
+
+        # Rows are chained in id order, so a chained last row means all are
+        last = cursor.execute('SELECT chain_hash FROM audit_logs ORDER BY id DESC LIMIT 1').fetchone()
+        if last is None or last['chain_hash'] is not None:
+            return
+
+        # One-time backfill; the only UPDATE ever made to audit_logs
+        previous = GENESIS_HASH
+        rows = cursor.execute('SELECT id, checksum, chain_hash FROM audit_logs ORDER BY id').fetchall()
+        updates = []
+        for row in rows:
+            if row['chain_hash'] is None:
+                updates.append((chain_link(previous, row['checksum']), row['id']))
+                previous = updates[-1][0]
+            else:
+                previous = row['chain_hash']
+        cursor.executemany('UPDATE audit_logs SET chain_hash = ? WHERE id = ?', updates)
+
+    def _init_search_index(self, cursor) -> bool:
+        """
+        Full-text index over the searched text columns, kept in sync by triggers.
+
+        The trigram tokenizer matches substrings case-insensitively, like the
+        LIKE '%text%' search it replaces. Returns False if this SQLite build
+        lacks FTS5 or the tokenizer; search then falls back to LIKE.
+        """
+        exists = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'audit_logs_fts'"
+        ).fetchone()
+        try:
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS audit_logs_fts USING fts5(
+                    request_path, error_message, details,
+                    content='audit_logs', content_rowid='id', tokenize='trigram'
+                )
+            ''')
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Audit full-text search unavailable, using LIKE: {e}")
+            return False
+
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS audit_logs_fts_insert AFTER INSERT ON audit_logs BEGIN
+                INSERT INTO audit_logs_fts(rowid, request_path, error_message, details)
+                VALUES (new.id, new.request_path, new.error_message, new.details);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS audit_logs_fts_delete AFTER DELETE ON audit_logs BEGIN
+                INSERT INTO audit_logs_fts(audit_logs_fts, rowid, request_path, error_message, details)
+                VALUES ('delete', old.id, old.request_path, old.error_message, old.details);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS audit_logs_fts_update
+            AFTER UPDATE OF request_path, error_message, details ON audit_logs BEGIN
+                INSERT INTO audit_logs_fts(audit_logs_fts, rowid, request_path, error_message, details)
+                VALUES ('delete', old.id, old.request_path, old.error_message, old.details);
+                INSERT INTO audit_logs_fts(rowid, request_path, error_message, details)
+                VALUES (new.id, new.request_path, new.error_message, new.details);
+            END
+        ''')
+
+        # Index the rows of databases created before the index
+        if not exists:
+            cursor.execute("INSERT INTO audit_logs_fts(audit_logs_fts) VALUES ('rebuild')")
+        return True
+
     def _compute_checksum(self, data: Dict[str, Any]) -> str:
         """Compute SHA-256 checksum for audit record integrity."""
-        # Sort keys for consistent hashing
-        serialized = json.dumps(data, sort_keys=True, default=str)
-        return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+        return compute_checksum(data)
 
     def _compute_signature_hash(self, audit_log_id: int, user_id: str, meaning: str, timestamp: str) -> str:
         """Compute HMAC signature for electronic signatures."""
@@ -182,6 +360,64 @@ class AuditDB:
         Returns:
             The ID of the inserted log entry.
         """
+        with self._get_connection(immediate=True) as conn:
+            return self._insert_log(conn.cursor(), event)
+
+    def insert_query_details(self, audit_log_id: int, details: QueryAuditDetails) -> int:
+        """
+        Insert query audit details linked to an audit log.
+
+        Args:
+            audit_log_id: The ID of the parent audit log.
+            details: The query details to log.
+
+        Returns:
+            The ID of the inserted details record.
+        """
+        with self._get_connection() as conn:
+            return self._insert_query_details(conn.cursor(), audit_log_id, details)
+
+    def insert_batch(
+        self,
+        items: List[Tuple[AuditEvent, Optional[QueryAuditDetails]]],
+        conn: Optional[sqlite3.Connection] = None,
+    ) -> List[int]:
+        """
+        Insert several audit events in one transaction.
+
+        Args:
+            items: (event, query details or None) pairs; details are linked
+                to their event's log entry.
+            conn: Autocommit connection to use (see open_writer_connection);
+                a new connection if None.
+
+        Returns:
+            The IDs of the inserted log entries, in order.
+        """
+        if conn is None:
+            with self._get_connection(immediate=True) as conn:
+                cursor = conn.cursor()
+                return [self._insert_item(cursor, event, details) for event, details in items]
+
+        cursor = conn.cursor()
+        cursor.execute('BEGIN IMMEDIATE')
+        try:
+            ids = [self._insert_item(cursor, event, details) for event, details in items]
+            cursor.execute('COMMIT')
+        except Exception:
+            cursor.execute('ROLLBACK')
+            raise
+        return ids
+
+    def _insert_item(self, cursor, event: AuditEvent, details: Optional[QueryAuditDetails]) -> int:
+        """Insert an event and its query details (if any)."""
+        log_id = self._insert_log(cursor, event)
+        if details is not None:
+            self._insert_query_details(cursor, log_id, details)
+        return log_id
+
+    def _insert_log(self, cursor, event: AuditEvent) -> int:
+        """Insert an audit log row with its checksum."""
         # Prepare data for checksum
         checksum_data = {
             'timestamp': event.timestamp.isoformat(),
@@ -199,77 +435,69 @@ class AuditDB:
         # Serialize details if present
         details_json = json.dumps(event.details) if event.details else None
 
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO audit_logs (
-                    timestamp, user_id, username, action, resource_type, resource_id,
-                    status, ip_address, user_agent, request_method, request_path,
-                    request_body, response_status, response_body, duration_ms,
-                    error_message, details, checksum
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                event.timestamp.isoformat(),
-                event.user_id,
-                event.username,
-                event.action.value if hasattr(event.action, 'value') else str(event.action),
-                event.resource_type,
-                event.resource_id,
-                event.status.value if hasattr(event.status, 'value') else str(event.status),
-                event.ip_address,
-                event.user_agent,
-                event.request_method,
-                event.request_path,
-                event.request_body,
-                event.response_status,
-                event.response_body,
-                event.duration_ms,
-                event.error_message,
-                details_json,
-                checksum,
-            ))
-            return cursor.lastrowid
-
-    def insert_query_details(self, audit_log_id: int, details: QueryAuditDetails) -> int:
-        """
-        Insert query audit details linked to an audit log.
-
-        Args:
-            audit_log_id: The ID of the parent audit log.
-            details: The query details to log.
-
-        Returns:
-            The ID of the inserted details record.
-        """
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO query_audit_details (
-                    audit_log_id, original_question, sanitized_question,
-                    intent_classification, matched_entities, generated_sql,
-                    llm_prompt, llm_response, llm_model, llm_tokens_used,
-                    confidence_score, confidence_breakdown, execution_time_ms,
-                    result_row_count, tables_accessed, columns_used
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                audit_log_id,
-                details.original_question,
-                details.sanitized_question,
-                details.intent_classification,
-                json.dumps(details.matched_entities) if details.matched_entities else None,
-                details.generated_sql,
-                details.llm_prompt,
-                details.llm_response,
-                details.llm_model,
-                details.llm_tokens_used,
-                details.confidence_score,
-                json.dumps(details.confidence_breakdown) if details.confidence_breakdown else None,
-                details.execution_time_ms,
-                details.result_row_count,
-                json.dumps(details.tables_accessed) if details.tables_accessed else None,
-                json.dumps(details.columns_used) if details.columns_used else None,
-            ))
-            return cursor.lastrowid
+        # Link to the chain head (the caller holds the write lock)
+        head = cursor.execute('SELECT chain_hash FROM audit_logs ORDER BY id DESC LIMIT 1').fetchone()
+        chain_hash = chain_link(head[0] if head and head[0] else GENESIS_HASH, checksum)
+
+        cursor.execute('''
+            INSERT INTO audit_logs (
+                timestamp, user_id, username, action, resource_type, resource_id,
+                status, ip_address, user_agent, request_method, request_path,
+                request_body, response_status, response_body, duration_ms,
+                error_message, details, checksum, chain_hash
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            event.timestamp.isoformat(),
+            event.user_id,
+            event.username,
+            event.action.value if hasattr(event.action, 'value') else str(event.action),
+            event.resource_type,
+            event.resource_id,
+            event.status.value if hasattr(event.status, 'value') else str(event.status),
+            event.ip_address,
+            event.user_agent,
+            event.request_method,
+            event.request_path,
+            event.request_body,
+            event.response_status,
+            event.response_body,
+            event.duration_ms,
+            event.error_message,
+            details_json,
+            checksum,
+            chain_hash,
+        ))
+        return cursor.lastrowid
+
+    def _insert_query_details(self, cursor, audit_log_id: int, details: QueryAuditDetails) -> int:
+        """Insert a query details row."""
+        cursor.execute('''
+            INSERT INTO query_audit_details (
+                audit_log_id, original_question, sanitized_question,
+                intent_classification, matched_entities, generated_sql,
+                llm_prompt, llm_response, llm_model, llm_tokens_used,
+                confidence_score, confidence_breakdown, execution_time_ms,
+                result_row_count, tables_accessed, columns_used
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            audit_log_id,
+            details.original_question,
+            details.sanitized_question,
+            details.intent_classification,
+            json.dumps(details.matched_entities) if details.matched_entities else None,
+            details.generated_sql,
+            details.llm_prompt,
+            details.llm_response,
+            details.llm_model,
+            details.llm_tokens_used,
+            details.confidence_score,
+            json.dumps(details.confidence_breakdown) if details.confidence_breakdown else None,
+            details.execution_time_ms,
+            details.result_row_count,
+            json.dumps(details.tables_accessed) if details.tables_accessed else None,
+            json.dumps(details.columns_used) if details.columns_used else None,
+        ))
+        return cursor.lastrowid
 
     def insert_signature(self, signature: ElectronicSignature) -> int:
         """
@@ -364,6 +592,66 @@ class AuditDB:
         Returns:
             Tuple of (list of matching logs, total count).
         """
+        page = self.search_logs_page(filters)
+        return page.logs, page.total
+
+    def search_logs_page(self, filters: AuditFilters) -> AuditLogPage:
+        """
+        Search audit logs, newest first, one page at a time.
+
+        Pages are read by keyset on (timestamp, id): with filters.cursor the
+        page starts after the cursor's log, so deep pages cost the same as
+        the first. Without a cursor, filters.page is read by offset.
+
+        The total is counted once per filter and then only over newer rows;
+        filtered counts stop at COUNT_LIMIT (total_exact is False).
+
+        Args:
+            filters: The search filters to apply.
+
+        Returns:
+            AuditLogPage with the logs, total and the cursor of the next page.
+
+        Raises:
+            ValueError: If filters.cursor is malformed.
+        """
+        where_clause, params = self._build_conditions(filters)
+
+        page_clause = ""
+        page_params: List[Any] = []
+        offset = 0
+        if filters.cursor:
+            timestamp, log_id = decode_cursor(filters.cursor)
+            # The first term is an index range; the second skips rows up to the cursor
+            page_clause = " AND timestamp <= ? AND (timestamp < ? OR id < ?)"
+            page_params = [timestamp, timestamp, log_id]
+        else:
+            offset = (filters.page - 1) * filters.page_size
+
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+
+            # One extra row tells whether another page follows
+            cursor.execute(f'''
+                SELECT * FROM audit_logs
+                WHERE {where_clause}{page_clause}
+                ORDER BY timestamp DESC, id DESC
+                LIMIT ? OFFSET ?
+            ''', params + page_params + [filters.page_size + 1, offset])
+            rows = cursor.fetchall()
+
+            total, exact = self._count_logs(cursor, where_clause, params)
+
+        logs = [self._row_to_audit_log(row) for row in rows[:filters.page_size]]
+        next_cursor = None
+        if len(rows) > filters.page_size:
+            last = rows[filters.page_size - 1]
+            next_cursor = encode_cursor(last['timestamp'], last['id'])
+
+        return AuditLogPage(logs=logs, total=total, total_exact=exact, next_cursor=next_cursor)
+
+    def _build_conditions(self, filters: AuditFilters) -> Tuple[str, List[Any]]:
+        """WHERE clause and parameters for the search filters."""
         conditions = []
         params = []
 
@@ -405,31 +693,64 @@ class AuditDB:
             params.append(filters.ip_address)
 
         if filters.search_text:
-            conditions.append("(request_path LIKE ? OR error_message LIKE ? OR details LIKE ?)")
-            search_pattern = f"%{filters.search_text}%"
-            params.extend([search_pattern, search_pattern, search_pattern])
+            if self._fts_enabled and len(filters.search_text) >= MIN_FTS_LENGTH:
+                # Quoted as one phrase: a substring match on any of the columns
+                conditions.append("id IN (SELECT rowid FROM audit_logs_fts WHERE audit_logs_fts MATCH ?)")
+                params.append('"' + filters.search_text.replace('"', '""') + '"')
+            else:
+                conditions.append("(request_path LIKE ? OR error_message LIKE ? OR details LIKE ?)")
+                search_pattern = f"%{filters.search_text}%"
+                params.extend([search_pattern, search_pattern, search_pattern])
 
         where_clause = " AND ".join(conditions) if conditions else "1=1"
+        return where_clause, params
 
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-
-            # Get total count
-            cursor.execute(f"SELECT COUNT(*) as total FROM audit_logs WHERE {where_clause}", params)
-            total = cursor.fetchone()['total']
-
-            # Get paginated results
-            offset = (filters.page - 1) * filters.page_size
-            cursor.execute(f'''
-                SELECT * FROM audit_logs
-                WHERE {where_clause}
-                ORDER BY timestamp DESC
-                LIMIT ? OFFSET ?
-            ''', params + [filters.page_size, offset])
+    def _count_logs(self, cursor, where_clause: str, params: List[Any]) -> Tuple[int, bool]:
+        """
+        Count the logs matching a filter, reusing the last count for it.
 
-            logs = [self._row_to_audit_log(row) for row in cursor.fetchall()]
+        Audit rows are never changed, so a filter's earlier count stays valid
+        and only rows added since (id above the last counted) are counted.
+        A filter's first count stops after COUNT_LIMIT matches, except for
+        the unfiltered total.
 
-            return logs, total
+        Returns:
+            (count, exact); exact is False when counting stopped at the limit.
+        """
+        max_id = cursor.execute("SELECT MAX(id) FROM audit_logs").fetchone()[0] or 0
+        key = (where_clause, tuple(params))
+
+        with self._counts_lock:
+            cached = self._counts.get(key)
+            if cached is not None:
+                self._counts.move_to_end(key)
+
+        if cached is not None and cached[0] <= max_id:
+            counted_id, count, exact = cached
+            if counted_id < max_id:
+                count += cursor.execute(
+                    f"SELECT COUNT(*) FROM audit_logs WHERE ({where_clause}) AND id > ? AND id <= ?",
+                    params + [counted_id, max_id]
+                ).fetchone()[0]
+        elif not params:
+            count, exact = cursor.execute(
+                "SELECT COUNT(*) FROM audit_logs WHERE id <= ?", (max_id,)
+            ).fetchone()[0], True
+        else:
+            count = cursor.execute(
+                f"SELECT COUNT(*) FROM (SELECT 1 FROM audit_logs WHERE ({where_clause}) AND id <= ? LIMIT ?)",
+                params + [max_id, COUNT_LIMIT + 1]
+            ).fetchone()[0]
+            exact = count <= COUNT_LIMIT
+            count = min(count, COUNT_LIMIT)
+
+        with self._counts_lock:
+            self._counts[key] = (max_id, count, exact)
+            self._counts.move_to_end(key)
+            while len(self._counts) > MAX_CACHED_COUNTS:
+                self._counts.popitem(last=False)
+
+        return count, exact
 
     def get_query_details(self, audit_log_id: int) -> Optional[QueryAuditDetails]:
         """Get query details for an audit log."""
@@ -444,6 +765,8 @@ class AuditDB:
         """
         Get audit statistics.
 
+        Read from the rollup tables, so the cost does not grow with the log.
+
         Args:
             start_date: Filter start date.
             end_date: Filter end date.
@@ -451,78 +774,25 @@ class AuditDB:
         Returns:
             Audit statistics.
         """
-        conditions = []
-        params = []
-
-        if start_date:
-            conditions.append("timestamp >= ?")
-            params.append(start_date.isoformat())
-
-        if end_date:
-            conditions.append("timestamp <= ?")
-            params.append(end_date.isoformat())
-
-        where_clause = " AND ".join(conditions) if conditions else "1=1"
-
         with self._get_connection() as conn:
-            cursor = conn.cursor()
-
-            # Total events
-            cursor.execute(f"SELECT COUNT(*) as total FROM audit_logs WHERE {where_clause}", params)
-            total = cursor.fetchone()['total']
-
-            # By action
-            cursor.execute(f'''
-                SELECT action, COUNT(*) as count
-                FROM audit_logs WHERE {where_clause}
-                GROUP BY action
-            ''', params)
-            by_action = {row['action']: row['count'] for row in cursor.fetchall()}
+            totals = rollups.read_totals(
+                conn, ['action', 'status', 'user', 'resource_type', 'confidence'], start_date, end_date
+            )
 
-            # By status
-            cursor.execute(f'''
-                SELECT status, COUNT(*) as count
-                FROM audit_logs WHERE {where_clause}
-                GROUP BY status
-            ''', params)
-            by_status = {row['status']: row['count'] for row in cursor.fetchall()}
+            def counts(dimension: str) -> Dict[str, int]:
+                return {value: rollup.events for value, rollup in totals[dimension].items()}
 
-            # By user
-            cursor.execute(f'''
-                SELECT username, COUNT(*) as count
-                FROM audit_logs WHERE {where_clause}
-                GROUP BY username
-                ORDER BY count DESC
-                LIMIT 10
-            ''', params)
-            by_user = {row['username']: row['count'] for row in cursor.fetchall()}
-
-            # By resource type
-            cursor.execute(f'''
-                SELECT resource_type, COUNT(*) as count
-                FROM audit_logs WHERE {where_clause} AND resource_type IS NOT NULL
-                GROUP BY resource_type
-            ''', params)
-            by_resource = {row['resource_type']: row['count'] for row in cursor.fetchall()}
+            # Every event has a status, so the status totals cover all events
+            all_events = rollups.combined(totals['status'].values())
+            top_users = sorted(totals['user'].items(), key=lambda item: (-item[1].events, item[0]))[:10]
 
-            # Average query confidence
-            cursor.execute(f'''
-                SELECT AVG(q.confidence_score) as avg_confidence
-                FROM query_audit_details q
-                JOIN audit_logs a ON q.audit_log_id = a.id
-                WHERE {where_clause} AND q.confidence_score IS NOT NULL
-            ''', params)
-            avg_conf_row = cursor.fetchone()
-            avg_confidence = avg_conf_row['avg_confidence'] if avg_conf_row else None
-
-            # Average duration
-            cursor.execute(f'''
-                SELECT AVG(duration_ms) as avg_duration
-                FROM audit_logs
-                WHERE {where_clause} AND duration_ms IS NOT NULL
-            ''', params)
-            avg_dur_row = cursor.fetchone()
-            avg_duration = avg_dur_row['avg_duration'] if avg_dur_row else None
+            total = all_events.events
+            by_action = counts('action')
+            by_status = counts('status')
+            by_user = {value: rollup.events for value, rollup in top_users}
+            by_resource = counts('resource_type')
+            avg_confidence = rollups.combined(totals['confidence'].values()).average
+            avg_duration = all_events.average
 
             # Only include date_range if we have valid dates
             date_range = None
@@ -544,6 +814,23 @@ class AuditDB:
                 date_range=date_range
             )
 
+    def get_rollup_totals(self, dimensions: List[str],
+                          start_date: Optional[datetime] = None,
+                          end_date: Optional[datetime] = None) -> Dict[str, Dict[str, rollups.RollupTotal]]:
+        """
+        Pre-aggregated totals per value of each dimension (see rollups.DIMENSIONS).
+
+        Args:
+            dimensions: Dimension names, e.g. ['action', 'confidence', 'table'].
+            start_date: Filter start date.
+            end_date: Filter end date.
+
+        Returns:
+            {dimension: {value: RollupTotal}}
+        """
+        with self._get_connection() as conn:
+            return rollups.read_totals(conn, dimensions, start_date, end_date)
+
     def get_available_actions(self) -> List[str]:
         """Get list of all distinct actions in the log."""
         with self._get_connection() as conn:
@@ -602,25 +889,27 @@ class AuditDB:
                 )
 
             # Recompute checksum
-            checksum_data = {
-                'timestamp': row['timestamp'],
-                'user_id': row['user_id'],
-                'username': row['username'],
-                'action': row['action'],
-                'resource_type': row['resource_type'],
-                'resource_id': row['resource_id'],
-                'status': row['status'],
-                'request_method': row['request_method'],
-                'request_path': row['request_path'],
-            }
-            computed_checksum = self._compute_checksum(checksum_data)
+            computed_checksum = self._compute_checksum({field: row[field] for field in CHECKSUM_FIELDS})
+
+            discrepancy = None
+            if computed_checksum != row['checksum']:
+                discrepancy = "Checksum mismatch - record may have been tampered"
+            else:
+                # Link to the previous row
+                cursor.execute(
+                    'SELECT chain_hash FROM audit_logs WHERE id < ? ORDER BY id DESC LIMIT 1', (log_id,)
+                )
+                previous = cursor.fetchone()
+                expected = chain_link(previous['chain_hash'] if previous else GENESIS_HASH, row['checksum'])
+                if row['chain_hash'] != expected:
+                    discrepancy = "Chain hash mismatch - records may have been removed, reordered or tampered"
 
             return IntegrityCheckResult(
                 log_id=log_id,
-                integrity_valid=(computed_checksum == row['checksum']),
+                integrity_valid=discrepancy is None,
                 stored_checksum=row['checksum'],
                 computed_checksum=computed_checksum,
-                discrepancy_details=None if computed_checksum == row['checksum'] else "Checksum mismatch - record may have been tampered"
+                discrepancy_details=discrepancy
             )
 
     # ==================== HELPER METHODS ====================
@@ -648,6 +937,7 @@ class AuditDB:
             duration_ms=row['duration_ms'],
             error_message=row['error_message'],
             checksum=row['checksum'],
+            chain_hash=row['chain_hash'],
             created_at=datetime.fromisoformat(row['created_at']),
             details=details,
         )
@@ -111,6 +111,7 @@ class AuditLog(BaseModel):
     duration_ms: Optional[int] = None
     error_message: Optional[str] = None
     checksum: str
+    chain_hash: Optional[str] = None
     created_at: datetime
     details: Optional[Dict[str, Any]] = None
     query_details: Optional[QueryAuditDetails] = None
@@ -131,6 +132,15 @@ class AuditFilters(BaseModel):
     search_text: Optional[str] = None
     page: int = 1
     page_size: int = 50
+    cursor: Optional[str] = None  # next_cursor of the previous page; replaces page
+
+
+class AuditLogPage(BaseModel):
+    """One page of audit log search results."""
+    logs: List[AuditLog] = Field(default_factory=list)
+    total: int = 0
+    total_exact: bool = True  # False: at least total matches (counting stopped)
+    next_cursor: Optional[str] = None  # None on the last page
 
 
 class AuditStatistics(BaseModel):
@@ -164,3 +174,18 @@ class IntegrityCheckResult(BaseModel):
     computed_checksum: str
     verified_at: datetime = Field(default_factory=datetime.now)
     discrepancy_details: Optional[str] = None
+
+
+class ChainVerificationResult(BaseModel):
+    """Result of verifying the whole audit trail's hash chain."""
+    chain_valid: bool
+    total_rows: int = 0
+    rows_verified: int = 0
+    segments_verified: int = 0
+    segments_skipped: int = 0          # Covered by checkpoints (resume)
+    checkpoints_created: int = 0
+    resumed_from_id: Optional[int] = None
+    last_id: Optional[int] = None
+    failures: List[Dict[str, Any]] = Field(default_factory=list)  # {log_id, reason}
+    duration_ms: int = 0
+    verified_at: datetime = Field(default_factory=datetime.now)
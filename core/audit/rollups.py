@@ -0,0 +1,291 @@
+"""
+Audit Rollups Module
+====================
+
+Pre-aggregated audit counts for the statistics and dashboard endpoints.
+
+audit_rollups holds one row per period (hour or day), bucket, dimension and
+value: the event count plus the count and sum of the dimension's measure, so
+averages can be derived. Dimensions:
+
+- action, status, user, resource_type: audit_logs rows (measure: duration_ms)
+- duration: duration_ms histogram bucket (measure: duration_ms)
+- confidence: high / medium / low query confidence (measure: confidence_score)
+- query_time: query execution time histogram bucket (measure: execution_time_ms)
+- table: each table in a query's tables_accessed
+
+Triggers on audit_logs and query_audit_details update the rollups in the
+inserting transaction, whatever path writes the row; an existing database is
+backfilled once. A time range is read from daily rows for its whole days,
+hourly rows for its whole hours and the log itself only for the partial
+hours at its edges.
+
+Usage:
+    totals = read_totals(conn, ["action", "status"], start_date, end_date)
+    totals["status"]["success"].events
+    totals["action"]["QUERY"].average        # mean duration_ms
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional, List, Dict, Tuple, Iterable
+
+# Bucket prefix length of an ISO timestamp per period ('2026-01-31T14', '2026-01-31')
+PERIODS = {'hour': 13, 'day': 10}
+
+# Histogram bucket bounds (ms) of the duration and query_time dimensions
+DURATION_BUCKETS_MS = (100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+# Confidence scores at or above these are high / medium
+HIGH_CONFIDENCE = 90
+MEDIUM_CONFIDENCE = 70
+
+# Rows each dimension is computed from; r is always the audit_logs row
+_SOURCES = {
+    'log': "audit_logs r",
+    'query': "query_audit_details q JOIN audit_logs r ON r.id = q.audit_log_id",
+    'table': (
+        "query_audit_details q JOIN audit_logs r ON r.id = q.audit_log_id, "
+        "json_each(CASE WHEN json_valid(q.tables_accessed) THEN q.tables_accessed "
+        "ELSE json_array(q.tables_accessed) END) t"
+    ),
+}
+
+
+def histogram_labels(bounds: Tuple[int, ...] = DURATION_BUCKETS_MS) -> List[str]:
+    """Histogram bucket labels in order: '0-100', '100-250', ..., '30000+'."""
+    edges = (0,) + bounds
+    return [f"{lo}-{hi}" for lo, hi in zip(edges, bounds)] + [f"{bounds[-1]}+"]
+
+
+def _histogram_sql(column: str) -> str:
+    labels = histogram_labels()
+    cases = " ".join(f"WHEN {column} < {bound} THEN '{label}'" for bound, label in zip(DURATION_BUCKETS_MS, labels))
+    return f"CASE WHEN {column} IS NULL THEN NULL {cases} ELSE '{labels[-1]}' END"
+
+
+@dataclass(frozen=True)
+class _Dimension:
+    name: str
+    value: str      # SQL for the value (NULL: row not counted)
+    measure: str    # SQL for the measure
+    source: str     # Key of _SOURCES
+
+
+DIMENSIONS = {
+    dimension.name: dimension for dimension in (
+        _Dimension('action', 'r.action', 'r.duration_ms', 'log'),
+        _Dimension('status', 'r.status', 'r.duration_ms', 'log'),
+        _Dimension('user', 'r.username', 'r.duration_ms', 'log'),
+        _Dimension('resource_type', 'r.resource_type', 'r.duration_ms', 'log'),
+        _Dimension('duration', _histogram_sql('r.duration_ms'), 'r.duration_ms', 'log'),
+        _Dimension(
+            'confidence',
+            f"CASE WHEN q.confidence_score IS NULL THEN NULL "
+            f"WHEN q.confidence_score >= {HIGH_CONFIDENCE} THEN 'high' "
+            f"WHEN q.confidence_score >= {MEDIUM_CONFIDENCE} THEN 'medium' ELSE 'low' END",
+            'q.confidence_score', 'query'
+        ),
+        _Dimension('query_time', _histogram_sql('q.execution_time_ms'), 'q.execution_time_ms', 'query'),
+        _Dimension('table', "NULLIF(t.value, '')", 'NULL', 'table'),
+    )
+}
+
+
+@dataclass
+class RollupTotal:
+    """Events of one dimension value, with its measure's count and sum."""
+    events: int = 0
+    measure_count: int = 0
+    measure_sum: float = 0.0
+
+    @property
+    def average(self) -> Optional[float]:
+        """Mean of the measure (None if never measured)."""
+        return self.measure_sum / self.measure_count if self.measure_count else None
+
+
+def combined(totals: Iterable[RollupTotal]) -> RollupTotal:
+    """Sum of several totals (e.g. all values of a dimension)."""
+    result = RollupTotal()
+    for total in totals:
+        result.events += total.events
+        result.measure_count += total.measure_count
+        result.measure_sum += total.measure_sum
+    return result
+
+
+def _upsert_sql(dimension: _Dimension, period: str, row_filter: Optional[str] = None) -> str:
+    """
+    Add a dimension's counts to a period's rollups: for the source rows
+    matching row_filter (one new row, in a trigger) or for all rows.
+    """
+    conditions = [f"{dimension.value} IS NOT NULL"] + ([row_filter] if row_filter else [])
+    if row_filter:
+        counts = f"1, {dimension.measure} IS NOT NULL, coalesce({dimension.measure}, 0)"
+        group_by = ""
+    else:
+        counts = f"COUNT(*), COUNT({dimension.measure}), TOTAL({dimension.measure})"
+        group_by = "GROUP BY 2, 4"
+    return f'''
+        INSERT INTO audit_rollups (period, bucket, dimension, value, events, measure_count, measure_sum)
+        SELECT '{period}', substr(r.timestamp, 1, {PERIODS[period]}), '{dimension.name}', {dimension.value}, {counts}
+        FROM {_SOURCES[dimension.source]}
+        WHERE {" AND ".join(conditions)}
+        {group_by}
+        ON CONFLICT (period, bucket, dimension, value) DO UPDATE SET
+            events = events + excluded.events,
+            measure_count = measure_count + excluded.measure_count,
+            measure_sum = measure_sum + excluded.measure_sum
+    '''
+
+
+def _trigger_sql(name: str, table: str, row_filter: str, sources: Tuple[str, ...]) -> str:
+    statements = [
+        _upsert_sql(dimension, period, row_filter)
+        for dimension in DIMENSIONS.values() if dimension.source in sources
+        for period in PERIODS
+    ]
+    body = ";\n".join(statements)
+    return f"CREATE TRIGGER IF NOT EXISTS {name} AFTER INSERT ON {table} BEGIN {body}; END"
+
+
+def install(cursor) -> None:
+    """Create the rollup table and triggers; backfill the rows of an existing database."""
+    exists = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'audit_rollups'"
+    ).fetchone()
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS audit_rollups (
+            period TEXT NOT NULL,
+            bucket TEXT NOT NULL,
+            dimension TEXT NOT NULL,
+            value TEXT NOT NULL,
+            events INTEGER NOT NULL,
+            measure_count INTEGER NOT NULL,
+            measure_sum REAL NOT NULL,
+            PRIMARY KEY (period, bucket, dimension, value)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute(_trigger_sql('audit_rollups_log', 'audit_logs', 'r.id = new.id', ('log',)))
+    cursor.execute(_trigger_sql('audit_rollups_query', 'query_audit_details', 'q.id = new.id', ('query', 'table')))
+
+    if not exists:
+        for dimension in DIMENSIONS.values():
+            for period in PERIODS:
+                cursor.execute(_upsert_sql(dimension, period))
+
+
+def _floor(moment: datetime, period: str) -> datetime:
+    moment = moment.replace(minute=0, second=0, microsecond=0)
+    return moment.replace(hour=0) if period == 'day' else moment
+
+
+def _ceil(moment: datetime, period: str) -> datetime:
+    floor = _floor(moment, period)
+    if floor == moment:
+        return floor
+    return floor + (timedelta(days=1) if period == 'day' else timedelta(hours=1))
+
+
+def split_range(start: Optional[datetime], end: Optional[datetime]):
+    """
+    Split the range start <= t <= end into whole days, whole hours and the rest.
+
+    Returns:
+        (day range, hour ranges, partial ranges): half-open [lo, hi) datetime
+        ranges, None for an open bound; the day range is None if no whole
+        day is covered.
+    """
+    stop = end + timedelta(microseconds=1) if end else None
+    if start and stop and start >= stop:
+        return None, [], []
+
+    first_day = _ceil(start, 'day') if start else None
+    last_day = _floor(stop, 'day') if stop else None
+    if first_day and last_day and first_day >= last_day:
+        first_hour, last_hour = _ceil(start, 'hour'), _floor(stop, 'hour')
+        if first_hour >= last_hour:
+            return None, [], [(start, stop)]
+        hours, partial = [(first_hour, last_hour)], [(start, first_hour), (last_hour, stop)]
+        return None, hours, [(lo, hi) for lo, hi in partial if lo < hi]
+
+    hours, partial = [], []
+    if start:
+        first_hour = _ceil(start, 'hour')
+        hours.append((first_hour, first_day))
+        partial.append((start, first_hour))
+    if stop:
+        last_hour = _floor(stop, 'hour')
+        hours.append((last_day, last_hour))
+        partial.append((last_hour, stop))
+    return (
+        (first_day, last_day),
+        [(lo, hi) for lo, hi in hours if lo < hi],
+        [(lo, hi) for lo, hi in partial if lo < hi],
+    )
+
+
+def read_totals(conn,
+                dimensions: List[str],
+                start: Optional[datetime] = None,
+                end: Optional[datetime] = None) -> Dict[str, Dict[str, RollupTotal]]:
+    """
+    Totals per value of each dimension for events with start <= timestamp <= end.
+
+    Args:
+        conn: Connection to the audit database
+        dimensions: Names from DIMENSIONS
+        start: First timestamp included (None: no bound)
+        end: Last timestamp included (None: no bound)
+
+    Returns:
+        {dimension: {value: RollupTotal}}
+    """
+    totals: Dict[str, Dict[str, RollupTotal]] = {name: {} for name in dimensions}
+
+    def add(dimension, value, events, measure_count, measure_sum):
+        total = totals[dimension].setdefault(value, RollupTotal())
+        total.events += events
+        total.measure_count += measure_count
+        total.measure_sum += measure_sum
+
+    days, hours, partial = split_range(start, end)
+    placeholders = ",".join("?" * len(dimensions))
+
+    rollup_ranges = [('day', days)] if days else []
+    rollup_ranges += [('hour', hour_range) for hour_range in hours]
+    for period, (lo, hi) in rollup_ranges:
+        conditions, params = ["period = ?", f"dimension IN ({placeholders})"], [period] + list(dimensions)
+        for op, bound in ((">=", lo), ("<", hi)):
+            if bound is not None:
+                conditions.append(f"bucket {op} ?")
+                params.append(bound.isoformat()[:PERIODS[period]])
+        for row in conn.execute(f'''
+            SELECT dimension, value, SUM(events), SUM(measure_count), SUM(measure_sum)
+            FROM audit_rollups WHERE {" AND ".join(conditions)}
+            GROUP BY dimension, value
+        ''', params):
+            add(*row)
+
+    # Partial hours at the edges come from the log
+    for lo, hi in partial:
+        for name in dimensions:
+            dimension = DIMENSIONS[name]
+            conditions, params = [f"{dimension.value} IS NOT NULL"], []
+            if lo is not None:
+                conditions.append("r.timestamp >= ?")
+                params.append(lo.isoformat())
+            if hi is not None:
+                conditions.append("r.timestamp < ?")
+                params.append(hi.isoformat())
+            for row in conn.execute(f'''
+                SELECT {dimension.value}, COUNT(*), COUNT({dimension.measure}), TOTAL({dimension.measure})
+                FROM {_SOURCES[dimension.source]}
+                WHERE {" AND ".join(conditions)}
+                GROUP BY 1
+            ''', params):
+                add(name, *row)
+
+    return totals
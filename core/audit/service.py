@@ -20,11 +20,16 @@ from .models import (
     QueryAuditDetails,
     AuditLog,
     AuditFilters,
+    AuditLogPage,
     AuditStatistics,
     ElectronicSignature,
     IntegrityCheckResult,
+    ChainVerificationResult,
 )
 from .database import AuditDB
+from .rollups import RollupTotal
+from .writer import AuditWriter
+from .verifier import verify_chain
 
 
 class AuditService:
@@ -34,7 +39,10 @@ class AuditService:
     Usage:
         service = get_audit_service()
         audit_id = service.log_login("user123", "Dr. Smith", "192.168.1.1")
-        service.log_query(audit_id, query_details)
+        service.log_query_details(audit_id, query_details)
+
+        # High-volume events go through the background writer
+        service.log_query("user123", "Dr. Smith", question, details=query_details, background=True)
     """
 
     # Maximum size for response body logging (bytes)
@@ -46,9 +54,56 @@ class AuditService:
         "/health,/docs,/openapi.json,/redoc,/favicon.ico"
     ).split(",")
 
-    def __init__(self, db_path: Optional[str] = None):
-        """Initialize the audit service."""
+    # Write API request and background events through the batched writer
+    ASYNC_WRITES = os.getenv("AUDIT_ASYNC_WRITES", "true").lower() == "true"
+
+    def __init__(self, db_path: Optional[str] = None, async_writes: Optional[bool] = None):
+        """
+        Initialize the audit service.
+
+        Args:
+            db_path: Path to the audit database (default location if None).
+            async_writes: Use the background writer (default: AUDIT_ASYNC_WRITES).
+                If False, background events are written synchronously.
+        """
         self._db = AuditDB(db_path)
+        if async_writes is None:
+            async_writes = self.ASYNC_WRITES
+        self._writer = AuditWriter(self._db) if async_writes else None
+
+    # ==================== BACKGROUND WRITES ====================
+
+    def submit(self, event: AuditEvent, details: Optional[QueryAuditDetails] = None) -> Optional[int]:
+        """
+        Queue an event for the background writer.
+
+        Args:
+            event: The audit event.
+            details: Query details to link to the event's log entry.
+
+        Returns:
+            The audit log ID if written synchronously (async writes off),
+            otherwise None.
+        """
+        if self._writer is None:
+            return self._db.insert_batch([(event, details)])[0]
+        self._writer.submit(event, details)
+        return None
+
+    def flush(self, timeout: Optional[float] = 10.0) -> bool:
+        """Wait until queued events are written; False on timeout."""
+        return self._writer.flush(timeout) if self._writer else True
+
+    def close(self) -> None:
+        """Write queued events and stop the background writer."""
+        if self._writer is not None:
+            self._writer.close()
+
+    def get_writer_stats(self) -> Dict[str, Any]:
+        """Background writer metrics (queue size, lag, dropped events)."""
+        if self._writer is None:
+            return {"enabled": False}
+        return {"enabled": True, **self._writer.get_stats()}
 
     # ==================== AUTHENTICATION LOGGING ====================
 
@@ -133,7 +188,9 @@ class AuditService:
         ip_address: Optional[str] = None,
         duration_ms: Optional[int] = None,
         resource_id: Optional[str] = None,
-    ) -> int:
+        details: Optional[QueryAuditDetails] = None,
+        background: bool = False,
+    ) -> Optional[int]:
         """
         Log a query event.
 
@@ -146,9 +203,11 @@ class AuditService:
             ip_address: Client IP address.
             duration_ms: Query duration in milliseconds.
             resource_id: Conversation or session ID.
+            details: Detailed query information, written with the event.
+            background: Queue the event for the background writer.
 
         Returns:
-            The audit log ID.
+            The audit log ID (None if queued).
         """
         event = AuditEvent(
             user_id=user_id,
@@ -162,7 +221,9 @@ class AuditService:
             error_message=error_message,
             details={"question_preview": question[:200]} if question else None,
         )
-        return self._db.insert_log(event)
+        if background:
+            return self.submit(event, details)
+        return self._db.insert_batch([(event, details)])[0]
 
     def log_query_details(self, audit_log_id: int, details: QueryAuditDetails) -> int:
         """
@@ -270,7 +331,8 @@ class AuditService:
             error_message: Error message if failed.
 
         Returns:
-            The audit log ID, or None if path is excluded.
+            None if the path is excluded or the event was queued for the
+            background writer, otherwise the audit log ID.
         """
         # Skip excluded paths
         if any(path.startswith(excluded) for excluded in self.EXCLUDED_PATHS):
@@ -304,7 +366,7 @@ class AuditService:
             duration_ms=duration_ms,
             error_message=error_message,
         )
-        return self._db.insert_log(event)
+        return self.submit(event)
 
     # ==================== SYSTEM LOGGING ====================
 
@@ -410,6 +472,10 @@ class AuditService:
         """Search audit logs with filters."""
         return self._db.search_logs(filters)
 
+    def search_logs_page(self, filters: AuditFilters) -> AuditLogPage:
+        """Search audit logs one page at a time (keyset cursor, cached counts)."""
+        return self._db.search_logs_page(filters)
+
     def get_query_details(self, audit_log_id: int) -> Optional[QueryAuditDetails]:
         """Get query details for an audit log."""
         return self._db.get_query_details(audit_log_id)
@@ -422,6 +488,15 @@ class AuditService:
         """Get audit statistics."""
         return self._db.get_statistics(start_date, end_date)
 
+    def get_rollup_totals(
+        self,
+        dimensions: List[str],
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Dict[str, Dict[str, RollupTotal]]:
+        """Pre-aggregated totals per value of each dimension (action, table, confidence, ...)."""
+        return self._db.get_rollup_totals(dimensions, start_date, end_date)
+
     def get_available_actions(self) -> List[str]:
         """Get list of available action types."""
         return self._db.get_available_actions()
@@ -440,6 +515,21 @@ class AuditService:
         """Verify the integrity of an audit log."""
         return self._db.verify_integrity(log_id)
 
+    def verify_chain(self, resume: bool = True, max_workers: Optional[int] = None) -> ChainVerificationResult:
+        """
+        Verify the hash chain of the whole audit trail.
+
+        Args:
+            resume: Start after the last verified checkpoint.
+            max_workers: Worker processes (default: one per core, at most 8).
+
+        Returns:
+            Verification result with any failing log IDs.
+        """
+        # Queued events are part of the trail being verified
+        self.flush()
+        return verify_chain(self._db, resume=resume, max_workers=max_workers)
+
     def add_signature(
         self,
         audit_log_id: int,
@@ -0,0 +1,254 @@
+"""
+Audit Chain Verifier Module
+===========================
+
+Bulk verification of the audit trail's hash chain.
+
+Every audit log row stores a checksum of its content and a chain hash
+covering the previous row's chain hash. A row can be checked on its own
+given the stored chain hash of the row before it, so the table is split into
+id-range segments verified in parallel worker processes, each streaming its
+rows in large batches. For every row the verifier recomputes the checksum
+and the chain link.
+
+Each fully verified segment gets a checkpoint: its row count, the chain hash
+of its last row and a Merkle root over its rows' chain hashes. A resumed
+verification only checks that the checkpoints still match the log and then
+verifies the rows after the last checkpoint; a full verification re-checks
+every row and compares each segment with its checkpoint.
+
+Usage:
+    result = verify_chain(AuditDB(), resume=True)
+    result.chain_valid, result.failures
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+import logging
+import multiprocessing
+from json.encoder import encode_basestring_ascii
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Optional, List, Dict, Any
+
+from .models import ChainVerificationResult
+from .database import AuditDB, GENESIS_HASH, CHECKSUM_FIELDS, compute_checksum, chain_link
+
+logger = logging.getLogger(__name__)
+
+# Rows per segment (and per checkpoint), by id range
+CHECKPOINT_INTERVAL = int(os.getenv("AUDIT_CHECKPOINT_INTERVAL", "100000"))
+
+# Rows fetched per round trip
+FETCH_SIZE = 50000
+
+# Failures reported at most (per segment and overall)
+MAX_FAILURES = 100
+
+
+# compute_checksum's JSON for text/NULL fields, keys in sorted order
+_SORTED_FIELDS = sorted(CHECKSUM_FIELDS)
+_FIELD_INDEX = [CHECKSUM_FIELDS.index(name) for name in _SORTED_FIELDS]
+_CHECKSUM_TEMPLATE = "{" + ", ".join(f'"{name}": %s' for name in _SORTED_FIELDS) + "}"
+
+
+def _row_checksum(values: tuple) -> str:
+    """compute_checksum of a row's CHECKSUM_FIELDS values, without building a dict."""
+    encoded = []
+    for i in _FIELD_INDEX:
+        value = values[i]
+        if value is None:
+            encoded.append("null")
+        elif isinstance(value, str):
+            encoded.append(encode_basestring_ascii(value))
+        else:
+            return compute_checksum(dict(zip(CHECKSUM_FIELDS, values)))
+    return hashlib.sha256((_CHECKSUM_TEMPLATE % tuple(encoded)).encode('utf-8')).hexdigest()
+
+
+def merkle_root(hashes: List[str]) -> str:
+    """Merkle root of hex digests (the last node is paired with itself on odd levels)."""
+    if not hashes:
+        return GENESIS_HASH
+
+    level = [bytes.fromhex(h) for h in hashes]
+    while len(level) > 1:
+        if len(level) % 2:
+            level.append(level[-1])
+        level = [hashlib.sha256(level[i] + level[i + 1]).digest() for i in range(0, len(level), 2)]
+    return level[0].hex()
+
+
+def _verify_segment(db_path: str, start_id: int, end_id: int, previous_hash: str) -> Dict[str, Any]:
+    """
+    Verify the rows with start_id <= id <= end_id (runs in a worker process).
+
+    Args:
+        db_path: Audit database path
+        start_id: First id of the segment
+        end_id: Last id of the segment
+        previous_hash: Stored chain hash of the row before the segment
+
+    Returns:
+        Segment summary: rows, last_id, merkle_root and failures
+    """
+    columns = ", ".join(CHECKSUM_FIELDS)
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        cursor = conn.execute(
+            f"SELECT id, {columns}, checksum, chain_hash FROM audit_logs "
+            f"WHERE id BETWEEN ? AND ? ORDER BY id",
+            (start_id, end_id)
+        )
+
+        rows = 0
+        last_id = None
+        hashes = []
+        failures = []
+        previous = previous_hash
+        while True:
+            batch = cursor.fetchmany(FETCH_SIZE)
+            if not batch:
+                break
+            for row in batch:
+                log_id, checksum, chain_hash = row[0], row[-2], row[-1]
+                if _row_checksum(row[1:-2]) != checksum:
+                    failures.append({"log_id": log_id, "reason": "Checksum mismatch"})
+                if chain_hash != chain_link(previous, checksum):
+                    failures.append({"log_id": log_id, "reason": "Chain hash mismatch"})
+
+                # Continue from the stored hash, so one bad row is reported once
+                previous = chain_hash or ""
+                hashes.append(chain_hash or GENESIS_HASH)
+                last_id = log_id
+                rows += 1
+    finally:
+        conn.close()
+
+    return {
+        "start_id": start_id,
+        "end_id": end_id,
+        "rows": rows,
+        "last_id": last_id,
+        "chain_hash": previous,
+        "merkle_root": merkle_root(hashes),
+        "failures": failures[:MAX_FAILURES],
+    }
+
+
+def verify_chain(db: AuditDB,
+                 resume: bool = True,
+                 max_workers: Optional[int] = None,
+                 segment_size: int = CHECKPOINT_INTERVAL) -> ChainVerificationResult:
+    """
+    Verify the audit trail's hash chain and record checkpoints.
+
+    Args:
+        db: Audit database
+        resume: Start after the last checkpoint instead of re-verifying all rows
+        max_workers: Worker processes (default: one per core, at most 8)
+        segment_size: Ids per segment; must match the existing checkpoints
+
+    Returns:
+        ChainVerificationResult with the failures found
+    """
+    started = time.time()
+
+    with db._get_connection() as conn:
+        total_rows, max_id = conn.execute("SELECT COUNT(*), MAX(id) FROM audit_logs").fetchone()
+        checkpoints = {
+            row['start_id']: dict(row) for row in conn.execute('''
+                SELECT c.*, a.chain_hash AS log_chain_hash
+                FROM audit_checkpoints c LEFT JOIN audit_logs a ON a.id = c.last_id
+                ORDER BY c.start_id
+            ''').fetchall()
+        }
+
+    failures: List[Dict[str, Any]] = []
+
+    # Checkpoints must still match the chain hash stored in the log
+    for checkpoint in checkpoints.values():
+        if checkpoint['log_chain_hash'] != checkpoint['chain_hash']:
+            failures.append({"log_id": checkpoint['last_id'], "reason": "Checkpoint mismatch"})
+    valid_checkpoints = {
+        start: cp for start, cp in checkpoints.items() if cp['log_chain_hash'] == cp['chain_hash']
+    }
+
+    segments = [
+        (start, start + segment_size - 1)
+        for start in range(1, (max_id or 0) + 1, segment_size)
+    ]
+
+    # Resume after the leading run of checkpointed segments
+    skipped = 0
+    if resume:
+        while skipped < len(segments) and segments[skipped][0] in valid_checkpoints:
+            skipped += 1
+    to_verify = segments[skipped:]
+    resumed_from = segments[skipped][0] if resume and skipped and to_verify else None
+
+    # Stored chain hash before each segment
+    with db._get_connection() as conn:
+        tasks = []
+        for start, end in to_verify:
+            previous = conn.execute(
+                "SELECT chain_hash FROM audit_logs WHERE id < ? ORDER BY id DESC LIMIT 1", (start,)
+            ).fetchone()
+            tasks.append((str(db.db_path), start, end, previous[0] if previous else GENESIS_HASH))
+
+    workers = max(1, min(max_workers or min(8, os.cpu_count() or 1), len(tasks)))
+    if workers == 1:
+        results = [_verify_segment(*task) for task in tasks]
+    else:
+        # Spawned workers do not inherit the server's threads and locks
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            results = list(pool.map(_verify_segment, *zip(*tasks)))
+
+    # Segment failures; checkpointed segments must still match their checkpoint
+    rows_verified = 0
+    for result in results:
+        rows_verified += result["rows"]
+        failures.extend(result["failures"])
+        checkpoint = valid_checkpoints.get(result["start_id"])
+        if checkpoint and (checkpoint['merkle_root'], checkpoint['row_count']) != (result["merkle_root"], result["rows"]):
+            failures.append({"log_id": result["last_id"], "reason": "Checkpoint mismatch"})
+
+    # Checkpoint the verified, closed segments (all their ids are allocated)
+    created = 0
+    if not failures:
+        new_checkpoints = [
+            result for result in results
+            if result["end_id"] <= (max_id or 0) and result["rows"] and result["start_id"] not in checkpoints
+        ]
+        with db._get_connection(immediate=True) as conn:
+            now = datetime.now().isoformat()
+            conn.executemany('''
+                INSERT OR IGNORE INTO audit_checkpoints
+                (start_id, end_id, last_id, row_count, merkle_root, chain_hash, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', [
+                (r["start_id"], r["end_id"], r["last_id"], r["rows"], r["merkle_root"], r["chain_hash"], now)
+                for r in new_checkpoints
+            ])
+        created = len(new_checkpoints)
+
+    failures.sort(key=lambda f: f["log_id"] or 0)
+    duration_ms = int((time.time() - started) * 1000)
+    logger.info(f"Audit chain verification: {rows_verified} rows in {len(results)} segments "
+                f"({skipped} skipped) with {workers} workers, {len(failures)} failures, {duration_ms}ms")
+
+    return ChainVerificationResult(
+        chain_valid=not failures,
+        total_rows=total_rows,
+        rows_verified=rows_verified,
+        segments_verified=len(results),
+        segments_skipped=skipped,
+        checkpoints_created=created,
+        resumed_from_id=resumed_from,
+        last_id=max_id,
+        failures=failures[:MAX_FAILURES],
+        duration_ms=duration_ms,
+    )
@@ -0,0 +1,288 @@
+"""
+Audit Writer Module
+===================
+
+Background writer for high-volume audit events (API requests, chat queries).
+
+Writing an audit row synchronously costs a connection, a transaction and an
+fsync per event, in the request path. The writer instead takes events into a
+bounded in-memory queue and a single thread group-commits them: a batch is
+written in one transaction on a long-lived WAL connection when it reaches
+batch_size events or flush_interval seconds after its first event, and on
+flush() or close(). close() runs at interpreter exit, so queued events are
+written on shutdown.
+
+When the queue is full, events are dropped (never blocking the request) and
+counted in the stats, along with the queue lag.
+
+Usage:
+    writer = AuditWriter(AuditDB())
+    writer.submit(event)                 # returns immediately
+    writer.submit(query_event, details)  # details linked to the event's row
+    writer.flush()                       # wait until written
+    writer.get_stats()["lag_ms"]
+"""
+
+import os
+import time
+import queue
+import atexit
+import logging
+import threading
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Tuple
+
+from .models import AuditEvent, QueryAuditDetails
+from .database import AuditDB
+
+logger = logging.getLogger(__name__)
+
+# Queue item: (event, query details, enqueue time)
+_Pending = Tuple[AuditEvent, Optional[QueryAuditDetails], float]
+
+_STOP = object()
+
+
+class AuditWriter:
+    """
+    Bounded queue of audit events, written in batches by a background thread.
+
+    The thread starts with the first submitted event.
+    """
+
+    MAX_QUEUE = int(os.getenv("AUDIT_QUEUE_SIZE", "10000"))
+    BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+    FLUSH_INTERVAL = float(os.getenv("AUDIT_FLUSH_INTERVAL_MS", "200")) / 1000
+
+    def __init__(
+        self,
+        db: AuditDB,
+        max_queue: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+    ):
+        """
+        Initialize the writer.
+
+        Args:
+            db: Audit database to write to.
+            max_queue: Events held before new ones are dropped.
+            batch_size: Events written per transaction at most.
+            flush_interval: Seconds a batch waits for more events.
+        """
+        self._db = db
+        self.max_queue = max_queue or self.MAX_QUEUE
+        self.batch_size = batch_size or self.BATCH_SIZE
+        self.flush_interval = self.FLUSH_INTERVAL if flush_interval is None else flush_interval
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=self.max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        # Held while checking _closed and enqueueing, so close() cannot
+        # drain the queue between the two
+        self._state_lock = threading.Lock()
+        self._closed = False
+
+        self._oldest_in_batch: Optional[float] = None
+        self._stats = {
+            'submitted': 0,
+            'written': 0,
+            'dropped': 0,
+            'failed': 0,
+            'batches': 0,
+            'last_batch_size': 0,
+            'last_batch_lag_ms': 0.0,
+            'max_lag_ms': 0.0,
+            'last_flush_at': None,
+        }
+
+    # ==================== PRODUCER SIDE ====================
+
+    def submit(self, event: AuditEvent, details: Optional[QueryAuditDetails] = None) -> bool:
+        """
+        Queue an event for writing.
+
+        After close() the event is written synchronously instead.
+
+        Args:
+            event: The audit event.
+            details: Query details to link to the event's log entry.
+
+        Returns:
+            True if queued (or written), False if dropped because the queue is full.
+        """
+        with self._state_lock:
+            closed = self._closed
+            if not closed:
+                self._ensure_started()
+                try:
+                    self._queue.put_nowait((event, details, time.monotonic()))
+                    queued = True
+                except queue.Full:
+                    queued = False
+
+        if closed:
+            self._db.insert_batch([(event, details)])
+            return True
+
+        if not queued:
+            with self._lock:
+                self._stats['dropped'] += 1
+                dropped = self._stats['dropped']
+            if dropped == 1 or dropped % 1000 == 0:
+                logger.warning(f"Audit queue full ({self.max_queue}); {dropped} events dropped")
+            return False
+
+        with self._lock:
+            self._stats['submitted'] += 1
+        return True
+
+    def flush(self, timeout: Optional[float] = 10.0) -> bool:
+        """
+        Wait until every event queued so far is written.
+
+        Args:
+            timeout: Seconds to wait at most (None: no limit).
+
+        Returns:
+            False if the timeout expired first.
+        """
+        if self._thread is None or not self._thread.is_alive():
+            return True
+
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        """Write the queued events and stop the thread."""
+        with self._state_lock:
+            if self._closed:
+                return
+            self._closed = True
+
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+
+        # Events queued before _closed was set but after the stop marker
+        leftover = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, tuple):
+                leftover.append((item[0], item[1]))
+            elif isinstance(item, threading.Event):
+                item.set()
+        if leftover:
+            self._db.insert_batch(leftover)
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    # ==================== WRITER THREAD ====================
+
+    def _run(self) -> None:
+        """Collect batches from the queue and write them."""
+        conn = self._db.open_writer_connection()
+        try:
+            stop = False
+            while not stop:
+                item = self._queue.get()
+                batch: List[_Pending] = []
+                flushed: List[threading.Event] = []
+                deadline = time.monotonic() + self.flush_interval
+
+                # Gather until the batch is full, the interval ends or a marker arrives
+                while True:
+                    if item is _STOP:
+                        stop = True
+                        break
+                    if isinstance(item, threading.Event):
+                        flushed.append(item)
+                        break
+                    if not batch:
+                        self._oldest_in_batch = item[2]
+                    batch.append(item)
+                    if len(batch) >= self.batch_size:
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = self._queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+
+                if batch:
+                    self._write(conn, batch)
+                self._oldest_in_batch = None
+                for done in flushed:
+                    done.set()
+        finally:
+            conn.close()
+
+    def _write(self, conn, batch: List[_Pending]) -> None:
+        """Write a batch in one transaction, or event by event if that fails."""
+        items = [(event, details) for event, details, _ in batch]
+        written = 0
+        try:
+            self._db.insert_batch(items, conn)
+            written = len(items)
+        except Exception as e:
+            logger.error(f"Audit batch of {len(items)} events failed, retrying one by one: {e}")
+            for item in items:
+                try:
+                    self._db.insert_batch([item], conn)
+                    written += 1
+                except Exception as item_error:
+                    logger.error(f"Audit event {item[0].action} could not be written: {item_error}")
+
+        lag_ms = (time.monotonic() - batch[0][2]) * 1000
+        with self._lock:
+            self._stats['written'] += written
+            self._stats['failed'] += len(items) - written
+            self._stats['batches'] += 1
+            self._stats['last_batch_size'] = len(items)
+            self._stats['last_batch_lag_ms'] = round(lag_ms, 1)
+            self._stats['max_lag_ms'] = round(max(self._stats['max_lag_ms'], lag_ms), 1)
+            self._stats['last_flush_at'] = datetime.now().isoformat()
+
+    # ==================== METRICS ====================
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Writer metrics.
+
+        lag_ms is the age of the oldest event not yet written; the
+        last_batch/max lags are measured from enqueue to commit.
+        """
+        now = time.monotonic()
+        with self._queue.mutex:
+            head = next((item for item in self._queue.queue if isinstance(item, tuple)), None)
+        oldest = [t for t in (self._oldest_in_batch, head[2] if head else None) if t is not None]
+
+        with self._lock:
+            stats = dict(self._stats)
+        batches = stats['batches']
+        stats.update({
+            'running': self._thread is not None and self._thread.is_alive(),
+            'queued': self._queue.qsize(),
+            'max_queue': self.max_queue,
+            'batch_size': self.batch_size,
+            'flush_interval_ms': round(self.flush_interval * 1000),
+            'lag_ms': round((now - min(oldest)) * 1000, 1) if oldest else 0.0,
+            'avg_batch_size': round(stats['written'] / batches, 1) if batches else 0.0,
+        })
+        return stats
@@ -10,6 +10,9 @@ This module provides:
 - DuckDBLoader: Load processed data into DuckDB with validation
 - UniversalReader: Unified reader for SAS7BDAT, Parquet, CSV, XPT formats
 - SchemaTracker: Version control and change detection for data schemas
+- DuckDBConnectionManager: Shared DuckDB handle with per-thread cursors
+- TableProfiler: Single-scan column statistics for whole tables
+- BatchProcessor: Parallel multi-file ingestion with a single DuckDB writer
 """
 
 from .sas_reader import SASReader
@@ -18,6 +21,12 @@ from .duckdb_loader import DuckDBLoader
 from .universal_reader import UniversalReader, DataFormat, FileMetadata, SchemaInfo, ReadResult
 from .schema_tracker import SchemaTracker, SchemaVersion, SchemaDiff, ColumnChange, ChangeType, ChangeSeverity
 from .file_store import FileStore, FileRecord, FileStatus, ProcessingStep
+from .connection_manager import (
+    DuckDBConnectionManager, get_connection_manager, close_connection_manager,
+    close_all_connection_managers, get_connection_stats
+)
+from .table_profiler import TableProfiler, ColumnProfile
+from .batch_processor import BatchProcessor, BatchJob, FileProgress, get_batch_job, shutdown_parse_pool
 
 __all__ = [
     # Original components
@@ -42,4 +51,19 @@ __all__ = [
     'FileRecord',
     'FileStatus',
     'ProcessingStep',
+    # Connection management
+    'DuckDBConnectionManager',
+    'get_connection_manager',
+    'close_connection_manager',
+    'close_all_connection_managers',
+    'get_connection_stats',
+    # Table profiling
+    'TableProfiler',
+    'ColumnProfile',
+    # Batch processing
+    'BatchProcessor',
+    'BatchJob',
+    'FileProgress',
+    'get_batch_job',
+    'shutdown_parse_pool',
 ]
@@ -0,0 +1,446 @@
+# SAGE - Batch Processor Module
+# ==============================
+# Parallel multi-file ingestion with a single DuckDB writer
+"""
+Batch ingestion of many data files at once (e.g. a study's SDTM/ADaM load).
+
+Parsing a SAS/XPT/CSV file and standardizing its dates is CPU-bound pandas
+work, so files are parsed in a process pool. The pool is shared by every
+batch of the process and sized to MAX_PARSE_WORKERS, so concurrent batches
+never run more parsers than that; each batch keeps at most its own
+max_workers files in it. Each worker streams its file through
+UniversalReader.read_chunks and writes the chunks as Parquet parts to a
+staging directory, hashing the file on the way.
+
+DuckDB writes stay serialized: one writer thread takes parsed files as they
+become ready, streams the parts into DuckDB with DuckDBLoader.load_chunks,
+checks the schema as loaded before the table is replaced, and records the
+schema version and file record. Parsing of the remaining files continues
+meanwhile.
+
+Progress is tracked per file in a BatchJob, kept in a process-wide registry
+so it can be polled while the batch runs.
+
+Example:
+    processor = BatchProcessor(loader, schema_tracker, file_store, max_workers=4)
+    job = processor.start(["data/raw/dm.sas7bdat", "data/raw/ae.sas7bdat"])
+    get_batch_job(job.job_id).to_dict()     # poll
+    job.wait()
+"""
+
+import os
+import uuid
+import shutil
+import hashlib
+import logging
+import tempfile
+import threading
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, Future, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .universal_reader import UniversalReader
+from .schema_tracker import SchemaTracker
+from .file_store import FileStore, FileRecord, FileStatus
+from .duckdb_loader import DuckDBLoader
+
+logger = logging.getLogger(__name__)
+
+# Jobs kept for status polling (oldest dropped first)
+MAX_TRACKED_JOBS = 50
+
+_jobs: "OrderedDict[str, BatchJob]" = OrderedDict()
+_jobs_lock = threading.Lock()
+
+# Parse processes across all batches of the process
+MAX_PARSE_WORKERS = max(1, int(os.getenv("DATA_PROCESS_MAX_WORKERS", "0")) or os.cpu_count() or 1)
+
+_parse_pool: Optional[ProcessPoolExecutor] = None
+_parse_pool_lock = threading.Lock()
+
+
+def default_workers() -> int:
+    """Default parse concurrency: one process per core, at most 4."""
+    return max(1, min(4, os.cpu_count() or 1, MAX_PARSE_WORKERS))
+
+
+def get_parse_pool() -> ProcessPoolExecutor:
+    """The process pool shared by every batch (MAX_PARSE_WORKERS processes)."""
+    global _parse_pool
+    with _parse_pool_lock:
+        # A pool whose worker died cannot take work; replace it
+        if _parse_pool is None or getattr(_parse_pool, "_broken", False):
+            # Spawned workers do not inherit the server's threads and locks
+            _parse_pool = ProcessPoolExecutor(
+                max_workers=MAX_PARSE_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _parse_pool
+
+
+def shutdown_parse_pool(wait: bool = True):
+    """Stop the shared parse pool (shutdown); the next batch starts a new one."""
+    global _parse_pool
+    with _parse_pool_lock:
+        pool, _parse_pool = _parse_pool, None
+    if pool is not None:
+        pool.shutdown(wait=wait)
+
+
+@dataclass
+class FileProgress:
+    """Processing state of one file in a batch."""
+    filename: str
+    table_name: str
+    status: str = "pending"      # pending, parsing, loading, completed, blocked, error
+    rows: Optional[int] = None
+    columns: Optional[int] = None
+    schema_version: Optional[int] = None
+    error: Optional[str] = None
+    reason: Optional[str] = None
+    schema_diff: Optional[Dict[str, Any]] = None
+    file_size: int = 0
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("completed", "blocked", "error")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Result entry, without fields that do not apply."""
+        d = {
+            "filename": self.filename,
+            "table_name": self.table_name,
+            "status": self.status,
+            "rows": self.rows,
+            "columns": self.columns,
+            "schema_version": self.schema_version,
+            "error": self.error,
+            "reason": self.reason,
+            "schema_diff": self.schema_diff,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+        return {k: v for k, v in d.items() if v is not None}
+
+
+@dataclass
+class BatchJob:
+    """A batch of files processed together."""
+    job_id: str
+    files: List[FileProgress]
+    max_workers: int
+    status: str = "running"      # running, finalizing (deferred completion), completed
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    finished_at: Optional[str] = None
+    details: Dict[str, Any] = field(default_factory=dict)   # Extra fields set by the caller
+    _loaded: threading.Event = field(default_factory=threading.Event, repr=False)
+    _done: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    @property
+    def progress(self) -> float:
+        """Percentage of files finished."""
+        if not self.files:
+            return 100.0
+        return round(100.0 * sum(f.finished for f in self.files) / len(self.files), 1)
+
+    def count(self, *statuses: str) -> int:
+        """Files in any of the given statuses."""
+        return sum(f.status in statuses for f in self.files)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the job is completed; False on timeout."""
+        return self._done.wait(timeout)
+
+    def wait_loaded(self, timeout: Optional[float] = None) -> bool:
+        """Block until every file is finished, before a deferred completion; False on timeout."""
+        return self._loaded.wait(timeout)
+
+    def complete(self):
+        """Mark the job completed (called by the caller when completion was deferred)."""
+        self.status = "completed"
+        self.finished_at = datetime.now().isoformat()
+        self._loaded.set()
+        self._done.set()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "progress": self.progress,
+            "total": len(self.files),
+            "completed": self.count("completed"),
+            "failed": self.count("error", "blocked"),
+            "max_workers": self.max_workers,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            **self.details,
+            "results": [f.to_dict() for f in self.files],
+        }
+
+
+def get_batch_job(job_id: str) -> Optional[BatchJob]:
+    """Look up a batch job by id (None if unknown or expired)."""
+    with _jobs_lock:
+        return _jobs.get(job_id)
+
+
+def _register_job(job: BatchJob):
+    with _jobs_lock:
+        _jobs[job.job_id] = job
+        while len(_jobs) > MAX_TRACKED_JOBS:
+            _jobs.popitem(last=False)
+
+
+def _parse_file(filepath: str, output_dir: str, reader_options: Dict[str, Any]) -> Tuple[List[str], str]:
+    """
+    Parse a file into Parquet parts (runs in a worker process).
+
+    Args:
+        filepath: Source data file
+        output_dir: Directory for the parts (created)
+        reader_options: UniversalReader keyword arguments
+
+    Returns:
+        (part paths in order, SHA256 of the source file)
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    reader = UniversalReader(**reader_options)
+
+    parts = []
+    for i, chunk in enumerate(reader.read_chunks(filepath)):
+        part = os.path.join(output_dir, f"part-{i:05d}.parquet")
+        pq.write_table(pa.Table.from_pandas(chunk, preserve_index=False), part)
+        parts.append(part)
+
+    sha256 = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            sha256.update(block)
+
+    return parts, sha256.hexdigest()
+
+
+class BatchProcessor:
+    """
+    Processes many files in parallel into DuckDB.
+
+    Up to max_workers files at a time are parsed in the shared process
+    pool; a single writer thread loads them into DuckDB one at a time, in
+    the order they finish parsing.
+    """
+
+    def __init__(self,
+                 loader: DuckDBLoader,
+                 schema_tracker: SchemaTracker,
+                 file_store: FileStore,
+                 max_workers: Optional[int] = None,
+                 reader_options: Optional[Dict[str, Any]] = None):
+        """
+        Initialize batch processor.
+
+        Args:
+            loader: Loader for the target database (the single writer)
+            schema_tracker: Schema version tracker
+            file_store: File record store
+            max_workers: Files parsed at once (default: default_workers(),
+                at most MAX_PARSE_WORKERS)
+            reader_options: UniversalReader keyword arguments for the workers
+        """
+        self.loader = loader
+        self.schema_tracker = schema_tracker
+        self.file_store = file_store
+        self.max_workers = max(1, min(max_workers or default_workers(), MAX_PARSE_WORKERS))
+        self.reader_options = reader_options or {}
+
+    def start(self, filepaths: List[str],
+              block_on_breaking: bool = True,
+              job_id: Optional[str] = None,
+              defer_completion: bool = False) -> BatchJob:
+        """
+        Start processing files in the background.
+
+        Args:
+            filepaths: Files to process (missing files are reported as errors)
+            block_on_breaking: Skip files with breaking schema changes
+            job_id: Optional job id (generated if None)
+            defer_completion: Leave the job "finalizing" once every file is
+                finished, for the caller to complete() after its own
+                follow-up work (wait_loaded() returns at that point)
+
+        Returns:
+            The registered BatchJob; use wait() to block until it finishes
+        """
+        paths = [Path(p) for p in filepaths]
+        job = BatchJob(
+            job_id=job_id or str(uuid.uuid4())[:8],
+            files=[FileProgress(filename=p.name, table_name=p.stem.upper()) for p in paths],
+            max_workers=self.max_workers,
+        )
+        _register_job(job)
+
+        threading.Thread(
+            target=self._run, args=(job, paths, block_on_breaking, defer_completion),
+            name=f"batch-{job.job_id}", daemon=True
+        ).start()
+        return job
+
+    def run(self, filepaths: List[str], block_on_breaking: bool = True) -> BatchJob:
+        """Process files and wait for the batch to finish."""
+        job = self.start(filepaths, block_on_breaking)
+        job.wait()
+        return job
+
+    def _run(self, job: BatchJob, paths: List[Path], block_on_breaking: bool,
+             defer_completion: bool = False):
+        """Parse in the shared process pool, load through the writer thread."""
+        staging_dir = tempfile.mkdtemp(prefix=f"sage_batch_{job.job_id}_")
+
+        try:
+            pool = get_parse_pool()
+            parsing: Dict[Future, Tuple[FileProgress, Path]] = {}
+
+            with ThreadPoolExecutor(max_workers=1, thread_name_prefix="batch-writer") as writer:
+
+                def hand_parsed_to_writer():
+                    done, _ = wait(parsing, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        progress, path = parsing.pop(future)
+                        writer.submit(self._load_file, future, progress, path, block_on_breaking)
+
+                for i, (path, progress) in enumerate(zip(paths, job.files)):
+                    if not path.exists():
+                        self._finish(progress, "error", error="File not found")
+                        continue
+
+                    # At most max_workers of this batch's files in the shared pool
+                    while len(parsing) >= self.max_workers:
+                        hand_parsed_to_writer()
+
+                    progress.status = "parsing"
+                    progress.started_at = datetime.now().isoformat()
+                    progress.file_size = path.stat().st_size
+                    future = pool.submit(
+                        _parse_file, str(path), os.path.join(staging_dir, f"{i:04d}"), self.reader_options
+                    )
+                    parsing[future] = (progress, path)
+
+                while parsing:
+                    hand_parsed_to_writer()
+
+                # Leaving the writer waits for the loads
+        except Exception as e:
+            logger.error(f"Batch {job.job_id} failed: {e}")
+            for progress in job.files:
+                if not progress.finished:
+                    self._finish(progress, "error", error=str(e))
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            if defer_completion:
+                job.status = "finalizing"
+                job._loaded.set()
+            else:
+                job.complete()
+
+        logger.info(f"Batch {job.job_id}: {job.count('completed')}/{len(job.files)} files loaded "
+                    f"with {self.max_workers} parse workers")
+
+    def _load_file(self, parsed: Future, progress: FileProgress, path: Path, block_on_breaking: bool):
+        """Load one parsed file (writer thread)."""
+        try:
+            parts, file_hash = parsed.result()
+        except Exception as e:
+            self._finish(progress, "error", error=str(e))
+            return
+
+        try:
+            table_name = progress.table_name
+            if not parts:
+                self._finish(progress, "error", error="File contains no data")
+                return
+
+            progress.status = "loading"
+            first = pd.read_parquet(parts[0])
+            schema = self.schema_tracker.extract_schema(first)
+
+            def chunks():
+                yield first
+                for part in parts[1:]:
+                    chunk = pd.read_parquet(part)
+                    self.schema_tracker.merge_schema(schema, chunk)
+                    yield chunk
+
+            def loaded(rows: int):
+                progress.rows = rows
+
+            # Schema check on the types as loaded, before the table is replaced
+            blocked = {}
+
+            def check_schema(columns):
+                self.schema_tracker.apply_loaded_types(schema, columns)
+                should_block, diff = self.schema_tracker.should_block_upload(
+                    table_name, schema, block_on_breaking
+                )
+                if should_block:
+                    blocked["diff"] = diff
+                    raise ValueError("Blocked: Breaking schema changes")
+
+            result = self.loader.load_chunks(chunks(), table_name, source_file=str(path),
+                                             progress_callback=loaded, schema_check=check_schema)
+            if "diff" in blocked:
+                diff = blocked["diff"]
+                self._finish(
+                    progress, "blocked",
+                    reason="Breaking schema changes",
+                    schema_diff={
+                        "severity": diff.severity.value,
+                        "removed_columns": [c.column_name for c in diff.removed_columns]
+                    }
+                )
+                return
+            if not result.success:
+                self._finish(progress, "error", error=result.error)
+                return
+
+            schema_version = self.schema_tracker.record_version(table_name, schema, str(path))
+
+            record = FileRecord(
+                id=str(uuid.uuid4()),
+                filename=progress.filename,
+                table_name=table_name,
+                file_format=path.suffix.lower()[1:],
+                file_size=progress.file_size,
+                file_hash=file_hash,
+                schema_hash=schema_version.schema_hash,
+                status=FileStatus.COMPLETED,
+                processed_at=datetime.now().isoformat(),
+                row_count=result.rows_loaded,
+                column_count=schema['column_count'],
+                schema_version=schema_version.version
+            )
+            self.file_store.save(record)
+            self.file_store.archive_previous(table_name, record.id)
+
+            progress.rows = result.rows_loaded
+            progress.columns = schema['column_count']
+            progress.schema_version = schema_version.version
+            self._finish(progress, "completed")
+
+        except Exception as e:
+            logger.error(f"Failed to load {progress.filename}: {e}")
+            self._finish(progress, "error", error=str(e))
+
+    @staticmethod
+    def _finish(progress: FileProgress, status: str, **details):
+        for key, value in details.items():
+            setattr(progress, key, value)
+        progress.status = status
+        progress.finished_at = datetime.now().isoformat()
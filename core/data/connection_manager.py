@@ -0,0 +1,351 @@
+# SAGE DuckDB Connection Manager
+# ===============================
+# Shared DuckDB handles with per-thread cursors
+"""
+Process-wide DuckDB connection management.
+
+DuckDB allows one database instance per file and process, and a connection
+object must not be used from several threads at once. This module keeps one
+database handle per file and hands out:
+
+- Per-thread cursors for reads (queries run in parallel across threads)
+- A single writer cursor, serialized by a lock, for loads and DDL
+- Utilization metrics (active reads, cursor count, writer waits)
+
+Example:
+    manager = get_connection_manager("data/database/clinical.duckdb")
+    with manager.read() as conn:
+        count = conn.execute("SELECT COUNT(*) FROM ADSL").fetchone()[0]
+
+    loader_manager = get_connection_manager(db_path, writable=True)
+    with loader_manager.write() as conn:
+        conn.execute("CREATE TABLE ...")
+"""
+
+import os
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Iterator, Tuple
+
+import duckdb
+
+logger = logging.getLogger(__name__)
+
+
+class DuckDBConnectionManager:
+    """
+    One DuckDB database handle shared by all threads of the process.
+
+    Reads use a cursor owned by the calling thread; writes go through a
+    dedicated writer cursor and are serialized. A read-only manager is
+    upgraded in place when a writer is first requested.
+
+    Results must be fetched inside the read()/write() block: the cursor is
+    reused by later calls on the same thread.
+    """
+
+    def __init__(self, db_path: str, writable: bool = False):
+        """
+        Open the database.
+
+        Args:
+            db_path: Path to the DuckDB file (or ":memory:")
+            writable: Open for writing (otherwise read-only)
+        """
+        self.db_path = str(db_path)
+        self.writable = writable
+
+        self._cond = threading.Condition()
+        self._write_lock = threading.RLock()
+        self._writer_thread: Optional[int] = None
+        self._write_depth = 0
+
+        self._db = None
+        self._writer = None
+        self._cursors: Dict[int, Any] = {}
+        self._file_id: Optional[Tuple[int, int]] = None
+        self._closed = False
+        self._upgrading = False
+
+        # Metrics
+        self._active_reads = 0
+        self._peak_active_reads = 0
+        self._reads = 0
+        self._read_time_ms = 0.0
+        self._writes = 0
+        self._write_wait_ms = 0.0
+        self._max_write_wait_ms = 0.0
+        self._cursors_created = 0
+
+        self._open(writable)
+
+    # ------------------------------------------------------------------
+    # Handles
+    # ------------------------------------------------------------------
+
+    def _open(self, writable: bool):
+        """Open the database handle (and writer cursor if writable)."""
+        try:
+            self._db = duckdb.connect(self.db_path, read_only=not writable)
+        except duckdb.ConnectionException as e:
+            if writable or "different configuration" not in str(e):
+                raise
+            # Already open read-write elsewhere in this process; share that mode
+            self._db = duckdb.connect(self.db_path, read_only=False)
+            writable = True
+
+        self.writable = writable
+        self._writer = self._db.cursor() if writable else None
+        self._file_id = self._stat_file()
+        logger.info(f"DuckDB handle opened: {self.db_path} ({'read-write' if writable else 'read-only'})")
+
+    def _close_handles(self):
+        """Close every cursor and the database handle."""
+        for cursor in list(self._cursors.values()) + [self._writer, self._db]:
+            if cursor is None:
+                continue
+            try:
+                cursor.close()
+            except Exception:
+                pass
+        self._cursors.clear()
+        self._writer = None
+        self._db = None
+
+    def _stat_file(self) -> Optional[Tuple[int, int]]:
+        """Identity of the database file, to detect replacement."""
+        if self.db_path == ":memory:":
+            return None
+        try:
+            st = os.stat(self.db_path)
+            return (st.st_dev, st.st_ino)
+        except OSError:
+            return None
+
+    def is_stale(self) -> bool:
+        """True if the database file was deleted or replaced since opening."""
+        if self.db_path == ":memory:":
+            return False
+        return self._stat_file() != self._file_id
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def upgrade_to_writable(self):
+        """
+        Reopen a read-only handle for writing.
+
+        Waits for in-flight reads, then closes all cursors; threads get new
+        cursors on their next read.
+        """
+        with self._write_lock:
+            with self._cond:
+                if self.writable:
+                    return
+                self._upgrading = True
+                while self._active_reads:
+                    self._cond.wait()
+                try:
+                    self._close_handles()
+                    self._open(writable=True)
+                finally:
+                    self._upgrading = False
+                    self._cond.notify_all()
+
+    def close(self):
+        """Close the handle; later use raises RuntimeError."""
+        with self._cond:
+            self._close_handles()
+            self._closed = True
+
+    # ------------------------------------------------------------------
+    # Cursors
+    # ------------------------------------------------------------------
+
+    def cursor(self):
+        """
+        Get the calling thread's cursor.
+
+        Inside write() the writer cursor is returned, so helpers called
+        during a load see uncommitted changes of the same transaction.
+        """
+        ident = threading.get_ident()
+        if self._writer_thread == ident:
+            return self._writer
+
+        with self._cond:
+            if self._closed:
+                raise RuntimeError(f"DuckDB connection manager closed: {self.db_path}")
+            cursor = self._cursors.get(ident)
+            if cursor is None:
+                self._prune_dead_threads()
+                cursor = self._db.cursor()
+                self._cursors[ident] = cursor
+                self._cursors_created += 1
+            return cursor
+
+    def _prune_dead_threads(self):
+        """Close cursors owned by threads that have exited."""
+        alive = {t.ident for t in threading.enumerate()}
+        for ident in [i for i in self._cursors if i not in alive]:
+            try:
+                self._cursors.pop(ident).close()
+            except Exception:
+                pass
+
+    @contextmanager
+    def read(self) -> Iterator[Any]:
+        """Run reads on this thread's cursor."""
+        with self._cond:
+            while self._upgrading:
+                self._cond.wait()
+            self._active_reads += 1
+            self._reads += 1
+            self._peak_active_reads = max(self._peak_active_reads, self._active_reads)
+
+        start = time.time()
+        try:
+            yield self.cursor()
+        finally:
+            with self._cond:
+                self._active_reads -= 1
+                self._read_time_ms += (time.time() - start) * 1000
+                self._cond.notify_all()
+
+    @contextmanager
+    def write(self) -> Iterator[Any]:
+        """
+        Run writes on the single writer cursor.
+
+        Writers are serialized; the block is re-entrant on the same thread.
+
+        Raises:
+            PermissionError: If the database was opened read-only
+        """
+        if not self.writable:
+            raise PermissionError(f"DuckDB database opened read-only: {self.db_path}")
+
+        wait_start = time.time()
+        self._write_lock.acquire()
+        wait_ms = (time.time() - wait_start) * 1000
+        try:
+            if self._closed:
+                raise RuntimeError(f"DuckDB connection manager closed: {self.db_path}")
+            with self._cond:
+                self._writes += 1
+                self._write_wait_ms += wait_ms
+                self._max_write_wait_ms = max(self._max_write_wait_ms, wait_ms)
+            self._writer_thread = threading.get_ident()
+            self._write_depth += 1
+            try:
+                yield self._writer
+            finally:
+                self._write_depth -= 1
+                if self._write_depth == 0:
+                    self._writer_thread = None
+        finally:
+            self._write_lock.release()
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool utilization metrics."""
+        with self._cond:
+            open_cursors = len(self._cursors)
+            return {
+                'db_path': self.db_path,
+                'writable': self.writable,
+                'closed': self._closed,
+                'open_cursors': open_cursors,
+                'cursors_created': self._cursors_created,
+                'active_reads': self._active_reads,
+                'peak_active_reads': self._peak_active_reads,
+                'utilization': round(self._active_reads / open_cursors * 100, 1) if open_cursors else 0.0,
+                'reads': self._reads,
+                'avg_read_ms': round(self._read_time_ms / self._reads, 2) if self._reads else 0.0,
+                'writes': self._writes,
+                'write_active': self._writer_thread is not None,
+                'avg_write_wait_ms': round(self._write_wait_ms / self._writes, 2) if self._writes else 0.0,
+                'max_write_wait_ms': round(self._max_write_wait_ms, 2),
+            }
+
+
+# =============================================================================
+# Global Registry
+# =============================================================================
+
+_managers: Dict[str, DuckDBConnectionManager] = {}
+_managers_lock = threading.Lock()
+
+
+def _registry_key(db_path) -> str:
+    """Normalize a database path for the registry."""
+    db_path = str(db_path)
+    if db_path == ":memory:":
+        return db_path
+    return str(Path(db_path).resolve())
+
+
+def get_connection_manager(db_path, writable: bool = False) -> DuckDBConnectionManager:
+    """
+    Get the shared connection manager for a database file.
+
+    Args:
+        db_path: Path to the DuckDB file
+        writable: Whether the caller needs the writer (upgrades a read-only handle)
+
+    Returns:
+        DuckDBConnectionManager for the file
+    """
+    key = _registry_key(db_path)
+    stale = None
+    created = False
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is not None and (manager.closed or manager.is_stale()):
+            stale = manager
+            manager = None
+
+        if manager is None:
+            manager = DuckDBConnectionManager(key, writable=writable)
+            _managers[key] = manager
+            created = True
+
+    # Closing and upgrading wait on in-flight reads; never under the
+    # registry lock, which every other database's callers need too
+    if stale is not None:
+        stale.close()
+    if writable and not created and not manager.writable:
+        manager.upgrade_to_writable()
+
+    return manager
+
+
+def close_connection_manager(db_path) -> None:
+    """Close and forget the manager for a database file."""
+    with _managers_lock:
+        manager = _managers.pop(_registry_key(db_path), None)
+    if manager is not None:
+        manager.close()
+
+
+def close_all_connection_managers() -> None:
+    """Close every managed database (shutdown)."""
+    with _managers_lock:
+        managers = list(_managers.values())
+        _managers.clear()
+    for manager in managers:
+        manager.close()
+
+
+def get_connection_stats() -> List[Dict[str, Any]]:
+    """Utilization metrics for every open database."""
+    with _managers_lock:
+        managers = list(_managers.values())
+    return [m.get_stats() for m in managers]
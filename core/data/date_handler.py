@@ -85,7 +85,7 @@ class DateHandler:
     - Automatic format detection
     - Partial date imputation following clinical trial rules
     - SAS date (numeric) conversion
-    - Batch processing for dataframes
+    - Vectorized batch processing for dataframes
 
     Example:
         handler = DateHandler()
@@ -133,6 +133,22 @@ class DateHandler:
         (r'^UN([A-Za-z]{3})(\d{4})$', 'UNMONYYYY'),
     ]
 
+    # String formats parsed without the per-value path:
+    # (pattern, group index of (year, month, day), precision)
+    # Same order as _try_iso_format and DATE_PATTERNS; ASCII digits only so
+    # anything unusual falls back to parse_date().
+    VECTOR_PATTERNS = [
+        (r'^([0-9]{4})-([0-9]{2})-([0-9]{2})$', (0, 1, 2), DatePrecision.FULL),
+        (r'^([0-9]{4})-([0-9]{2})$', (0, 1, None), DatePrecision.MONTH),
+        (r'^([0-9]{4})$', (0, None, None), DatePrecision.YEAR),
+        (r'^([0-9]{4})-([0-9]{2})-([0-9]{2})T', (0, 1, 2), DatePrecision.FULL),
+        (r'^([0-9]{2})/([0-9]{2})/([0-9]{4})$', (2, 0, 1), DatePrecision.FULL),
+        (r'^([0-9]{2})-([0-9]{2})-([0-9]{4})$', (2, 0, 1), DatePrecision.FULL),
+        (r'^([0-9]{2})\.([0-9]{2})\.([0-9]{4})$', (2, 1, 0), DatePrecision.FULL),
+        (r'^([0-9]{2})-([A-Za-z]{3})-([0-9]{4})$', (2, 1, 0), DatePrecision.FULL),
+        (r'^([0-9]{2})([A-Za-z]{3})([0-9]{4})$', (2, 1, 0), DatePrecision.FULL),
+    ]
+
     MONTH_NAMES = {
         'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
         'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
@@ -488,20 +504,8 @@ class DateHandler:
         output_col = output_column or f"{column}_ISO"
         precision_col = f"{column}_PRECISION"
 
-        iso_dates = []
-        precisions = []
-        imputed_dates = []
-
         rule = imputation_rule or self.default_imputation
-
-        for value in df[column]:
-            parsed = self.parse_date(value)
-            iso_dates.append(parsed.iso_partial)
-            precisions.append(parsed.precision.value)
-
-            if rule != ImputationRule.NONE:
-                imputed = self.impute_date(parsed, rule)
-                imputed_dates.append(imputed)
+        iso_dates, precisions, imputed_dates = self._standardize_values(df[column], rule)
 
         df[output_col] = iso_dates
 
@@ -513,6 +517,218 @@ class DateHandler:
 
         return df
 
+    def _standardize_values(self, series: pd.Series,
+                            rule: ImputationRule) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+        """
+        Parse and impute a whole Series at once.
+
+        Works on the distinct values of the column. SAS numeric dates, datetime
+        columns and the common string formats in DATE_PATTERNS are handled with
+        NumPy/pandas operations; any other value goes through parse_date() and
+        impute_date(), so results match the per-value methods exactly.
+
+        Returns:
+            (iso, precision, imputed) object arrays aligned with the Series;
+            imputed is None for ImputationRule.NONE
+        """
+        codes, uniques = pd.factorize(series)
+        n = len(uniques)
+
+        year = np.full(n, np.nan)
+        month = np.full(n, np.nan)
+        day = np.full(n, np.nan)
+        precision = np.full(n, DatePrecision.UNKNOWN.value, dtype=object)
+        matched = np.zeros(n, dtype=bool)
+
+        dtype = series.dtype
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            year[:] = uniques.year
+            month[:] = uniques.month
+            day[:] = uniques.day
+            precision[:] = DatePrecision.FULL.value
+            matched[:] = True
+        elif pd.api.types.is_integer_dtype(dtype) or pd.api.types.is_float_dtype(dtype):
+            matched = self._match_sas_dates(np.asarray(uniques, dtype=float), year, month, day, precision)
+        else:
+            values = np.asarray(uniques, dtype=object)
+            is_str = np.fromiter((isinstance(v, str) for v in values), dtype=bool, count=n)
+            if is_str.any():
+                strings = pd.Series(values[is_str]).str.strip()
+                idx = np.flatnonzero(is_str)
+                str_matched = self._match_string_dates(strings, year, month, day, precision, idx)
+                matched[idx] = str_matched
+
+        iso = self._iso_strings(year, month, day, precision, matched)
+        imputed = None
+        if rule != ImputationRule.NONE:
+            imputed = self._impute_values(year, month, day, matched, rule)
+
+        # Values the vectorized formats do not cover
+        values = None
+        for i in np.flatnonzero(~matched):
+            if values is None:
+                values = np.asarray(uniques, dtype=object)
+            parsed = self.parse_date(values[i])
+            iso[i] = parsed.iso_partial
+            precision[i] = parsed.precision.value
+            if imputed is not None:
+                imputed[i] = self.impute_date(parsed, rule)
+
+        # Matched values whose imputation is not a valid date (e.g. month 13)
+        if imputed is not None:
+            for i in [i for i in np.flatnonzero(matched) if imputed[i] is None]:
+                parsed = ParsedDate(
+                    original="",
+                    year=int(year[i]),
+                    month=None if np.isnan(month[i]) else int(month[i]),
+                    day=None if np.isnan(day[i]) else int(day[i]),
+                    precision=DatePrecision(precision[i]),
+                    is_valid=True
+                )
+                imputed[i] = self.impute_date(parsed, rule)
+
+        # Missing values (code -1) take the trailing empty slot
+        iso = np.append(iso, "")[codes]
+        precision = np.append(precision, DatePrecision.UNKNOWN.value)[codes]
+        if imputed is not None:
+            imputed = np.append(imputed, None)[codes]
+
+        return iso, precision, imputed
+
+    def _match_sas_dates(self, values: np.ndarray, year: np.ndarray, month: np.ndarray,
+                         day: np.ndarray, precision: np.ndarray) -> np.ndarray:
+        """Fill date components from SAS day counts; returns the matched mask."""
+        min_days = (date.min - self.SAS_EPOCH).days
+        max_days = (date.max - self.SAS_EPOCH).days
+
+        with np.errstate(invalid='ignore'):
+            days = np.trunc(values)
+            matched = np.isfinite(days) & (days >= min_days) & (days <= max_days)
+
+        dates = np.datetime64(self.SAS_EPOCH, 'D') + days[matched].astype(np.int64)
+        y, m, d = self._date_parts(dates)
+        year[matched] = y
+        month[matched] = m
+        day[matched] = d
+        precision[matched] = DatePrecision.FULL.value
+        return matched
+
+    def _match_string_dates(self, strings: pd.Series, year: np.ndarray, month: np.ndarray,
+                            day: np.ndarray, precision: np.ndarray, idx: np.ndarray) -> np.ndarray:
+        """
+        Fill date components for stripped strings; returns the matched mask.
+
+        idx maps each string to its slot in the component arrays.
+        """
+        matched = np.zeros(len(strings), dtype=bool)
+
+        for pattern, (yi, mi, di), prec in self.VECTOR_PATTERNS:
+            pending = np.flatnonzero(~matched)
+            if len(pending) == 0:
+                break
+
+            parts = strings.iloc[pending].str.extract(pattern)
+            hit = parts[0].notna().to_numpy(copy=True)
+
+            y = pd.to_numeric(parts[yi], errors='coerce').to_numpy(dtype=float)
+            m = np.full(len(parts), np.nan)
+            if mi is not None:
+                m = pd.to_numeric(parts[mi], errors='coerce').to_numpy(dtype=float)
+                # Month names (DD-MON-YYYY); unknown names leave the value for later patterns
+                names = parts[mi].str.lower().map(self.MONTH_NAMES).to_numpy(dtype=float)
+                m = np.where(np.isnan(m), names, m)
+                hit &= ~np.isnan(m)
+            d = np.full(len(parts), np.nan)
+            if di is not None:
+                d = pd.to_numeric(parts[di], errors='coerce').to_numpy(dtype=float)
+
+            rows = pending[hit]
+            slots = idx[rows]
+            year[slots] = y[hit]
+            month[slots] = m[hit]
+            day[slots] = d[hit]
+            precision[slots] = prec.value
+            matched[rows] = True
+
+        return matched
+
+    @staticmethod
+    def _iso_strings(year: np.ndarray, month: np.ndarray, day: np.ndarray,
+                     precision: np.ndarray, matched: np.ndarray) -> np.ndarray:
+        """ISO 8601 partial strings for the matched slots ("" elsewhere)."""
+        iso = np.full(len(year), "", dtype=object)
+        if not matched.any():
+            return iso
+
+        def padded(values, width):
+            return pd.Series(np.nan_to_num(values).astype(np.int64)).astype(str).str.zfill(width).to_numpy(dtype=object)
+
+        ys = padded(year, 4)
+        ms = padded(month, 2)
+        ds = padded(day, 2)
+
+        full = matched & (precision == DatePrecision.FULL.value)
+        month_only = matched & (precision == DatePrecision.MONTH.value)
+        year_only = matched & (precision == DatePrecision.YEAR.value)
+
+        iso[full] = ys[full] + "-" + ms[full] + "-" + ds[full]
+        iso[month_only] = ys[month_only] + "-" + ms[month_only]
+        iso[year_only] = ys[year_only]
+        return iso
+
+    @staticmethod
+    def _date_parts(dates: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Year, month and day of a datetime64[D] array."""
+        months = dates.astype('datetime64[M]')
+        year = dates.astype('datetime64[Y]').astype(np.int64) + 1970
+        month = months.astype(np.int64) % 12 + 1
+        day = (dates - months.astype('datetime64[D]')).astype(np.int64) + 1
+        return year, month, day
+
+    @staticmethod
+    def _impute_values(year: np.ndarray, month: np.ndarray, day: np.ndarray,
+                       matched: np.ndarray, rule: ImputationRule) -> np.ndarray:
+        """
+        Vectorized impute_date() for the matched slots.
+
+        Slots whose imputed components are not a valid date are left None
+        for the caller to run through impute_date().
+        """
+        imputed = np.full(len(year), None, dtype=object)
+
+        m = month.copy()
+        d = day.copy()
+        if rule == ImputationRule.FIRST:
+            m[np.isnan(m)] = 1
+        elif rule == ImputationRule.LAST:
+            m[np.isnan(m)] = 12
+        elif rule == ImputationRule.MIDDLE:
+            m[np.isnan(m)] = 6
+
+        ok = matched & (year >= 1) & (year <= 9999) & (m >= 1) & (m <= 12)
+        y_ok = year[ok].astype(np.int64)
+        m_ok = m[ok].astype(np.int64)
+
+        month_start = (y_ok - 1970).astype('datetime64[Y]').astype('datetime64[M]') + (m_ok - 1)
+        month_days = ((month_start + 1).astype('datetime64[D]')
+                      - month_start.astype('datetime64[D]')).astype(np.int64)
+
+        d_ok = d[ok]
+        missing_day = np.isnan(d_ok)
+        if rule == ImputationRule.FIRST:
+            d_ok[missing_day] = 1
+        elif rule == ImputationRule.LAST:
+            d_ok[missing_day] = month_days[missing_day]
+        elif rule == ImputationRule.MIDDLE:
+            d_ok[missing_day] = 15
+
+        valid = (d_ok >= 1) & (d_ok <= month_days)
+        dates = month_start[valid].astype('datetime64[D]') + (d_ok[valid].astype(np.int64) - 1)
+
+        slots = np.flatnonzero(ok)[valid]
+        imputed[slots] = dates.astype(object)
+        return imputed
+
     def get_date_statistics(self, df: pd.DataFrame, column: str) -> Dict[str, Any]:
         """
         Get statistics about dates in a column.
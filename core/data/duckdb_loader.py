@@ -8,21 +8,49 @@ DuckDB database loader for clinical trial data with support for:
 - Data quality validation
 - Incremental updates and versioning
 - Query optimization hints
+- Streaming loads: chunks appended to a staging table, swapped in atomically
 """
 
 import os
+import uuid
 import logging
+import functools
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any, Union
+from typing import Dict, List, Optional, Tuple, Any, Union, Iterable, Callable
 from dataclasses import dataclass, field
 from datetime import datetime
 import json
 
 import pandas as pd
+import pyarrow as pa
 import duckdb
 
+from .connection_manager import DuckDBConnectionManager, get_connection_manager
+
 logger = logging.getLogger(__name__)
 
+# Prefix of the loader's own tables (metadata, staging)
+INTERNAL_TABLE_PREFIX = '_sage_'
+
+# Staging tables of loads in progress in this process (not stale)
+_active_staging = set()
+_active_staging_lock = threading.Lock()
+
+
+def is_internal_table(table_name: str) -> bool:
+    """True for tables the loader keeps for itself, hidden from table listings."""
+    return table_name.lower().startswith(INTERNAL_TABLE_PREFIX)
+
+
+def _writes(method):
+    """Run a loader method under the database's single-writer lock."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._manager.write():
+            return method(self, *args, **kwargs)
+    return wrapper
+
 
 @dataclass
 class TableInfo:
@@ -90,6 +118,9 @@ class DuckDBLoader:
 
         # Get table info
         info = loader.get_table_info('DM')
+
+        # Stream a large file in chunks
+        result = loader.load_chunks(reader.read_chunks('ae.sas7bdat'), 'AE')
     """
 
     # Type mapping from pandas to DuckDB
@@ -108,6 +139,31 @@ class DuckDBLoader:
         'date': 'DATE',
     }
 
+    # Prefix of staging tables used by load_chunks (hidden by list_tables)
+    STAGING_PREFIX = '_sage_staging_'
+
+    # DuckDB column types widened to DOUBLE when a later chunk has decimals
+    INTEGER_TYPES = {'TINYINT', 'SMALLINT', 'INTEGER', 'BIGINT', 'HUGEINT',
+                     'UTINYINT', 'USMALLINT', 'UINTEGER', 'UBIGINT'}
+
+    # Type DuckDB gives a column that is all NULL so far
+    PLACEHOLDER_TYPE = 'INTEGER'
+
+    # DuckDB column types reported as pandas dtypes (as DTYPE_MAP, reversed)
+    PANDAS_DTYPES = {
+        'BIGINT': 'int64',
+        'INTEGER': 'int32',
+        'SMALLINT': 'int16',
+        'TINYINT': 'int8',
+        'DOUBLE': 'float64',
+        'FLOAT': 'float32',
+        'BOOLEAN': 'bool',
+        'VARCHAR': 'object',
+        'TIMESTAMP': 'datetime64[ns]',
+        'TIMESTAMP_NS': 'datetime64[ns]',
+        'DATE': 'date',
+    }
+
     def __init__(self, db_path: str, read_only: bool = False):
         """
         Initialize DuckDB loader.
@@ -122,25 +178,28 @@ class DuckDBLoader:
         # Ensure directory exists
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Initialize connection
-        self._conn = None
+        # Initialize connection (shared handle, see connection_manager)
+        self._manager: Optional[DuckDBConnectionManager] = None
         self._connect()
 
         # Create metadata table if not exists
         if not read_only:
             self._init_metadata_table()
+            self._drop_stale_staging()
 
     def _connect(self):
-        """Establish database connection."""
-        if self._conn is not None:
-            try:
-                self._conn.close()
-            except Exception:
-                pass
-
-        self._conn = duckdb.connect(str(self.db_path), read_only=self.read_only)
+        """Attach to the process-wide handle for this database."""
+        self._manager = get_connection_manager(self.db_path, writable=not self.read_only)
         logger.info(f"Connected to DuckDB: {self.db_path}")
 
+    @property
+    def _conn(self):
+        """This thread's cursor (the writer cursor inside a write)."""
+        if self._manager is None:
+            return None
+        return self._manager.cursor()
+
+    @_writes
     def _init_metadata_table(self):
         """Create metadata tracking table."""
         self._conn.execute("""
@@ -157,11 +216,28 @@ class DuckDBLoader:
             )
         """)
 
+    @_writes
+    def _drop_stale_staging(self):
+        """Drop staging tables left by loads that died before their swap."""
+        tables = self._conn.execute("""
+            SELECT table_name FROM information_schema.tables
+            WHERE table_schema = 'main'
+        """).fetchall()
+        with _active_staging_lock:
+            stale = [name for (name,) in tables
+                     if name.startswith(self.STAGING_PREFIX) and name not in _active_staging]
+        for name in stale:
+            self._conn.execute(f'DROP TABLE IF EXISTS "{name}"')
+            logger.info(f"Dropped stale staging table {name}")
+
     def close(self):
-        """Close database connection."""
-        if self._conn:
-            self._conn.close()
-            self._conn = None
+        """
+        Detach from the database.
+
+        The handle is shared with every other reader of the file in this
+        process; close_all_connection_managers() closes it at shutdown.
+        """
+        self._manager = None
 
     def __enter__(self):
         return self
@@ -169,6 +245,7 @@ class DuckDBLoader:
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.close()
 
+    @_writes
     def load_dataframe(self, df: pd.DataFrame, table_name: str,
                        source_file: Optional[str] = None,
                        if_exists: str = 'replace',
@@ -243,6 +320,182 @@ class DuckDBLoader:
                 error=str(e)
             )
 
+    def load_chunks(self, chunks: Iterable[pd.DataFrame], table_name: str,
+                    source_file: Optional[str] = None,
+                    progress_callback: Optional[Callable[[int], None]] = None,
+                    validate: bool = True,
+                    schema_check: Optional[Callable[[List[Dict[str, str]]], None]] = None) -> LoadResult:
+        """
+        Load a stream of DataFrame chunks into DuckDB, replacing the table.
+
+        Each chunk is appended to a staging table as an Arrow record batch,
+        so memory is bounded by the chunk size rather than the file size.
+        Once every chunk is in, the staging table replaces the target in one
+        transaction: readers see the old table or the new one, never a
+        partial load, and a failed load leaves the old table untouched.
+
+        Column types come from the first chunk. If a later chunk needs a
+        wider type (decimals in an integer column, text in any column, any
+        type in a column that was all NULL so far), the staging column is
+        widened before the chunk is appended.
+
+        The write lock is taken per chunk, not for the whole file.
+
+        Args:
+            chunks: DataFrames with the same columns (e.g. UniversalReader.read_chunks)
+            table_name: Name of the target table
+            source_file: Original source file path (for metadata)
+            progress_callback: Optional callback(rows_loaded) after each chunk
+            validate: Whether to validate after loading
+            schema_check: Optional callback with the loaded columns
+                ([{'name', 'dtype'}], see _staged_columns) before the swap;
+                raising aborts the load and keeps the old table
+
+        Returns:
+            LoadResult with status and details
+        """
+        start_time = datetime.now()
+        table_name = table_name.upper()
+        staging = f"{self.STAGING_PREFIX}{table_name}_{uuid.uuid4().hex[:8]}"
+        created = False
+        swapped = False
+        rows = 0
+        warnings = []
+
+        with _active_staging_lock:
+            _active_staging.add(staging)
+
+        try:
+            for chunk in chunks:
+                batch = pa.Table.from_pandas(self._optimize_for_duckdb(chunk), preserve_index=False)
+
+                with self._manager.write() as conn:
+                    conn.register('_sage_chunk', batch)
+                    try:
+                        if not created:
+                            conn.execute(f"CREATE TABLE {staging} AS SELECT * FROM _sage_chunk")
+                            created = True
+                        else:
+                            self._widen_columns(conn, staging)
+                            conn.execute(f"INSERT INTO {staging} BY NAME SELECT * FROM _sage_chunk")
+                    finally:
+                        conn.unregister('_sage_chunk')
+
+                rows += len(chunk)
+                del batch, chunk  # Release before the next chunk is read
+                if progress_callback:
+                    progress_callback(rows)
+
+            if not created:
+                raise ValueError("No data to load")
+
+            # Column types as loaded, after every widening
+            with self._manager.read() as conn:
+                columns = self._staged_columns(conn, staging)
+            if schema_check:
+                schema_check(columns)
+
+            # Swap the staging table in
+            with self._manager.write() as conn:
+                conn.execute("BEGIN TRANSACTION")
+                try:
+                    conn.execute(f"DROP TABLE IF EXISTS {table_name}")
+                    conn.execute(f"ALTER TABLE {staging} RENAME TO {table_name}")
+                    self._write_metadata(table_name, columns, rows, source_file)
+                    conn.execute("COMMIT")
+                    swapped = True
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+
+            if validate:
+                validation = self.validate_table(table_name, expected_rows=rows)
+                if not validation.is_valid:
+                    warnings.extend(validation.warnings)
+                    warnings.extend(validation.errors)
+
+            duration = (datetime.now() - start_time).total_seconds()
+
+            logger.info(f"Loaded {rows} rows into {table_name} in {duration:.2f}s (streamed)")
+
+            return LoadResult(
+                success=True,
+                table_name=table_name,
+                rows_loaded=rows,
+                warnings=warnings,
+                duration_seconds=duration
+            )
+
+        except Exception as e:
+            logger.error(f"Failed to load table {table_name}: {e}")
+            return LoadResult(
+                success=False,
+                table_name=table_name,
+                rows_loaded=0,
+                error=str(e)
+            )
+
+        finally:
+            # Also reached when the chunk stream is abandoned mid-load
+            if created and not swapped:
+                try:
+                    with self._manager.write() as conn:
+                        conn.execute(f"DROP TABLE IF EXISTS {staging}")
+                except Exception as cleanup_error:
+                    logger.warning(f"Failed to drop staging table {staging}: {cleanup_error}")
+            with _active_staging_lock:
+                _active_staging.discard(staging)
+
+    def _staged_columns(self, conn, staging: str) -> List[Dict[str, str]]:
+        """
+        Columns of a loaded table as [{'name', 'dtype'}], dtypes named as pandas does.
+
+        A column still of the placeholder type with no values is reported
+        as 'object', as pandas reports an all-missing column.
+        """
+        described = conn.execute(f"DESCRIBE {staging}").fetchall()
+        placeholders = [name for name, col_type, *_ in described if col_type == self.PLACEHOLDER_TYPE]
+        empty = set()
+        if placeholders:
+            counts = conn.execute(
+                "SELECT " + ", ".join(f'COUNT("{name}")' for name in placeholders) + f" FROM {staging}"
+            ).fetchone()
+            empty = {name for name, count in zip(placeholders, counts) if count == 0}
+
+        return [
+            {'name': name,
+             'dtype': 'object' if name in empty else self.PANDAS_DTYPES.get(col_type, col_type.lower())}
+            for name, col_type, *_ in described
+        ]
+
+    def _widen_columns(self, conn, staging: str):
+        """Widen staging columns the registered chunk does not fit into."""
+        current = {row[0]: row[1] for row in conn.execute(f"DESCRIBE {staging}").fetchall()}
+        incoming = conn.execute("DESCRIBE SELECT * FROM _sage_chunk").fetchall()
+
+        for name, new_type, *_ in incoming:
+            old_type = current.get(name)
+            if old_type is None or old_type == new_type or old_type == 'VARCHAR':
+                continue
+
+            if new_type == 'VARCHAR':
+                target = 'VARCHAR'
+            elif old_type == self.PLACEHOLDER_TYPE and self._all_null(conn, staging, name):
+                target = new_type  # Only NULLs so far: take the first real type
+            elif old_type in self.INTEGER_TYPES and (
+                    new_type in ('FLOAT', 'DOUBLE') or new_type.startswith('DECIMAL')):
+                target = 'DOUBLE'
+            else:
+                continue  # Cast on insert
+
+            conn.execute(f'ALTER TABLE {staging} ALTER COLUMN "{name}" SET DATA TYPE {target}')
+            logger.debug(f"Widened {staging}.{name} from {old_type} to {target}")
+
+    @staticmethod
+    def _all_null(conn, table: str, column: str) -> bool:
+        """True if a column has no non-NULL value."""
+        return conn.execute(f'SELECT COUNT("{column}") = 0 FROM {table}').fetchone()[0]
+
     def _optimize_for_duckdb(self, df: pd.DataFrame) -> pd.DataFrame:
         """Optimize DataFrame for DuckDB loading."""
         df = df.copy()
@@ -273,6 +526,11 @@ class DuckDBLoader:
             {'name': col, 'dtype': str(df[col].dtype)}
             for col in df.columns
         ]
+        self._write_metadata(table_name, columns, len(df), source_file)
+
+    def _write_metadata(self, table_name: str, columns: List[Dict[str, str]],
+                        row_count: int, source_file: Optional[str] = None):
+        """Insert or update the metadata row of a table."""
         columns_json = json.dumps(columns)
         now = datetime.now()
 
@@ -293,16 +551,17 @@ class DuckDBLoader:
                     updated_at = ?,
                     version = ?
                 WHERE table_name = ?
-            """, [source_file, len(df), len(df.columns), columns_json,
+            """, [source_file, row_count, len(columns), columns_json,
                   now, version, table_name])
         else:
             self._conn.execute("""
                 INSERT INTO _sage_metadata
                 (table_name, source_file, row_count, column_count, columns, created_at, updated_at, version)
                 VALUES (?, ?, ?, ?, ?, ?, ?, 1)
-            """, [table_name, source_file, len(df), len(df.columns),
+            """, [table_name, source_file, row_count, len(columns),
                   columns_json, now, now])
 
+    @_writes
     def load_parquet(self, parquet_path: str, table_name: str,
                     if_exists: str = 'replace') -> LoadResult:
         """
@@ -545,6 +804,7 @@ class DuckDBLoader:
         tables = self.list_tables()
         return [self.get_table_info(t) for t in tables if self.get_table_info(t)]
 
+    @_writes
     def drop_table(self, table_name: str) -> bool:
         """
         Drop a table from the database.
@@ -8,6 +8,10 @@ Schema tracking and version control for data tables:
 - Calculate schema diffs (added/removed/changed columns)
 - Block or warn on breaking changes
 - Store version history in SQLite
+
+Files loaded in chunks are tracked with a schema dict: extract_schema() of
+the first chunk, folded with merge_schema() for each later one. Methods that
+take a DataFrame also accept such a dict.
 """
 
 import os
@@ -16,7 +20,7 @@ import json
 import hashlib
 import logging
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Union
 from dataclasses import dataclass, field
 from datetime import datetime
 from contextlib import contextmanager
@@ -251,11 +255,15 @@ class SchemaTracker:
                 ON schema_versions(table_name, is_current)
             ''')
 
-    def calculate_schema_hash(self, df: pd.DataFrame) -> str:
-        """Calculate a hash of the DataFrame schema."""
+    def calculate_schema_hash(self, df: Union[pd.DataFrame, Dict[str, Any]]) -> str:
+        """Calculate a hash of the DataFrame (or extracted schema) column types."""
+        if isinstance(df, dict):
+            dtypes = {c['name']: c['dtype'] for c in df['columns']}
+        else:
+            dtypes = {col: str(df[col].dtype) for col in df.columns}
         schema_str = '|'.join([
-            f"{col}:{str(df[col].dtype)}"
-            for col in sorted(df.columns)
+            f"{col}:{dtypes[col]}"
+            for col in sorted(dtypes)
         ])
         return hashlib.sha256(schema_str.encode()).hexdigest()[:16]
 
@@ -276,6 +284,54 @@ class SchemaTracker:
             'row_count': len(df)
         }
 
+    def merge_schema(self, schema: Dict[str, Any], df: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Fold another chunk of the same table into an extracted schema.
+
+        Column types stay those of the first chunk (see apply_loaded_types);
+        nullability and the row count cover every chunk merged so far.
+
+        Args:
+            schema: Schema from extract_schema (updated in place)
+            df: Next chunk of the table
+
+        Returns:
+            The updated schema
+        """
+        for col_info in schema['columns']:
+            if not col_info['nullable'] and col_info['name'] in df.columns:
+                col_info['nullable'] = bool(df[col_info['name']].isnull().any())
+        schema['row_count'] += len(df)
+        return schema
+
+    def apply_loaded_types(self, schema: Dict[str, Any],
+                           columns: List[Dict[str, str]]) -> Dict[str, Any]:
+        """
+        Take the column types of the table as loaded.
+
+        A streamed load widens a column when a later chunk needs it, so the
+        first chunk's dtypes can be wrong for the table; check the loaded
+        types before deciding whether to block.
+
+        Args:
+            schema: Schema from extract_schema/merge_schema (updated in place)
+            columns: Loaded columns as [{'name', 'dtype'}] (DuckDBLoader.load_chunks)
+
+        Returns:
+            The updated schema
+        """
+        nullable = {c['name']: c['nullable'] for c in schema['columns']}
+        schema['columns'] = [
+            {'name': c['name'], 'dtype': c['dtype'], 'nullable': nullable.get(c['name'], True)}
+            for c in columns
+        ]
+        schema['column_count'] = len(columns)
+        return schema
+
+    def _as_schema(self, df: Union[pd.DataFrame, Dict[str, Any]]) -> Dict[str, Any]:
+        """Extracted schema of a DataFrame, or the schema itself."""
+        return df if isinstance(df, dict) else self.extract_schema(df)
+
     def get_current_version(self, table_name: str) -> Optional[SchemaVersion]:
         """Get the current schema version for a table."""
         table_name = table_name.upper()
@@ -421,13 +477,14 @@ class SchemaTracker:
         # Check compatibility matrix
         return self.TYPE_COMPATIBILITY.get((old_dtype, new_dtype), False)
 
-    def compare_with_previous(self, table_name: str, new_df: pd.DataFrame) -> SchemaDiff:
+    def compare_with_previous(self, table_name: str,
+                              new_df: Union[pd.DataFrame, Dict[str, Any]]) -> SchemaDiff:
         """
         Compare a new DataFrame with the current version.
 
         Args:
             table_name: Table name to compare
-            new_df: New DataFrame
+            new_df: New DataFrame (or its extracted schema)
 
         Returns:
             SchemaDiff with changes from current version
@@ -435,7 +492,8 @@ class SchemaTracker:
         table_name = table_name.upper()
         current = self.get_current_version(table_name)
 
-        new_schema = self.extract_schema(new_df)
+        new_schema = self._as_schema(new_df)
+        new_row_count = new_schema['row_count']
 
         if not current:
             # No previous version - everything is new
@@ -454,20 +512,20 @@ class SchemaTracker:
                 type_changes=[],
                 severity=ChangeSeverity.INFO,
                 old_row_count=0,
-                new_row_count=len(new_df),
-                row_count_change=len(new_df)
+                new_row_count=new_row_count,
+                row_count_change=new_row_count
             )
 
         return self.compare_schemas(
             old_schema=current.schema_json,
             new_schema=new_schema,
             old_row_count=current.row_count,
-            new_row_count=len(new_df)
+            new_row_count=new_row_count
         )
 
     def record_version(self,
                       table_name: str,
-                      df: pd.DataFrame,
+                      df: Union[pd.DataFrame, Dict[str, Any]],
                       source_file: str,
                       source_format: Optional[str] = None,
                       user: str = 'system',
@@ -478,7 +536,7 @@ class SchemaTracker:
 
         Args:
             table_name: Table name
-            df: DataFrame with the data
+            df: DataFrame with the data (or its extracted schema)
             source_file: Source file path
             source_format: Format of the source file (auto-detected if not provided)
             user: User who created this version
@@ -506,14 +564,16 @@ class SchemaTracker:
         version_number = (current.version_number + 1) if current else 1
 
         # Extract schema
-        schema = self.extract_schema(df)
-        schema_hash = self.calculate_schema_hash(df)
+        schema = self._as_schema(df)
+        schema_hash = self.calculate_schema_hash(schema)
+        row_count = schema['row_count']
+        column_count = schema['column_count']
 
         # Generate change summary if not provided
         if not change_summary and current:
             diff = self.compare_schemas(
                 current.schema_json, schema,
-                current.row_count, len(df)
+                current.row_count, row_count
             )
             change_summary = diff.get_summary()
 
@@ -541,7 +601,7 @@ class SchemaTracker:
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1, ?)
             ''', (
                 version_id, table_name, version_number, source_file, source_format,
-                len(df), len(df.columns), json.dumps(schema), schema_hash, now,
+                row_count, column_count, json.dumps(schema), schema_hash, now,
                 user, change_summary
             ))
 
@@ -553,8 +613,8 @@ class SchemaTracker:
             version_number=version_number,
             source_file=source_file,
             source_format=source_format,
-            row_count=len(df),
-            column_count=len(df.columns),
+            row_count=row_count,
+            column_count=column_count,
             schema_json=schema,
             schema_hash=schema_hash,
             created_at=datetime.fromisoformat(now),
@@ -609,14 +669,15 @@ class SchemaTracker:
             logger.info(f"Deleted {deleted} version records for {table_name}")
             return deleted > 0
 
-    def should_block_upload(self, table_name: str, df: pd.DataFrame,
+    def should_block_upload(self, table_name: str,
+                           df: Union[pd.DataFrame, Dict[str, Any]],
                            block_on_breaking: bool = True) -> Tuple[bool, Optional[SchemaDiff]]:
         """
         Check if an upload should be blocked due to breaking changes.
 
         Args:
             table_name: Table name
-            df: New DataFrame to upload
+            df: New DataFrame to upload (or its extracted schema)
             block_on_breaking: Whether to block on breaking changes
 
         Returns:
@@ -0,0 +1,257 @@
+# SAGE Table Profiler
+# ====================
+# Column statistics for whole tables in a single scan
+"""
+Table-level column profiling for DuckDB tables.
+
+Profiling a column used to take two or three queries (type lookup, counts,
+then DISTINCT or GROUP BY), issued column by column. The profiler needs at
+most two scans per table, whatever the number of columns:
+
+1. One aggregate gives the row, non-null and distinct counts of every column.
+2. If values are wanted, a GROUP BY GROUPING SETS with one set per column
+   counts each column's values; window functions over the groups pick the
+   most frequent values and the first distinct values in sort order, so
+   only those rows leave DuckDB.
+
+Columns with very many distinct values (MAX_GROUPED_DISTINCT) are ranked by
+their own ORDER BY ... LIMIT query instead, which keeps only the top rows.
+
+Several tables are profiled in parallel, each on its own thread's cursor.
+
+Used by ValueScanner (dictionary build) and DataKnowledgeLearner.
+
+Example:
+    profiler = TableProfiler("data/database/clinical.duckdb", max_values=1000, top_k=10)
+    profiles = profiler.profile_table("ADAE", ["AEDECOD", "AESEV"])
+    profiles["AEDECOD"].distinct_count
+    profiles["AESEV"].top_values        # [("MILD", 412), ("MODERATE", 180), ...]
+
+    by_table = profiler.profile_tables({"ADAE": None, "ADSL": ["SEX", "RACE"]})
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .connection_manager import get_connection_manager
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class ColumnProfile:
+    """Statistics for one column of a table."""
+    table: str
+    column: str
+    data_type: str
+    total_rows: int = 0
+    non_null_count: int = 0
+    distinct_count: int = 0
+    values: List[str] = field(default_factory=list)                 # First distinct values, in sort order
+    top_values: List[Tuple[str, int]] = field(default_factory=list)  # (value, frequency), most frequent first
+
+    @property
+    def null_count(self) -> int:
+        """Rows where the column is NULL."""
+        return self.total_rows - self.non_null_count
+
+
+def _quote(identifier: str) -> str:
+    """Quote a DuckDB identifier."""
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+class TableProfiler:
+    """
+    Profiles the columns of DuckDB tables, one scan per table.
+    """
+
+    # Tables profiled at once by profile_tables
+    MAX_WORKERS = 4
+
+    # Columns with more distinct values are ranked one query each
+    MAX_GROUPED_DISTINCT = 50_000
+
+    def __init__(self,
+                 db_path: str,
+                 max_values: int = 0,
+                 top_k: int = 0,
+                 max_workers: int = MAX_WORKERS):
+        """
+        Initialize profiler.
+
+        Args:
+            db_path: Path to DuckDB database
+            max_values: Distinct values to return per column (in sort order)
+            top_k: Most frequent values to return per column
+            max_workers: Tables profiled in parallel by profile_tables
+        """
+        self.db_path = Path(db_path)
+        self.max_values = max_values
+        self.top_k = top_k
+        self.max_workers = max_workers
+
+    def column_types(self, table: str) -> Dict[str, str]:
+        """Column name -> DuckDB type, in table order."""
+        with get_connection_manager(self.db_path).read() as conn:
+            rows = conn.execute(f"DESCRIBE {_quote(table)}").fetchall()
+        return {row[0]: row[1] for row in rows}
+
+    def profile_table(self,
+                      table: str,
+                      columns: Optional[List[str]] = None,
+                      max_values: Optional[int] = None,
+                      top_k: Optional[int] = None) -> Dict[str, ColumnProfile]:
+        """
+        Profile columns of a table.
+
+        Args:
+            table: Table name
+            columns: Columns to profile (all columns if None); names are
+                matched case-insensitively and unknown ones are skipped
+            max_values: Override the instance's max_values
+            top_k: Override the instance's top_k
+
+        Returns:
+            Dict mapping the table's column names to their profiles
+        """
+        max_values = self.max_values if max_values is None else max_values
+        top_k = self.top_k if top_k is None else top_k
+
+        types = self.column_types(table)
+        if columns is not None:
+            by_upper = {name.upper(): name for name in types}
+            wanted = [by_upper[c.upper()] for c in columns if c.upper() in by_upper]
+            types = {name: types[name] for name in dict.fromkeys(wanted)}
+
+        names = list(types)
+        if not names:
+            return {}
+
+        profiles = {
+            name: ColumnProfile(table=table, column=name, data_type=types[name])
+            for name in names
+        }
+
+        with get_connection_manager(self.db_path).read() as conn:
+            row = conn.execute(self._stats_sql(table, names)).fetchone()
+            for i, name in enumerate(names):
+                profile = profiles[name]
+                profile.total_rows = row[0]
+                profile.non_null_count = row[1 + 2 * i]
+                profile.distinct_count = row[2 + 2 * i]
+
+            if max_values <= 0 and top_k <= 0:
+                return profiles
+
+            listed = [name for name in names if profiles[name].distinct_count > 0]
+            grouped = [name for name in listed if profiles[name].distinct_count <= self.MAX_GROUPED_DISTINCT]
+            if grouped:
+                rows = conn.execute(self._grouped_sql(table, grouped, max_values, top_k)).fetchall()
+                for col_id, value, count, freq_rank, value_rank in sorted(rows, key=lambda r: (r[0], r[4] or 0)):
+                    profile = profiles[grouped[col_id]]
+                    if value_rank is not None and value_rank <= max_values:
+                        profile.values.append(value)
+                    if freq_rank is not None and freq_rank <= top_k:
+                        profile.top_values.append((value, count))
+
+            for name in listed:
+                if name in grouped:
+                    continue
+                # Too many groups to rank together; LIMIT keeps only the top rows
+                column = _quote(name)
+                if max_values > 0:
+                    profiles[name].values = [row[0] for row in conn.execute(f"""
+                        SELECT CAST(v AS VARCHAR) FROM (
+                            SELECT DISTINCT {column} AS v FROM {_quote(table)}
+                            WHERE {column} IS NOT NULL ORDER BY v LIMIT {max_values}
+                        ) ORDER BY v
+                    """).fetchall()]
+                if top_k > 0:
+                    profiles[name].top_values = [(row[0], row[1]) for row in conn.execute(f"""
+                        SELECT CAST(v AS VARCHAR), n FROM (
+                            SELECT {column} AS v, COUNT(*) AS n FROM {_quote(table)}
+                            WHERE {column} IS NOT NULL GROUP BY {column} ORDER BY n DESC LIMIT {top_k}
+                        )
+                    """).fetchall()]
+
+        for profile in profiles.values():
+            profile.top_values.sort(key=lambda item: (-item[1], item[0]))
+
+        return profiles
+
+    def _stats_sql(self, table: str, names: List[str]) -> str:
+        """Row, non-null and distinct counts of every column in one scan."""
+        counts = ", ".join(f"COUNT({_quote(name)}), COUNT(DISTINCT {_quote(name)})" for name in names)
+        return f"SELECT COUNT(*), {counts} FROM {_quote(table)}"
+
+    def _grouped_sql(self, table: str, names: List[str], max_values: int, top_k: int) -> str:
+        """
+        Values and frequencies of several columns in one scan.
+
+        One grouping set per column counts its non-null values. Columns are
+        renamed c0..cN and keep their type; in column k's groups every other
+        c is NULL, so ordering by all of them orders by column k. Values are
+        cast to text only for the rows returned.
+        """
+        aliases = [f"c{i}" for i in range(len(names))]
+        selects = ", ".join(f"{_quote(name)} AS {alias}" for name, alias in zip(names, aliases))
+        sets = ", ".join(f"({_quote(name)})" for name in names)
+        col_id = " ".join(f"WHEN GROUPING({_quote(name)}) = 0 THEN {i}" for i, name in enumerate(names))
+        value = " ".join(f"WHEN {i} THEN CAST({alias} AS VARCHAR)" for i, alias in enumerate(aliases))
+
+        # Ties at the top-k boundary are broken arbitrarily, as with ORDER BY ... LIMIT
+        freq_rank = "NULL"
+        if top_k > 0:
+            freq_rank = "ROW_NUMBER() OVER (PARTITION BY col_id ORDER BY n DESC)"
+        value_rank = "NULL"
+        if max_values > 0:
+            value_rank = f"ROW_NUMBER() OVER (PARTITION BY col_id ORDER BY {', '.join(aliases)})"
+
+        return f"""
+            SELECT col_id, CASE col_id {value} END AS val, n, freq_rank, value_rank
+            FROM (
+                SELECT *, {freq_rank} AS freq_rank, {value_rank} AS value_rank
+                FROM (
+                    SELECT CASE {col_id} END AS col_id, {selects}, COUNT(*) AS n
+                    FROM {_quote(table)}
+                    GROUP BY GROUPING SETS ({sets})
+                )
+                WHERE {' OR '.join(f'{alias} IS NOT NULL' for alias in aliases)}
+            )
+            WHERE freq_rank <= {top_k} OR value_rank <= {max_values}
+        """
+
+    def profile_tables(self,
+                       tables: Dict[str, Optional[List[str]]],
+                       max_values: Optional[int] = None,
+                       top_k: Optional[int] = None) -> Dict[str, Dict[str, ColumnProfile]]:
+        """
+        Profile several tables in parallel.
+
+        A table that fails to profile is logged and left out.
+
+        Args:
+            tables: {table: columns to profile, or None for all}
+            max_values: Override the instance's max_values
+            top_k: Override the instance's top_k
+
+        Returns:
+            {table: {column: ColumnProfile}}, in the order of tables
+        """
+        def profile(item):
+            table, columns = item
+            try:
+                return self.profile_table(table, columns, max_values, top_k)
+            except Exception as e:
+                logger.error(f"Error profiling table {table}: {e}")
+                return None
+
+        items = list(tables.items())
+        workers = max(1, min(self.max_workers, len(items)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="profiler") as executor:
+            results = list(executor.map(profile, items))
+
+        return {table: result for (table, _), result in zip(items, results) if result is not None}
@@ -9,13 +9,14 @@ Universal data reader with support for:
 - XPT: SAS transport file support
 
 All formats produce consistent output with standardized table naming.
+Large files can be read in bounded memory with read_chunks().
 """
 
 import os
 import logging
 import hashlib
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any, Union
+from typing import Dict, List, Optional, Tuple, Any, Union, Iterator
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
@@ -149,19 +150,22 @@ class UniversalReader:
 
     def __init__(self,
                  standardize_dates: bool = True,
-                 date_imputation_rule: str = 'FIRST'):
+                 date_imputation_rule: str = 'FIRST',
+                 chunk_size: int = 100000):
         """
         Initialize universal reader.
 
         Args:
             standardize_dates: Whether to standardize date columns
             date_imputation_rule: Rule for partial date imputation (FIRST, LAST, MIDDLE, NONE)
+            chunk_size: Rows per chunk for read_chunks
         """
         self.standardize_dates = standardize_dates
         self.date_imputation_rule = date_imputation_rule
+        self.chunk_size = chunk_size
 
         # Initialize sub-readers
-        self._sas_reader = SASReader()
+        self._sas_reader = SASReader(chunk_size=chunk_size)
         self._date_handler = DateHandler(default_imputation=date_imputation_rule)
 
     def detect_format(self, filepath: str) -> DataFormat:
@@ -384,6 +388,123 @@ class UniversalReader:
                 error=str(e)
             )
 
+    def read_chunks(self, filepath: str,
+                    format_override: Optional[DataFormat] = None,
+                    encoding: Optional[str] = None,
+                    delimiter: Optional[str] = None) -> Iterator[pd.DataFrame]:
+        """
+        Read a data file as DataFrames of at most chunk_size rows.
+
+        Only one chunk is held in memory at a time, whatever the file size.
+        Chunks get the same processing as read_file (CSV type inference,
+        date standardization), applied chunk by chunk.
+
+        Args:
+            filepath: Path to the file
+            format_override: Force a specific format (auto-detect if None)
+            encoding: Encoding override (for SAS/CSV)
+            delimiter: Delimiter override (for CSV)
+
+        Yields:
+            DataFrame chunks, in file order
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+            ValueError: If the format is unsupported or the file cannot be decoded
+        """
+        path = Path(filepath)
+        if not path.exists():
+            raise FileNotFoundError(f"File not found: {filepath}")
+
+        file_format = format_override or self.detect_format(filepath)
+        if file_format == DataFormat.SAS7BDAT:
+            encodings = [encoding] if encoding else self._sas_encodings()
+            chunks = self._first_decodable(
+                encodings, lambda enc: self._sas_reader.read_chunked(filepath, enc)
+            )
+        elif file_format == DataFormat.PARQUET:
+            chunks = (
+                batch.to_pandas()
+                for batch in pq.ParquetFile(filepath).iter_batches(batch_size=self.chunk_size)
+            )
+        elif file_format == DataFormat.CSV:
+            chunks = self._read_csv_chunks(filepath, delimiter, encoding)
+        elif file_format == DataFormat.XPT:
+            chunks = self._first_decodable(
+                [encoding or 'utf-8'],
+                lambda enc: pd.read_sas(filepath, format='xport', encoding=enc,
+                                        chunksize=self.chunk_size)
+            )
+        else:
+            raise ValueError(f"Unsupported file format: {path.suffix}")
+
+        for chunk in chunks:
+            # Standardize dates if enabled (not for Parquet which is pre-processed)
+            if self.standardize_dates and file_format != DataFormat.PARQUET:
+                chunk, date_warnings = self._standardize_dates(chunk)
+                for warning in date_warnings:
+                    logger.debug(f"{path.name}: {warning}")
+            yield chunk
+
+    def count_rows(self, filepath: str) -> Optional[int]:
+        """
+        Number of data rows in a file, from its header where the format has one.
+
+        Args:
+            filepath: Path to the file
+
+        Returns:
+            Row count, or None for formats without one (CSV) or unreadable headers
+        """
+        file_format = self.detect_format(filepath)
+        try:
+            if file_format == DataFormat.PARQUET:
+                return pq.ParquetFile(filepath).metadata.num_rows
+            if file_format == DataFormat.SAS7BDAT:
+                with pd.read_sas(filepath, format='sas7bdat', chunksize=1) as reader:
+                    return reader.row_count
+            if file_format == DataFormat.XPT:
+                with pd.read_sas(filepath, format='xport', chunksize=1) as reader:
+                    return reader.nobs
+        except Exception as e:
+            logger.debug(f"Could not count rows of {filepath}: {e}")
+        return None
+
+    def _sas_encodings(self) -> List[str]:
+        """Encodings to try for SAS files, default first."""
+        default = self._sas_reader.default_encoding
+        return [default] + [e for e in SASReader.ENCODINGS if e != default]
+
+    def _first_decodable(self, encodings: List[str], open_chunks) -> Iterator[pd.DataFrame]:
+        """
+        Chunks from the first encoding whose first chunk reads.
+
+        Args:
+            encodings: Encodings to try, in order
+            open_chunks: Callable(encoding) returning an iterator of chunks
+
+        Yields:
+            DataFrame chunks
+        """
+        last_error = None
+        for enc in encodings:
+            try:
+                chunks = iter(open_chunks(enc))
+                first = next(chunks, None)
+            except Exception as e:
+                last_error = e
+                continue
+
+            if first is None:
+                return
+            if enc != encodings[0]:
+                logger.info(f"Reading with encoding '{enc}'")
+            yield first
+            yield from chunks
+            return
+
+        raise ValueError(f"Failed to read file with any encoding: {last_error}")
+
     def _read_sas(self, filepath: str, encoding: Optional[str] = None) -> Dict[str, Any]:
         """Read SAS7BDAT file."""
         result = self._sas_reader.read_file(filepath, encoding)
@@ -475,6 +596,27 @@ class UniversalReader:
             'warnings': warnings
         }
 
+    def _read_csv_chunks(self, filepath: str,
+                         delimiter: Optional[str] = None,
+                         encoding: Optional[str] = None) -> Iterator[pd.DataFrame]:
+        """Read CSV file in chunks with delimiter and encoding detection."""
+        if delimiter is None:
+            delimiter = self._detect_csv_delimiter(filepath)
+
+        encodings = [encoding] if encoding else ['utf-8', 'latin-1', 'windows-1252', 'iso-8859-1']
+        chunks = self._first_decodable(
+            encodings,
+            lambda enc: pd.read_csv(
+                filepath,
+                delimiter=delimiter,
+                encoding=enc,
+                chunksize=self.chunk_size,
+                on_bad_lines='warn'
+            )
+        )
+        for chunk in chunks:
+            yield self._infer_csv_types(chunk)
+
     def _detect_csv_delimiter(self, filepath: str) -> str:
         """Detect CSV delimiter by analyzing first few lines."""
         try:
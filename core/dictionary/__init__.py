@@ -11,6 +11,7 @@ Components:
 - FuzzyMatcher: RapidFuzz-based string matching for typo correction
 - SchemaMapper: Generates schema_map.json for column lookups
 - TermResolver: Unified resolution combining fuzzy matching + MedDRA lookup
+- update_dictionary: Rescans changed tables into a built fuzzy index and schema map
 
 Note: Semantic/embedding search has been intentionally excluded.
 Clinical data requires exact terminology matching (MedDRA controlled vocabulary).
@@ -39,6 +40,8 @@ from .schema_mapper import (
     build_schema_map,
 )
 
+from .incremental import update_dictionary, dictionary_lock
+
 from .term_resolver import (
     TermResolver,
     MatchSource,
@@ -69,6 +72,10 @@ __all__ = [
     "TableInfo",
     "build_schema_map",
 
+    # Incremental Updates
+    "update_dictionary",
+    "dictionary_lock",
+
     # Term Resolver
     "TermResolver",
     "MatchSource",
@@ -0,0 +1,398 @@
+# SAGE Dictionary - Fuzzy Index File
+# ===================================
+"""
+Versioned, memory-mapped on-disk format for FuzzyMatcher indexes.
+
+Layout (little-endian):
+
+    8 bytes   magic b"SAGEFZX\\0"
+    uint32    format version
+    uint32    header length
+    header    JSON: sections {name: [offset, dtype, count]}, columns [[table, column]]
+    sections  raw NumPy arrays, each aligned to 64 bytes
+
+Strings are stored as one UTF-8 byte array plus an int64 offset table.
+Entries, per-value and per-column entry lists, and the trigram index are
+int32 arrays (CSR offsets + members where grouped).
+
+MappedFuzzyIndex maps the file read-only with np.memmap and exposes it
+through lazy sequences and mappings, so loading reads only the header and
+pages are shared between processes that map the same file. Nothing is
+unpickled; the legacy fuzzy_index.pkl is read once by a restricted
+unpickler and converted (see migrate_pickle_index).
+
+Example:
+    write_index_file("knowledge/fuzzy_index.idx", matcher)
+    mapped = MappedFuzzyIndex("knowledge/fuzzy_index.idx")
+"""
+
+import os
+import json
+import struct
+import pickle
+import logging
+from bisect import bisect_left
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"SAGEFZX\0"
+FORMAT_VERSION = 1
+
+FUZZY_INDEX_FILENAME = "fuzzy_index.idx"
+LEGACY_FUZZY_INDEX_FILENAME = "fuzzy_index.pkl"
+
+_PREAMBLE = struct.Struct("<8sII")
+_ALIGNMENT = 64
+
+
+class FuzzyIndexFormatError(ValueError):
+    """File is not a fuzzy index, or uses an unsupported format version."""
+
+
+# ============================================================================
+# Lazy views over the mapped arrays
+# ============================================================================
+
+class StringArray(Sequence):
+    """Strings decoded on access from UTF-8 bytes plus an offset table."""
+
+    def __init__(self, data: np.ndarray, offsets: np.ndarray):
+        self._data = data
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        return self._data[self._offsets[i]:self._offsets[i + 1]].tobytes().decode("utf-8")
+
+
+class _Selection(Sequence):
+    """Strings of a StringArray picked by an id array."""
+
+    def __init__(self, strings: StringArray, ids: np.ndarray):
+        self._strings = strings
+        self._ids = ids
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        return self._strings[int(self._ids[i])]
+
+
+class _LowerSorted(Sequence):
+    """Lower-cased strings in sorted order, for bisect lookups."""
+
+    def __init__(self, strings: Sequence, order: np.ndarray):
+        self._strings = strings
+        self._order = order
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __getitem__(self, i: int) -> str:
+        return self._strings[int(self._order[i])].lower()
+
+    def find(self, key: str) -> Optional[int]:
+        """Position in the underlying strings of the string whose lower case is key."""
+        pos = bisect_left(self, key)
+        if pos < len(self) and self[pos] == key:
+            return int(self._order[pos])
+        return None
+
+
+class _SortedKeys(Mapping):
+    """Sorted strings -> their position, looked up by bisect."""
+
+    def __init__(self, strings: StringArray):
+        self._strings = strings
+
+    def __getitem__(self, key: str) -> int:
+        pos = bisect_left(self._strings, key)
+        if pos < len(self._strings) and self._strings[pos] == key:
+            return pos
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self._strings)
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+
+class _Entries(Sequence):
+    """IndexEntry objects built on access."""
+
+    def __init__(self, strings: StringArray, entry_strings: np.ndarray,
+                 entry_columns: np.ndarray, columns: List[Tuple[str, str]]):
+        self._strings = strings
+        self._entry_strings = entry_strings
+        self._entry_columns = entry_columns
+        self._columns = columns
+
+    def __len__(self) -> int:
+        return len(self._entry_strings)
+
+    def __getitem__(self, i):
+        from .fuzzy_matcher import IndexEntry
+
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        value = self._strings[int(self._entry_strings[i])]
+        table, column = self._columns[self._entry_columns[i]]
+        return IndexEntry(value=value, value_lower=value.lower(), table=table, column=column)
+
+
+class _ValueEntries(Mapping):
+    """Lower-cased value -> its IndexEntry list (FuzzyMatcher._value_to_entries)."""
+
+    def __init__(self, lookup: _LowerSorted, entries: _Entries,
+                 offsets: np.ndarray, members: np.ndarray):
+        self._lookup = lookup
+        self._entries = entries
+        self._offsets = offsets
+        self._members = members
+
+    def __getitem__(self, key: str):
+        value_id = self._lookup.find(key)
+        if value_id is None:
+            raise KeyError(key)
+        return [self._entries[int(e)] for e in
+                self._members[self._offsets[value_id]:self._offsets[value_id + 1]]]
+
+    def __contains__(self, key) -> bool:
+        return isinstance(key, str) and self._lookup.find(key) is not None
+
+    def __iter__(self):
+        return iter(self._lookup)
+
+    def __len__(self) -> int:
+        return len(self._lookup)
+
+
+# ============================================================================
+# Reading
+# ============================================================================
+
+def is_index_file(path) -> bool:
+    """Whether a file starts with the fuzzy index magic bytes."""
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+class MappedFuzzyIndex:
+    """Read-only, memory-mapped fuzzy index file."""
+
+    def __init__(self, path):
+        """
+        Map an index file and parse its header.
+
+        Raises:
+            FuzzyIndexFormatError: Not an index file, or a newer format version
+        """
+        self.path = Path(path)
+        self._map = np.memmap(self.path, dtype=np.uint8, mode="r")
+
+        if len(self._map) < _PREAMBLE.size:
+            raise FuzzyIndexFormatError(f"{self.path} is not a fuzzy index file")
+        magic, version, header_len = _PREAMBLE.unpack(self._map[:_PREAMBLE.size].tobytes())
+        if magic != MAGIC:
+            raise FuzzyIndexFormatError(f"{self.path} is not a fuzzy index file")
+        if version > FORMAT_VERSION:
+            raise FuzzyIndexFormatError(
+                f"{self.path} uses fuzzy index format {version}; this version reads up to {FORMAT_VERSION}"
+            )
+        self.version = version
+
+        header = json.loads(self._map[_PREAMBLE.size:_PREAMBLE.size + header_len].tobytes())
+        self._sections = header["sections"]
+        self.columns: List[Tuple[str, str]] = [tuple(c) for c in header["columns"]]
+
+        self.strings = StringArray(self._array("strings"), self._array("string_offsets"))
+        self.values = _Selection(self.strings, self._array("values"))
+        self.entries = _Entries(self.strings, self._array("entry_strings"),
+                                self._array("entry_columns"), self.columns)
+        self.value_to_entries = _ValueEntries(
+            _LowerSorted(self.values, self._array("values_by_lower")), self.entries,
+            self._array("value_entry_offsets"), self._array("value_entries"),
+        )
+
+    def _array(self, name: str) -> np.ndarray:
+        """A section as a read-only view of the mapping."""
+        offset, dtype, count = self._sections[name]
+        return np.frombuffer(self._map, dtype=np.dtype(dtype), count=count, offset=offset)
+
+    def values_by_table(self) -> Dict[str, Dict[str, Sequence]]:
+        """{table: {column: entry values}}, as FuzzyMatcher._values_by_table."""
+        offsets = self._array("column_entry_offsets")
+        members = self._array("column_entries")
+        entry_strings = self._array("entry_strings")
+
+        result: Dict[str, Dict[str, Sequence]] = {}
+        for i, (table, column) in enumerate(self.columns):
+            ids = entry_strings[members[offsets[i]:offsets[i + 1]]]
+            result.setdefault(table, {})[column] = _Selection(self.strings, ids)
+        return result
+
+    def trigram_arrays(self) -> Tuple[Mapping, np.ndarray, np.ndarray, np.ndarray]:
+        """(trigram -> code, postings, posting offsets per code, value lengths)."""
+        grams = StringArray(self._array("grams"), self._array("gram_offsets"))
+        return (_SortedKeys(grams), self._array("gram_postings"),
+                self._array("gram_posting_offsets"), self._array("value_lengths"))
+
+
+# ============================================================================
+# Writing
+# ============================================================================
+
+def _encode_strings(strings: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """UTF-8 byte array and int64 offsets for a list of strings."""
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def _csr(keys: np.ndarray, key_count: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Offsets and members grouping positions of keys, keeping order within a key."""
+    offsets = np.zeros(key_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys, minlength=key_count), out=offsets[1:])
+    return offsets, np.argsort(keys, kind="stable").astype(np.int32)
+
+
+def write_index_file(path, matcher) -> None:
+    """
+    Write a FuzzyMatcher's index.
+
+    The file is written next to the target and renamed into place, so
+    processes that have the old file mapped keep a consistent view.
+    """
+    path = Path(path)
+    entries = list(matcher._index)
+    all_values = list(matcher._all_values)
+
+    # Distinct strings; unique values are entry values, so they are all in the pool
+    string_ids: Dict[str, int] = {}
+    entry_strings = np.fromiter((string_ids.setdefault(e.value, len(string_ids)) for e in entries),
+                                dtype=np.int32, count=len(entries))
+    values = np.fromiter((string_ids.setdefault(v, len(string_ids)) for v in all_values),
+                         dtype=np.int32, count=len(all_values))
+
+    column_ids: Dict[Tuple[str, str], int] = {}
+    entry_columns = np.fromiter((column_ids.setdefault((e.table, e.column), len(column_ids)) for e in entries),
+                                dtype=np.int32, count=len(entries))
+
+    value_lower = {v.lower(): i for i, v in enumerate(all_values)}
+    entry_values = np.fromiter((value_lower[e.value_lower] for e in entries),
+                               dtype=np.int32, count=len(entries))
+    values_by_lower = np.array(sorted(range(len(all_values)), key=lambda i: all_values[i].lower()),
+                               dtype=np.int32)
+
+    trigram_index = matcher._search_index()
+    gram_order = sorted(trigram_index._vocab)
+    gram_postings, gram_posting_offsets = [], np.zeros(len(gram_order) + 1, dtype=np.int64)
+    for i, gram in enumerate(gram_order):
+        code = trigram_index._vocab[gram]
+        postings = trigram_index._postings[trigram_index._offsets[code]:trigram_index._offsets[code + 1]]
+        gram_postings.append(postings)
+        gram_posting_offsets[i + 1] = gram_posting_offsets[i] + len(postings)
+
+    strings, string_offsets = _encode_strings(list(string_ids))
+    grams, gram_offsets = _encode_strings(gram_order)
+    value_entry_offsets, value_entries = _csr(entry_values, len(all_values))
+    column_entry_offsets, column_entries = _csr(entry_columns, len(column_ids))
+
+    arrays = {
+        "strings": strings,
+        "string_offsets": string_offsets,
+        "values": values,
+        "values_by_lower": values_by_lower,
+        "value_lengths": np.asarray(trigram_index.lengths, dtype=np.int32),
+        "entry_strings": entry_strings,
+        "entry_columns": entry_columns,
+        "value_entry_offsets": value_entry_offsets,
+        "value_entries": value_entries,
+        "column_entry_offsets": column_entry_offsets,
+        "column_entries": column_entries,
+        "grams": grams,
+        "gram_offsets": gram_offsets,
+        "gram_postings": (np.concatenate(gram_postings) if gram_postings
+                          else np.empty(0, dtype=np.int32)).astype(np.int32),
+        "gram_posting_offsets": gram_posting_offsets,
+    }
+
+    # Section offsets depend on the header length, which depends on the offsets
+    columns = [list(c) for c in column_ids]
+    sections: Dict[str, List[Any]] = {name: [0, a.dtype.str, len(a)] for name, a in arrays.items()}
+    header = b""
+    while True:
+        position = _PREAMBLE.size + len(header)
+        for name, a in arrays.items():
+            position = -(-position // _ALIGNMENT) * _ALIGNMENT
+            sections[name][0] = position
+            position += a.nbytes
+        encoded = json.dumps({"sections": sections, "columns": columns}).encode("utf-8")
+        if len(encoded) == len(header):
+            break
+        header = encoded
+
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header)))
+        f.write(header)
+        for name, a in arrays.items():
+            f.write(b"\0" * (sections[name][0] - f.tell()))
+            f.write(np.ascontiguousarray(a).tobytes())
+    os.replace(tmp_path, path)
+
+
+# ============================================================================
+# Legacy pickle migration
+# ============================================================================
+
+class _LegacyUnpickler(pickle.Unpickler):
+    """Unpickler limited to the types the old FuzzyMatcher.save wrote."""
+
+    ALLOWED = {
+        ("builtins", "list"),
+        ("builtins", "dict"),
+        ("collections", "defaultdict"),
+    }
+
+    def find_class(self, module: str, name: str):
+        if (module, name) in self.ALLOWED:
+            return super().find_class(module, name)
+        if name == "IndexEntry" and module.endswith("fuzzy_matcher"):
+            from .fuzzy_matcher import IndexEntry
+            return IndexEntry
+        raise pickle.UnpicklingError(f"Refusing to load {module}.{name} from a fuzzy index pickle")
+
+
+def read_legacy_pickle(path) -> Dict[str, Any]:
+    """Contents of a fuzzy_index.pkl written by the old FuzzyMatcher.save."""
+    with open(path, "rb") as f:
+        return _LegacyUnpickler(f).load()
+
+
+def migrate_pickle_index(pickle_path, index_path) -> None:
+    """Convert a legacy fuzzy_index.pkl into the memory-mapped format."""
+    from .fuzzy_matcher import FuzzyMatcher
+
+    data = read_legacy_pickle(pickle_path)
+    matcher = FuzzyMatcher()
+    matcher._index = data["index"]
+    matcher._all_values = data["all_values"]
+    write_index_file(index_path, matcher)
+    logger.info(f"Migrated fuzzy index {pickle_path} -> {index_path} ({len(matcher._index)} entries)")
@@ -3,18 +3,38 @@
 """
 Fast fuzzy string matching using RapidFuzz library.
 Supports typo correction, partial matching, and token-based matching.
+
+Large dictionaries are searched in two stages: a character-trigram inverted
+index retrieves values that share enough trigrams with the query, and only
+those candidates are scored with rapidfuzz.process.cdist.
+
+Indexes are saved in the memory-mapped format of fuzzy_index_file, so
+loading one is near-instant and does not unpickle anything.
 """
 
-import pickle
+import math
 import logging
+import threading
+from array import array
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, field
 from collections import defaultdict
+from collections.abc import Mapping
 
+import numpy as np
 from rapidfuzz import fuzz, process
 from rapidfuzz.distance import Levenshtein
 
+from .fuzzy_index_file import (
+    FUZZY_INDEX_FILENAME,
+    LEGACY_FUZZY_INDEX_FILENAME,
+    MappedFuzzyIndex,
+    is_index_file,
+    migrate_pickle_index,
+    write_index_file,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -62,6 +82,79 @@ class IndexEntry:
     column: str
 
 
+class TrigramIndex:
+    """
+    Character-trigram inverted index over a list of values.
+
+    Values are lowercased and padded ("  value ") so that the first
+    characters and word boundaries produce trigrams too. Posting lists are
+    stored as one sorted int32 array with per-trigram offsets.
+    """
+
+    def __init__(self, values: List[str]):
+        self.size = len(values)
+        self.lengths = np.fromiter((len(v) for v in values), dtype=np.int32, count=self.size)
+
+        vocab: Dict[str, int] = {}
+        codes = array('l')
+        counts = np.empty(self.size, dtype=np.int64)
+        for i, value in enumerate(values):
+            grams = trigrams(value)
+            counts[i] = len(grams)
+            codes.extend(vocab.setdefault(g, len(vocab)) for g in grams)
+
+        codes_np = np.frombuffer(codes, dtype=codes.typecode) if codes else np.empty(0, dtype=np.int64)
+        value_ids = np.repeat(np.arange(self.size, dtype=np.int32), counts)
+        order = np.argsort(codes_np, kind='stable')
+
+        self._vocab = vocab
+        self._postings = value_ids[order]
+        self._offsets = np.zeros(len(vocab) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(codes_np, minlength=len(vocab)), out=self._offsets[1:])
+
+    @classmethod
+    def from_arrays(cls, vocab: Mapping, postings: np.ndarray,
+                    offsets: np.ndarray, lengths: np.ndarray) -> 'TrigramIndex':
+        """Index over stored arrays (vocab maps trigram -> posting list number)."""
+        index = cls.__new__(cls)
+        index.size = len(lengths)
+        index.lengths = lengths
+        index._vocab = vocab
+        index._postings = postings
+        index._offsets = offsets
+        return index
+
+    def candidates(self, query: str, min_overlap: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Values sharing trigrams with the query.
+
+        Args:
+            query: Search string
+            min_overlap: Fraction of the query's trigrams a value must share
+
+        Returns:
+            (value ids in ascending order, shared trigram counts)
+        """
+        grams = trigrams(query)
+        postings = [
+            self._postings[self._offsets[code]:self._offsets[code + 1]]
+            for code in (self._vocab.get(g) for g in grams)
+            if code is not None
+        ]
+        if not postings:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int64)
+
+        ids, shared = np.unique(np.concatenate(postings), return_counts=True)
+        keep = shared >= max(1, math.ceil(len(grams) * min_overlap))
+        return ids[keep], shared[keep]
+
+
+def trigrams(value: str) -> set:
+    """Padded lowercase character trigrams of a value."""
+    padded = f"  {value.lower()} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
 class FuzzyMatcher:
     """
     RapidFuzz-based fuzzy string matcher for clinical data values.
@@ -79,6 +172,8 @@ class FuzzyMatcher:
         self._values_by_table: Dict[str, Dict[str, List[str]]] = defaultdict(lambda: defaultdict(list))
         self._all_values: List[str] = []
         self._value_to_entries: Dict[str, List[IndexEntry]] = defaultdict(list)
+        self._trigram_index: Optional[TrigramIndex] = None
+        self._trigram_lock = threading.Lock()
 
     # Minimum length for values to be indexed (prevents Y/N and short codes)
     MIN_VALUE_LENGTH = 2
@@ -95,6 +190,23 @@ class FuzzyMatcher:
         'USUBJID', 'STUDYID', 'SUBJID', 'SITEID',
     }
 
+    # Dictionaries up to this many unique values are scored in full
+    FULL_SCAN_LIMIT = 2000
+
+    # Fraction of the query's trigrams a candidate must share
+    TRIGRAM_MIN_OVERLAP = 0.25
+
+    # Most candidates scored per query (those sharing the most trigrams)
+    MAX_CANDIDATES = 2000
+
+    # Raw scores combined by the smart scorer
+    SMART_SCORERS = {
+        "ratio": fuzz.ratio,
+        "token_sort": fuzz.token_sort_ratio,
+        "token_set": fuzz.token_set_ratio,
+        "partial": fuzz.partial_ratio,
+    }
+
     def build_index(self, values: Dict[str, Dict[str, List[str]]]) -> int:
         """
         Build flat index from nested value dictionary.
@@ -114,6 +226,7 @@ class FuzzyMatcher:
         self._values_by_table = defaultdict(lambda: defaultdict(list))
         self._all_values = []
         self._value_to_entries = defaultdict(list)
+        self._trigram_index = None
 
         seen_values = set()
         skipped_short = 0
@@ -168,6 +281,49 @@ class FuzzyMatcher:
         )
         return len(self._index)
 
+    def update_table(self, table: str, columns: Dict[str, List[str]]) -> int:
+        """
+        Replace one table's values, keeping every other table's as indexed.
+
+        See update_tables; changing several tables at once rebuilds once.
+
+        Args:
+            table: Table name
+            columns: {column: [values]} for the table's current contents
+
+        Returns:
+            Number of entries indexed
+        """
+        return self.update_tables({table: columns})
+
+    def update_tables(self, tables: Dict[str, Dict[str, List[str]]]) -> int:
+        """
+        Replace several tables' values in one rebuild.
+
+        Other tables are re-indexed from the values already held (or mapped),
+        so only the changed tables have to be rescanned. An existing table
+        keeps its position (new ones are appended), so the result matches a
+        full build_index over the same values. An empty columns dict removes
+        the table.
+
+        Args:
+            tables: {table: {column: [values]}} for the tables' current contents
+
+        Returns:
+            Number of entries indexed
+        """
+        changed = {table.upper(): columns for table, columns in tables.items()}
+        values: Dict[str, Dict[str, List[str]]] = {}
+        for name, table_columns in self._values_by_table.items():
+            if name in changed:
+                values[name] = changed.pop(name)
+            else:
+                values[name] = {column: list(column_values)
+                                for column, column_values in table_columns.items()}
+        values.update(changed)
+
+        return self.build_index(values)
+
     def match(self,
               query: str,
               threshold: float = 80.0,
@@ -194,81 +350,175 @@ class FuzzyMatcher:
             return []
 
         query_clean = query.strip()
-        query_lower = query_clean.lower()
-        query_len = len(query_clean)
 
         # Check for exact match first
-        if query_lower in self._value_to_entries:
-            exact_matches = []
-            for entry in self._value_to_entries[query_lower]:
-                exact_matches.append(FuzzyMatch(
-                    value=entry.value,
-                    score=100.0,
-                    table=entry.table,
-                    column=entry.column,
-                    match_type="exact",
-                    original_query=query_clean
-                ))
-            if exact_matches:
-                return exact_matches[:limit]
+        exact_matches = self._exact_matches(query_clean, limit)
+        if exact_matches:
+            return exact_matches
 
         # Smart scoring for clinical data
-        scored_results = []
+        values, value_lens = self._length_filtered(query_clean, self._candidate_ids(query_clean))
+        scores = {
+            name: self._cdist(query_clean, values, func)
+            for name, func in self.SMART_SCORERS.items()
+            if name != "partial" or len(query_clean) >= 4
+        }
+        return self._rank_matches(query_clean, values, value_lens, scores, threshold, limit, scorer)
 
-        for value in self._all_values:
-            value_len = len(value)
+    def match_many(self,
+                   queries: List[str],
+                   threshold: float = 80.0,
+                   limit: int = 10,
+                   scorer: str = "smart") -> List[List[FuzzyMatch]]:
+        """
+        Match several queries in one pass.
 
-            # Skip values that are too short compared to query (prevents "Y" matching "TYLENOL")
-            # Allow some flexibility: value should be at least 40% of query length
-            min_len_ratio = 0.4
-            max_len_ratio = 3.0  # Value shouldn't be more than 3x query length
+        Returns the same results as calling match() for each query, but
+        scores every query against the union of their candidates with one
+        rapidfuzz.process.cdist matrix per scorer (spread over all cores).
 
-            len_ratio = value_len / query_len if query_len > 0 else 0
-            if len_ratio < min_len_ratio or len_ratio > max_len_ratio:
-                # Only skip if query is reasonably long (> 3 chars)
-                if query_len > 3:
-                    continue
+        Args:
+            queries: Search queries
+            threshold: Minimum score threshold (0-100)
+            limit: Maximum number of results per query
+            scorer: Scoring method, as for match()
 
-            # Calculate multiple scores
-            ratio_score = fuzz.ratio(query_clean, value)
-            token_sort_score = fuzz.token_sort_ratio(query_clean, value)
-            token_set_score = fuzz.token_set_ratio(query_clean, value)
-
-            # Only use partial_ratio for longer queries where substring match makes sense
-            if query_len >= 4:
-                partial_score = fuzz.partial_ratio(query_clean, value)
-                # Penalize partial matches where the value is very short
-                if value_len < query_len * 0.5:
-                    partial_score = partial_score * 0.5  # Heavy penalty
-            else:
-                partial_score = ratio_score  # For short queries, use ratio
-
-            # Smart weighted score - prioritize full matches over partial
-            if scorer == "smart" or scorer == "weighted":
-                # Weight: ratio (40%), token_sort (30%), token_set (20%), partial (10%)
-                final_score = (
-                    ratio_score * 0.40 +
-                    token_sort_score * 0.30 +
-                    token_set_score * 0.20 +
-                    partial_score * 0.10
-                )
+        Returns:
+            One list of FuzzyMatch results per query, in query order
+        """
+        results: List[List[FuzzyMatch]] = [[] for _ in queries]
+        if not self._all_values:
+            return results
 
-                # Bonus for similar length (encourages better matches)
-                len_similarity = 1 - abs(query_len - value_len) / max(query_len, value_len)
-                final_score = final_score * (0.9 + 0.1 * len_similarity)
-            elif scorer == "ratio":
-                final_score = ratio_score
-            elif scorer == "partial":
-                final_score = partial_score
-            elif scorer == "token_sort":
-                final_score = token_sort_score
-            elif scorer == "token_set":
-                final_score = token_set_score
+        pending = []  # (position, cleaned query, candidate ids)
+        for pos, query in enumerate(queries):
+            if not query:
+                continue
+            query_clean = query.strip()
+            exact_matches = self._exact_matches(query_clean, limit)
+            if exact_matches:
+                results[pos] = exact_matches
             else:
-                final_score = ratio_score
+                pending.append((pos, query_clean, self._candidate_ids(query_clean)))
+
+        if not pending:
+            return results
+
+        union = np.unique(np.concatenate([ids for _, _, ids in pending]))
+        union_values = [self._all_values[i] for i in union]
+        union_lens = self._search_index().lengths[union].astype(np.float64)
+        matrices = {
+            name: self._cdist_matrix([q for _, q, _ in pending], union_values, func)
+            for name, func in self.SMART_SCORERS.items()
+        }
+
+        for row, (pos, query_clean, ids) in enumerate(pending):
+            columns = np.searchsorted(union, ids)
+            in_range = self._length_mask(len(query_clean), union_lens[columns])
+            columns = columns[in_range]
+            values = [union_values[c] for c in columns]
+            scores = {name: matrix[row, columns] for name, matrix in matrices.items()}
+            results[pos] = self._rank_matches(
+                query_clean, values, union_lens[columns], scores, threshold, limit, scorer
+            )
+
+        return results
+
+    def _exact_matches(self, query_clean: str, limit: int) -> List[FuzzyMatch]:
+        """Case-insensitive exact matches for a query (empty if none)."""
+        exact_matches = []
+        for entry in self._value_to_entries.get(query_clean.lower(), []):
+            exact_matches.append(FuzzyMatch(
+                value=entry.value,
+                score=100.0,
+                table=entry.table,
+                column=entry.column,
+                match_type="exact",
+                original_query=query_clean
+            ))
+        return exact_matches[:limit]
+
+    @staticmethod
+    def _length_mask(query_len: int, value_lens: np.ndarray) -> np.ndarray:
+        """
+        Values whose length is close enough to the query's.
+
+        Skip values that are too short compared to query (prevents "Y" matching "TYLENOL").
+        Allow some flexibility: value should be at least 40% of query length,
+        and no more than 3x query length. Only applies to queries > 3 chars.
+        """
+        if query_len <= 3:
+            return np.ones(len(value_lens), dtype=bool)
+        len_ratio = value_lens / query_len
+        return (len_ratio >= 0.4) & (len_ratio <= 3.0)
+
+    def _length_filtered(self, query_clean: str, candidates: np.ndarray) -> Tuple[List[str], np.ndarray]:
+        """Candidate values (and lengths) passing the length filter."""
+        value_lens = self._search_index().lengths[candidates].astype(np.float64)
+        in_range = self._length_mask(len(query_clean), value_lens)
+        values = [self._all_values[i] for i in candidates[in_range]]
+        return values, value_lens[in_range]
+
+    def _rank_matches(self,
+                      query_clean: str,
+                      values: List[str],
+                      value_lens: np.ndarray,
+                      scores: Dict[str, np.ndarray],
+                      threshold: float,
+                      limit: int,
+                      scorer: str) -> List[FuzzyMatch]:
+        """
+        Combine raw rapidfuzz scores into ranked FuzzyMatch results.
+
+        Args:
+            query_clean: Stripped query
+            values: Candidate values
+            value_lens: Lengths of values
+            scores: SMART_SCORERS name -> scores aligned with values
+                ("partial" only needed for queries of 4+ characters)
+            threshold: Minimum score threshold
+            limit: Maximum number of results
+            scorer: Scoring method, as for match()
+        """
+        query_len = len(query_clean)
+        ratio_scores = scores["ratio"]
+        token_sort_scores = scores["token_sort"]
+        token_set_scores = scores["token_set"]
+
+        # Only use partial_ratio for longer queries where substring match makes sense
+        if query_len >= 4:
+            partial_scores = scores["partial"]
+            # Penalize partial matches where the value is very short (heavy penalty)
+            partial_scores = np.where(value_lens < query_len * 0.5, partial_scores * 0.5, partial_scores)
+        else:
+            partial_scores = ratio_scores  # For short queries, use ratio
+
+        # Smart weighted score - prioritize full matches over partial
+        if scorer == "smart" or scorer == "weighted":
+            # Weight: ratio (40%), token_sort (30%), token_set (20%), partial (10%)
+            final_scores = (
+                ratio_scores * 0.40 +
+                token_sort_scores * 0.30 +
+                token_set_scores * 0.20 +
+                partial_scores * 0.10
+            )
 
-            if final_score >= threshold:
-                scored_results.append((value, final_score, ratio_score))
+            # Bonus for similar length (encourages better matches)
+            len_similarity = 1 - np.abs(query_len - value_lens) / np.maximum(query_len, value_lens)
+            final_scores = final_scores * (0.9 + 0.1 * len_similarity)
+        elif scorer == "partial":
+            final_scores = partial_scores
+        elif scorer == "token_sort":
+            final_scores = token_sort_scores
+        elif scorer == "token_set":
+            final_scores = token_set_scores
+        else:
+            final_scores = ratio_scores
+
+        passed = np.flatnonzero(final_scores >= threshold)
+        scored_results = [
+            (values[i], float(final_scores[i]), float(ratio_scores[i])) for i in passed
+        ]
 
         # Sort by final score, then by ratio score (for tie-breaking)
         scored_results.sort(key=lambda x: (-x[1], -x[2], x[0]))
@@ -413,26 +663,26 @@ class FuzzyMatcher:
                 return exact_matches[:limit]
 
         # Calculate scores with multiple strategies
-        scored_values: Dict[str, Dict[str, float]] = {}
+        values = [self._all_values[i] for i in self._candidate_ids(query_clean)]
+        score_arrays = {
+            "ratio": self._cdist(query_clean, values, fuzz.ratio),
+            "partial": self._cdist(query_clean, values, fuzz.partial_ratio),
+            "token_sort": self._cdist(query_clean, values, fuzz.token_sort_ratio),
+            "token_set": self._cdist(query_clean, values, fuzz.token_set_ratio),
+        }
 
-        for value in self._all_values:
-            scores = {
-                "ratio": fuzz.ratio(query_clean, value),
-                "partial": fuzz.partial_ratio(query_clean, value),
-                "token_sort": fuzz.token_sort_ratio(query_clean, value),
-                "token_set": fuzz.token_set_ratio(query_clean, value),
-            }
-
-            # Weighted combination
-            combined = (
-                scores["ratio"] * 0.25 +
-                scores["partial"] * 0.25 +
-                scores["token_sort"] * 0.25 +
-                scores["token_set"] * 0.25
-            )
+        # Weighted combination
+        combined_scores = (
+            score_arrays["ratio"] * 0.25 +
+            score_arrays["partial"] * 0.25 +
+            score_arrays["token_sort"] * 0.25 +
+            score_arrays["token_set"] * 0.25
+        )
 
-            if combined >= threshold:
-                scored_values[value] = {**scores, "combined": combined}
+        scored_values: Dict[str, Dict[str, float]] = {}
+        for i in np.flatnonzero(combined_scores >= threshold):
+            scores = {name: float(arr[i]) for name, arr in score_arrays.items()}
+            scored_values[values[i]] = {**scores, "combined": float(combined_scores[i])}
 
         # Sort by combined score
         sorted_values = sorted(
@@ -479,6 +729,47 @@ class FuzzyMatcher:
 
         return matches
 
+    def _search_index(self) -> TrigramIndex:
+        """Trigram index over _all_values, built on first use."""
+        index = self._trigram_index
+        if index is None or index.size != len(self._all_values):
+            with self._trigram_lock:
+                index = self._trigram_index
+                if index is None or index.size != len(self._all_values):
+                    index = TrigramIndex(self._all_values)
+                    self._trigram_index = index
+        return index
+
+    def _candidate_ids(self, query: str) -> np.ndarray:
+        """
+        Positions in _all_values worth scoring for a query.
+
+        Small dictionaries are scored in full. Larger ones keep values that
+        share at least TRIGRAM_MIN_OVERLAP of the query's trigrams, capped at
+        the MAX_CANDIDATES with the most shared trigrams.
+        """
+        index = self._search_index()
+        if index.size <= self.FULL_SCAN_LIMIT:
+            return np.arange(index.size)
+
+        ids, shared = index.candidates(query, self.TRIGRAM_MIN_OVERLAP)
+        if len(ids) > self.MAX_CANDIDATES:
+            top = np.argpartition(-shared, self.MAX_CANDIDATES - 1)[:self.MAX_CANDIDATES]
+            ids = np.sort(ids[top])
+        return ids
+
+    @staticmethod
+    def _cdist(query: str, values: List[str], scorer) -> np.ndarray:
+        """Scores of query against each value as a float64 array."""
+        if not values:
+            return np.empty(0, dtype=np.float64)
+        return process.cdist([query], values, scorer=scorer, dtype=np.float64)[0]
+
+    @staticmethod
+    def _cdist_matrix(queries: List[str], values: List[str], scorer) -> np.ndarray:
+        """queries x values score matrix, computed on all cores."""
+        return process.cdist(queries, values, scorer=scorer, dtype=np.float64, workers=-1)
+
     def _determine_match_type(self, query: str, value: str, score: float) -> str:
         """Determine the type of match based on query and value."""
         if score >= 100:
@@ -506,31 +797,41 @@ class FuzzyMatcher:
         }
 
     def save(self, path: str) -> None:
-        """Save index to pickle file."""
-        data = {
-            "index": self._index,
-            "values_by_table": dict(self._values_by_table),
-            "all_values": self._all_values,
-            "value_to_entries": dict(self._value_to_entries)
-        }
-
-        with open(path, 'wb') as f:
-            pickle.dump(data, f)
-
+        """Save index in the memory-mapped fuzzy index format."""
+        write_index_file(path, self)
         logger.info(f"Saved fuzzy index to {path}")
 
+    @staticmethod
+    def index_exists(path: str) -> bool:
+        """Whether load(path) will find an index (or a legacy pickle next to it)."""
+        path = Path(path)
+        return path.exists() or path.with_name(LEGACY_FUZZY_INDEX_FILENAME).exists()
+
     @classmethod
     def load(cls, path: str) -> 'FuzzyMatcher':
-        """Load index from pickle file."""
-        matcher = cls()
-
-        with open(path, 'rb') as f:
-            data = pickle.load(f)
+        """
+        Map an index file saved by save().
 
-        matcher._index = data["index"]
-        matcher._values_by_table = defaultdict(lambda: defaultdict(list), data["values_by_table"])
-        matcher._all_values = data["all_values"]
-        matcher._value_to_entries = defaultdict(list, data["value_to_entries"])
+        Only the header is read; values, entries and the trigram index are
+        read from the mapping on access. A legacy fuzzy_index.pkl (given
+        directly, or found next to a missing path) is converted first and
+        the converted file is loaded.
+        """
+        path = Path(path)
+        if not path.exists() and path.with_name(LEGACY_FUZZY_INDEX_FILENAME).exists():
+            migrate_pickle_index(path.with_name(LEGACY_FUZZY_INDEX_FILENAME), path)
+        elif path.exists() and not is_index_file(path):
+            index_path = path.with_name(FUZZY_INDEX_FILENAME)
+            migrate_pickle_index(path, index_path)
+            path = index_path
+
+        mapped = MappedFuzzyIndex(path)
+        matcher = cls()
+        matcher._index = mapped.entries
+        matcher._values_by_table = mapped.values_by_table()
+        matcher._all_values = mapped.values
+        matcher._value_to_entries = mapped.value_to_entries
+        matcher._trigram_index = TrigramIndex.from_arrays(*mapped.trigram_arrays())
 
         logger.info(f"Loaded fuzzy index from {path} with {len(matcher._index)} entries")
         return matcher
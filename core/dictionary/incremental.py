@@ -0,0 +1,102 @@
+# SAGE Dictionary - Incremental Updates
+# ======================================
+"""
+Keeps a built dictionary current as individual tables change.
+
+A full build scans every scannable column of every table. When tables are
+loaded, replaced or dropped, only those tables are rescanned: their values
+are spliced into the saved fuzzy index in a single FuzzyMatcher.update_tables
+rebuild and their schema entries are refreshed with
+SchemaMapper.update_schema_map. Both files are then saved in place.
+
+Example:
+    from core.dictionary import update_dictionary
+
+    summary = update_dictionary(
+        "data/database/clinical.duckdb",
+        ["ADAE"],
+        "knowledge/fuzzy_index.idx",
+        "knowledge/schema_map.json",
+    )
+"""
+
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .value_scanner import ValueScanner
+from .fuzzy_matcher import FuzzyMatcher
+from .schema_mapper import SchemaMapper
+
+logger = logging.getLogger(__name__)
+
+# Serializes writers of the saved index and schema map: incremental
+# updates and full builds (held for the whole build). Re-entrant, so callers
+# can hold it around update_dictionary and their own bookkeeping.
+dictionary_lock = threading.RLock()
+
+
+def update_dictionary(db_path: str,
+                      tables: List[str],
+                      fuzzy_index_path: str,
+                      schema_map_path: str,
+                      metadata_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Rescan the given tables and splice them into a built dictionary.
+
+    Tables that no longer exist in the database are removed from the
+    fuzzy index and schema map. If no schema map has been saved yet, a
+    full one is built.
+
+    Args:
+        db_path: Path to DuckDB database
+        tables: Tables that were loaded, replaced or dropped
+        fuzzy_index_path: Fuzzy index saved by a full build
+        schema_map_path: Schema map saved by a full build
+        metadata_path: Optional path to golden metadata
+
+    Returns:
+        Summary with the updated tables, fuzzy index entries and schema map tables
+
+    Raises:
+        FileNotFoundError: If no fuzzy index has been built
+    """
+    if not FuzzyMatcher.index_exists(fuzzy_index_path):
+        raise FileNotFoundError(f"Fuzzy index not found: {fuzzy_index_path}")
+
+    with dictionary_lock:
+        matcher = FuzzyMatcher.load(fuzzy_index_path)
+
+        with ValueScanner(db_path, metadata_path) as scanner:
+            db_tables = {name.upper(): name for name in scanner.get_tables()}
+            changed = {}
+            for table in tables:
+                columns = {}
+                if table.upper() in db_tables:
+                    scan_results = scanner.scan_table(db_tables[table.upper()])
+                    columns = {column: result.values for column, result in scan_results.items()}
+                changed[table] = columns
+        matcher.update_tables(changed)
+
+        matcher.save(fuzzy_index_path)
+
+        with SchemaMapper(db_path, metadata_path) as mapper:
+            if Path(schema_map_path).exists():
+                schema_map = SchemaMapper.load_schema_map(schema_map_path)
+                for table in tables:
+                    mapper.update_schema_map(schema_map, table)
+            else:
+                schema_map = mapper.build_schema_map()
+            mapper.save_schema_map(schema_map, schema_map_path)
+
+    logger.info(
+        f"Updated dictionary for {', '.join(t.upper() for t in tables)}: "
+        f"{len(matcher)} fuzzy entries, {len(schema_map.tables)} tables"
+    )
+
+    return {
+        "tables": [t.upper() for t in tables],
+        "fuzzy_entries": len(matcher),
+        "schema_tables": len(schema_map.tables),
+    }
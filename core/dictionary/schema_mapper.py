@@ -11,7 +11,8 @@ from pathlib import Path
 from typing import Dict, List, Any, Optional, Set
 from dataclasses import dataclass, field, asdict
 
-import duckdb
+from core.data.connection_manager import get_connection_manager
+from core.data.duckdb_loader import is_internal_table
 
 logger = logging.getLogger(__name__)
 
@@ -123,17 +124,19 @@ class SchemaMapper:
         """
         self.db_path = Path(db_path)
         self.metadata_path = Path(metadata_path) if metadata_path else None
-        self._conn: Optional[duckdb.DuckDBPyConnection] = None
         self._metadata: Optional[Dict] = None
 
         if not self.db_path.exists():
             raise FileNotFoundError(f"Database not found: {db_path}")
 
-    def _get_connection(self) -> duckdb.DuckDBPyConnection:
-        """Get or create database connection."""
-        if self._conn is None:
-            self._conn = duckdb.connect(str(self.db_path))
-        return self._conn
+    def _read(self):
+        """
+        Read on this thread's cursor of the shared database handle.
+
+        Taken per operation, never kept: upgrading the handle for writing
+        closes every cursor.
+        """
+        return get_connection_manager(self.db_path).read()
 
     def _load_metadata(self) -> Dict:
         """Load golden metadata if available."""
@@ -149,30 +152,30 @@ class SchemaMapper:
         return self._metadata
 
     def get_tables(self) -> List[str]:
-        """Get list of all tables in the database."""
-        conn = self._get_connection()
-        result = conn.execute("SHOW TABLES").fetchall()
-        return [row[0] for row in result]
+        """Get list of all tables in the database (the loader's internal tables excluded)."""
+        with self._read() as conn:
+            result = conn.execute("SHOW TABLES").fetchall()
+        return [row[0] for row in result if not is_internal_table(row[0])]
 
     def get_table_schema(self, table_name: str) -> List[Dict[str, str]]:
         """Get column schema for a table."""
-        conn = self._get_connection()
-        result = conn.execute(f'DESCRIBE "{table_name}"').fetchall()
+        with self._read() as conn:
+            result = conn.execute(f'DESCRIBE "{table_name}"').fetchall()
         return [{"name": row[0], "type": row[1]} for row in result]
 
     def get_row_count(self, table_name: str) -> int:
         """Get row count for a table."""
-        conn = self._get_connection()
-        result = conn.execute(f'SELECT COUNT(*) FROM "{table_name}"').fetchone()
+        with self._read() as conn:
+            result = conn.execute(f'SELECT COUNT(*) FROM "{table_name}"').fetchone()
         return result[0] if result else 0
 
     def get_unique_count(self, table_name: str, column_name: str) -> int:
         """Get unique value count for a column."""
-        conn = self._get_connection()
         try:
-            result = conn.execute(
-                f'SELECT COUNT(DISTINCT "{column_name}") FROM "{table_name}"'
-            ).fetchone()
+            with self._read() as conn:
+                result = conn.execute(
+                    f'SELECT COUNT(DISTINCT "{column_name}") FROM "{table_name}"'
+                ).fetchone()
             return result[0] if result else 0
         except Exception:
             return 0
@@ -182,14 +185,14 @@ class SchemaMapper:
                           column_name: str,
                           limit: int = 5) -> List[str]:
         """Get sample values from a column."""
-        conn = self._get_connection()
         try:
-            result = conn.execute(f'''
-                SELECT DISTINCT "{column_name}"
-                FROM "{table_name}"
-                WHERE "{column_name}" IS NOT NULL
-                LIMIT {limit}
-            ''').fetchall()
+            with self._read() as conn:
+                result = conn.execute(f'''
+                    SELECT DISTINCT "{column_name}"
+                    FROM "{table_name}"
+                    WHERE "{column_name}" IS NOT NULL
+                    LIMIT {limit}
+                ''').fetchall()
             return [str(row[0]) for row in result if row[0]]
         except Exception:
             return []
@@ -288,21 +291,7 @@ class SchemaMapper:
 
             table_upper = table_name.upper()
             schema = self.get_table_schema(table_name)
-            row_count = self.get_row_count(table_name)
-
-            # Build table info
-            columns = [col["name"].upper() for col in schema]
-            key_columns = [c for c in columns if self._is_key_column(c)]
-
-            table_info = TableInfo(
-                name=table_upper,
-                columns=columns,
-                row_count=row_count,
-                description=self._get_table_description(table_upper),
-                domain_type=self._detect_domain_type(table_name),
-                key_columns=key_columns
-            )
-            schema_map.tables[table_upper] = table_info
+            schema_map.tables[table_upper] = self._table_info(table_name, schema)
 
             # Process columns
             for col in schema:
@@ -363,6 +352,133 @@ class SchemaMapper:
 
         return schema_map
 
+    def update_schema_map(self,
+                          schema_map: SchemaMap,
+                          table_name: str,
+                          include_samples: bool = True) -> SchemaMap:
+        """
+        Refresh one table in an existing schema map.
+
+        The table's entry is rebuilt from the database and its columns are
+        merged into the column entries it shares with other tables. Other
+        tables are only queried to recount unique values of a shared column
+        the table previously contributed to. A table that no longer exists
+        is removed.
+
+        Args:
+            schema_map: Schema map to update in place
+            table_name: Table that was loaded, replaced or dropped
+            include_samples: Include sample values for new columns
+
+        Returns:
+            The updated schema map
+        """
+        import datetime
+
+        table_upper = table_name.upper()
+        db_tables = {name.upper(): name for name in self.get_tables()}
+
+        # Remove the table's previous contribution
+        recount: Set[str] = set()
+        previous = schema_map.tables.pop(table_upper, None)
+        for col_name in (previous.columns if previous else []):
+            col_info = schema_map.columns.get(col_name)
+            if col_info is None or table_upper not in col_info.tables:
+                continue
+            col_info.tables = [t for t in col_info.tables if t != table_upper]
+            if col_info.tables:
+                recount.add(col_name)
+            else:
+                del schema_map.columns[col_name]
+
+        if table_upper in db_tables:
+            db_table = db_tables[table_upper]
+            schema = self.get_table_schema(db_table)
+            schema_map.tables[table_upper] = self._table_info(db_table, schema)
+
+            for col in schema:
+                col_name = col["name"].upper()
+                unique_count = self.get_unique_count(db_table, col["name"])
+                samples = []
+                if include_samples and "VARCHAR" in col["type"].upper():
+                    samples = self.get_sample_values(db_table, col["name"])
+
+                col_info = schema_map.columns.get(col_name)
+                if col_info is None:
+                    description = self.get_variable_description(table_upper, col_name)
+                    schema_map.columns[col_name] = ColumnInfo(
+                        name=col_name,
+                        tables=[table_upper],
+                        data_type=col["type"],
+                        is_key=self._is_key_column(col_name),
+                        description=description,
+                        codelist=self.get_codelist(table_upper, col_name) if description else None,
+                        unique_values_count=unique_count,
+                        sample_values=samples[:5]
+                    )
+                    continue
+
+                col_info.tables = sorted(set(col_info.tables) | {table_upper})
+                if col_name in recount:
+                    recount.discard(col_name)
+                    unique_count = max(unique_count, self._max_unique_count(
+                        [db_tables.get(t, t) for t in col_info.tables if t != table_upper],
+                        col_name
+                    ))
+                    col_info.unique_values_count = unique_count
+                    # Drop samples the table's previous contents contributed
+                    col_info.sample_values = self._merged_samples(
+                        [db_tables.get(t, t) for t in col_info.tables], col_name
+                    ) if col_info.sample_values or samples else []
+                else:
+                    col_info.unique_values_count = max(col_info.unique_values_count, unique_count)
+                    col_info.sample_values = list(dict.fromkeys(col_info.sample_values + samples))[:5]
+
+                if not col_info.description:
+                    col_info.description = self.get_variable_description(table_upper, col_name)
+                    if col_info.description:
+                        col_info.codelist = self.get_codelist(table_upper, col_name)
+
+        # Shared columns the table no longer has
+        for col_name in recount:
+            col_info = schema_map.columns[col_name]
+            remaining = [db_tables.get(t, t) for t in col_info.tables]
+            col_info.unique_values_count = self._max_unique_count(remaining, col_name)
+            if col_info.sample_values:
+                col_info.sample_values = self._merged_samples(remaining, col_name)
+
+        schema_map.generated_at = datetime.datetime.now().isoformat()
+        logger.info(
+            f"Updated schema map for {table_upper}: {len(schema_map.tables)} tables "
+            f"and {len(schema_map.columns)} columns"
+        )
+
+        return schema_map
+
+    def _table_info(self, table_name: str, schema: List[Dict[str, str]]) -> TableInfo:
+        """Build the TableInfo of a table from its DuckDB schema."""
+        columns = [col["name"].upper() for col in schema]
+
+        return TableInfo(
+            name=table_name.upper(),
+            columns=columns,
+            row_count=self.get_row_count(table_name),
+            description=self._get_table_description(table_name.upper()),
+            domain_type=self._detect_domain_type(table_name),
+            key_columns=[c for c in columns if self._is_key_column(c)]
+        )
+
+    def _max_unique_count(self, tables: List[str], column_name: str) -> int:
+        """Largest unique value count of a column across tables."""
+        return max((self.get_unique_count(t, column_name) for t in tables), default=0)
+
+    def _merged_samples(self, tables: List[str], column_name: str) -> List[str]:
+        """Sample values of a column across tables, in table order, deduplicated."""
+        samples: List[str] = []
+        for table in tables:
+            samples.extend(self.get_sample_values(table, column_name))
+        return list(dict.fromkeys(samples))[:5]
+
     def _get_table_description(self, table_name: str) -> str:
         """Get table description from metadata or use default."""
         metadata = self._load_metadata()
@@ -443,10 +559,7 @@ class SchemaMapper:
         return schema_map
 
     def close(self):
-        """Close database connection."""
-        if self._conn:
-            self._conn.close()
-            self._conn = None
+        """Nothing to release: cursors are taken per operation (the shared handle stays open)."""
 
     def __enter__(self):
         return self
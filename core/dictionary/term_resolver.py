@@ -24,6 +24,8 @@ from typing import Optional, List, Dict, Any, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 
+from .fuzzy_matcher import FuzzyMatcher, FUZZY_INDEX_FILENAME
+
 logger = logging.getLogger(__name__)
 
 
@@ -310,7 +312,7 @@ def create_term_resolver(
     Args:
         db_path: Path to DuckDB database
         knowledge_dir: Path to knowledge directory
-        fuzzy_index_path: Optional path to fuzzy index pickle file
+        fuzzy_index_path: Optional path to fuzzy index file
 
     Returns:
         Configured TermResolver instance
@@ -322,11 +324,10 @@ def create_term_resolver(
     if fuzzy_index_path:
         fuzzy_path = Path(fuzzy_index_path)
     else:
-        fuzzy_path = Path(knowledge_dir) / "fuzzy_index.pkl"
+        fuzzy_path = Path(knowledge_dir) / FUZZY_INDEX_FILENAME
 
-    if fuzzy_path.exists():
+    if FuzzyMatcher.index_exists(str(fuzzy_path)):
         try:
-            from .fuzzy_matcher import FuzzyMatcher
             fuzzy_matcher = FuzzyMatcher.load(str(fuzzy_path))
             logger.info(f"Loaded fuzzy index with {len(fuzzy_matcher)} entries")
         except Exception as e:
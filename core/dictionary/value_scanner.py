@@ -3,15 +3,21 @@
 """
 Scans clinical data tables in DuckDB and extracts unique values
 from key columns for fuzzy matching and semantic search.
+
+Columns are read through TableProfiler: all scannable columns of a table
+are profiled in one scan, and tables are scanned in parallel.
 """
 
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Callable, Set
 from dataclasses import dataclass, field
 
-import duckdb
+from core.data.connection_manager import get_connection_manager
+from core.data.duckdb_loader import is_internal_table
+from core.data.table_profiler import TableProfiler, ColumnProfile
 
 logger = logging.getLogger(__name__)
 
@@ -96,16 +102,15 @@ class ValueScanner:
         self.metadata_path = Path(metadata_path) if metadata_path else None
         self.max_values = max_values_per_column
         self._metadata: Optional[Dict] = None
-        self._conn: Optional[duckdb.DuckDBPyConnection] = None
 
         if not self.db_path.exists():
             raise FileNotFoundError(f"Database not found: {db_path}")
 
-    def _get_connection(self) -> duckdb.DuckDBPyConnection:
-        """Get or create database connection."""
-        if self._conn is None:
-            self._conn = duckdb.connect(str(self.db_path))
-        return self._conn
+        self._profiler = TableProfiler(str(self.db_path), max_values=self.max_values)
+
+    def _read(self):
+        """Read on this thread's cursor of the shared database handle (per operation)."""
+        return get_connection_manager(self.db_path).read()
 
     def _load_metadata(self) -> Dict:
         """Load golden metadata if available."""
@@ -120,15 +125,15 @@ class ValueScanner:
         return self._metadata
 
     def get_tables(self) -> List[str]:
-        """Get list of all tables in the database."""
-        conn = self._get_connection()
-        result = conn.execute("SHOW TABLES").fetchall()
-        return [row[0] for row in result]
+        """Get list of all tables in the database (the loader's internal tables excluded)."""
+        with self._read() as conn:
+            result = conn.execute("SHOW TABLES").fetchall()
+        return [row[0] for row in result if not is_internal_table(row[0])]
 
     def get_table_columns(self, table_name: str) -> List[Dict[str, str]]:
         """Get column info for a table."""
-        conn = self._get_connection()
-        result = conn.execute(f'DESCRIBE "{table_name}"').fetchall()
+        with self._read() as conn:
+            result = conn.execute(f'DESCRIBE "{table_name}"').fetchall()
         return [{"name": row[0], "type": row[1]} for row in result]
 
     def get_scannable_columns(self, table_name: str) -> List[str]:
@@ -148,37 +153,45 @@ class ValueScanner:
             return [col for col in predefined if col.upper() in actual_columns]
 
         # Fallback: scan VARCHAR columns with reasonable cardinality
-        columns = self.get_table_columns(table_name)
-        conn = self._get_connection()
+        profiles = self._profiler.profile_table(
+            table_name, self._candidate_columns(table_name), max_values=0
+        )
+        return [name for name, profile in profiles.items() if self._has_scannable_cardinality(profile)]
 
-        scannable = []
-        for col in columns:
+    def _candidate_columns(self, table_name: str) -> List[str]:
+        """Text columns without ID-like names (fallback for unknown domains)."""
+        candidates = []
+        for col in self.get_table_columns(table_name):
             if "VARCHAR" not in col["type"].upper() and "TEXT" not in col["type"].upper():
                 continue
 
-            col_name = col["name"]
-
             # Skip ID-like columns
-            if any(suffix in col_name.upper() for suffix in ["ID", "SEQ", "NUM", "DTC", "DT", "TM"]):
+            if any(suffix in col["name"].upper() for suffix in ["ID", "SEQ", "NUM", "DTC", "DT", "TM"]):
                 continue
 
-            # Check cardinality
-            try:
-                result = conn.execute(f'''
-                    SELECT
-                        COUNT(*) as total,
-                        COUNT(DISTINCT "{col_name}") as unique_count
-                    FROM "{table_name}"
-                ''').fetchone()
+            candidates.append(col["name"])
+        return candidates
 
-                total, unique = result
-                if total > 0 and unique >= MIN_CARDINALITY:
-                    if unique / total <= MAX_CARDINALITY_RATIO:
-                        scannable.append(col_name)
-            except Exception as e:
-                logger.warning(f"Error checking cardinality for {table_name}.{col_name}: {e}")
+    @staticmethod
+    def _has_scannable_cardinality(profile: ColumnProfile) -> bool:
+        """Whether a column has enough, but not too many, unique values."""
+        total, unique = profile.total_rows, profile.distinct_count
+        return total > 0 and unique >= MIN_CARDINALITY and unique / total <= MAX_CARDINALITY_RATIO
 
-        return scannable
+    def _scan_result(self, table_name: str, profile: ColumnProfile) -> ScanResult:
+        """ScanResult from a column profile."""
+        values = [str(v).strip() for v in profile.values if v is not None]
+        values = [v for v in values if v]  # Remove empty strings
+
+        return ScanResult(
+            table=table_name.upper(),
+            column=profile.column.upper(),
+            values=values,
+            total_rows=profile.total_rows,
+            unique_count=profile.distinct_count,
+            null_count=profile.null_count,
+            sample_values=values[:10]  # Sample values for preview
+        )
 
     def scan_column(self, table_name: str, column_name: str) -> ScanResult:
         """
@@ -191,43 +204,10 @@ class ValueScanner:
         Returns:
             ScanResult with unique values and statistics
         """
-        conn = self._get_connection()
-
-        # Get statistics
-        stats = conn.execute(f'''
-            SELECT
-                COUNT(*) as total,
-                COUNT(DISTINCT "{column_name}") as unique_count,
-                COUNT(*) - COUNT("{column_name}") as null_count
-            FROM "{table_name}"
-        ''').fetchone()
-
-        total_rows, unique_count, null_count = stats
-
-        # Get unique values (limited)
-        result = conn.execute(f'''
-            SELECT DISTINCT "{column_name}"
-            FROM "{table_name}"
-            WHERE "{column_name}" IS NOT NULL
-            ORDER BY "{column_name}"
-            LIMIT {self.max_values}
-        ''').fetchall()
-
-        values = [str(row[0]).strip() for row in result if row[0] is not None]
-        values = [v for v in values if v]  # Remove empty strings
-
-        # Get sample values for preview
-        sample_values = values[:10] if values else []
-
-        return ScanResult(
-            table=table_name.upper(),
-            column=column_name.upper(),
-            values=values,
-            total_rows=total_rows,
-            unique_count=unique_count,
-            null_count=null_count,
-            sample_values=sample_values
-        )
+        profiles = self._profiler.profile_table(table_name, [column_name])
+        if not profiles:
+            raise ValueError(f"Column not found: {table_name}.{column_name}")
+        return self._scan_result(table_name, next(iter(profiles.values())))
 
     def scan_table(self,
                    table_name: str,
@@ -236,6 +216,8 @@ class ValueScanner:
         """
         Scan all scannable columns in a table.
 
+        The columns are profiled together in one scan of the table.
+
         Args:
             table_name: Name of the table to scan
             progress_callback: Optional callback(column, current, total)
@@ -243,20 +225,26 @@ class ValueScanner:
         Returns:
             Dict mapping column names to ScanResults
         """
-        columns = self.get_scannable_columns(table_name)
-        results = {}
+        try:
+            if table_name.upper() in SCANNABLE_COLUMNS:
+                profiles = self._profiler.profile_table(table_name, self.get_scannable_columns(table_name))
+            else:
+                profiles = self._profiler.profile_table(table_name, self._candidate_columns(table_name))
+                profiles = {name: profile for name, profile in profiles.items()
+                            if self._has_scannable_cardinality(profile)}
+        except Exception as e:
+            logger.error(f"Error scanning {table_name}: {e}")
+            return {}
 
-        for i, col in enumerate(columns):
+        results = {}
+        for i, profile in enumerate(profiles.values()):
             if progress_callback:
-                progress_callback(col, i + 1, len(columns))
+                progress_callback(profile.column, i + 1, len(profiles))
 
-            try:
-                result = self.scan_column(table_name, col)
-                if result.values:  # Only include columns with values
-                    results[col.upper()] = result
-                    logger.debug(f"Scanned {table_name}.{col}: {result.unique_count} unique values")
-            except Exception as e:
-                logger.error(f"Error scanning {table_name}.{col}: {e}")
+            result = self._scan_result(table_name, profile)
+            if result.values:  # Only include columns with values
+                results[result.column] = result
+                logger.debug(f"Scanned {table_name}.{profile.column}: {result.unique_count} unique values")
 
         return results
 
@@ -267,6 +255,9 @@ class ValueScanner:
         """
         Scan all tables for unique values.
 
+        Tables are scanned in parallel (TableProfiler.MAX_WORKERS at a time),
+        so progress_callback may be called from worker threads.
+
         Args:
             tables: Optional list of tables to scan (defaults to all)
             progress_callback: Optional callback(table, column, current, total)
@@ -277,17 +268,24 @@ class ValueScanner:
         if tables is None:
             tables = self.get_tables()
 
-        all_results = {}
         total_tables = len(tables)
 
-        for i, table in enumerate(tables):
+        def scan(item):
+            i, table = item
             logger.info(f"Scanning table {table} ({i+1}/{total_tables})")
 
             def table_progress(col, cur, tot):
                 if progress_callback:
                     progress_callback(table, col, cur, tot)
 
-            results = self.scan_table(table, table_progress)
+            return self.scan_table(table, table_progress)
+
+        workers = max(1, min(self._profiler.max_workers, total_tables))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scanner") as executor:
+            table_results = list(executor.map(scan, enumerate(tables)))
+
+        all_results = {}
+        for table, results in zip(tables, table_results):
             if results:
                 all_results[table.upper()] = results
 
@@ -349,10 +347,7 @@ class ValueScanner:
         return ""
 
     def close(self):
-        """Close database connection."""
-        if self._conn:
-            self._conn.close()
-            self._conn = None
+        """Nothing to release: cursors belong to the shared handle."""
 
     def __enter__(self):
         return self
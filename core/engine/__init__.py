@@ -50,6 +50,7 @@ from .context_builder import ContextBuilder, SchemaInfo
 from .sql_generator import MockSQLGenerator, UnifiedSQLGenerator, create_sql_generator
 from .sql_validator import SQLValidator, ValidatorConfig
 from .executor import SQLExecutor, ExecutorConfig, MockExecutor
+from .columnar import ColumnarRows
 from .confidence_scorer import ConfidenceScorer, ScorerConfig, get_confidence_color
 from .explanation_generator import ExplanationGenerator, ResponseBuilder
 
@@ -60,6 +61,16 @@ from .pipeline import (
     create_pipeline
 )
 
+# Pipeline Worker Pool (runs the pipeline off the event loop)
+from .pipeline_pool import (
+    PipelinePoolConfig,
+    PipelineWorkerPool,
+    PipelineTicket,
+    PipelineSaturatedError,
+    get_pipeline_pool,
+    shutdown_pipeline_pool
+)
+
 # Clinical Naming Service (dynamic friendly names)
 from .clinical_naming import (
     ClinicalNamingService,
@@ -115,6 +126,7 @@ __all__ = [
     'SQLExecutor',
     'ExecutorConfig',
     'MockExecutor',
+    'ColumnarRows',
     'ConfidenceScorer',
     'ScorerConfig',
     'get_confidence_color',
@@ -126,6 +138,14 @@ __all__ = [
     'PipelineConfig',
     'create_pipeline',
 
+    # Pipeline Worker Pool
+    'PipelinePoolConfig',
+    'PipelineWorkerPool',
+    'PipelineTicket',
+    'PipelineSaturatedError',
+    'get_pipeline_pool',
+    'shutdown_pipeline_pool',
+
     # Clinical Naming
     'ClinicalNamingService',
     'get_naming_service',
@@ -408,11 +408,17 @@ class AnswerVerifier:
         if result.data:
             total_cells = 0
             null_cells = 0
-            for row in result.data:
-                for value in row.values():
-                    total_cells += 1
-                    if value is None:
-                        null_cells += 1
+            if result.arrow_table is not None:
+                # Columnar results carry per-column NULL counts
+                table = result.arrow_table
+                total_cells = table.num_rows * table.num_columns
+                null_cells = sum(column.null_count for column in table.columns)
+            else:
+                for row in result.data:
+                    for value in row.values():
+                        total_cells += 1
+                        if value is None:
+                            null_cells += 1
 
             if total_cells > 0:
                 null_ratio = null_cells / total_cells
@@ -462,9 +468,8 @@ class AnswerVerifier:
             return None
 
         try:
-            import duckdb
-            conn = duckdb.connect(self.db_path, read_only=True)
-            try:
+            from core.data.connection_manager import get_connection_manager
+            with get_connection_manager(self.db_path).read() as conn:
                 # Try ADSL first
                 try:
                     result = conn.execute(
@@ -482,8 +487,6 @@ class AnswerVerifier:
                             self._total_subjects = result[0]
                     except Exception:
                         pass
-            finally:
-                conn.close()
         except Exception as e:
             logger.warning(f"Could not get total subjects: {e}")
 
@@ -7,9 +7,13 @@ This module provides a two-tier caching system:
 1. Full query cache: Caches complete PipelineResult objects
 2. SQL cache: Caches generated SQL for similar query patterns
 
+Plus a small intent cache so repeated questions skip the LLM intent
+classifier entirely.
+
 Features:
 - TTL-based expiration (default 1 hour)
-- Data version tracking - auto-invalidates when DuckDB data changes
+- Data version tracking per table - when a table changes, only the entries
+  whose queries read it are invalidated
 - Manual invalidation via API endpoint
 
 This significantly reduces response time for repeated queries.
@@ -20,13 +24,46 @@ import hashlib
 import logging
 import os
 from dataclasses import dataclass, field
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterable, Set, Tuple
 from threading import Lock
 from pathlib import Path
+from collections import OrderedDict
 
 logger = logging.getLogger(__name__)
 
 
+def normalize_query(query: str) -> str:
+    """
+    Normalize query for consistent hashing.
+
+    Normalizations:
+    - Convert to lowercase
+    - Strip whitespace
+    - Collapse multiple spaces
+    - Remove trailing punctuation
+
+    Args:
+        query: Raw query string
+
+    Returns:
+        Normalized query string
+    """
+    if not query:
+        return ""
+
+    # Lowercase and strip
+    normalized = query.lower().strip()
+
+    # Collapse whitespace
+    normalized = ' '.join(normalized.split())
+
+    # Remove trailing punctuation (but keep internal punctuation like hyphens)
+    while normalized and normalized[-1] in '?!.,;:':
+        normalized = normalized[:-1]
+
+    return normalized
+
+
 # =============================================================================
 # Data Version Tracker
 # =============================================================================
@@ -38,9 +75,12 @@ class DataVersionTracker:
     When data changes (new files loaded, tables updated), the version
     changes and the cache can be automatically invalidated.
 
-    Version is computed from:
-    - DuckDB file modification time
-    - Row counts of key tables (ADSL, ADAE, etc.)
+    Each table has its own version, from:
+    - Its row count
+    - Its load version and time in _sage_metadata (if loaded by DuckDBLoader)
+
+    The overall version is a hash of the table versions (or of the DuckDB
+    file modification time if the tables cannot be read).
     """
 
     def __init__(self, db_path: Optional[str] = None):
@@ -52,6 +92,7 @@ class DataVersionTracker:
         """
         self.db_path = db_path
         self._current_version: Optional[str] = None
+        self._table_versions: Dict[str, str] = {}
         self._last_check: float = 0
         self._check_interval: float = 60.0  # Check at most every 60 seconds
         self._lock = Lock()
@@ -61,6 +102,12 @@ class DataVersionTracker:
         with self._lock:
             self.db_path = db_path
             self._current_version = None  # Force recompute
+            self._table_versions = {}
+
+    def expire(self) -> None:
+        """Recompute the versions on the next check (e.g. after a load)."""
+        with self._lock:
+            self._last_check = 0
 
     def get_version(self, force: bool = False) -> Optional[str]:
         """
@@ -73,60 +120,92 @@ class DataVersionTracker:
             Version hash string or None if unable to compute
         """
         with self._lock:
-            now = time.time()
+            self._refresh(force)
+            return self._current_version
 
-            # Return cached version if recently checked
-            if not force and self._current_version and (now - self._last_check) < self._check_interval:
-                return self._current_version
+    def get_table_versions(self, force: bool = False) -> Dict[str, str]:
+        """
+        Get the current version of each table.
 
-            # Compute new version
-            self._current_version = self._compute_version()
-            self._last_check = now
-            return self._current_version
+        Args:
+            force: Force recomputation even if recently checked
+
+        Returns:
+            Dict of upper-case table name -> version string
+        """
+        with self._lock:
+            self._refresh(force)
+            return dict(self._table_versions)
+
+    def _refresh(self, force: bool) -> None:
+        """Recompute the versions if not recently checked (lock held)."""
+        now = time.time()
+
+        # Keep versions if recently checked
+        if not force and self._current_version and (now - self._last_check) < self._check_interval:
+            return
+
+        self._table_versions = self._compute_table_versions()
+        self._current_version = self._compute_version()
+        self._last_check = now
+
+    def _compute_table_versions(self) -> Dict[str, str]:
+        """Compute the version of each table from database state."""
+        if not self.db_path or not Path(self.db_path).exists():
+            return {}
+
+        versions = {}
+        try:
+            from core.data.connection_manager import get_connection_manager
+            with get_connection_manager(Path(self.db_path)).read() as conn:
+                # Get list of tables
+                tables = conn.execute("SHOW TABLES").fetchall()
+                table_names = [t[0] for t in tables if not t[0].startswith("_sage_")]
+
+                # Load version per table (tables loaded by DuckDBLoader)
+                loads = {}
+                if any(t[0] == "_sage_metadata" for t in tables):
+                    loads = {
+                        row[0].upper(): f"{row[1]}@{row[2]}"
+                        for row in conn.execute(
+                            "SELECT table_name, version, updated_at FROM _sage_metadata"
+                        ).fetchall()
+                    }
+
+                # Get row counts for each table
+                # Import validation at function level to avoid circular imports
+                from .sql_security import validate_table_name
+                for table in sorted(table_names):
+                    try:
+                        # Validate table name before use in SQL
+                        if validate_table_name(table):
+                            count = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                            key = table.upper()
+                            versions[key] = f"{count}:{loads.get(key, '')}"
+                        else:
+                            logger.debug(f"Skipping invalid table name: {table}")
+                    except Exception as e:
+                        logger.debug(f"Could not count rows in {table}: {e}")
+        except ImportError:
+            # DuckDB not available, use file mtime only
+            pass
+        except Exception as e:
+            logger.debug(f"Could not query DuckDB for version: {e}")
+
+        return versions
 
     def _compute_version(self) -> Optional[str]:
-        """Compute version hash from database state."""
+        """Compute overall version hash from the table versions."""
         if not self.db_path:
             return None
 
         try:
-            version_parts = []
+            version_parts = [f"{table}:{version}" for table, version in sorted(self._table_versions.items())]
 
-            # 1. File modification time
+            # File modification time when the tables could not be read
             db_file = Path(self.db_path)
-            if db_file.exists():
-                mtime = db_file.stat().st_mtime
-                version_parts.append(f"mtime:{mtime}")
-
-            # 2. Row counts from key tables (if duckdb available)
-            try:
-                import duckdb
-                conn = duckdb.connect(str(db_file), read_only=True)
-                try:
-                    # Get list of tables
-                    tables = conn.execute("SHOW TABLES").fetchall()
-                    table_names = [t[0] for t in tables]
-
-                    # Get row counts for each table
-                    # Import validation at function level to avoid circular imports
-                    from .sql_security import validate_table_name
-                    for table in sorted(table_names):
-                        try:
-                            # Validate table name before use in SQL
-                            if validate_table_name(table):
-                                count = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
-                                version_parts.append(f"{table}:{count}")
-                            else:
-                                logger.debug(f"Skipping invalid table name: {table}")
-                        except Exception as e:
-                            logger.debug(f"Could not count rows in {table}: {e}")
-                finally:
-                    conn.close()
-            except ImportError:
-                # DuckDB not available, use file mtime only
-                pass
-            except Exception as e:
-                logger.debug(f"Could not query DuckDB for version: {e}")
+            if not version_parts and db_file.exists():
+                version_parts.append(f"mtime:{db_file.stat().st_mtime}")
 
             if not version_parts:
                 return None
@@ -175,6 +254,7 @@ class CacheEntry:
     hit_count: int = 0
     query_hash: str = ""
     data_version: Optional[str] = None  # Version of data when cached
+    tables: Tuple[str, ...] = ()        # Tables the query read (empty: unknown, depends on all)
 
     def is_expired(self) -> bool:
         """Check if this entry has expired."""
@@ -184,6 +264,10 @@ class CacheEntry:
         """Record a cache hit."""
         self.hit_count += 1
 
+    def depends_on(self, tables: Set[str]) -> bool:
+        """Whether the entry may have read any of the given (upper-case) tables."""
+        return not self.tables or any(table in tables for table in self.tables)
+
 
 class QueryCache:
     """
@@ -193,8 +277,10 @@ class QueryCache:
     - Query normalization for consistent cache keys
     - TTL-based expiration
     - Thread-safe operations
-    - Hit/miss statistics
+    - Hit/miss statistics, overall and per table
     - LRU eviction when cache is full
+    - Table-scoped invalidation: entries record the tables their query read,
+      and a change to a table evicts only the entries that read it
 
     Example:
         cache = QueryCache(max_size=1000, default_ttl=3600)
@@ -207,6 +293,10 @@ class QueryCache:
 
         # Second query - cache hit
         result = cache.get("how many patients had nausea")  # Same normalized form
+
+        # Record dependencies; reloading ADLB later keeps this entry
+        cache.set("How many patients had nausea?", result, tables=["ADAE"])
+        cache.invalidate_tables(["ADLB"])
     """
 
     def __init__(self, max_size: int = 1000, default_ttl: int = 3600, db_path: Optional[str] = None):
@@ -229,40 +319,15 @@ class QueryCache:
             'expirations': 0,
             'data_invalidations': 0
         }
+        self.table_stats: Dict[str, Dict[str, int]] = {}
         # Data version tracking
         self._version_tracker = DataVersionTracker(db_path)
         self._last_known_version: Optional[str] = None
+        self._known_table_versions: Dict[str, str] = {}
 
     def _normalize(self, query: str) -> str:
-        """
-        Normalize query for consistent hashing.
-
-        Normalizations:
-        - Convert to lowercase
-        - Strip whitespace
-        - Collapse multiple spaces
-        - Remove trailing punctuation
-
-        Args:
-            query: Raw query string
-
-        Returns:
-            Normalized query string
-        """
-        if not query:
-            return ""
-
-        # Lowercase and strip
-        normalized = query.lower().strip()
-
-        # Collapse whitespace
-        normalized = ' '.join(normalized.split())
-
-        # Remove trailing punctuation (but keep internal punctuation like hyphens)
-        while normalized and normalized[-1] in '?!.,;:':
-            normalized = normalized[:-1]
-
-        return normalized
+        """Normalize query for consistent hashing (see normalize_query)."""
+        return normalize_query(query)
 
     def _hash(self, query: str, session_id: Optional[str] = None) -> str:
         """
@@ -286,13 +351,20 @@ class QueryCache:
             cache_input = normalized
         return hashlib.sha256(cache_input.encode()).hexdigest()[:16]
 
-    def get(self, query: str, session_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    def get(
+        self,
+        query: str,
+        session_id: Optional[str] = None,
+        record_miss: bool = True
+    ) -> Optional[Dict[str, Any]]:
         """
         Get cached result if exists, not expired, and data hasn't changed.
 
         Args:
             query: Query string
             session_id: Optional session ID for session-scoped caching
+            record_miss: Count a plain miss in stats (False for a first probe
+                that will be followed by a fallback lookup)
 
         Returns:
             Cached result dict or None if not found/expired/stale
@@ -300,19 +372,8 @@ class QueryCache:
         key = self._hash(query, session_id)
 
         with self._lock:
-            # Check if data version changed - invalidate entire cache if so
-            current_version = self._version_tracker.get_version()
-            if current_version and self._last_known_version and current_version != self._last_known_version:
-                logger.info(f"Data version changed ({self._last_known_version} -> {current_version}), clearing cache")
-                self._cache.clear()
-                self.stats['data_invalidations'] += 1
-                self._last_known_version = current_version
-                self.stats['misses'] += 1
-                return None
-
-            # Update last known version if not set
-            if current_version and not self._last_known_version:
-                self._last_known_version = current_version
+            # Evict entries that read tables changed since the last check
+            self._sync_data_version()
 
             entry = self._cache.get(key)
 
@@ -325,25 +386,20 @@ class QueryCache:
                     logger.debug(f"Cache EXPIRED for query (key={key[:8]})")
                     return None
 
-                # Check if entry was created with different data version
-                if entry.data_version and current_version and entry.data_version != current_version:
-                    del self._cache[key]
-                    self.stats['data_invalidations'] += 1
-                    self.stats['misses'] += 1
-                    logger.info(f"Cache STALE for query (key={key[:8]}, data changed)")
-                    return None
-
                 # Cache hit
                 entry.touch()
                 self.stats['hits'] += 1
+                self._count_tables(entry.tables, 'hits')
                 logger.info(f"Cache HIT for query (key={key[:8]}, hits={entry.hit_count})")
                 return entry.result
 
             # Cache miss
-            self.stats['misses'] += 1
+            if record_miss:
+                self.stats['misses'] += 1
             return None
 
-    def set(self, query: str, result: Dict[str, Any], ttl: Optional[int] = None, session_id: Optional[str] = None) -> None:
+    def set(self, query: str, result: Dict[str, Any], ttl: Optional[int] = None,
+            session_id: Optional[str] = None, tables: Optional[Iterable[str]] = None) -> None:
         """
         Store result in cache with current data version.
 
@@ -352,14 +408,15 @@ class QueryCache:
             result: Result dictionary to cache
             ttl: Optional custom TTL (uses default if not specified)
             session_id: Optional session ID for session-scoped caching
+            tables: Tables the query read (e.g. ValidationResult.tables_verified);
+                if None, the entry is invalidated by a change to any table
         """
         key = self._hash(query, session_id)
+        tables = tuple(sorted({t.upper() for t in tables or ()}))
 
         with self._lock:
-            # Get current data version
-            current_version = self._version_tracker.get_version()
-            if current_version:
-                self._last_known_version = current_version
+            # Evict stale entries first, so the new entry starts from current versions
+            current_version = self._sync_data_version()
 
             # Create cache entry with data version
             self._cache[key] = CacheEntry(
@@ -367,8 +424,11 @@ class QueryCache:
                 created_at=time.time(),
                 ttl_seconds=ttl or self.default_ttl,
                 query_hash=key,
-                data_version=current_version
+                data_version=current_version,
+                tables=tables
             )
+            # The miss that produced this result, attributed to its tables
+            self._count_tables(tables, 'misses')
             logger.info(f"Cache SET for query (key={key[:8]}, version={current_version or 'none'})")
 
             # Evict if over capacity (LRU-style)
@@ -389,6 +449,74 @@ class QueryCache:
         self.stats['evictions'] += 1
         logger.debug(f"Cache EVICT oldest entry (key={oldest_key[:8]})")
 
+    def _sync_data_version(self) -> Optional[str]:
+        """
+        Compare table versions with the last check and evict entries that
+        read a changed table (lock held).
+
+        Returns:
+            Current overall data version
+        """
+        current_version = self._version_tracker.get_version()
+        table_versions = self._version_tracker.get_table_versions()
+
+        if self._last_known_version and current_version and current_version != self._last_known_version:
+            previous = self._known_table_versions
+            changed = {
+                table for table in set(previous) | set(table_versions)
+                if previous.get(table) != table_versions.get(table)
+            }
+            # No table versions (file mtime only): treat every table as changed
+            evicted = self._evict_tables(changed or None)
+            logger.info(f"Data version changed ({self._last_known_version} -> {current_version}), "
+                        f"tables {sorted(changed) or 'unknown'}: {evicted} entries invalidated")
+
+        if current_version:
+            self._last_known_version = current_version
+            self._known_table_versions = table_versions
+        return current_version
+
+    def _evict_tables(self, tables: Optional[Set[str]]) -> int:
+        """Evict entries that read any of the tables, or all if None (lock held)."""
+        stale = [
+            key for key, entry in self._cache.items()
+            if tables is None or entry.depends_on(tables)
+        ]
+        for key in stale:
+            entry = self._cache.pop(key)
+            self._count_tables(entry.tables, 'invalidations')
+        self.stats['data_invalidations'] += len(stale)
+        return len(stale)
+
+    def _count_tables(self, tables: Iterable[str], stat: str) -> None:
+        """Add one to a per-table statistic (lock held)."""
+        for table in tables:
+            counts = self.table_stats.setdefault(table, {'hits': 0, 'misses': 0, 'invalidations': 0})
+            counts[stat] += 1
+
+    def invalidate_tables(self, tables: Iterable[str]) -> int:
+        """
+        Invalidate the entries that read any of the given tables.
+
+        Call after loading or dropping tables. Entries with unknown tables
+        are invalidated too; entries reading only other tables are kept.
+
+        Args:
+            tables: Changed table names (any case)
+
+        Returns:
+            Number of entries removed
+        """
+        changed = {t.upper() for t in tables}
+
+        with self._lock:
+            removed = self._evict_tables(changed)
+
+        # Pick up the new table versions on the next lookup
+        self._version_tracker.expire()
+        logger.info(f"Cache INVALIDATE tables {sorted(changed)} ({removed} entries removed)")
+        return removed
+
     def invalidate(self, query: str) -> bool:
         """
         Invalidate a specific query's cache entry.
@@ -424,6 +552,8 @@ class QueryCache:
             count = len(self._cache)
             self._cache.clear()
             self._last_known_version = None  # Force version recheck
+            self._known_table_versions = {}
+            self.table_stats = {}
             self.stats = {
                 'hits': 0,
                 'misses': 0,
@@ -455,8 +585,27 @@ class QueryCache:
                 'hit_rate': round(hit_rate, 1),
                 'hit_rate_str': f"{hit_rate:.1f}%",
                 'data_version': self._last_known_version,
-                'db_path': self._version_tracker.db_path
+                'db_path': self._version_tracker.db_path,
+                'tables': self._table_breakdown()
+            }
+
+    def _table_breakdown(self) -> Dict[str, Dict[str, Any]]:
+        """Per-table entries, hits, misses, invalidations and hit rate (lock held)."""
+        entries: Dict[str, int] = {}
+        for entry in self._cache.values():
+            for table in entry.tables:
+                entries[table] = entries.get(table, 0) + 1
+
+        breakdown = {}
+        for table in sorted(set(entries) | set(self.table_stats)):
+            counts = self.table_stats.get(table, {'hits': 0, 'misses': 0, 'invalidations': 0})
+            total = counts['hits'] + counts['misses']
+            breakdown[table] = {
+                'entries': entries.get(table, 0),
+                **counts,
+                'hit_rate': round(counts['hits'] / total * 100, 1) if total > 0 else 0,
             }
+        return breakdown
 
     def get_detailed_stats(self) -> Dict[str, Any]:
         """
@@ -486,7 +635,8 @@ class QueryCache:
                 'newest_entry_age_seconds': round(min(ages), 1) if ages else 0,
                 'avg_entry_age_seconds': round(sum(ages) / len(ages), 1) if ages else 0,
                 'default_ttl_seconds': self.default_ttl,
-                'data_version': self._version_tracker.get_current_version() if self._version_tracker else None
+                'data_version': self._version_tracker.get_current_version() if self._version_tracker else None,
+                'tables': self._table_breakdown()
             }
 
     def get_entries(self) -> List[Dict[str, Any]]:
@@ -504,6 +654,7 @@ class QueryCache:
                     'created_at': entry.created_at,
                     'ttl_seconds': entry.ttl_seconds,
                     'hit_count': entry.hit_count,
+                    'tables': list(entry.tables),
                     'is_expired': entry.is_expired(),
                     'age_seconds': int(time.time() - entry.created_at)
                 })
@@ -541,6 +692,84 @@ class QueryCache:
         return self.get(query) is not None
 
 
+# =============================================================================
+# Intent Classification Cache
+# =============================================================================
+
+class IntentCache:
+    """
+    Cache of intent classifications keyed by normalized query.
+
+    Intent classification only looks at the query text (no session or data
+    context), so the result for a normalized query never changes and can be
+    reused across sessions. Entries are kept in LRU order.
+
+    Example:
+        intents = IntentCache(max_size=5000)
+        intent = intents.get("How many patients?")
+        if intent is None:
+            intent = classify(...)
+            intents.set("How many patients?", intent)
+    """
+
+    def __init__(self, max_size: int = 5000):
+        """
+        Initialize the intent cache.
+
+        Args:
+            max_size: Maximum number of classifications to keep
+        """
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self.max_size = max_size
+        self._lock = Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def get(self, query: str) -> Optional[str]:
+        """Get the cached intent for a query, or None."""
+        key = normalize_query(query)
+        with self._lock:
+            intent = self._cache.get(key)
+            if intent is None:
+                self.stats['misses'] += 1
+                return None
+            self._cache.move_to_end(key)
+            self.stats['hits'] += 1
+            return intent
+
+    def set(self, query: str, intent: str) -> None:
+        """Store the intent for a query."""
+        key = normalize_query(query)
+        with self._lock:
+            self._cache[key] = intent
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+                self.stats['evictions'] += 1
+
+    def clear(self) -> None:
+        """Remove all cached classifications."""
+        with self._lock:
+            self._cache.clear()
+            self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss statistics."""
+        with self._lock:
+            total = self.stats['hits'] + self.stats['misses']
+            hit_rate = (self.stats['hits'] / total * 100) if total > 0 else 0
+            return {
+                'size': len(self._cache),
+                'max_size': self.max_size,
+                'hits': self.stats['hits'],
+                'misses': self.stats['misses'],
+                'evictions': self.stats['evictions'],
+                'hit_rate': round(hit_rate, 1),
+            }
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
 # =============================================================================
 # Global Cache Instance
 # =============================================================================
@@ -583,3 +812,34 @@ def reset_query_cache() -> None:
             _query_cache.clear()
         _query_cache = None
         logger.info("Global query cache reset")
+
+
+_intent_cache: Optional[IntentCache] = None
+
+
+def get_intent_cache(max_size: int = 5000) -> IntentCache:
+    """
+    Get or create the global intent classification cache.
+
+    Args:
+        max_size: Maximum cache size (only used on first call)
+
+    Returns:
+        Global IntentCache instance
+    """
+    global _intent_cache
+
+    with _cache_lock:
+        if _intent_cache is None:
+            _intent_cache = IntentCache(max_size=max_size)
+        return _intent_cache
+
+
+def reset_intent_cache() -> None:
+    """Reset the global intent cache (for testing)."""
+    global _intent_cache
+
+    with _cache_lock:
+        if _intent_cache is not None:
+            _intent_cache.clear()
+        _intent_cache = None
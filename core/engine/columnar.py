@@ -0,0 +1,156 @@
+# SAGE - Columnar Query Results
+# ==============================
+"""
+Columnar Query Results
+======================
+Arrow-backed result rows for SQLExecutor.
+
+With columnar results enabled the executor keeps DuckDB's Arrow output
+instead of building a list of dicts. ColumnarRows behaves like that list
+(len, indexing, iteration, truthiness), so the pipeline, cache and session
+memory pass it along without copying; rows are only turned into Python
+objects when something reads them, and the API can send the table as Arrow
+IPC without materializing rows at all.
+"""
+
+from collections.abc import Sequence
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import pyarrow as pa
+    ARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    ARROW_AVAILABLE = False
+
+# Media type for Arrow IPC stream responses
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+# Rows per record batch when reading from DuckDB
+FETCH_BATCH_ROWS = 8192
+
+
+class ColumnarRows(Sequence):
+    """
+    Read-only list of row dicts backed by a pyarrow Table.
+
+    Example:
+        rows = ColumnarRows(table)
+        len(rows)            # no conversion
+        rows[0]              # converts one row
+        rows.to_ipc_bytes()  # Arrow IPC stream, no row conversion
+    """
+
+    def __init__(self, table):
+        self.table = table
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.table.column_names)
+
+    def __len__(self) -> int:
+        return self.table.num_rows
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                return self.table.slice(start, max(stop - start, 0)).to_pylist()
+            return [self[i] for i in range(start, stop, step)]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("row index out of range")
+        return self.table.slice(index, 1).to_pylist()[0]
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        # Convert one record batch at a time
+        for batch in self.table.to_batches():
+            yield from batch.to_pylist()
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, ColumnarRows):
+            return self.table.equals(other.table)
+        if isinstance(other, list):
+            return self.to_pylist() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"ColumnarRows(rows={len(self)}, columns={self.columns})"
+
+    def to_pylist(self) -> List[Dict[str, Any]]:
+        """Materialize all rows as dicts."""
+        return self.table.to_pylist()
+
+    def to_ipc_bytes(self) -> bytes:
+        """Serialize the table as an Arrow IPC stream."""
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, self.table.schema) as writer:
+            writer.write_table(self.table)
+        return sink.getvalue().to_pybytes()
+
+
+def fetch_columnar(result, max_rows: int) -> ColumnarRows:
+    """
+    Fetch up to max_rows rows of a DuckDB result as Arrow.
+
+    Args:
+        result: DuckDB relation/cursor after execute()
+        max_rows: Row limit
+
+    Returns:
+        ColumnarRows over at most max_rows rows
+    """
+    reader = result.fetch_record_batch(FETCH_BATCH_ROWS)
+    batches = []
+    fetched = 0
+    for batch in reader:
+        batches.append(batch)
+        fetched += batch.num_rows
+        if fetched >= max_rows:
+            break
+
+    table = pa.Table.from_batches(batches, schema=reader.schema)
+    if table.num_rows > max_rows:
+        table = table.slice(0, max_rows)
+    return ColumnarRows(table)
+
+
+def rows_for_json(data: Optional[Sequence]) -> Optional[List[Dict[str, Any]]]:
+    """Plain list of row dicts for JSON encoders (no-op for lists)."""
+    if isinstance(data, ColumnarRows):
+        return data.to_pylist()
+    return data
+
+
+def json_default(obj):
+    """json.dumps default= hook that writes ColumnarRows as a list of dicts."""
+    if isinstance(obj, ColumnarRows):
+        return obj.to_pylist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def to_arrow_ipc(data: Optional[Sequence],
+                 columns: Optional[List[str]] = None,
+                 metadata: Optional[Dict[str, str]] = None) -> bytes:
+    """
+    Arrow IPC stream for result rows.
+
+    Arrow-backed rows are written as-is; row dicts are converted first.
+
+    Args:
+        data: ColumnarRows or list of row dicts
+        columns: Column names (used when there are no rows)
+        metadata: Optional key/value pairs stored in the schema metadata
+    """
+    if isinstance(data, ColumnarRows):
+        table = data.table
+    elif data:
+        table = pa.Table.from_pylist(list(data))
+    else:
+        table = pa.table({name: pa.array([], type=pa.null()) for name in (columns or [])})
+
+    if metadata:
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), **metadata})
+    return ColumnarRows(table).to_ipc_bytes()
@@ -103,8 +103,9 @@ class ContextBuilder:
         Returns:
             LLMContext ready for LLM
         """
-        # Build system prompt with clinical rules
-        system_prompt = self._build_system_prompt(
+        # Static system prompt (the cacheable prefix), then its per-query rules
+        system_prompt = self._build_system_prompt(table_resolution)
+        system_rules = self._build_system_rules(
             table_resolution,
             accumulated_filters=accumulated_filters if preserve_filters else None
         )
@@ -115,9 +116,6 @@ class ContextBuilder:
             include_full_schema
         )
 
-        # Build entity context
-        entity_context = self._build_entity_context(entities)
-
         # Build clinical rules context
         clinical_rules = self._build_clinical_rules(table_resolution)
 
@@ -125,6 +123,9 @@ class ContextBuilder:
         if preserve_filters and accumulated_filters:
             clinical_rules += self._build_refinement_context(accumulated_filters)
 
+        # Build entity context
+        entity_context = self._build_entity_context(entities)
+
         # Build user prompt
         user_prompt = self._build_user_prompt(
             query,
@@ -134,49 +135,26 @@ class ContextBuilder:
         )
 
         # Estimate token count (rough: 4 chars per token)
-        total_text = system_prompt + schema_context + entity_context + clinical_rules + user_prompt
+        total_text = system_prompt + system_rules + schema_context + clinical_rules + entity_context + user_prompt
         token_estimate = len(total_text) // 4
 
         return LLMContext(
             system_prompt=system_prompt,
-            user_prompt=user_prompt,
             schema_context=schema_context,
-            entity_context=entity_context,
             clinical_rules=clinical_rules,
-            token_count_estimate=token_estimate
+            entity_context=entity_context,
+            user_prompt=user_prompt,
+            token_count_estimate=token_estimate,
+            system_rules=system_rules
         )
 
-    def _build_system_prompt(self,
-                             table_resolution: TableResolution,
-                             accumulated_filters: Optional[str] = None
-                            ) -> str:
-        """Build the system prompt - LLM-first approach."""
-
-        # Get grade column for emphasis
-        grade_col = table_resolution.get_grade_column()
-        grade_note = ""
-        if grade_col:
-            grade_note = f"\n- For toxicity/grade queries, use {grade_col}"
-
-        # Add accumulated filters for refinement queries
-        refinement_rule = ""
-        if accumulated_filters:
-            # Check if there are cross-table filters (ADSL columns used with ADAE query)
-            ADSL_COLUMNS = {'ITTFL', 'SAFFL', 'EFFFL', 'PPROTFL', 'AGE', 'SEX', 'RACE',
-                            'ETHNIC', 'ARM', 'TRT01A', 'ENRLFL', 'RANDFL', 'DTHFL'}
-            has_adsl_filter = any(col in accumulated_filters.upper() for col in ADSL_COLUMNS)
-
-            cross_table_note = ""
-            if has_adsl_filter:
-                cross_table_note = """
-IMPORTANT: Population filters (SAFFL, ITTFL, etc.) are in ADSL, not ADAE.
-For ADAE queries, use: USUBJID IN (SELECT USUBJID FROM ADSL WHERE <filter>)"""
-
-            refinement_rule = f"""
-
-FOLLOW-UP QUERY:
-This refines previous results. Include these filters: {accumulated_filters}{cross_table_note}"""
+    def _build_system_prompt(self, table_resolution: TableResolution) -> str:
+        """
+        Build the system prompt - LLM-first approach.
 
+        Contains no per-query text (see _build_system_rules) so it can be
+        cached as a prompt prefix.
+        """
         # Get available tables for context
         available = ", ".join(table_resolution.available_tables) if table_resolution.available_tables else "ADSL, ADAE"
 
@@ -204,7 +182,7 @@ CRITICAL RULES:
 - Use ATOXGR for toxicity grades - NOTE: it's VARCHAR with '.' for missing values
   Use: ATOXGR != '.' AND CAST(ATOXGR AS INTEGER) >= 3 for Grade 3+
 - Use COUNT(DISTINCT USUBJID) when counting patients/subjects
-- Use COUNT(*) when counting events/records{grade_note}
+- Use COUNT(*) when counting events/records
 
 CRITICAL - TERM HANDLING:
 - Use the EXACT adverse event terms provided in the TERMS section below
@@ -212,10 +190,48 @@ CRITICAL - TERM HANDLING:
 - For colloquial terms, use the medical term mapping provided (e.g., "belly pain"→"ABDOMINAL PAIN")
 - If no mapping is provided, use the exact term from the query
 - DO NOT add additional synonyms or related terms beyond what is explicitly mapped
-{CRITICAL_SYNONYM_HINTS}{refinement_rule}
+{CRITICAL_SYNONYM_HINTS}
 
 Output SQL in ```sql block."""
 
+    def _build_system_rules(self,
+                            table_resolution: TableResolution,
+                            accumulated_filters: Optional[str] = None
+                           ) -> str:
+        """
+        Build the per-query part of the system prompt: the grade column note
+        and the follow-up filters, appended after the static prompt.
+        """
+        # Get grade column for emphasis
+        grade_col = table_resolution.get_grade_column()
+        grade_note = ""
+        if grade_col:
+            grade_note = f"\n- For toxicity/grade queries, use {grade_col}"
+
+        # Add accumulated filters for refinement queries
+        refinement_rule = ""
+        if accumulated_filters:
+            # Check if there are cross-table filters (ADSL columns used with ADAE query)
+            ADSL_COLUMNS = {'ITTFL', 'SAFFL', 'EFFFL', 'PPROTFL', 'AGE', 'SEX', 'RACE',
+                            'ETHNIC', 'ARM', 'TRT01A', 'ENRLFL', 'RANDFL', 'DTHFL'}
+            has_adsl_filter = any(col in accumulated_filters.upper() for col in ADSL_COLUMNS)
+
+            cross_table_note = ""
+            if has_adsl_filter:
+                cross_table_note = """
+IMPORTANT: Population filters (SAFFL, ITTFL, etc.) are in ADSL, not ADAE.
+For ADAE queries, use: USUBJID IN (SELECT USUBJID FROM ADSL WHERE <filter>)"""
+
+            refinement_rule = f"""
+
+FOLLOW-UP QUERY:
+This refines previous results. Include these filters: {accumulated_filters}{cross_table_note}"""
+
+        if not grade_note and not refinement_rule:
+            return ""
+        rules = f"\n\nQUERY RULES:{grade_note}" if grade_note else ""
+        return rules + refinement_rule
+
     def _build_schema_context(self,
                               table_resolution: TableResolution,
                               include_full: bool = False
@@ -495,9 +511,8 @@ WHERE USUBJID IN (SELECT USUBJID FROM ADSL WHERE SAFFL = 'Y')
             return None
 
         try:
-            import duckdb
-            conn = duckdb.connect(self.db_path, read_only=True)
-            try:
+            from core.data.connection_manager import get_connection_manager
+            with get_connection_manager(self.db_path).read() as conn:
                 # Get columns (table_name validated above)
                 columns = conn.execute(f"""
                     SELECT column_name, data_type
@@ -516,8 +531,6 @@ WHERE USUBJID IN (SELECT USUBJID FROM ADSL WHERE SAFFL = 'Y')
                 )
                 self._schema_cache[table_name] = schema
                 return schema
-            finally:
-                conn.close()
         except Exception as e:
             logger.error(f"Could not get schema for {table_name}: {e}")
             return None
@@ -18,6 +18,9 @@ from typing import List, Dict, Optional, Any, Tuple
 from datetime import datetime
 import re
 
+from core.data.table_profiler import TableProfiler, ColumnProfile
+from core.data.duckdb_loader import is_internal_table
+
 from .sql_security import validate_table_name, validate_column_name, SQLSecurityError
 
 logger = logging.getLogger(__name__)
@@ -211,19 +214,23 @@ class DataKnowledgeLearner:
             db_path: Path to DuckDB database
         """
         self.db_path = db_path
-        self._conn = None
 
-    def _get_connection(self):
-        """Get database connection."""
-        if self._conn is None:
-            import duckdb
-            self._conn = duckdb.connect(self.db_path, read_only=True)
-        return self._conn
+    def _read(self):
+        """
+        Read on this thread's cursor of the shared database handle.
+
+        Taken per operation, never kept: upgrading the handle for writing
+        closes every cursor.
+        """
+        from core.data.connection_manager import get_connection_manager
+        return get_connection_manager(self.db_path).read()
 
     def learn(self) -> DataKnowledge:
         """
         Learn knowledge from the database.
 
+        Each table is profiled in a single scan, several tables at a time.
+
         Returns:
             DataKnowledge populated from data
         """
@@ -231,20 +238,12 @@ class DataKnowledgeLearner:
         knowledge = DataKnowledge()
 
         try:
-            conn = self._get_connection()
-
-            # Get all tables
-            tables = self._get_tables(conn)
-
-            for table in tables:
-                # Get columns for this table
-                columns = self._get_columns(conn, table)
+            # Get all tables and their columns
+            with self._read() as conn:
+                tables = self._get_tables(conn)
+                columns = {table: self._get_columns(conn, table) for table in tables}
 
-                for column in columns:
-                    # Learn about this column
-                    col_knowledge = self._learn_column(conn, table, column)
-                    if col_knowledge:
-                        knowledge.add_column_knowledge(table, column, col_knowledge)
+            self._learn_columns(knowledge, columns)
 
             # Discover patterns
             patterns = self._discover_patterns(knowledge)
@@ -263,20 +262,20 @@ class DataKnowledgeLearner:
         return knowledge
 
     def _get_tables(self, conn) -> List[str]:
-        """Get list of tables."""
+        """Get list of tables (the loader's internal tables excluded)."""
         try:
             result = conn.execute("""
                 SELECT table_name FROM information_schema.tables
                 WHERE table_schema = 'main'
                   AND table_type = 'BASE TABLE'
             """).fetchall()
-            return [row[0] for row in result]
+            return [row[0] for row in result if not is_internal_table(row[0])]
         except Exception as e:
             # Fallback for DuckDB
             logger.debug(f"information_schema query failed, using SHOW TABLES: {e}")
             try:
                 result = conn.execute("SHOW TABLES").fetchall()
-                return [row[0] for row in result]
+                return [row[0] for row in result if not is_internal_table(row[0])]
             except Exception as e2:
                 logger.warning(f"Failed to get tables: {e2}")
                 return []
@@ -305,70 +304,61 @@ class DataKnowledgeLearner:
                 logger.warning(f"Failed to get columns for {table}: {e2}")
                 return []
 
-    def _learn_column(
+    def _learn_columns(
         self,
-        conn,
-        table: str,
-        column: str
-    ) -> Optional[ColumnKnowledge]:
-        """Learn about a specific column."""
-        # Validate table and column names to prevent SQL injection
-        if not validate_table_name(table):
-            logger.warning(f"Invalid table name rejected in _learn_column: {table}")
-            return None
-        if not validate_column_name(column):
-            logger.warning(f"Invalid column name rejected in _learn_column: {column}")
-            return None
-
-        try:
-            # Get data type (table/column validated above)
-            type_result = conn.execute(f"""
-                SELECT data_type FROM information_schema.columns
-                WHERE table_name = '{table}' AND column_name = '{column}'
-            """).fetchone()
-            data_type = type_result[0] if type_result else "unknown"
-
-            # Get distinct count and sample values (table/column validated)
-            result = conn.execute(f"""
-                SELECT
-                    COUNT(DISTINCT "{column}") as distinct_count,
-                    COUNT(*) FILTER (WHERE "{column}" IS NULL) as null_count,
-                    COUNT(*) as total_count
-                FROM {table}
-            """).fetchone()
-
-            distinct_count = result[0] if result else 0
-            null_count = result[1] if result else 0
-            total_count = result[2] if result else 1
-            null_percentage = (null_count / total_count * 100) if total_count > 0 else 0
-
-            # Get sample values (most common) - table/column validated
-            sample_result = conn.execute(f"""
-                SELECT "{column}", COUNT(*) as freq
-                FROM {table}
-                WHERE "{column}" IS NOT NULL
-                GROUP BY "{column}"
-                ORDER BY freq DESC
-                LIMIT {self.MAX_SAMPLE_VALUES}
-            """).fetchall()
-
-            sample_values = [str(row[0]) for row in sample_result if row[0] is not None]
-            value_frequencies = {str(row[0]): row[1] for row in sample_result if row[0] is not None}
-
-            return ColumnKnowledge(
-                table=table,
-                column=column,
-                data_type=data_type,
-                distinct_count=distinct_count,
-                sample_values=sample_values,
-                value_frequencies=value_frequencies,
-                has_nulls=null_count > 0,
-                null_percentage=null_percentage
-            )
+        knowledge: DataKnowledge,
+        columns: Dict[str, List[str]]
+    ) -> None:
+        """
+        Learn about columns of several tables, one profiling scan per table.
 
-        except Exception as e:
-            logger.warning(f"Error learning column {table}.{column}: {e}")
-            return None
+        Args:
+            knowledge: Knowledge store to add to
+            columns: {table: columns to learn}; unknown columns are skipped
+        """
+        wanted: Dict[str, List[str]] = {}
+        for table, table_columns in columns.items():
+            # Validate table and column names to prevent SQL injection
+            if not validate_table_name(table):
+                logger.warning(f"Invalid table name rejected in _learn_columns: {table}")
+                continue
+            valid = [c for c in table_columns if validate_column_name(c)]
+            if len(valid) < len(table_columns):
+                logger.warning(f"Invalid column names rejected in _learn_columns: {table}")
+            if valid:
+                wanted[table] = valid
+
+        if not wanted:
+            return
+
+        profiler = TableProfiler(self.db_path, top_k=self.MAX_SAMPLE_VALUES)
+        profiles = profiler.profile_tables(wanted)
+
+        for table, table_columns in wanted.items():
+            by_upper = {name.upper(): profile for name, profile in profiles.get(table, {}).items()}
+            for column in table_columns:
+                profile = by_upper.get(column.upper())
+                if profile is not None:
+                    knowledge.add_column_knowledge(
+                        table, column, self._column_knowledge(table, column, profile)
+                    )
+
+    @staticmethod
+    def _column_knowledge(table: str, column: str, profile: ColumnProfile) -> ColumnKnowledge:
+        """ColumnKnowledge from a column profile."""
+        total_count = profile.total_rows
+        null_percentage = (profile.null_count / total_count * 100) if total_count > 0 else 0
+
+        return ColumnKnowledge(
+            table=table,
+            column=column,
+            data_type=profile.data_type,
+            distinct_count=profile.distinct_count,
+            sample_values=[value for value, _ in profile.top_values],
+            value_frequencies=dict(profile.top_values),
+            has_nulls=profile.null_count > 0,
+            null_percentage=null_percentage
+        )
 
     def _discover_patterns(self, knowledge: DataKnowledge) -> List[PatternKnowledge]:
         """Discover patterns in the knowledge."""
@@ -424,28 +414,13 @@ class DataKnowledgeLearner:
         knowledge = DataKnowledge()
 
         try:
-            conn = self._get_connection()
-
-            for table in tables:
-                # Validate table name before SQL use
-                if not validate_table_name(table):
-                    logger.debug(f"Skipping invalid table name in quick_learn: {table}")
-                    continue
-
-                # Check if table exists
-                try:
-                    conn.execute(f"SELECT 1 FROM {table} LIMIT 1")
-                except Exception:
-                    continue
+            with self._read() as conn:
+                existing = {t.upper() for t in self._get_tables(conn)}
 
-                # Learn priority columns
-                for column in self.PRIORITY_COLUMNS:
-                    try:
-                        col_knowledge = self._learn_column(conn, table, column)
-                        if col_knowledge:
-                            knowledge.add_column_knowledge(table, column, col_knowledge)
-                    except Exception:
-                        pass
+            # Learn priority columns of the tables that exist
+            self._learn_columns(knowledge, {
+                table: self.PRIORITY_COLUMNS for table in tables if table.upper() in existing
+            })
 
             knowledge.learned_at = datetime.now()
 
@@ -455,10 +430,7 @@ class DataKnowledgeLearner:
         return knowledge
 
     def close(self):
-        """Close database connection."""
-        if self._conn:
-            self._conn.close()
-            self._conn = None
+        """Nothing to release: cursors are taken per operation (the shared handle stays open)."""
 
 
 # =============================================================================
@@ -129,9 +129,8 @@ class EntityExtractor:
         # Extract candidate terms
         candidates = self._extract_candidates(query)
 
-        # Resolve each candidate
-        for term in candidates:
-            match = self._resolve_term(term)
+        # Resolve all candidates in one batch
+        for term, match in zip(candidates, self.resolve_many(candidates)):
             if match:
                 entities.append(match)
             else:
@@ -306,6 +305,46 @@ class EntityExtractor:
 
         return None
 
+    def resolve_many(self, terms: List[str]) -> List[Optional[EntityMatch]]:
+        """
+        Resolve several terms with the same priority order as _resolve_term.
+
+        Each step runs once for all terms still unresolved: FuzzyMatcher
+        scores them in a single match_many() pass, and MedDRA exact names
+        come from one IN (...) query. Only terms without an exact MedDRA
+        name fall back to the per-term MedDRA search.
+
+        Args:
+            terms: Terms to resolve
+
+        Returns:
+            EntityMatch (or None) for each term, in order
+        """
+        # Step 1: Medical synonyms
+        matches = [self._try_medical_synonyms(term) for term in terms]
+
+        # Step 2: FuzzyMatcher (data-driven)
+        pending = [i for i, match in enumerate(matches) if match is None]
+        if self.fuzzy_matcher and pending:
+            fuzzy_matches = self._try_fuzzy_many([terms[i] for i in pending])
+            for i, match in zip(pending, fuzzy_matches):
+                matches[i] = match
+
+        # Step 3: MedDRA, validated against the original term
+        pending = [i for i, match in enumerate(matches) if match is None]
+        if self.meddra_lookup and pending:
+            meddra_matches = self._try_meddra_many([terms[i] for i in pending])
+            for i, match in zip(pending, meddra_matches):
+                if match and self._validate_meddra_match(terms[i], match):
+                    matches[i] = match
+
+        # Step 4: Typo dictionary
+        for i, match in enumerate(matches):
+            if match is None:
+                matches[i] = self._try_typo_dictionary(terms[i])
+
+        return matches
+
     def _try_medical_synonyms(self, term: str) -> Optional[EntityMatch]:
         """
         Try to resolve term via medical synonyms dictionary.
@@ -419,21 +458,7 @@ class EntityExtractor:
             # SearchResult has: term (MedDRATerm), match_score, hierarchy
             results = self.meddra_lookup.search(term, limit=1)
             if results and len(results) > 0:
-                result = results[0]
-                # match_score is 0-100
-                confidence = result.match_score
-
-                if confidence >= self.min_confidence:
-                    return EntityMatch(
-                        original_term=term,
-                        matched_term=result.term.name,
-                        match_type="meddra",
-                        confidence=confidence,
-                        table="ADAE",
-                        column="AEDECOD",
-                        meddra_code=str(result.term.code),
-                        meddra_level=result.term.level
-                    )
+                return self._meddra_entity(term, results[0])
         except Exception as e:
             logger.warning(f"MedDRA lookup failed for '{term}': {e}")
 
@@ -450,24 +475,73 @@ class EntityExtractor:
             # FuzzyMatch has: value, score, table, column, match_type, original_query
             results = self.fuzzy_matcher.match(term, threshold=self.min_confidence, limit=1)
             if results and len(results) > 0:
-                result = results[0]
-                # FuzzyMatch is an object, not a dict
-                confidence = result.score
-
-                if confidence >= self.min_confidence:
-                    return EntityMatch(
-                        original_term=term,
-                        matched_term=result.value,
-                        match_type=result.match_type,
-                        confidence=confidence,
-                        table=result.table,
-                        column=result.column
-                    )
+                return self._fuzzy_entity(term, results[0])
         except Exception as e:
             logger.warning(f"Fuzzy match failed for '{term}': {e}")
 
         return None
 
+    def _try_meddra_many(self, terms: List[str]) -> List[Optional[EntityMatch]]:
+        """Resolve terms via MedDRA, batching the exact-name lookups."""
+        try:
+            exact = self.meddra_lookup.search_exact_many(terms)
+        except Exception as e:
+            logger.warning(f"Batched MedDRA lookup failed, searching terms one at a time: {e}")
+            exact = {}
+
+        matches = []
+        for term in terms:
+            result = exact.get(term.strip().upper())
+            matches.append(self._meddra_entity(term, result) if result else self._try_meddra(term))
+        return matches
+
+    def _try_fuzzy_many(self, terms: List[str]) -> List[Optional[EntityMatch]]:
+        """Resolve terms via one batched fuzzy matcher pass."""
+        try:
+            results = self.fuzzy_matcher.match_many(terms, threshold=self.min_confidence, limit=1)
+        except Exception as e:
+            logger.warning(f"Batched fuzzy match failed, matching terms one at a time: {e}")
+            return [self._try_fuzzy(term) for term in terms]
+
+        return [
+            self._fuzzy_entity(term, found[0]) if found else None
+            for term, found in zip(terms, results)
+        ]
+
+    def _meddra_entity(self, term: str, result) -> Optional[EntityMatch]:
+        """EntityMatch for a MedDRA SearchResult above min_confidence."""
+        # match_score is 0-100
+        confidence = result.match_score
+
+        if confidence >= self.min_confidence:
+            return EntityMatch(
+                original_term=term,
+                matched_term=result.term.name,
+                match_type="meddra",
+                confidence=confidence,
+                table="ADAE",
+                column="AEDECOD",
+                meddra_code=str(result.term.code),
+                meddra_level=result.term.level
+            )
+        return None
+
+    def _fuzzy_entity(self, term: str, result) -> Optional[EntityMatch]:
+        """EntityMatch for a FuzzyMatch above min_confidence."""
+        # FuzzyMatch is an object, not a dict
+        confidence = result.score
+
+        if confidence >= self.min_confidence:
+            return EntityMatch(
+                original_term=term,
+                matched_term=result.value,
+                match_type=result.match_type,
+                confidence=confidence,
+                table=result.table,
+                column=result.column
+            )
+        return None
+
     def _build_resolved_query(self, query: str, entities: List[EntityMatch]) -> str:
         """Build query with resolved entities noted."""
         resolved = query
@@ -517,6 +591,10 @@ class SimpleEntityExtractor(EntityExtractor):
         """Initialize simple extractor."""
         super().__init__(None, None, min_confidence)
 
+    def resolve_many(self, terms: List[str]) -> List[Optional[EntityMatch]]:
+        """Resolve terms one at a time against the built-in dictionary."""
+        return [self._resolve_term(term) for term in terms]
+
     def _resolve_term(self, term: str) -> Optional[EntityMatch]:
         """Resolve term using built-in dictionary."""
         term_lower = term.lower()
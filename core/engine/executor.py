@@ -10,10 +10,14 @@ This is STEP 7 of the 9-step pipeline.
 
 import time
 import logging
+import threading
+from contextlib import closing
 from typing import Optional, List, Dict, Any
 from dataclasses import dataclass
 
-from .models import ExecutionResult
+from .models import ExecutionResult, ExecutionErrorCode
+from .columnar import ARROW_AVAILABLE, fetch_columnar
+from core.data.connection_manager import DuckDBConnectionManager, get_connection_manager
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +25,7 @@ logger = logging.getLogger(__name__)
 @dataclass
 class ExecutorConfig:
     """Configuration for SQL executor."""
-    # Timeout in seconds
+    # Statement deadline in seconds (0 = no deadline); enforced by interrupting DuckDB
     timeout_seconds: int = 30
 
     # Maximum rows to return
@@ -33,15 +37,19 @@ class ExecutorConfig:
     # Memory limit for DuckDB (in bytes, 0 = unlimited)
     memory_limit: int = 0
 
+    # Keep results as Arrow (ColumnarRows) instead of a list of dicts
+    columnar: bool = False
+
 
 class SQLExecutor:
     """
     Executes SQL queries against DuckDB.
 
     Features:
-    - Timeout enforcement
+    - Timeout enforcement (watchdog interrupts queries past the deadline)
     - Read-only mode
     - Result size limits
+    - Optional Arrow (columnar) results
     - Error handling
 
     Example:
@@ -56,7 +64,8 @@ class SQLExecutor:
     def __init__(self,
                  db_path: str,
                  config: Optional[ExecutorConfig] = None,
-                 connection=None):
+                 connection=None,
+                 connection_manager: Optional[DuckDBConnectionManager] = None):
         """
         Initialize executor.
 
@@ -64,10 +73,66 @@ class SQLExecutor:
             db_path: Path to DuckDB database
             config: Executor configuration
             connection: Optional shared DuckDB connection (avoids lock conflicts)
+            connection_manager: Optional shared connection manager (read per query)
         """
         self.db_path = db_path
         self.config = config or ExecutorConfig()
         self._shared_connection = connection  # Use shared connection if provided
+        self._connection_manager = connection_manager
+
+        self.columnar = self.config.columnar and ARROW_AVAILABLE
+        if self.config.columnar and not ARROW_AVAILABLE:
+            logger.warning("pyarrow not installed, columnar results disabled")
+
+    def _reader(self):
+        """
+        Context manager yielding a cursor for one query.
+
+        With a shared connection this is a fresh cursor closed afterwards;
+        otherwise it is this thread's cursor on the managed database handle
+        (the given manager, or its replacement once it was closed or its file
+        replaced).
+        """
+        if self._shared_connection is not None:
+            return closing(self._shared_connection.cursor())
+        manager = self._connection_manager
+        if manager is None:
+            return get_connection_manager(self.db_path, writable=not self.config.read_only).read()
+        if manager.closed or manager.is_stale():
+            manager = get_connection_manager(manager.db_path, writable=not self.config.read_only)
+            self._connection_manager = manager
+        return manager.read()
+
+    # Statement types a read-only executor will run
+    READ_ONLY_STATEMENTS = ('SELECT', 'EXPLAIN')
+
+    def _write_rejection(self, conn, sql: str) -> Optional[str]:
+        """
+        Why a read-only executor refuses this SQL, or None to run it.
+
+        The managed handle may already be writable for a loader in the same
+        process, so read-only is enforced per statement, not by the handle.
+        """
+        if not self.config.read_only:
+            return None
+        for statement in conn.extract_statements(sql):
+            kind = statement.type.name
+            if kind not in self.READ_ONLY_STATEMENTS:
+                return f"Read-only executor: {kind} statements are not allowed"
+        return None
+
+    def _rejected(self, message: str, sql: str, start_time: float) -> ExecutionResult:
+        """ExecutionResult for SQL refused by a read-only executor."""
+        logger.warning(f"{message}: {sql[:200]}")
+        return ExecutionResult(
+            success=False,
+            data=None,
+            row_count=0,
+            execution_time_ms=(time.time() - start_time) * 1000,
+            error_message=message,
+            sql_executed=sql,
+            error_code=ExecutionErrorCode.ERROR
+        )
 
     def execute(self, sql: str) -> ExecutionResult:
         """
@@ -87,59 +152,104 @@ class SQLExecutor:
                 data=None,
                 row_count=0,
                 execution_time_ms=0,
-                error_message="Empty SQL query"
+                error_message="Empty SQL query",
+                error_code=ExecutionErrorCode.EMPTY_QUERY
             )
 
+        watchdog = None
+        timed_out = threading.Event()
+
         try:
             import duckdb
 
-            # Use shared connection if provided, otherwise create new one
-            if self._shared_connection is not None:
-                conn = self._shared_connection
-                own_connection = False
-            else:
-                conn = duckdb.connect(
-                    self.db_path,
-                    read_only=self.config.read_only
-                )
-                own_connection = True
-
-            try:
-                # Set memory limit if specified (validated to be numeric)
-                if self.config.memory_limit > 0:
-                    # Ensure memory_limit is a valid integer to prevent injection
-                    safe_limit = int(self.config.memory_limit)
-                    conn.execute(f"SET memory_limit='{safe_limit}'")
-
-                # Execute query
-                result = conn.execute(sql)
-
-                # Fetch results
-                columns = [desc[0] for desc in result.description]
-                rows = result.fetchmany(self.config.max_rows)
-
-                # Convert to list of dicts
-                data = [dict(zip(columns, row)) for row in rows]
-
-                execution_time = (time.time() - start_time) * 1000
-
-                # Check if there are more rows
-                truncated = len(rows) >= self.config.max_rows
+            # A cursor private to this call (shared connection) or this
+            # thread (managed handle), so an interrupt only cancels this query
+            with self._reader() as conn:
+                rejection = self._write_rejection(conn, sql)
+                if rejection:
+                    return self._rejected(rejection, sql, start_time)
+
+                try:
+                    # Set memory limit if specified (validated to be numeric)
+                    if self.config.memory_limit > 0:
+                        # Ensure memory_limit is a valid integer to prevent injection
+                        safe_limit = int(self.config.memory_limit)
+                        conn.execute(f"SET memory_limit='{safe_limit}'")
+
+                    # Arm the watchdog: interrupt the statement at the deadline
+                    if self.config.timeout_seconds > 0:
+                        watchdog = threading.Timer(
+                            self.config.timeout_seconds,
+                            self._interrupt,
+                            args=(conn, timed_out)
+                        )
+                        watchdog.daemon = True
+                        watchdog.start()
+
+                    # Execute query
+                    result = conn.execute(sql)
+
+                    # Fetch results
+                    columns = [desc[0] for desc in result.description]
+                    if self.columnar:
+                        # Arrow record batches, no per-row Python objects
+                        data = fetch_columnar(result, self.config.max_rows)
+                    else:
+                        rows = result.fetchmany(self.config.max_rows)
+
+                        # Convert to list of dicts
+                        data = [dict(zip(columns, row)) for row in rows]
+
+                    execution_time = (time.time() - start_time) * 1000
+
+                    # Check if there are more rows
+                    truncated = len(data) >= self.config.max_rows
+
+                    return ExecutionResult(
+                        success=True,
+                        data=data,
+                        columns=columns,
+                        row_count=len(data),
+                        execution_time_ms=execution_time,
+                        truncated=truncated,
+                        sql_executed=sql
+                    )
+
+                finally:
+                    if watchdog is not None:
+                        watchdog.cancel()
+
+        except duckdb.InterruptException as e:
+            execution_time = (time.time() - start_time) * 1000
 
+            if not timed_out.is_set():
+                # Interrupted by something other than our watchdog
+                logger.error(f"SQL execution interrupted: {e}")
                 return ExecutionResult(
-                    success=True,
-                    data=data,
-                    columns=columns,
-                    row_count=len(data),
+                    success=False,
+                    data=None,
+                    row_count=0,
                     execution_time_ms=execution_time,
-                    truncated=truncated,
-                    sql_executed=sql
+                    error_message=f"Query interrupted: {e}",
+                    sql_executed=sql,
+                    error_code=ExecutionErrorCode.ERROR
                 )
 
-            finally:
-                # Only close connection if we created it
-                if own_connection:
-                    conn.close()
+            logger.warning(
+                f"SQL timed out after {self.config.timeout_seconds}s and was cancelled: {sql[:200]}"
+            )
+            return ExecutionResult(
+                success=False,
+                data=None,
+                row_count=0,
+                execution_time_ms=execution_time,
+                error_message=(
+                    f"Query timed out: exceeded the {self.config.timeout_seconds}s "
+                    f"time limit and was cancelled"
+                ),
+                sql_executed=sql,
+                error_code=ExecutionErrorCode.TIMEOUT
+            )
 
         except duckdb.CatalogException as e:
             # Table or column not found
@@ -160,7 +270,8 @@ class SQLExecutor:
                 row_count=0,
                 execution_time_ms=execution_time,
                 error_message=error_msg,
-                sql_executed=sql
+                sql_executed=sql,
+                error_code=ExecutionErrorCode.CATALOG
             )
 
         except duckdb.ParserException as e:
@@ -174,7 +285,8 @@ class SQLExecutor:
                 row_count=0,
                 execution_time_ms=execution_time,
                 error_message=f"SQL syntax error: {e}",
-                sql_executed=sql
+                sql_executed=sql,
+                error_code=ExecutionErrorCode.SYNTAX
             )
 
         except duckdb.BinderException as e:
@@ -188,7 +300,8 @@ class SQLExecutor:
                 row_count=0,
                 execution_time_ms=execution_time,
                 error_message=f"Column reference error: {e}",
-                sql_executed=sql
+                sql_executed=sql,
+                error_code=ExecutionErrorCode.BINDER
             )
 
         except Exception as e:
@@ -201,9 +314,19 @@ class SQLExecutor:
                 row_count=0,
                 execution_time_ms=execution_time,
                 error_message=str(e),
-                sql_executed=sql
+                sql_executed=sql,
+                error_code=ExecutionErrorCode.ERROR
             )
 
+    @staticmethod
+    def _interrupt(conn, timed_out: threading.Event):
+        """Watchdog callback: flag the timeout and cancel the running statement."""
+        timed_out.set()
+        try:
+            conn.interrupt()
+        except Exception as e:
+            logger.warning(f"Could not interrupt timed-out query: {e}")
+
     def execute_with_params(self,
                             sql: str,
                             params: Dict[str, Any]
@@ -221,34 +344,31 @@ class SQLExecutor:
         start_time = time.time()
 
         try:
-            import duckdb
+            with self._reader() as conn:
+                rejection = self._write_rejection(conn, sql)
+                if rejection:
+                    return self._rejected(rejection, sql, start_time)
 
-            conn = duckdb.connect(
-                self.db_path,
-                read_only=self.config.read_only
-            )
-
-            try:
                 # Execute with parameters
                 result = conn.execute(sql, params)
 
                 columns = [desc[0] for desc in result.description]
-                rows = result.fetchmany(self.config.max_rows)
-                data = [dict(zip(columns, row)) for row in rows]
-
-                execution_time = (time.time() - start_time) * 1000
+                if self.columnar:
+                    data = fetch_columnar(result, self.config.max_rows)
+                else:
+                    rows = result.fetchmany(self.config.max_rows)
+                    data = [dict(zip(columns, row)) for row in rows]
 
-                return ExecutionResult(
-                    success=True,
-                    data=data,
-                    columns=columns,
-                    row_count=len(data),
-                    execution_time_ms=execution_time,
-                    sql_executed=sql
-                )
+            execution_time = (time.time() - start_time) * 1000
 
-            finally:
-                conn.close()
+            return ExecutionResult(
+                success=True,
+                data=data,
+                columns=columns,
+                row_count=len(data),
+                execution_time_ms=execution_time,
+                sql_executed=sql
+            )
 
         except Exception as e:
             execution_time = (time.time() - start_time) * 1000
@@ -260,16 +380,14 @@ class SQLExecutor:
                 row_count=0,
                 execution_time_ms=execution_time,
                 error_message=str(e),
-                sql_executed=sql
+                sql_executed=sql,
+                error_code=ExecutionErrorCode.ERROR
             )
 
     def get_tables(self) -> List[str]:
         """Get list of available tables."""
         try:
-            import duckdb
-
-            conn = duckdb.connect(self.db_path, read_only=True)
-            try:
+            with self._reader() as conn:
                 result = conn.execute("""
                     SELECT table_name
                     FROM information_schema.tables
@@ -277,8 +395,6 @@ class SQLExecutor:
                     ORDER BY table_name
                 """)
                 return [row[0] for row in result.fetchall()]
-            finally:
-                conn.close()
         except Exception as e:
             logger.error(f"Error getting tables: {e}")
             return []
@@ -292,10 +408,7 @@ class SQLExecutor:
             return []
 
         try:
-            import duckdb
-
-            conn = duckdb.connect(self.db_path, read_only=True)
-            try:
+            with self._reader() as conn:
                 # Table name validated above
                 result = conn.execute(f"""
                     SELECT column_name, data_type
@@ -307,8 +420,6 @@ class SQLExecutor:
                     {'name': row[0], 'type': row[1]}
                     for row in result.fetchall()
                 ]
-            finally:
-                conn.close()
         except Exception as e:
             logger.error(f"Error getting columns for {table_name}: {e}")
             return []
@@ -322,15 +433,10 @@ class SQLExecutor:
             return 0
 
         try:
-            import duckdb
-
-            conn = duckdb.connect(self.db_path, read_only=True)
-            try:
+            with self._reader() as conn:
                 # Table name validated above
                 result = conn.execute(f"SELECT COUNT(*) FROM {table_name}")
                 return result.fetchone()[0]
-            finally:
-                conn.close()
         except Exception as e:
             logger.error(f"Error getting row count for {table_name}: {e}")
             return 0
@@ -338,10 +444,8 @@ class SQLExecutor:
     def validate_connection(self) -> bool:
         """Validate database connection."""
         try:
-            import duckdb
-
-            conn = duckdb.connect(self.db_path, read_only=True)
-            conn.close()
+            with self._reader() as conn:
+                conn.execute("SELECT 1").fetchone()
             return True
         except Exception as e:
             logger.error(f"Database connection failed: {e}")
@@ -0,0 +1,421 @@
+# SAGE - Local Intent Classifier
+# ==============================
+"""
+Local Intent Classifier
+=======================
+In-process classifier for Step 0 intent routing (CLINICAL_DATA, GREETING,
+HELP, IDENTITY, FAREWELL, STATUS, GENERAL).
+
+Every query used to pay an LLM round trip just to pick one of these labels.
+This module answers the common cases locally and only defers to the LLM
+when it is unsure:
+
+- TF-IDF nearest-neighbour model over word unigrams and bigrams: a label
+  scores its most similar training example
+- Trained from the golden question suite plus conversational examples
+- Non-clinical labels (canned answers) need a near-verbatim training phrase;
+  anything looser goes to the LLM
+- Follow-up references ("them", "of those") are always CLINICAL_DATA, as in
+  the LLM prompt; clinical vocabulary is strong CLINICAL_DATA evidence and
+  disagreement with the model lowers confidence
+- Confidence below the threshold means "ask the LLM"
+
+Pure Python, no model files: training on the golden suite and built-in
+examples takes a few milliseconds at pipeline start-up.
+"""
+
+import json
+import math
+import re
+import logging
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Any, FrozenSet
+
+logger = logging.getLogger(__name__)
+
+
+INTENT_LABELS = ['CLINICAL_DATA', 'GREETING', 'HELP', 'IDENTITY', 'FAREWELL', 'STATUS', 'GENERAL']
+
+
+# =============================================================================
+# TRAINING DATA
+# =============================================================================
+# CLINICAL_DATA examples are the golden suite questions, including the
+# conversational flow follow-ups; the other labels follow the definitions in
+# INTENT_CLASSIFICATION_PROMPT.
+
+GOLDEN_QUESTIONS_PATH = Path(__file__).parent.parent.parent / 'knowledge' / 'golden_suite' / 'questions.json'
+
+CONVERSATIONAL_EXAMPLES: Dict[str, List[str]] = {
+    'GREETING': [
+        "Hi",
+        "Hello",
+        "Hey",
+        "Hey there",
+        "Hello SAGE",
+        "Good morning",
+        "Good afternoon",
+        "Good evening",
+        "Hi there, how are you?",
+        "Howdy",
+    ],
+    'HELP': [
+        "What can you help me with?",
+        "What can you do?",
+        "Help",
+        "I need help",
+        "How do I use this?",
+        "How does this work?",
+        "What kind of questions can I ask?",
+        "Show me some example questions",
+        "What are your capabilities?",
+        "How should I phrase my questions?",
+    ],
+    'IDENTITY': [
+        "Who are you?",
+        "What are you?",
+        "What is SAGE?",
+        "What model are you?",
+        "Which AI model do you use?",
+        "Are you ChatGPT?",
+        "Are you Claude?",
+        "Who made you?",
+        "Who built this system?",
+        "What LLM powers you?",
+    ],
+    'FAREWELL': [
+        "Thank you",
+        "Thanks",
+        "Thanks a lot",
+        "Thank you very much",
+        "Bye",
+        "Goodbye",
+        "See you later",
+        "That is all for today",
+        "Cheers, bye",
+        "Have a nice day",
+    ],
+    'STATUS': [
+        "Ping",
+        "Are you there?",
+        "Are you online?",
+        "Are you working?",
+        "Is the system up?",
+        "Status",
+        "System status",
+        "Are you alive?",
+        "Is anyone there?",
+        "Test",
+    ],
+    'GENERAL': [
+        "What is the weather like today?",
+        "Tell me a joke",
+        "What is the capital of France?",
+        "Write me a poem",
+        "What time is it?",
+        "Who won the football game?",
+        "What is the meaning of life?",
+        "Can you recommend a good book?",
+        "How do I cook pasta?",
+        "What is two plus two?",
+    ],
+}
+
+
+def load_training_examples(golden_path: Path = GOLDEN_QUESTIONS_PATH) -> Dict[str, List[str]]:
+    """
+    Training examples per intent: the golden suite questions as CLINICAL_DATA
+    plus CONVERSATIONAL_EXAMPLES.
+
+    Without the golden suite there are no CLINICAL_DATA examples, so clinical
+    questions are left to the LLM.
+    """
+    examples: Dict[str, List[str]] = {'CLINICAL_DATA': []}
+    try:
+        with open(golden_path, 'r', encoding='utf-8') as f:
+            examples['CLINICAL_DATA'] = [q['question'] for q in json.load(f) if q.get('question')]
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logger.warning(f"Golden questions not loaded from {golden_path}: {e}")
+    examples.update(CONVERSATIONAL_EXAMPLES)
+    return examples
+
+
+# Vocabulary that only makes sense for a clinical data question
+CLINICAL_TERMS = frozenset({
+    'patient', 'patients', 'subject', 'subjects', 'participant', 'participants',
+    'adverse', 'event', 'events', 'ae', 'aes', 'sae', 'saes', 'serious', 'grade',
+    'severity', 'severe', 'toxicity', 'population', 'safety', 'itt', 'efficacy',
+    'enrolled', 'randomized', 'treatment', 'placebo', 'arm', 'arms', 'dose',
+    'lab', 'labs', 'laboratory', 'vital', 'vitals', 'visit', 'visits', 'baseline',
+    'age', 'sex', 'male', 'female', 'race', 'ethnicity', 'demographics',
+    'headache', 'nausea', 'vomiting', 'diarrhea', 'fatigue', 'rash', 'death', 'deaths',
+    'adsl', 'adae', 'adlb', 'advs', 'meddra', 'soc',
+    'alt', 'ast', 'bilirubin', 'hemoglobin', 'blood', 'pressure', 'liver',
+})
+
+# Follow-up references to a previous result (always clinical per the LLM prompt)
+FOLLOW_UP_PATTERN = re.compile(r'\b(them|those|these)\b|\bwho are they\b|\bthe details\b', re.I)
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9+]+")
+
+# Function words shared by every intent; dropping them keeps "what is the ..."
+# from outweighing the content words
+_STOPWORDS = frozenset({'a', 'an', 'the', 'is', 'are', 'was', 'were', 'of', 'in', 'to', 'for', 'and', 'or'})
+
+
+# =============================================================================
+# DATA CLASSES
+# =============================================================================
+
+@dataclass
+class IntentPrediction:
+    """Result of a local intent classification."""
+    intent: str
+    confidence: float          # 0.0-1.0
+    confident: bool            # confidence >= threshold (no LLM fallback needed)
+    scores: Dict[str, float] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'intent': self.intent,
+            'confidence': round(self.confidence, 3),
+            'confident': self.confident,
+            'scores': {k: round(v, 3) for k, v in self.scores.items()},
+        }
+
+
+# =============================================================================
+# CLASSIFIER
+# =============================================================================
+
+class LocalIntentClassifier:
+    """
+    TF-IDF nearest-neighbour intent classifier with an LLM-fallback threshold.
+
+    Example:
+        classifier = LocalIntentClassifier(threshold=0.75)
+        prediction = classifier.classify("How many patients had nausea?")
+        if prediction.confident:
+            intent = prediction.intent
+        else:
+            intent = ask_llm(...)
+    """
+
+    def __init__(self,
+                 examples: Optional[Dict[str, List[str]]] = None,
+                 threshold: float = 0.75,
+                 min_similarity: float = 0.3,
+                 exact_match: float = 0.75):
+        """
+        Initialize and train the classifier.
+
+        Args:
+            examples: Training examples per intent (defaults to load_training_examples())
+            threshold: Minimum confidence to answer without the LLM
+            min_similarity: Best-example similarity below which confidence is scaled down
+            exact_match: Word overlap with a training phrase (cosine of word sets)
+                a non-clinical prediction needs to answer without the LLM
+        """
+        self.threshold = threshold
+        self.min_similarity = min_similarity
+        self.exact_match = exact_match
+        self._idf: Dict[str, float] = {}
+        self._vectors: Dict[str, List[Dict[str, float]]] = {}
+        self._phrases: Dict[str, List[FrozenSet[str]]] = {}
+        self._lock = threading.Lock()
+        self.stats = {
+            'predictions': 0,
+            'local': 0,
+            'fallbacks': 0,
+            'confidence_sum': 0.0,
+            'by_intent': Counter(),
+        }
+        self.fit(examples or load_training_examples())
+
+    # -------------------------------------------------------------------------
+    # Training
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def _words(text: str) -> List[str]:
+        """Lowercased words without stopwords."""
+        return [t for t in _TOKEN_PATTERN.findall(text.lower()) if t not in _STOPWORDS]
+
+    @classmethod
+    def _features(cls, text: str) -> List[str]:
+        """Word unigrams and bigrams of lowercased text (stopwords removed)."""
+        tokens = cls._words(text)
+        return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+    def _phrase_match(self, text: str, label: str) -> float:
+        """
+        Best word overlap (cosine of word sets) between text and a training
+        phrase of the label; words never seen in training count too.
+        """
+        words = set(self._words(text))
+        if not words:
+            return 0.0
+        return max(
+            (len(words & phrase) / math.sqrt(len(words) * len(phrase))
+             for phrase in self._phrases.get(label, []) if phrase),
+            default=0.0
+        )
+
+    def _vectorize(self, text: str) -> Dict[str, float]:
+        """L2-normalized TF-IDF vector (features unseen in training are dropped)."""
+        counts = Counter(f for f in self._features(text) if f in self._idf)
+        vector = {f: (1 + math.log(c)) * self._idf[f] for f, c in counts.items()}
+        norm = math.sqrt(sum(v * v for v in vector.values()))
+        if norm == 0:
+            return {}
+        return {f: v / norm for f, v in vector.items()}
+
+    def fit(self, examples: Dict[str, List[str]]) -> None:
+        """
+        Train on labelled examples (TF-IDF vectors per intent).
+
+        Args:
+            examples: Mapping of intent label to example queries
+        """
+        documents = [(label, text) for label, texts in examples.items() for text in texts]
+        doc_freq = Counter()
+        for _, text in documents:
+            doc_freq.update(set(self._features(text)))
+
+        n_docs = len(documents)
+        self._idf = {f: math.log((1 + n_docs) / (1 + df)) + 1 for f, df in doc_freq.items()}
+
+        # Nearest example rather than class centroid: the golden suite's many
+        # varied questions would otherwise dilute the CLINICAL_DATA centroid
+        # against the small conversational labels
+        self._vectors = {
+            label: [vector for vector in map(self._vectorize, texts) if vector]
+            for label, texts in examples.items()
+        }
+        self._phrases = {
+            label: [frozenset(self._words(text)) for text in texts]
+            for label, texts in examples.items()
+        }
+
+        logger.debug(f"Trained local intent classifier on {n_docs} examples, {len(self._idf)} features")
+
+    # -------------------------------------------------------------------------
+    # Prediction
+    # -------------------------------------------------------------------------
+
+    def predict(self, query: str) -> IntentPrediction:
+        """
+        Classify a query without updating metrics.
+
+        Args:
+            query: User's input query
+
+        Returns:
+            IntentPrediction with label, confidence and per-intent scores
+        """
+        vector = self._vectorize(query or "")
+        scores = {
+            label: max(
+                (sum(weight * example.get(f, 0.0) for f, weight in vector.items()) for example in examples),
+                default=0.0
+            )
+            for label, examples in self._vectors.items()
+        }
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        best_label, best = ranked[0] if ranked else ('CLINICAL_DATA', 0.0)
+        second = ranked[1][1] if len(ranked) > 1 else 0.0
+
+        if best <= 0:
+            confidence = 0.0
+        else:
+            # Margin over the runner-up, scaled down when nothing is very similar
+            confidence = ((best - second) / best) * min(1.0, best / self.min_similarity)
+
+        tokens = set(_TOKEN_PATTERN.findall((query or "").lower()))
+
+        if FOLLOW_UP_PATTERN.search(query or ""):
+            # References to earlier results are always data questions
+            if best_label != 'CLINICAL_DATA':
+                confidence = 0.0
+            best_label = 'CLINICAL_DATA'
+            confidence = max(confidence, 0.9)
+        elif tokens & CLINICAL_TERMS:
+            if best_label == 'CLINICAL_DATA' or best <= 0:
+                best_label = 'CLINICAL_DATA'
+                confidence = max(confidence, 0.9)
+            else:
+                # Conversational wording around clinical terms: let the LLM decide
+                confidence *= 0.5
+
+        confidence = max(0.0, min(1.0, confidence))
+        confident = confidence >= self.threshold
+
+        if best_label != 'CLINICAL_DATA' and confident:
+            # A canned answer to a data question is worse than an LLM call:
+            # only near-verbatim conversational phrases are answered locally
+            match = self._phrase_match(query or "", best_label)
+            if match < self.exact_match:
+                confidence = min(confidence, match)
+                confident = False
+
+        return IntentPrediction(
+            intent=best_label,
+            confidence=confidence,
+            confident=confident,
+            scores=scores
+        )
+
+    def classify(self, query: str) -> IntentPrediction:
+        """
+        Classify a query and record confidence / fallback metrics.
+
+        Args:
+            query: User's input query
+
+        Returns:
+            IntentPrediction (callers fall back to the LLM when not confident)
+        """
+        prediction = self.predict(query)
+        with self._lock:
+            self.stats['predictions'] += 1
+            self.stats['confidence_sum'] += prediction.confidence
+            if prediction.confident:
+                self.stats['local'] += 1
+                self.stats['by_intent'][prediction.intent] += 1
+            else:
+                self.stats['fallbacks'] += 1
+        return prediction
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get classifier metrics.
+
+        Returns:
+            Dictionary with prediction counts, fallback rate and average confidence
+        """
+        with self._lock:
+            total = self.stats['predictions']
+            return {
+                'threshold': self.threshold,
+                'predictions': total,
+                'local': self.stats['local'],
+                'fallbacks': self.stats['fallbacks'],
+                'fallback_rate': round(self.stats['fallbacks'] / total * 100, 1) if total else 0.0,
+                'avg_confidence': round(self.stats['confidence_sum'] / total, 3) if total else 0.0,
+                'by_intent': dict(self.stats['by_intent']),
+            }
+
+    def reset_stats(self) -> None:
+        """Reset metrics counters."""
+        with self._lock:
+            self.stats = {
+                'predictions': 0,
+                'local': 0,
+                'fallbacks': 0,
+                'confidence_sum': 0.0,
+                'by_intent': Counter(),
+            }
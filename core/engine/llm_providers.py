@@ -59,6 +59,12 @@ class LLMConfig:
     audit_log_path: Optional[str] = None
     block_potential_pii: bool = True
 
+    # Prompt caching (stable system prompt prefixes). Anthropic does not
+    # cache a prefix shorter than about 1024 tokens; shorter prefixes are
+    # sent without cache_control.
+    enable_prompt_cache: bool = True
+    prompt_cache_min_tokens: int = 1024
+
     @classmethod
     def from_env(cls) -> "LLMConfig":
         """Create config from environment variables."""
@@ -84,6 +90,9 @@ class LLMConfig:
             enable_safety_audit=os.getenv("LLM_SAFETY_AUDIT", "true").lower() == "true",
             audit_log_path=os.getenv("LLM_AUDIT_LOG_PATH"),
             block_potential_pii=os.getenv("LLM_BLOCK_PII", "true").lower() == "true",
+            # Prompt caching
+            enable_prompt_cache=os.getenv("LLM_PROMPT_CACHE", "true").lower() == "true",
+            prompt_cache_min_tokens=int(os.getenv("LLM_PROMPT_CACHE_MIN_TOKENS", "1024")),
         )
 
 
@@ -94,6 +103,61 @@ class LLMRequest:
     system_prompt: Optional[str] = None
     max_tokens: int = 2000
     temperature: float = 0.1
+    # Leading part of system_prompt that is identical across requests
+    # (schema, clinical rules). Providers with prompt caching cache it.
+    cache_prefix: Optional[str] = None
+    # Leading part of prompt that is identical across requests; cached
+    # together with the whole system prompt before it
+    prompt_cache_prefix: Optional[str] = None
+
+    def split_system_prompt(self) -> Tuple[Optional[str], str]:
+        """
+        Split the system prompt into its cacheable prefix and the remainder.
+
+        Returns:
+            Tuple of (prefix or None if not cacheable, remaining system text)
+        """
+        system = self.system_prompt or ""
+        if self.cache_prefix and system.startswith(self.cache_prefix):
+            return self.cache_prefix, system[len(self.cache_prefix):]
+        return None, system
+
+    def split_prompt(self) -> Tuple[Optional[str], str]:
+        """
+        Split the prompt into its cacheable prefix and the remainder.
+
+        Returns:
+            Tuple of (prefix or None if not cacheable, remaining prompt text)
+        """
+        if self.prompt_cache_prefix and self.prompt.startswith(self.prompt_cache_prefix):
+            return self.prompt_cache_prefix, self.prompt[len(self.prompt_cache_prefix):]
+        return None, self.prompt
+
+    def cache_breakpoints(self, min_tokens: int) -> Dict[str, str]:
+        """
+        Get the prefixes long enough to be cached.
+
+        A cache breakpoint caches all text before it, so the prompt
+        breakpoint covers the whole system prompt plus the prompt prefix.
+        Prefixes under min_tokens (estimated at 4 characters per token) are
+        left out: the provider would not cache them.
+
+        Args:
+            min_tokens: Shortest prefix the provider caches
+
+        Returns:
+            "system" and/or "prompt" -> the text cached up to that breakpoint
+        """
+        breakpoints = {}
+        system_prefix, _ = self.split_system_prompt()
+        if system_prefix is not None and len(system_prefix) // 4 >= min_tokens:
+            breakpoints["system"] = system_prefix
+        prompt_prefix, _ = self.split_prompt()
+        if prompt_prefix is not None:
+            cached = (self.system_prompt or "") + prompt_prefix
+            if len(cached) // 4 >= min_tokens:
+                breakpoints["prompt"] = cached
+        return breakpoints
 
 
 @dataclass
@@ -105,6 +169,9 @@ class LLMResponse:
     generation_time_ms: float
     tokens_used: Optional[int] = None
     raw_response: Optional[Any] = None
+    # Prompt cache usage (input tokens served from / written to the cache)
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
 
 
 # =============================================================================
@@ -421,14 +488,17 @@ class ClaudeProvider(BaseLLMProvider):
         start_time = time.time()
         client = self._get_client()
 
+        breakpoints = (request.cache_breakpoints(self.config.prompt_cache_min_tokens)
+                       if self.config.enable_prompt_cache else {})
+
         # Build messages
-        messages = [{"role": "user", "content": request.prompt}]
+        messages = [{"role": "user", "content": self._build_content(request, breakpoints)}]
 
         try:
             response = client.messages.create(
                 model=self.model,
                 max_tokens=request.max_tokens,
-                system=request.system_prompt or "You are a SQL expert for clinical data analysis.",
+                system=self._build_system(request, breakpoints),
                 messages=messages,
                 temperature=request.temperature
             )
@@ -442,13 +512,22 @@ class ClaudeProvider(BaseLLMProvider):
 
             generation_time = (time.time() - start_time) * 1000
 
+            # Cached input tokens are reported separately from input_tokens
+            usage = response.usage
+            cache_read = (getattr(usage, 'cache_read_input_tokens', None) or 0) if usage else 0
+            cache_write = (getattr(usage, 'cache_creation_input_tokens', None) or 0) if usage else 0
+            if cache_read or cache_write:
+                logger.debug(f"Claude prompt cache: read={cache_read}, write={cache_write}")
+
             return LLMResponse(
                 content=content,
                 model=self.model,
                 provider="claude",
                 generation_time_ms=generation_time,
-                tokens_used=response.usage.input_tokens + response.usage.output_tokens if response.usage else None,
-                raw_response=response
+                tokens_used=usage.input_tokens + usage.output_tokens + cache_read + cache_write if usage else None,
+                raw_response=response,
+                cache_read_tokens=cache_read,
+                cache_write_tokens=cache_write
             )
 
         except Exception as e:
@@ -460,6 +539,40 @@ class ClaudeProvider(BaseLLMProvider):
             else:
                 raise RuntimeError(f"Claude API error: {error_msg}")
 
+    def _build_system(self, request: LLMRequest, breakpoints: Dict[str, str]):
+        """
+        Build the system parameter for the Messages API.
+
+        With a cacheable prefix the system prompt is sent as text blocks and
+        the prefix block carries cache_control, so repeated schema/rules
+        context is read from Anthropic's prompt cache instead of re-processed.
+        """
+        if "system" not in breakpoints:
+            return request.system_prompt or "You are a SQL expert for clinical data analysis."
+
+        prefix, remainder = request.split_system_prompt()
+        blocks = [{"type": "text", "text": prefix, "cache_control": {"type": "ephemeral"}}]
+        if remainder.strip():
+            blocks.append({"type": "text", "text": remainder})
+        return blocks
+
+    def _build_content(self, request: LLMRequest, breakpoints: Dict[str, str]):
+        """
+        Build the user message content.
+
+        With a cacheable prompt prefix (schema, clinical rules) the prefix
+        block carries cache_control, which caches the system prompt and the
+        prefix together.
+        """
+        if "prompt" not in breakpoints:
+            return request.prompt
+
+        prefix, remainder = request.split_prompt()
+        blocks = [{"type": "text", "text": prefix, "cache_control": {"type": "ephemeral"}}]
+        if remainder.strip():
+            blocks.append({"type": "text", "text": remainder})
+        return blocks
+
 
 # =============================================================================
 # GEMINI PROVIDER
@@ -577,7 +690,19 @@ class GeminiProvider(BaseLLMProvider):
 # =============================================================================
 
 class MockProvider(BaseLLMProvider):
-    """Mock LLM provider for testing."""
+    """
+    Mock LLM provider for testing.
+
+    Simulates prompt caching like Anthropic: only prefixes of at least
+    prompt_cache_min_tokens are cached. The first request with a given
+    prefix reports cache-write tokens, later requests read the longest
+    cached prefix (4 characters per token).
+    """
+
+    def __init__(self, config: LLMConfig):
+        super().__init__(config)
+        self._cached_prefixes: set = set()
+        self._cache_lock = threading.Lock()
 
     def get_provider_name(self) -> str:
         return "mock"
@@ -603,13 +728,29 @@ class MockProvider(BaseLLMProvider):
             sql = "SELECT * FROM ADSL WHERE SAFFL = 'Y' LIMIT 10"
 
         content = f"```sql\n{sql}\n```"
+
+        # Simulated prompt cache
+        cache_read = cache_write = 0
+        if self.config.enable_prompt_cache:
+            cached = list(request.cache_breakpoints(self.config.prompt_cache_min_tokens).values())
+            hashes = [hashlib.sha256(text.encode()).hexdigest() for text in cached]
+            with self._cache_lock:
+                hit = next((text for text, h in zip(reversed(cached), reversed(hashes))
+                            if h in self._cached_prefixes), "")
+                cache_read = len(hit) // 4
+                if cached and len(cached[-1]) > len(hit):
+                    cache_write = len(cached[-1]) // 4 - cache_read
+                self._cached_prefixes.update(hashes)
+
         generation_time = (time.time() - start_time) * 1000
 
         return LLMResponse(
             content=content,
             model="mock-model",
             provider="mock",
-            generation_time_ms=generation_time
+            generation_time_ms=generation_time,
+            cache_read_tokens=cache_read,
+            cache_write_tokens=cache_write
         )
 
 
@@ -84,13 +84,41 @@ class RouteDecision:
 
 @dataclass
 class LLMContext:
-    """Context prepared for the LLM."""
+    """
+    Context prepared for the LLM.
+
+    The system prompt is split for prompt caching: system_prompt depends only
+    on the available tables and is the cacheable prefix; system_rules (grade
+    column note, follow-up filters) change per query and are appended after
+    it. The other fields are unchanged by caching.
+
+    The static system prompt alone is shorter than Anthropic's minimum
+    cacheable prefix (about 1024 tokens), so on its own it is not cached.
+    Prompts that also send the schema and clinical rules put them first
+    (prompt_prefix), and the cache covers the system prompt plus that prefix.
+    """
     system_prompt: str
-    user_prompt: str
     schema_context: str
-    entity_context: str
     clinical_rules: str
+    entity_context: str
+    user_prompt: str
     token_count_estimate: int
+    system_rules: str = ""
+
+    @property
+    def cacheable_prefix(self) -> str:
+        """Static system text shared by every query against the same tables."""
+        return self.system_prompt
+
+    @property
+    def prompt_prefix(self) -> str:
+        """Schema and clinical rules: the start of the prompt shared by queries on the same tables."""
+        return "\n".join(p for p in (self.schema_context, self.clinical_rules) if p)
+
+    @property
+    def full_system_prompt(self) -> str:
+        """Complete system prompt: cacheable prefix followed by the per-query rules."""
+        return self.system_prompt + self.system_rules
 
 
 @dataclass
@@ -114,21 +142,43 @@ class ValidationResult:
     errors: List[str] = field(default_factory=list)
     warnings: List[str] = field(default_factory=list)
     tables_verified: List[str] = field(default_factory=list)
+    tables_read: Optional[List[str]] = None  # Every table read (parse tree); None if unknown
     columns_verified: List[str] = field(default_factory=list)
     dangerous_patterns_found: List[str] = field(default_factory=list)
 
 
+class ExecutionErrorCode(Enum):
+    """Why a SQL execution failed."""
+    EMPTY_QUERY = "empty_query"
+    CATALOG = "catalog"     # Table or column does not exist
+    SYNTAX = "syntax"       # Parser error
+    BINDER = "binder"       # Column reference / type binding error
+    TIMEOUT = "timeout"     # Exceeded the statement deadline and was cancelled
+    ERROR = "error"         # Any other execution error
+
+
 @dataclass
 class ExecutionResult:
     """Result of SQL execution."""
     success: bool
-    data: Optional[List[Dict]] = None  # Result as list of dicts
+    data: Optional[List[Dict]] = None  # Result as list of dicts (ColumnarRows in columnar mode)
     columns: List[str] = field(default_factory=list)  # Column names
     row_count: int = 0
     execution_time_ms: float = 0.0
     error_message: Optional[str] = None
     truncated: bool = False  # If results were truncated
     sql_executed: Optional[str] = None  # The SQL that was run
+    error_code: Optional[ExecutionErrorCode] = None  # Set when success is False
+
+    @property
+    def timed_out(self) -> bool:
+        """True if the query was cancelled for exceeding its deadline."""
+        return self.error_code == ExecutionErrorCode.TIMEOUT
+
+    @property
+    def arrow_table(self):
+        """The pyarrow Table behind columnar results, else None."""
+        return getattr(self.data, 'table', None)
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
@@ -140,7 +190,8 @@ class ExecutionResult:
             'execution_time_ms': self.execution_time_ms,
             'error_message': self.error_message,
             'truncated': self.truncated,
-            'sql_executed': self.sql_executed
+            'sql_executed': self.sql_executed,
+            'error_code': self.error_code.value if self.error_code else None
         }
 
 
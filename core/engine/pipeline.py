@@ -6,8 +6,9 @@ Inference Pipeline
 Main orchestrator for the query processing pipeline.
 
 Pipeline Steps:
-0. Intent Classification (Claude-based) - Determines if query is clinical data or conversational
-0.5 Cache Check - Return cached result if available
+-1 Instant Response - Regex greetings/thanks (no LLM)
+-0.5 Cache Check - Return cached result before any LLM call
+0. Intent Classification (local model, Claude fallback, cached) - Determines if query is clinical data or conversational
 1. Input Sanitization - Security checks
 1.5 Query Analysis - Structured query understanding (NEW)
 1.7 Clarification Check - Ask for clarification if needed (NEW)
@@ -15,6 +16,7 @@ Pipeline Steps:
 3. Table Resolution - Clinical Rules Engine
 4. Context Building - LLM context preparation
 5. SQL Generation - Claude-powered SQL generation
+   (single-shot mode: Step 1.5 analysis is returned by this same call)
 6. SQL Validation - Safety and correctness checks
 7. Execution - DuckDB query execution
 7.5 Answer Verification - Verify result accuracy (NEW)
@@ -35,13 +37,16 @@ This is the main entry point for Factory 4.
 """
 
 import re
+import json
 import time
 import logging
 from typing import Optional, Dict, Any, List
 from dataclasses import dataclass, field
 from pathlib import Path
 
-from .models import PipelineResult, EntityMatch, ConfidenceLevel, EntityExtractionResult
+from .models import (
+    PipelineResult, EntityMatch, ConfidenceLevel, EntityExtractionResult, ExecutionResult
+)
 from .clinical_config import ClinicalQueryConfig, DEFAULT_CLINICAL_CONFIG, QueryDomain, PopulationType
 from .input_sanitizer import InputSanitizer, SanitizerConfig
 from .entity_extractor import EntityExtractor, SimpleEntityExtractor
@@ -58,7 +63,8 @@ from .sql_validator import SQLValidator, ValidatorConfig
 from .executor import SQLExecutor, ExecutorConfig, MockExecutor
 from .confidence_scorer import ConfidenceScorer, ScorerConfig
 from .explanation_generator import ExplanationGenerator, ResponseBuilder, init_naming_service
-from .cache import QueryCache, get_query_cache
+from .cache import QueryCache, get_query_cache, get_intent_cache, normalize_query
+from .intent_classifier import LocalIntentClassifier
 
 # New Accuracy Components
 from .query_analyzer import QueryAnalyzer, QueryAnalysis, QueryIntent, QuerySubject
@@ -193,6 +199,73 @@ Please analyze the error and generate a corrected SQL query. Common issues:
 
 Generate a corrected SQL query that will work with DuckDB."""
 
+# Appended to the error when the executor cancelled a query at its deadline
+SQL_TIMEOUT_GUIDANCE = """The query was too expensive and was cancelled. Rewrite it to do less work:
+- Never join tables without a join condition (no cross joins or cartesian products)
+- Relate ADAE and ADSL through USUBJID, e.g. USUBJID IN (SELECT USUBJID FROM ADSL WHERE ...)
+- Filter rows before joining or aggregating
+- Return aggregates (COUNT, GROUP BY) rather than row-level data where possible"""
+
+
+# =============================================================================
+# SINGLE-SHOT MODE (analysis + SQL in one LLM call)
+# =============================================================================
+
+SINGLE_SHOT_INSTRUCTIONS = """
+
+ALSO RETURN YOUR STRUCTURED UNDERSTANDING OF THE QUESTION.
+
+Respond with exactly two fenced blocks, in this order:
+
+1. A ```json block with the query analysis:
+{
+    "intent": "COUNT_SUBJECTS|COUNT_EVENTS|LIST_VALUES|LIST_TOP_N|LIST_RECORDS|DISTRIBUTION|COMPARE_GROUPS|AVERAGE|EXISTS|UNCLEAR",
+    "subject": "SUBJECTS|EVENTS|RECORDS|SITES|PARAMETERS",
+    "conditions": [
+        {
+            "original_text": "the part of the question this refers to",
+            "cdisc_concept": "the CDISC standard concept this maps to",
+            "column": "the column name (e.g., AEDECOD, AEREL, ATOXGR)",
+            "operator": "=|IN|>|<|>=|<=|LIKE|BETWEEN|IS NOT NULL",
+            "values": ["value1", "value2"],
+            "confidence": 0.0-1.0
+        }
+    ],
+    "group_by": ["column1"] or null,
+    "limit": number or null,
+    "ambiguities": [],
+    "understanding_confidence": 0.0-1.0,
+    "suggested_table": "ADAE|ADSL|ADLB|ADVS|DM|AE",
+    "suggested_population": "Safety|ITT|All Subjects",
+    "suggested_clarification": null
+}
+
+2. A ```sql block with the DuckDB query that answers the question.
+
+Standard medical terms and UK/US spelling variants need no clarification. Only
+lower understanding_confidence below 0.7 or list ambiguities when the question is
+genuinely unclear - and still return your best SQL."""
+
+
+def _extract_json_block(content: str) -> Optional[Dict[str, Any]]:
+    """Extract the first ```json block (or bare JSON object) from a response."""
+    match = re.search(r'```json\s*(.*?)\s*```', content, re.DOTALL | re.IGNORECASE)
+    candidate = match.group(1) if match else None
+
+    if candidate is None:
+        start = content.find('{')
+        end = content.rfind('}')
+        if start == -1 or end <= start:
+            return None
+        candidate = content[start:end + 1]
+
+    try:
+        data = json.loads(candidate)
+    except json.JSONDecodeError as e:
+        logger.warning(f"Could not parse single-shot analysis JSON: {e}")
+        return None
+    return data if isinstance(data, dict) else None
+
 
 # =============================================================================
 # CLAUDE SQL GENERATOR
@@ -206,16 +279,18 @@ class ClaudeSQLGenerator:
     SQL generation capabilities for the pipeline.
     """
 
-    def __init__(self, timeout: int = 60):
+    def __init__(self, timeout: int = 60, provider=None):
         """
         Initialize Claude SQL generator.
 
         Args:
             timeout: Request timeout in seconds
+            provider: Pre-built LLM provider (created from environment if omitted)
         """
         self.timeout = timeout
-        self._provider = None
-        self._init_provider()
+        self._provider = provider
+        if self._provider is None:
+            self._init_provider()
 
     def _init_provider(self):
         """Initialize the Claude provider."""
@@ -245,7 +320,7 @@ class ClaudeSQLGenerator:
         start_time = time.time()
 
         # Use the prompts already prepared by ContextBuilder
-        system_prompt = context.system_prompt if hasattr(context, 'system_prompt') else self._build_system_prompt()
+        system_prompt, cache_prefix = self._system_prompt(context)
         user_prompt = context.user_prompt if hasattr(context, 'user_prompt') else ""
 
         # If no user_prompt, try to build from context attributes
@@ -258,7 +333,8 @@ class ClaudeSQLGenerator:
                 prompt=user_prompt,
                 system_prompt=system_prompt,
                 max_tokens=2000,
-                temperature=0.1
+                temperature=0.1,
+                cache_prefix=cache_prefix
             )
 
             response = self._provider.generate(request)
@@ -273,7 +349,9 @@ class ClaudeSQLGenerator:
                 model_used=response.model,
                 generation_time_ms=generation_time,
                 success=bool(sql),
-                error=None if sql else "No SQL found in response"
+                error=None if sql else "No SQL found in response",
+                cache_read_tokens=getattr(response, 'cache_read_tokens', 0),
+                cache_write_tokens=getattr(response, 'cache_write_tokens', 0)
             )
 
         except Exception as e:
@@ -288,6 +366,84 @@ class ClaudeSQLGenerator:
             else:
                 raise LLMError(f"Claude API error: {error_msg}")
 
+    def generate_single_shot(self, context) -> tuple[Optional[Dict[str, Any]], GenerationResult]:
+        """
+        Generate the query analysis and the SQL in one Claude call.
+
+        Uses the same prompts as generate() with the analysis schema appended,
+        so the SQL sees the full schema context while the analysis replaces a
+        separate QueryAnalyzer round trip.
+
+        Args:
+            context: LLMContext with system_prompt, user_prompt, and schema info
+
+        Returns:
+            Tuple of (analysis JSON dict or None if unparseable, GenerationResult)
+        """
+        start_time = time.time()
+
+        system_prompt, cache_prefix = self._system_prompt(context)
+        user_prompt = context.user_prompt if hasattr(context, 'user_prompt') else ""
+        if not user_prompt:
+            user_prompt = self._build_user_prompt(context)
+
+        try:
+            request = LLMRequest(
+                prompt=user_prompt + SINGLE_SHOT_INSTRUCTIONS,
+                system_prompt=system_prompt,
+                max_tokens=3000,
+                temperature=0.0,
+                cache_prefix=cache_prefix
+            )
+
+            response = self._provider.generate(request)
+            generation_time = (time.time() - start_time) * 1000
+
+            analysis_data = _extract_json_block(response.content)
+            sql = self._extract_sql(response.content)
+
+            return analysis_data, GenerationResult(
+                sql=sql,
+                raw_response=response.content,
+                model_used=response.model,
+                generation_time_ms=generation_time,
+                success=bool(sql),
+                error=None if sql else "No SQL found in response",
+                reasoning="Single-shot analysis and SQL",
+                cache_read_tokens=getattr(response, 'cache_read_tokens', 0),
+                cache_write_tokens=getattr(response, 'cache_write_tokens', 0)
+            )
+
+        except Exception as e:
+            error_msg = str(e)
+
+            if "connect" in error_msg.lower() or "connection" in error_msg.lower():
+                raise LLMConnectionError(f"Cannot connect to Claude API: {error_msg}")
+            elif "timeout" in error_msg.lower():
+                raise LLMTimeoutError(f"Claude API timeout: {error_msg}")
+            else:
+                raise LLMError(f"Claude API error: {error_msg}")
+
+    def _system_prompt(self, context) -> tuple[str, Optional[str]]:
+        """
+        Get the system prompt and its cacheable prefix from a context.
+
+        LLMContext puts the static system text first and the per-query rules
+        after it, so the prefix is identical across queries. These prompts
+        carry no schema, and the static system text is shorter than the
+        provider's minimum cacheable prefix, so providers send it uncached
+        (LLMRequest.cache_breakpoints) until it grows. Other context objects
+        fall back to an uncached prompt.
+
+        Returns:
+            Tuple of (system prompt, cacheable prefix or None)
+        """
+        if hasattr(context, 'full_system_prompt'):
+            return context.full_system_prompt, context.cacheable_prefix
+        if hasattr(context, 'system_prompt'):
+            return context.system_prompt, None
+        return self._build_system_prompt(), None
+
     def _build_system_prompt(self) -> str:
         """Build system prompt for SQL generation."""
         return """You are a SQL expert for clinical trial data analysis.
@@ -388,8 +544,8 @@ IMPORTANT RULES:
             failed_sql=failed_sql
         )
 
-        # Get schema context from original
-        system_prompt = context.system_prompt if hasattr(context, 'system_prompt') else self._build_system_prompt()
+        # Get schema context from original (the cached prefix is reused)
+        system_prompt, cache_prefix = self._system_prompt(context)
 
         # Add correction instruction to system prompt
         system_prompt += "\n\nIMPORTANT: You must fix the error in the previous SQL. Be precise with column and table names."
@@ -399,7 +555,8 @@ IMPORTANT RULES:
                 prompt=correction_prompt,
                 system_prompt=system_prompt,
                 max_tokens=2000,
-                temperature=0.0  # More deterministic for corrections
+                temperature=0.0,  # More deterministic for corrections
+                cache_prefix=cache_prefix
             )
 
             response = self._provider.generate(request)
@@ -414,7 +571,9 @@ IMPORTANT RULES:
                 generation_time_ms=generation_time,
                 success=bool(sql),
                 error=None if sql else "No SQL found in correction response",
-                reasoning="SQL correction attempt"
+                reasoning="SQL correction attempt",
+                cache_read_tokens=getattr(response, 'cache_read_tokens', 0),
+                cache_write_tokens=getattr(response, 'cache_write_tokens', 0)
             )
 
         except Exception as e:
@@ -460,10 +619,14 @@ class PipelineConfig:
     # Shared DuckDB connection (to avoid lock conflicts)
     db_connection: Any = None
 
+    # Shared DuckDB connection manager; the executor reads through it per query
+    db_connection_manager: Any = None
+
     # Cache configuration
     enable_cache: bool = True
     cache_ttl_seconds: int = 3600  # 1 hour default
     cache_max_size: int = 1000
+    intent_cache_max_size: int = 5000
 
     # === New Accuracy Features ===
 
@@ -495,6 +658,41 @@ class PipelineConfig:
     # Enable natural language error messages
     enable_error_humanization: bool = True
 
+    # Ask for the query analysis and the SQL in one LLM call (instead of
+    # QueryAnalyzer + SQL generator). Follow-ups in a session with context
+    # still use the multi-call path, since their analysis shapes the SQL prompt.
+    enable_single_shot: bool = False
+
+    # Keep query results as Arrow (ColumnarRows) from execution to the API
+    # instead of building a list of dicts per row
+    enable_columnar_results: bool = False
+
+    # === Intent Routing ===
+
+    # Classify intent in-process and only call the LLM when unsure
+    enable_local_intent: bool = True
+    local_intent_threshold: float = 0.75  # Below this confidence, fall back to the LLM
+
+
+@dataclass
+class PipelineRun:
+    """
+    Per-request state for one pass through the pipeline.
+
+    InferencePipeline itself only holds shareable, effectively immutable
+    components (matcher, resolver, validator, executor, providers). Anything
+    that belongs to a single request - the conversation session, stage
+    results and timings - lives here, so concurrent process() calls on one
+    pipeline instance never see each other's state.
+    """
+    query: str
+    session: Optional[SessionMemory] = None
+    session_id: Optional[str] = None
+    start_time: float = field(default_factory=time.time)
+    pipeline_stages: Dict[str, Any] = field(default_factory=dict)
+    # Whether the session had earlier turns when the run started
+    had_context: bool = False
+
 
 class InferencePipeline:
     """
@@ -511,10 +709,17 @@ class InferencePipeline:
     8. Score confidence
     9. Generate explanation
 
+    The instance is safe to share across threads: per-request state is
+    carried by a PipelineRun created for each process() call. `session`
+    is only the default conversation used when no session_id is given.
+
     Example:
         pipeline = InferencePipeline(config)
         result = pipeline.process("How many patients had headaches?")
         print(result.answer)
+
+        # Concurrent API requests each name their own conversation
+        result = pipeline.process("List them", session_id=conversation_id)
     """
 
     def __init__(self,
@@ -529,7 +734,7 @@ class InferencePipeline:
             config: Pipeline configuration
             fuzzy_matcher: Factory 3 fuzzy matcher instance
             meddra_lookup: Factory 3.5 MedDRA lookup instance
-            session_id: Optional session ID for conversation memory
+            session_id: Optional default session ID for conversation memory
         """
         self.config = config or PipelineConfig()
         self.session_id = session_id
@@ -541,9 +746,12 @@ class InferencePipeline:
                 default_ttl=self.config.cache_ttl_seconds,
                 db_path=self.config.db_path  # Enable data version tracking
             )
+            # Intent only depends on the query text, so it is shared across sessions
+            self.intent_cache = get_intent_cache(max_size=self.config.intent_cache_max_size)
             logger.info(f"Query cache enabled (global singleton, db_path={self.config.db_path})")
         else:
             self.cache = None
+            self.intent_cache = None
             logger.info("Query cache disabled")
 
         # Initialize components
@@ -561,6 +769,14 @@ class InferencePipeline:
         )
         logger.info("Clinical naming service initialized")
 
+        # Step 0: Local intent classifier (LLM is only the fallback)
+        if self.config.enable_local_intent:
+            self.intent_classifier = LocalIntentClassifier(
+                threshold=self.config.local_intent_threshold
+            )
+        else:
+            self.intent_classifier = None
+
         # Step 1: Input Sanitizer
         self.sanitizer = InputSanitizer(SanitizerConfig())
 
@@ -606,8 +822,12 @@ class InferencePipeline:
         else:
             self.executor = SQLExecutor(
                 db_path=self.config.db_path,
-                config=ExecutorConfig(timeout_seconds=self.config.query_timeout_seconds),
-                connection=self.config.db_connection  # Use shared connection if provided
+                config=ExecutorConfig(
+                    timeout_seconds=self.config.query_timeout_seconds,
+                    columnar=self.config.enable_columnar_results
+                ),
+                connection=self.config.db_connection,  # Use shared connection if provided
+                connection_manager=self.config.db_connection_manager
             )
 
         # Step 8: Confidence Scorer
@@ -734,9 +954,8 @@ class InferencePipeline:
             return {}
 
         try:
-            import duckdb
-            conn = duckdb.connect(self.config.db_path, read_only=True)
-            try:
+            from core.data.connection_manager import get_connection_manager
+            with get_connection_manager(self.config.db_path).read() as conn:
                 tables = {}
                 # Get all tables
                 result = conn.execute("""
@@ -755,8 +974,6 @@ class InferencePipeline:
                     """)
                     tables[table_name] = [c[0] for c in cols.fetchall()]
                 return tables
-            finally:
-                conn.close()
         except Exception as e:
             logger.error(f"Error getting tables: {e}")
             return {}
@@ -919,12 +1136,15 @@ class InferencePipeline:
         context,
         pipeline_stages: Dict[str, Any],
         accumulated_filters: Optional[str] = None,
-        preserve_filters: bool = False
+        preserve_filters: bool = False,
+        session: Optional[SessionMemory] = None,
+        generated: Optional[GenerationResult] = None
     ) -> tuple[Optional[Any], Optional[Any], Optional[str], Dict[str, Any]]:
         """
         Execute SQL generation with self-correction loop.
 
         If SQL fails to execute, feeds error back to Claude for correction.
+        Timeouts add guidance asking for a cheaper query.
         Retries up to MAX_CORRECTION_ATTEMPTS times.
 
         Args:
@@ -933,6 +1153,8 @@ class InferencePipeline:
             pipeline_stages: Dict to update with stage info
             accumulated_filters: SQL conditions that must be preserved for refinement queries
             preserve_filters: Whether to validate and inject missing filters
+            session: Conversation session for this run (if any)
+            generated: SQL already generated by a single-shot call (skips Step 5)
 
         Returns:
             Tuple of (validation_result, execution_result, final_sql, correction_info)
@@ -941,18 +1163,32 @@ class InferencePipeline:
             'attempts': 0,
             'corrections': [],
             'final_success': False,
-            'filter_warnings': []
+            'filter_warnings': [],
+            'timeouts': 0
         }
+        last_error_code = None
 
         # Initial SQL generation
-        logger.info("Step 5: Generating SQL")
-        step_start = time.time()
-        generated = self.sql_generator.generate(context)
-        pipeline_stages['sql_generation'] = {
-            'success': generated.sql is not None,
-            'time_ms': (time.time() - step_start) * 1000,
-            'model': generated.model_used
-        }
+        if generated is None:
+            logger.info("Step 5: Generating SQL")
+            step_start = time.time()
+            generated = self.sql_generator.generate(context)
+            pipeline_stages['sql_generation'] = {
+                'success': generated.sql is not None,
+                'time_ms': (time.time() - step_start) * 1000,
+                'model': generated.model_used,
+                'cache_read_tokens': getattr(generated, 'cache_read_tokens', 0),
+                'cache_write_tokens': getattr(generated, 'cache_write_tokens', 0)
+            }
+        else:
+            pipeline_stages['sql_generation'] = {
+                'success': generated.sql is not None,
+                'time_ms': generated.generation_time_ms,
+                'model': generated.model_used,
+                'single_shot': True,
+                'cache_read_tokens': getattr(generated, 'cache_read_tokens', 0),
+                'cache_write_tokens': getattr(generated, 'cache_write_tokens', 0)
+            }
 
         if not generated.sql:
             return None, None, None, correction_info
@@ -963,7 +1199,7 @@ class InferencePipeline:
         # CRITICAL FIX: Always inject filters when we have accumulated_filters AND session context
         # Don't rely solely on preserve_filters flag which depends on LLM classification
         # This ensures filters are preserved even if the LLM misclassifies the query intent
-        has_session_context = self.session and self.session.has_context()
+        has_session_context = bool(session and session.has_context())
         should_inject_filters = accumulated_filters and (preserve_filters or has_session_context)
 
         if should_inject_filters:
@@ -1018,7 +1254,8 @@ class InferencePipeline:
                         correction_info['corrections'].append({
                             'attempt': attempt + 1,
                             'error': last_error,
-                            'corrected_sql': correction.sql
+                            'corrected_sql': correction.sql,
+                            'cache_read_tokens': correction.cache_read_tokens
                         })
                         current_sql = correction.sql
                         continue
@@ -1044,21 +1281,29 @@ class InferencePipeline:
 
             # Execution failed - try to correct
             last_error = execution.error_message
+            last_error_code = execution.error_code
             logger.warning(f"SQL execution failed on attempt {attempt + 1}: {last_error}")
 
+            # A cancelled query needs a cheaper rewrite, not a syntax fix
+            correction_error = last_error
+            if execution.timed_out:
+                correction_info['timeouts'] += 1
+                correction_error = f"{last_error}\n\n{SQL_TIMEOUT_GUIDANCE}"
+
             if attempt < MAX_CORRECTION_ATTEMPTS - 1:
                 logger.info(f"Attempting SQL correction after execution error (attempt {attempt + 2})")
                 correction = self.sql_generator.generate_correction(
                     original_query=query,
                     failed_sql=validation.validated_sql,
-                    error=last_error,
+                    error=correction_error,
                     context=context
                 )
                 if correction.sql:
                     correction_info['corrections'].append({
                         'attempt': attempt + 1,
                         'error': last_error,
-                        'corrected_sql': correction.sql
+                        'corrected_sql': correction.sql,
+                        'cache_read_tokens': correction.cache_read_tokens
                     })
                     current_sql = correction.sql
                     continue
@@ -1067,16 +1312,77 @@ class InferencePipeline:
         logger.error(f"SQL self-correction exhausted after {correction_info['attempts']} attempts")
 
         # Return last validation and a failed execution result
-        from .models import ExecutionResult
         failed_execution = ExecutionResult(
             success=False,
-            error_message=f"Query failed after {correction_info['attempts']} attempts. Last error: {last_error}"
+            error_message=f"Query failed after {correction_info['attempts']} attempts. Last error: {last_error}",
+            error_code=last_error_code
         )
         return validation, failed_execution, current_sql, correction_info
 
+    def _clarification_needed(self, query_analysis: QueryAnalysis) -> bool:
+        """Whether to ask for clarification instead of answering (Step 1.7)."""
+        return bool(
+            self.clarification_manager and
+            self.clarification_manager.needs_clarification(query_analysis) and
+            not query_analysis.references_previous
+        )
+
+    def _generate_single_shot(
+        self,
+        query: str,
+        context,
+        pipeline_stages: Dict[str, Any]
+    ) -> tuple[Optional[QueryAnalysis], GenerationResult]:
+        """
+        Get the query analysis and the SQL from a single LLM call.
+
+        Produces the same QueryAnalysis and GenerationResult objects as the
+        QueryAnalyzer + SQL generator path, so clarification, verification and
+        confidence scoring are unchanged.
+
+        Args:
+            query: Sanitized user query
+            context: LLM context built at Step 4
+            pipeline_stages: Dict to update with stage info
+
+        Returns:
+            Tuple of (QueryAnalysis or None if the analysis was unusable, GenerationResult)
+        """
+        logger.info("Step 1.5 + 5: Generating analysis and SQL (single-shot)")
+        step_start = time.time()
+        analysis_data, generated = self.sql_generator.generate_single_shot(context)
+        elapsed_ms = (time.time() - step_start) * 1000
+
+        if analysis_data is None:
+            logger.warning("Single-shot response had no usable analysis, continuing without analysis")
+            pipeline_stages['query_analysis'] = {
+                'success': False,
+                'single_shot': True,
+                'error': 'No analysis JSON in response'
+            }
+            return None, generated
+
+        query_analysis = self.query_analyzer.analysis_from_dict(query, analysis_data)
+        pipeline_stages['query_analysis'] = {
+            'success': True,
+            'single_shot': True,
+            'time_ms': elapsed_ms,
+            'intent': query_analysis.intent.value if query_analysis.intent else 'unknown',
+            'subject': query_analysis.subject.value if query_analysis.subject else 'unknown',
+            'confidence': query_analysis.understanding_confidence,
+            'conditions_count': len(query_analysis.conditions),
+            'ambiguities_count': len(query_analysis.ambiguities),
+            'references_previous': query_analysis.references_previous,
+            'preserve_filters': query_analysis.preserve_filters
+        }
+        return query_analysis, generated
+
     def _classify_intent(self, query: str) -> tuple[str, float]:
         """
-        Use Claude to classify query intent.
+        Classify query intent.
+
+        Tries the intent cache, then the local classifier; Claude is only
+        called when the local classifier's confidence is below threshold.
 
         Args:
             query: User's input query
@@ -1086,6 +1392,28 @@ class InferencePipeline:
         """
         start_time = time.time()
 
+        # Repeated questions skip the LLM round trip entirely
+        if self.intent_cache is not None:
+            cached_intent = self.intent_cache.get(query)
+            if cached_intent:
+                elapsed_ms = (time.time() - start_time) * 1000
+                logger.info(f"Intent cache hit: '{cached_intent}'")
+                return cached_intent, elapsed_ms
+
+        if self.intent_classifier is not None:
+            prediction = self.intent_classifier.classify(query)
+            if prediction.confident:
+                elapsed_ms = (time.time() - start_time) * 1000
+                logger.info(
+                    f"Intent classified locally as '{prediction.intent}' "
+                    f"(confidence {prediction.confidence:.2f}) in {elapsed_ms:.1f}ms"
+                )
+                return prediction.intent, elapsed_ms
+            logger.info(
+                f"Local intent '{prediction.intent}' below threshold "
+                f"(confidence {prediction.confidence:.2f}), asking LLM"
+            )
+
         try:
             # Use the SQL generator's provider for classification
             if hasattr(self.sql_generator, '_provider') and self.sql_generator._provider:
@@ -1105,6 +1433,10 @@ class InferencePipeline:
 
                 elapsed_ms = (time.time() - start_time) * 1000
                 logger.info(f"Intent classified as '{intent}' in {elapsed_ms:.0f}ms")
+
+                # Only cache real classifications, not failure fallbacks
+                if self.intent_cache is not None:
+                    self.intent_cache.set(query, intent)
                 return intent, elapsed_ms
             else:
                 # Fallback: assume clinical data query
@@ -1257,18 +1589,133 @@ class InferencePipeline:
             }
         )
 
-    def process(self, query: str) -> PipelineResult:
+    def _check_cache(self, query: str, session: Optional[SessionMemory]) -> Optional[PipelineResult]:
+        """
+        Look up a cached result for the query before any LLM stage runs.
+
+        The session-scoped key is tried first so context-dependent follow-ups
+        ("list them") stay isolated per conversation. The shared key holds
+        answers that did not depend on conversation context; it is used by
+        sessions without prior turns, and by sessions re-asking a question
+        they already asked.
+
+        The shared key is intentionally not scoped by user: every user with
+        chat access queries the same study database with the same
+        permissions, so a context-free answer depends only on the question
+        and the data (entries are invalidated when their tables reload).
+        Data access that differs per user would need the user in the key.
+
+        Args:
+            query: User's input query
+            session: Conversation session for this run (if any)
+
+        Returns:
+            PipelineResult rebuilt from the cache, or None on a miss
+        """
+        session_id = session.session_id if session else None
+
+        keys = [session_id]
+        if session_id:
+            normalized = normalize_query(query)
+            asked_before = any(
+                normalize_query(turn.query) == normalized for turn in session.history
+            )
+            if not session.has_context() or asked_before:
+                keys.append(None)
+
+        cached_result = None
+        cache_key_session = None
+        for i, key_session in enumerate(keys):
+            cached_result = self.cache.get(
+                query, session_id=key_session, record_miss=(i == len(keys) - 1)
+            )
+            if cached_result:
+                cache_key_session = key_session
+                break
+
+        if not cached_result:
+            return None
+
+        logger.info("Cache HIT - returning cached result")
+        # Reconstruct PipelineResult from cached dict
+        result = PipelineResult(**cached_result)
+        # Copy before annotating so the cached entry itself is never mutated
+        result.metadata = dict(result.metadata or {})
+        result.metadata['cache_hit'] = True
+        result.metadata['cache_key'] = self.cache._hash(query, session_id=cache_key_session)
+        result.metadata['session_id'] = session_id
+
+        # Record the turn so follow-ups after a cache hit still have context
+        if session:
+            methodology = result.methodology or {}
+            session.add_turn(
+                query=query,
+                response_type='answer',
+                answer=result.answer,
+                data=result.data,
+                table=methodology.get('table_used'),
+                population=methodology.get('population_used'),
+                sql=result.sql
+            )
+
+        return result
+
+    def start_run(self, query: str, session_id: Optional[str] = None) -> PipelineRun:
+        """
+        Create the per-request state for a query.
+
+        Args:
+            query: User's natural language query
+            session_id: Conversation to use (defaults to the pipeline's default session)
+
+        Returns:
+            PipelineRun bound to the resolved session
+        """
+        if not self.config.enable_session_memory:
+            return PipelineRun(query=query)
+
+        if session_id and session_id != self.session_id:
+            session = get_session_manager().get_session(session_id)
+        else:
+            session = self.session
+
+        return PipelineRun(
+            query=query,
+            session=session,
+            session_id=session.session_id if session else None,
+            had_context=session.has_context() if session else False
+        )
+
+    def process(self, query: str, session_id: Optional[str] = None) -> PipelineResult:
         """
         Process a natural language query.
 
+        Safe to call concurrently: each call gets its own PipelineRun, and
+        runs within the same conversation are serialized on the session lock
+        so follow-ups see the previous turn.
+
         Args:
             query: User's natural language query
+            session_id: Optional conversation ID (defaults to the pipeline's default session)
 
         Returns:
             PipelineResult with answer, data, and methodology
         """
-        start_time = time.time()
-        pipeline_stages = {}
+        run = self.start_run(query, session_id)
+
+        if run.session is None:
+            return self._process_run(run)
+
+        with run.session.lock:
+            return self._process_run(run)
+
+    def _process_run(self, run: PipelineRun) -> PipelineResult:
+        """Run all pipeline steps for one request."""
+        query = run.query
+        start_time = run.start_time
+        pipeline_stages = run.pipeline_stages
+        session = run.session
+        session_id = run.session_id
 
         try:
             # Initialize working variables
@@ -1289,6 +1736,14 @@ class InferencePipeline:
                 logger.info("Instant response matched - returning immediately")
                 return instant_result
 
+            # STEP -0.5: Check Cache (before any LLM call)
+            # Only completed clinical answers are cached, so a hit needs no intent check
+            if self.cache is not None and not direct_sql:
+                logger.info("Step -0.5: Checking cache")
+                cached = self._check_cache(query, session)
+                if cached:
+                    return cached
+
             # STEP 0: Non-Clinical Query Routing (LLM-based classification)
             # Uses LLM to classify intent - help, identity, etc. get conversational responses
             if not direct_sql:
@@ -1298,20 +1753,6 @@ class InferencePipeline:
                     logger.info(f"Non-clinical query handled instantly")
                     return non_clinical_result
 
-            # STEP 0.5: Check Cache
-            if self.cache is not None and not direct_sql:
-                logger.info("Step 0.5: Checking cache")
-                # Include session_id in cache key for session-scoped caching
-                # This ensures context-dependent queries (like "list them") are isolated per session
-                cached_result = self.cache.get(query, session_id=self.session_id)
-                if cached_result:
-                    logger.info("Cache HIT - returning cached result")
-                    # Reconstruct PipelineResult from cached dict
-                    result = PipelineResult(**cached_result)
-                    result.metadata['cache_hit'] = True
-                    result.metadata['cache_key'] = self.cache._hash(query, session_id=self.session_id)
-                    return result
-
             # STEP 1: Input Sanitization
             logger.info("Step 1: Sanitizing input")
             sanitization = self.sanitizer.sanitize(working_query)
@@ -1330,9 +1771,22 @@ class InferencePipeline:
 
             clean_query = sanitization.sanitized_query
 
+            # Single-shot mode: analysis arrives with the SQL at Step 5, so
+            # Step 1.5 is deferred. Only for queries without conversation
+            # context - follow-up analysis decides how the SQL prompt is built.
+            single_shot = (
+                self.config.enable_single_shot and
+                self.query_analyzer is not None and
+                hasattr(self.sql_generator, 'generate_single_shot') and
+                not direct_sql and
+                not (session and session.has_context())
+            )
+            if single_shot:
+                pipeline_stages['query_analysis'] = {'deferred': 'single_shot'}
+
             # STEP 1.5: Query Analysis (Structured Understanding)
             # Skip if we already have direct SQL from pattern matching
-            if self.query_analyzer and not direct_sql:
+            if self.query_analyzer and not direct_sql and not single_shot:
                 logger.info("Step 1.5: Analyzing query structure")
                 step_start = time.time()
                 try:
@@ -1343,13 +1797,13 @@ class InferencePipeline:
                     conversation_context = None
                     accumulated_filters = None
 
-                    if self.session and self.session.has_context():
-                        previous_query = self.session.context.last_query
-                        previous_sql = self.session.context.last_sql
-                        previous_result = f"{self.session.context.last_count or 0} subjects"
+                    if session and session.has_context():
+                        previous_query = session.context.last_query
+                        previous_sql = session.context.last_sql
+                        previous_result = f"{session.context.last_count or 0} subjects"
                         # Get rich conversation context for LLM
-                        conversation_context = self.session.get_conversation_context_for_llm()
-                        accumulated_filters = self.session.context.get_accumulated_filters_sql()
+                        conversation_context = session.get_conversation_context_for_llm()
+                        accumulated_filters = session.context.get_accumulated_filters_sql()
 
                     query_analysis = self.query_analyzer.analyze(
                         clean_query,
@@ -1375,9 +1829,9 @@ class InferencePipeline:
                     from .query_analyzer import QueryIntent
 
                     # DETAIL_PREVIOUS: Transform COUNT to SELECT with same filters
-                    if query_analysis.intent == QueryIntent.DETAIL_PREVIOUS and self.session and self.session.context.last_sql:
+                    if query_analysis.intent == QueryIntent.DETAIL_PREVIOUS and session and session.context.last_sql:
                         logger.info("LLM detected DETAIL_PREVIOUS intent - transforming SQL")
-                        list_sql = self.session._transform_count_to_select(self.session.context.last_sql)
+                        list_sql = session._transform_count_to_select(session.context.last_sql)
                         if list_sql:
                             direct_sql = list_sql
                             working_query = "List subjects from previous query"
@@ -1385,7 +1839,7 @@ class InferencePipeline:
                             logger.info(f"Transformed to list SQL: {direct_sql[:100]}...")
 
                     # REFINE_PREVIOUS: Keep accumulated filters and add new condition
-                    elif query_analysis.intent == QueryIntent.REFINE_PREVIOUS and self.session:
+                    elif query_analysis.intent == QueryIntent.REFINE_PREVIOUS and session:
                         logger.info("LLM detected REFINE_PREVIOUS intent - will preserve accumulated filters")
                         pipeline_stages['query_analysis']['refine_detected'] = True
                         pipeline_stages['query_analysis']['accumulated_filters'] = accumulated_filters
@@ -1393,9 +1847,7 @@ class InferencePipeline:
 
                     # STEP 1.7: Clarification Check
                     # Skip clarification for follow-up queries that reference previous results
-                    if (self.clarification_manager and
-                        self.clarification_manager.needs_clarification(query_analysis) and
-                        not query_analysis.references_previous):
+                    if self._clarification_needed(query_analysis):
                         logger.info("Step 1.7: Generating clarification request")
                         clarification_request = self.clarification_manager.generate_clarification_request(query_analysis)
 
@@ -1404,7 +1856,8 @@ class InferencePipeline:
                             query=query,
                             clarification=clarification_request,
                             start_time=start_time,
-                            pipeline_stages=pipeline_stages
+                            pipeline_stages=pipeline_stages,
+                            session=session
                         )
 
                 except Exception as e:
@@ -1537,6 +1990,25 @@ class InferencePipeline:
                     'accumulated_filters': accumulated_filters if preserve_filters else None
                 }
 
+                # STEPS 1.5 + 5 (single-shot): analysis and SQL from one LLM call
+                generated = None
+                if single_shot:
+                    query_analysis, generated = self._generate_single_shot(
+                        clean_query, context, pipeline_stages
+                    )
+
+                    # STEP 1.7: Clarification Check (same rule as the multi-call path)
+                    if query_analysis and self._clarification_needed(query_analysis):
+                        logger.info("Step 1.7: Generating clarification request")
+                        clarification_request = self.clarification_manager.generate_clarification_request(query_analysis)
+                        return self._build_clarification_result(
+                            query=query,
+                            clarification=clarification_request,
+                            start_time=start_time,
+                            pipeline_stages=pipeline_stages,
+                            session=session
+                        )
+
                 # STEPS 5-7: SQL Generation with Self-Correction Loop
                 # Generates SQL, validates, executes - if execution fails, feeds error
                 # back to Claude for correction (up to MAX_CORRECTION_ATTEMPTS times)
@@ -1545,7 +2017,9 @@ class InferencePipeline:
                     context=context,
                     pipeline_stages=pipeline_stages,
                     accumulated_filters=accumulated_filters,
-                    preserve_filters=preserve_filters
+                    preserve_filters=preserve_filters,
+                    session=session,
+                    generated=generated
                 )
 
             # Add correction info to metadata
@@ -1724,7 +2198,7 @@ class InferencePipeline:
                     'verification_passed': verification_result.passed if verification_result else None,
                     'query_intent': query_analysis.intent.value if query_analysis else None,
                     'understanding_confidence': query_analysis.understanding_confidence if query_analysis else None,
-                    'session_id': self.session_id,
+                    'session_id': session_id,
                     'has_enriched_explanation': enriched_explanation is not None
                 }
             )
@@ -1732,16 +2206,23 @@ class InferencePipeline:
             # Cache successful results (session-scoped for proper isolation)
             if self.cache is not None:
                 logger.info("Caching successful result")
-                self.cache.set(query, result.to_dict(), session_id=self.session_id)
+                # Answers that did not depend on earlier turns are stored under the
+                # shared key so the next conversation asking the same question hits,
+                # whichever user asks it (see _check_cache)
+                cache_session = None if not run.had_context else session_id
+                # Record the tables read, so reloading another table keeps the entry;
+                # if they are not known (None), any table reload evicts it
+                self.cache.set(query, result.to_dict(), session_id=cache_session,
+                               tables=validation.tables_read)
 
             # Update session memory with this turn
-            if self.session:
+            if session:
                 # Determine if this is a refinement query that should accumulate filters
                 is_refinement = (query_analysis is not None and
                                 query_analysis.preserve_filters and
                                 query_analysis.intent == QueryIntent.REFINE_PREVIOUS)
 
-                self.session.add_turn(
+                session.add_turn(
                     query=query,
                     response_type='answer',
                     answer=response['answer'],
@@ -1752,7 +2233,7 @@ class InferencePipeline:
                     sql=final_sql,  # Use final_sql to ensure SQL is always passed
                     is_refinement=is_refinement
                 )
-                logger.info(f"Session {self.session_id}: Turn recorded (is_refinement={is_refinement})")
+                logger.info(f"Session {session_id}: Turn recorded (is_refinement={is_refinement})")
 
             return result
 
@@ -1872,7 +2353,8 @@ class InferencePipeline:
         query: str,
         clarification,
         start_time: float,
-        pipeline_stages: Dict[str, Any]
+        pipeline_stages: Dict[str, Any],
+        session: Optional[SessionMemory] = None
     ) -> PipelineResult:
         """
         Build a clarification request result.
@@ -1885,6 +2367,7 @@ class InferencePipeline:
             clarification: ClarificationRequest object
             start_time: When processing started
             pipeline_stages: Stages completed so far
+            session: Conversation session for this run (if any)
         """
         total_time = (time.time() - start_time) * 1000
 
@@ -1902,8 +2385,8 @@ class InferencePipeline:
         answer = "\n".join(answer_parts)
 
         # Record in session as clarification turn
-        if self.session:
-            self.session.add_turn(
+        if session:
+            session.add_turn(
                 query=query,
                 response_type='clarification',
                 answer=answer
@@ -1929,7 +2412,7 @@ class InferencePipeline:
                 'response_type': 'clarification',
                 'clarification_needed': True,
                 'questions_count': len(clarification.questions),
-                'session_id': self.session_id
+                'session_id': session.session_id if session else None
             }
         )
 
@@ -1996,13 +2479,15 @@ class InferencePipeline:
 
     def switch_session(self, session_id: str) -> None:
         """
-        Switch to a different session for conversation context.
+        Switch the default session used by process() without a session_id.
 
-        This allows a shared pipeline instance to handle multiple conversations
-        by switching sessions before processing each query.
+        Intended for single-conversation callers (scripts, CLI). Shared
+        instances serving several conversations must pass session_id to
+        process()/process_with_session() instead, which never touches the
+        default session.
 
         Args:
-            session_id: Session ID to switch to (typically conversation_id from API)
+            session_id: Session ID to switch to
         """
         if not self.config.enable_session_memory:
             logger.debug("Session memory not enabled, switch_session has no effect")
@@ -2023,8 +2508,9 @@ class InferencePipeline:
         Process a query with a specific session context.
 
         This is the recommended method for API endpoints that need to maintain
-        conversation context across requests. It switches to the specified session
-        before processing and maintains context for follow-up questions.
+        conversation context across requests. The session is bound to this
+        request only, so concurrent calls for different conversations are
+        isolated from each other.
 
         Example:
             # First query
@@ -2039,10 +2525,7 @@ class InferencePipeline:
         Returns:
             PipelineResult with answer, data, and methodology
         """
-        if session_id and self.config.enable_session_memory:
-            self.switch_session(session_id)
-
-        return self.process(query)
+        return self.process(query, session_id=session_id)
 
 
 def load_factory3_components(
@@ -2053,7 +2536,7 @@ def load_factory3_components(
     Load Factory 3 and Factory 3.5 components if available.
 
     Args:
-        fuzzy_index_path: Path to fuzzy_index.pkl
+        fuzzy_index_path: Path to fuzzy_index.idx
         db_path: Path to DuckDB database (for MedDRA lookup)
 
     Returns:
@@ -2063,11 +2546,12 @@ def load_factory3_components(
     meddra_lookup = None
 
     # Try to load FuzzyMatcher from Factory 3
-    if fuzzy_index_path and Path(fuzzy_index_path).exists():
+    if fuzzy_index_path:
         try:
             from core.dictionary.fuzzy_matcher import FuzzyMatcher
-            fuzzy_matcher = FuzzyMatcher.load(fuzzy_index_path)
-            logger.info(f"Loaded FuzzyMatcher from {fuzzy_index_path} with {len(fuzzy_matcher)} entries")
+            if FuzzyMatcher.index_exists(fuzzy_index_path):
+                fuzzy_matcher = FuzzyMatcher.load(fuzzy_index_path)
+                logger.info(f"Loaded FuzzyMatcher from {fuzzy_index_path} with {len(fuzzy_matcher)} entries")
         except Exception as e:
             logger.warning(f"Could not load FuzzyMatcher: {e}")
 
@@ -2093,6 +2577,7 @@ def create_pipeline(
     auto_load_factory3: bool = True,
     available_tables: Dict[str, List[str]] = None,
     db_connection=None,
+    db_connection_manager=None,
     session_id: str = None,
     enable_query_analysis: bool = True,
     enable_clarification: bool = True,
@@ -2102,7 +2587,9 @@ def create_pipeline(
     # Factory 4.5: LLM-Enhanced Features
     enable_synonym_resolution: bool = True,
     enable_explanation_enrichment: bool = True,
-    enable_error_humanization: bool = True
+    enable_error_humanization: bool = True,
+    enable_single_shot: bool = False,
+    enable_columnar_results: bool = False
 ) -> InferencePipeline:
     """
     Factory function to create a configured pipeline.
@@ -2113,10 +2600,11 @@ def create_pipeline(
         use_mock: Use mock components for testing
         fuzzy_matcher: Factory 3 fuzzy matcher (pre-loaded)
         meddra_lookup: Factory 3.5 MedDRA lookup (pre-loaded)
-        fuzzy_index_path: Path to fuzzy_index.pkl (auto-loads if provided)
+        fuzzy_index_path: Path to fuzzy_index.idx (auto-loads if provided)
         auto_load_factory3: Automatically try to load Factory 3/3.5 components
         available_tables: Pre-loaded table schema dict to avoid DuckDB lock conflicts
         db_connection: Shared DuckDB connection to avoid lock conflicts
+        db_connection_manager: Shared DuckDB connection manager (read per query)
         session_id: Optional session ID for conversation memory
         enable_query_analysis: Enable structured query understanding
         enable_clarification: Enable clarification requests for ambiguous queries
@@ -2126,6 +2614,8 @@ def create_pipeline(
         enable_synonym_resolution: Enable LLM-suggested synonyms validated against data
         enable_explanation_enrichment: Enable metadata-based column explanations
         enable_error_humanization: Enable natural language error messages
+        enable_single_shot: Get query analysis and SQL from one LLM call
+        enable_columnar_results: Keep query results as Arrow instead of row dicts
 
     Returns:
         Configured InferencePipeline (uses Claude for SQL generation)
@@ -2143,6 +2633,7 @@ def create_pipeline(
         use_mock=use_mock,
         available_tables=available_tables,
         db_connection=db_connection,
+        db_connection_manager=db_connection_manager,
         enable_query_analysis=enable_query_analysis,
         enable_clarification=enable_clarification,
         enable_verification=enable_verification,
@@ -2151,7 +2642,9 @@ def create_pipeline(
         # Factory 4.5: LLM-Enhanced Features
         enable_synonym_resolution=enable_synonym_resolution,
         enable_explanation_enrichment=enable_explanation_enrichment,
-        enable_error_humanization=enable_error_humanization
+        enable_error_humanization=enable_error_humanization,
+        enable_single_shot=enable_single_shot,
+        enable_columnar_results=enable_columnar_results
     )
 
     return InferencePipeline(
@@ -0,0 +1,360 @@
+# SAGE - Pipeline Worker Pool
+# ============================
+"""
+Pipeline Worker Pool
+====================
+Runs blocking InferencePipeline calls off the asyncio event loop.
+
+`InferencePipeline.process()` is synchronous and spends most of its time
+waiting on LLM round trips and DuckDB. Calling it directly inside an
+`async def` handler freezes the whole uvicorn worker (health checks, SSE
+streams for other users). This pool moves that work onto a bounded set of
+worker threads and applies admission control:
+
+- A global limit on in-flight jobs (running + queued)
+- A per-user concurrency limit
+- Backpressure via PipelineSaturatedError (mapped to HTTP 429 + Retry-After)
+- Queue depth / wait time metrics for the status endpoints
+
+Threads are used rather than processes: the pipeline holds LLM clients,
+the shared DuckDB connection and in-memory session state, none of which
+can be shipped to another process.
+"""
+
+import os
+import time
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+@dataclass
+class PipelinePoolConfig:
+    """Configuration for the pipeline worker pool."""
+    # Number of worker threads executing pipeline calls
+    max_workers: int = 8
+
+    # Maximum jobs admitted at once (running + waiting for a worker)
+    max_in_flight: int = 32
+
+    # Maximum concurrent jobs for a single user
+    per_user_limit: int = 2
+
+    # Seconds a rejected client should wait before retrying
+    retry_after_seconds: int = 5
+
+    @classmethod
+    def from_env(cls) -> "PipelinePoolConfig":
+        """Create config from environment variables."""
+        return cls(
+            max_workers=int(os.getenv("PIPELINE_MAX_WORKERS", "8")),
+            max_in_flight=int(os.getenv("PIPELINE_MAX_IN_FLIGHT", "32")),
+            per_user_limit=int(os.getenv("PIPELINE_PER_USER_LIMIT", "2")),
+            retry_after_seconds=int(os.getenv("PIPELINE_RETRY_AFTER_SECONDS", "5")),
+        )
+
+
+class PipelineSaturatedError(Exception):
+    """Raised when the pool cannot admit another job."""
+
+    def __init__(self, message: str, reason: str, retry_after: int):
+        super().__init__(message)
+        self.reason = reason  # 'pool_full' or 'user_limit'
+        self.retry_after = retry_after
+
+
+# =============================================================================
+# ADMISSION TICKET
+# =============================================================================
+
+class PipelineTicket:
+    """
+    A reserved slot in the pool.
+
+    Once a ticket has been submitted, the slot is returned automatically
+    when the job finishes (or is cancelled before starting). Callers that
+    reserve a ticket but never submit it must call release().
+    """
+
+    def __init__(self, pool: "PipelineWorkerPool", user_id: str):
+        self._pool = pool
+        self.user_id = user_id
+        self.reserved_at = time.time()
+        self.submitted = False
+        self._released = False
+        self._lock = threading.Lock()
+
+    def release(self) -> None:
+        """Return an unused slot to the pool (no-op once submitted)."""
+        if self.submitted:
+            return
+        self._finish()
+
+    def _finish(self) -> None:
+        """Release the slot exactly once."""
+        with self._lock:
+            if self._released:
+                return
+            self._released = True
+        self._pool._release(self.user_id)
+
+    @property
+    def released(self) -> bool:
+        return self._released
+
+
+# =============================================================================
+# WORKER POOL
+# =============================================================================
+
+class PipelineWorkerPool:
+    """
+    Bounded thread pool for blocking pipeline calls.
+
+    Example:
+        pool = get_pipeline_pool()
+        try:
+            result = await pool.run(user_id, pipeline.process, query)
+        except PipelineSaturatedError as e:
+            raise HTTPException(429, headers={"Retry-After": str(e.retry_after)})
+    """
+
+    def __init__(self, config: Optional[PipelinePoolConfig] = None):
+        """
+        Initialize the worker pool.
+
+        Args:
+            config: Pool configuration (defaults to environment settings)
+        """
+        self.config = config or PipelinePoolConfig.from_env()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.config.max_workers,
+            thread_name_prefix="sage-pipeline"
+        )
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._running = 0
+        self._per_user: Dict[str, int] = {}
+        self.stats = {
+            'submitted': 0,
+            'completed': 0,
+            'failed': 0,
+            'rejected_pool_full': 0,
+            'rejected_user_limit': 0,
+            'total_wait_ms': 0.0,
+            'max_wait_ms': 0.0,
+        }
+
+    # -------------------------------------------------------------------------
+    # Admission control
+    # -------------------------------------------------------------------------
+
+    def reserve(self, user_id: str) -> PipelineTicket:
+        """
+        Reserve a slot for a user, or raise if the pool is saturated.
+
+        Streaming endpoints call this before returning a response so that
+        rejection can still be reported with a proper 429 status.
+
+        Args:
+            user_id: User the job runs on behalf of
+
+        Returns:
+            PipelineTicket to pass to run()
+
+        Raises:
+            PipelineSaturatedError: If the global or per-user limit is reached
+        """
+        with self._lock:
+            if self._in_flight >= self.config.max_in_flight:
+                self.stats['rejected_pool_full'] += 1
+                raise PipelineSaturatedError(
+                    f"Query pool is full ({self._in_flight} queries in progress)",
+                    reason='pool_full',
+                    retry_after=self.config.retry_after_seconds
+                )
+
+            user_count = self._per_user.get(user_id, 0)
+            if user_count >= self.config.per_user_limit:
+                self.stats['rejected_user_limit'] += 1
+                raise PipelineSaturatedError(
+                    f"Too many concurrent queries for this user (limit {self.config.per_user_limit})",
+                    reason='user_limit',
+                    retry_after=self.config.retry_after_seconds
+                )
+
+            self._in_flight += 1
+            self._per_user[user_id] = user_count + 1
+
+        return PipelineTicket(self, user_id)
+
+    def _release(self, user_id: str) -> None:
+        """Release a slot held by a ticket."""
+        with self._lock:
+            self._in_flight = max(0, self._in_flight - 1)
+            remaining = self._per_user.get(user_id, 0) - 1
+            if remaining > 0:
+                self._per_user[user_id] = remaining
+            else:
+                self._per_user.pop(user_id, None)
+
+    # -------------------------------------------------------------------------
+    # Execution
+    # -------------------------------------------------------------------------
+
+    def submit(self, ticket: PipelineTicket, func: Callable[..., Any], *args, **kwargs) -> Future:
+        """
+        Submit a blocking call using a previously reserved ticket.
+
+        The ticket is released when the future completes or is cancelled.
+
+        Returns:
+            concurrent.futures.Future for the call
+        """
+        submitted_at = time.time()
+
+        def _job():
+            wait_ms = (time.time() - submitted_at) * 1000
+            with self._lock:
+                self._running += 1
+                self.stats['total_wait_ms'] += wait_ms
+                self.stats['max_wait_ms'] = max(self.stats['max_wait_ms'], wait_ms)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._running -= 1
+
+        def _on_done(fut: Future) -> None:
+            with self._lock:
+                if fut.cancelled() or fut.exception() is not None:
+                    self.stats['failed'] += 1
+                else:
+                    self.stats['completed'] += 1
+            ticket._finish()
+
+        with self._lock:
+            self.stats['submitted'] += 1
+
+        try:
+            future = self._executor.submit(_job)
+        except RuntimeError:
+            # Executor already shut down
+            ticket._finish()
+            raise
+        ticket.submitted = True
+        future.add_done_callback(_on_done)
+        return future
+
+    async def run(
+        self,
+        user_id: str,
+        func: Callable[..., Any],
+        *args,
+        ticket: Optional[PipelineTicket] = None,
+        **kwargs
+    ) -> Any:
+        """
+        Run a blocking call on the pool and await its result.
+
+        Args:
+            user_id: User the job runs on behalf of
+            func: Blocking callable (e.g. pipeline.process_with_session)
+            ticket: Previously reserved ticket (reserved here if omitted)
+
+        Returns:
+            Return value of func
+
+        Raises:
+            PipelineSaturatedError: If no ticket was given and the pool is full
+        """
+        if ticket is None:
+            ticket = self.reserve(user_id)
+        future = self.submit(ticket, func, *args, **kwargs)
+        return await asyncio.wrap_future(future)
+
+    # -------------------------------------------------------------------------
+    # Metrics / lifecycle
+    # -------------------------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get pool utilization statistics.
+
+        Returns:
+            Dictionary with queue depth, active workers and rejection counts
+        """
+        with self._lock:
+            started = self.stats['completed'] + self.stats['failed'] + self._running
+            avg_wait = self.stats['total_wait_ms'] / started if started > 0 else 0.0
+            return {
+                'max_workers': self.config.max_workers,
+                'max_in_flight': self.config.max_in_flight,
+                'per_user_limit': self.config.per_user_limit,
+                'in_flight': self._in_flight,
+                'running': self._running,
+                'queue_depth': max(0, self._in_flight - self._running),
+                'active_users': len(self._per_user),
+                'submitted': self.stats['submitted'],
+                'completed': self.stats['completed'],
+                'failed': self.stats['failed'],
+                'rejected_pool_full': self.stats['rejected_pool_full'],
+                'rejected_user_limit': self.stats['rejected_user_limit'],
+                'avg_wait_ms': round(avg_wait, 1),
+                'max_wait_ms': round(self.stats['max_wait_ms'], 1),
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting work and optionally wait for running jobs."""
+        self._executor.shutdown(wait=wait)
+        logger.info("Pipeline worker pool shut down")
+
+
+# =============================================================================
+# Global Pool Instance
+# =============================================================================
+
+_pipeline_pool: Optional[PipelineWorkerPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pipeline_pool(config: Optional[PipelinePoolConfig] = None) -> PipelineWorkerPool:
+    """
+    Get or create the global pipeline worker pool.
+
+    Args:
+        config: Pool configuration (only used on first call)
+
+    Returns:
+        Global PipelineWorkerPool instance
+    """
+    global _pipeline_pool
+
+    with _pool_lock:
+        if _pipeline_pool is None:
+            _pipeline_pool = PipelineWorkerPool(config)
+            logger.info(
+                f"Created pipeline worker pool (workers={_pipeline_pool.config.max_workers}, "
+                f"max_in_flight={_pipeline_pool.config.max_in_flight}, "
+                f"per_user={_pipeline_pool.config.per_user_limit})"
+            )
+        return _pipeline_pool
+
+
+def shutdown_pipeline_pool(wait: bool = True) -> None:
+    """Shut down and discard the global pool (on app shutdown and in tests)."""
+    global _pipeline_pool
+
+    with _pool_lock:
+        if _pipeline_pool is not None:
+            _pipeline_pool.shutdown(wait=wait)
+        _pipeline_pool = None
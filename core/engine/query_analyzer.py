@@ -428,14 +428,7 @@ class QueryAnalyzer:
             analysis_data = self._parse_json_response(response.content)
 
             # Convert to structured object
-            analysis = self._build_analysis(query, analysis_data)
-
-            # Check if clarification needed
-            if analysis.understanding_confidence < self.CLARIFICATION_THRESHOLD:
-                analysis.needs_clarification = True
-
-            if any(a.clarification_needed for a in analysis.ambiguities):
-                analysis.needs_clarification = True
+            analysis = self.analysis_from_dict(query, analysis_data)
 
             logger.info(f"Query analysis complete: intent={analysis.intent.value}, "
                        f"references_previous={analysis.references_previous}, "
@@ -456,6 +449,31 @@ class QueryAnalyzer:
                 clarification_question="Could you please rephrase your question?"
             )
 
+    def analysis_from_dict(self, query: str, data: Dict[str, Any]) -> QueryAnalysis:
+        """
+        Build a QueryAnalysis from analysis JSON produced elsewhere.
+
+        Used by analyze() and by the pipeline's single-shot mode, where the
+        analysis JSON arrives in the same LLM response as the SQL.
+
+        Args:
+            query: Natural language query
+            data: Parsed analysis JSON (same schema as QUERY_ANALYSIS_PROMPT)
+
+        Returns:
+            QueryAnalysis with clarification flags applied
+        """
+        analysis = self._build_analysis(query, data)
+
+        # Check if clarification needed
+        if analysis.understanding_confidence < self.CLARIFICATION_THRESHOLD:
+            analysis.needs_clarification = True
+
+        if any(a.clarification_needed for a in analysis.ambiguities):
+            analysis.needs_clarification = True
+
+        return analysis
+
     def _parse_json_response(self, content: str) -> Dict[str, Any]:
         """Parse JSON from LLM response, handling markdown code blocks."""
         # Remove markdown code blocks if present
@@ -14,6 +14,7 @@ Key Capabilities:
 
 import logging
 import re
+import threading
 from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Any, Tuple
 from datetime import datetime, timedelta
@@ -175,6 +176,8 @@ class SessionMemory:
         self.context = SessionContext()
         self.corrections: List[Correction] = []
         self.created_at = datetime.now()
+        # Serializes pipeline runs within one conversation (turns are ordered)
+        self.lock = threading.RLock()
 
     def _generate_session_id(self) -> str:
         """Generate a unique session ID."""
@@ -803,43 +806,50 @@ class SessionManager:
     def __init__(self):
         """Initialize session manager."""
         self.sessions: Dict[str, SessionMemory] = {}
+        self._lock = threading.Lock()
 
     def get_session(self, session_id: str) -> SessionMemory:
         """
         Get or create a session.
 
+        Thread-safe: concurrent requests for the same ID get the same session.
+
         Args:
             session_id: Session identifier
 
         Returns:
             SessionMemory instance
         """
-        if session_id not in self.sessions:
-            self.sessions[session_id] = SessionMemory(session_id)
-            logger.info(f"Created new session: {session_id}")
+        with self._lock:
+            if session_id not in self.sessions:
+                self.sessions[session_id] = SessionMemory(session_id)
+                logger.info(f"Created new session: {session_id}")
 
-        return self.sessions[session_id]
+            return self.sessions[session_id]
 
     def create_session(self) -> SessionMemory:
         """Create a new session."""
         session = SessionMemory()
-        self.sessions[session.session_id] = session
+        with self._lock:
+            self.sessions[session.session_id] = session
         return session
 
     def remove_session(self, session_id: str):
         """Remove a session."""
-        if session_id in self.sessions:
-            del self.sessions[session_id]
-            logger.info(f"Removed session: {session_id}")
+        with self._lock:
+            if session_id in self.sessions:
+                del self.sessions[session_id]
+                logger.info(f"Removed session: {session_id}")
 
     def cleanup_expired_sessions(self):
         """Remove expired sessions."""
         cutoff = datetime.now() - timedelta(minutes=self.SESSION_TIMEOUT)
         expired = []
 
-        for sid, session in self.sessions.items():
-            if session.created_at < cutoff:
-                expired.append(sid)
+        with self._lock:
+            for sid, session in self.sessions.items():
+                if session.created_at < cutoff:
+                    expired.append(sid)
 
         for sid in expired:
             self.remove_session(sid)
@@ -854,11 +864,14 @@ class SessionManager:
 
 # Global session manager instance
 _session_manager: Optional[SessionManager] = None
+_session_manager_lock = threading.Lock()
 
 
 def get_session_manager() -> SessionManager:
     """Get the global session manager."""
     global _session_manager
     if _session_manager is None:
-        _session_manager = SessionManager()
+        with _session_manager_lock:
+            if _session_manager is None:
+                _session_manager = SessionManager()
     return _session_manager
@@ -90,6 +90,9 @@ class GenerationResult:
     success: bool = False
     error: Optional[str] = None
     reasoning: Optional[str] = None
+    # Prompt cache usage reported by the provider
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
 
 
 # =============================================================================
@@ -274,9 +277,11 @@ class UnifiedSQLGenerator:
         # Create LLM request
         request = LLMRequest(
             prompt=full_prompt,
-            system_prompt=context.system_prompt,
+            system_prompt=context.full_system_prompt,
             max_tokens=self.config.max_tokens,
-            temperature=self.config.temperature
+            temperature=self.config.temperature,
+            cache_prefix=context.cacheable_prefix,
+            prompt_cache_prefix=context.prompt_prefix
         )
 
         # Try with retries
@@ -319,14 +324,18 @@ class UnifiedSQLGenerator:
         raise RuntimeError("SQL generation failed: no valid SQL in response")
 
     def _build_full_prompt(self, context: LLMContext) -> str:
-        """Build the complete prompt for the LLM."""
+        """
+        Build the complete prompt for the LLM.
+
+        The schema and clinical rules come first (LLMContext.prompt_prefix),
+        so they are cached with the system prompt; the entity terms and the
+        question follow.
+        """
         parts = [
-            context.schema_context,
+            context.prompt_prefix,
             "",
             context.entity_context,
             "",
-            context.clinical_rules,
-            "",
             context.user_prompt
         ]
         return "\n".join(p for p in parts if p)
@@ -13,7 +13,9 @@ This is STEP 6 of the 9-step pipeline.
 """
 
 import re
+import json
 import logging
+import threading
 from typing import List, Set, Optional, Tuple
 from dataclasses import dataclass
 
@@ -21,6 +23,56 @@ from .models import ValidationResult
 
 logger = logging.getLogger(__name__)
 
+# In-memory DuckDB connection per thread, used only to parse SQL
+_parser = threading.local()
+
+
+def referenced_tables(sql: str) -> Optional[List[str]]:
+    """
+    Every table a query reads, from DuckDB's parse tree.
+
+    Covers FROM lists, joins, subqueries and CTE bodies; CTE names are not
+    tables. Returns None when that cannot be determined: the SQL does not
+    parse, reads through a table function, or DuckDB is unavailable.
+
+    Args:
+        sql: SQL query
+
+    Returns:
+        Upper-cased table names (sorted), or None
+    """
+    try:
+        conn = getattr(_parser, 'conn', None)
+        if conn is None:
+            import duckdb
+            conn = _parser.conn = duckdb.connect()
+        tree = json.loads(conn.execute("SELECT json_serialize_sql(?)", [sql]).fetchone()[0])
+    except Exception as e:
+        logger.debug(f"Could not parse SQL for its tables: {e}")
+        return None
+    if tree.get('error'):
+        return None
+
+    tables: Set[str] = set()
+    ctes: Set[str] = set()
+    nodes = [tree['statements']]
+    while nodes:
+        node = nodes.pop()
+        if isinstance(node, list):
+            nodes.extend(node)
+            continue
+        if not isinstance(node, dict):
+            continue
+        if node.get('type') == 'BASE_TABLE':
+            tables.add(node['table_name'].upper())
+        elif node.get('type') == 'TABLE_FUNCTION':
+            return None
+        for cte in (node.get('cte_map') or {}).get('map', []):
+            ctes.add(cte['key'].upper())
+        nodes.extend(node.values())
+
+    return sorted(tables - ctes)
+
 
 @dataclass
 class ValidatorConfig:
@@ -148,7 +200,8 @@ class SQLValidator:
             warnings.append(f"Query has {join_count} joins (max recommended: {self.config.max_joins})")
 
         # Verify tables exist
-        tables_used = self._extract_tables(sql)
+        tables_read = referenced_tables(sql)
+        tables_used = tables_read if tables_read is not None else self._extract_tables(sql)
         tables_verified = []
         for table in tables_used:
             if table.upper() in self.available_tables:
@@ -195,6 +248,7 @@ class SQLValidator:
             errors=errors,
             warnings=warnings,
             tables_verified=tables_verified,
+            tables_read=tables_read,
             columns_verified=columns_verified,
             dangerous_patterns_found=dangerous_found
         )
@@ -245,13 +299,11 @@ class SQLValidator:
         return len(re.findall(r'\bJOIN\b', sql, re.IGNORECASE))
 
     def _extract_tables(self, sql: str) -> List[str]:
-        """Extract table names from SQL."""
+        """Extract table names after FROM/JOIN (for SQL DuckDB cannot parse)."""
         tables = []
 
-        # FROM clause
-        from_match = re.search(r'\bFROM\s+(\w+)', sql, re.IGNORECASE)
-        if from_match:
-            tables.append(from_match.group(1))
+        # FROM clauses (subqueries included)
+        tables.extend(re.findall(r'\bFROM\s+(\w+)', sql, re.IGNORECASE))
 
         # JOIN clauses
         join_matches = re.findall(r'\bJOIN\s+(\w+)', sql, re.IGNORECASE)
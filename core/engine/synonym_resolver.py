@@ -98,7 +98,8 @@ class SynonymResolver:
                  llm_client=None,
                  fuzzy_matcher=None,
                  target_column: str = 'AEDECOD',
-                 target_table: str = 'ADAE'):
+                 target_table: str = 'ADAE',
+                 db_path: Optional[str] = None):
         """
         Initialize synonym resolver.
 
@@ -108,8 +109,11 @@ class SynonymResolver:
             fuzzy_matcher: FuzzyMatcher from Factory 3
             target_column: Column to search (default: AEDECOD)
             target_table: Table to search (default: ADAE)
+            db_path: Managed DuckDB file to validate against, read per query
+                (used when no db_connection is given)
         """
         self.db = db_connection
+        self.db_path = db_path
         self.llm = llm_client
         self.fuzzy_matcher = fuzzy_matcher
         self.target_column = target_column
@@ -181,9 +185,31 @@ class SynonymResolver:
             processing_time_ms=processing_time
         )
 
+    def _has_data(self) -> bool:
+        """Whether there is a database to validate against."""
+        return bool(self.db) or bool(self.db_path)
+
+    def _fetchall(self, sql: str, params: Optional[List[Any]] = None) -> List[tuple]:
+        """
+        Run a query and fetch every row.
+
+        A managed database is read on this thread's cursor per query, never
+        a kept one: upgrading the handle for writing closes every cursor.
+        """
+        if self.db is not None:
+            return self.db.execute(sql, params or []).fetchall()
+        from core.data.connection_manager import get_connection_manager
+        with get_connection_manager(self.db_path).read() as conn:
+            return conn.execute(sql, params or []).fetchall()
+
+    def _fetchone(self, sql: str, params: Optional[List[Any]] = None) -> Optional[tuple]:
+        """Run a query and fetch its first row."""
+        rows = self._fetchall(sql, params)
+        return rows[0] if rows else None
+
     def _check_exact_match(self, term: str, column: str, table: str) -> Optional[SynonymMatch]:
         """Check if term exists exactly in data (case-insensitive)."""
-        if not self.db:
+        if not self._has_data():
             return None
 
         try:
@@ -194,7 +220,7 @@ class SynonymResolver:
                 WHERE UPPER({column}) = UPPER(?)
                 GROUP BY {column}
             """
-            result = self.db.execute(sql, [term]).fetchone()
+            result = self._fetchone(sql, [term])
 
             if result:
                 return SynonymMatch(
@@ -259,7 +285,7 @@ Synonyms:"""
     def _validate_term(self, term: str, column: str, table: str,
                        original_query: str) -> Optional[SynonymMatch]:
         """Validate that a term exists in the data."""
-        if not self.db:
+        if not self._has_data():
             return None
 
         try:
@@ -269,7 +295,7 @@ Synonyms:"""
                 WHERE UPPER({column}) = UPPER(?)
                 GROUP BY {column}
             """
-            result = self.db.execute(sql, [term]).fetchone()
+            result = self._fetchone(sql, [term])
 
             if result and result[1] > 0:
                 return SynonymMatch(
@@ -315,12 +341,12 @@ Synonyms:"""
         if self._cached_values and (time.time() - self._cache_time) < self._cache_ttl:
             return self._cached_values
 
-        if not self.db:
+        if not self._has_data():
             return set()
 
         try:
             sql = f"SELECT DISTINCT {column} FROM {table} WHERE {column} IS NOT NULL"
-            results = self.db.execute(sql).fetchall()
+            results = self._fetchall(sql)
             self._cached_values = {r[0] for r in results}
             self._cache_time = time.time()
             return self._cached_values
@@ -341,16 +367,7 @@ def create_synonym_resolver(db_path: str = None,
     Returns:
         Configured SynonymResolver
     """
-    db_connection = None
-
-    if db_path:
-        try:
-            import duckdb
-            db_connection = duckdb.connect(db_path, read_only=True)
-        except Exception as e:
-            logger.warning(f"Could not connect to database: {e}")
-
     return SynonymResolver(
-        db_connection=db_connection,
+        db_path=db_path,
         fuzzy_matcher=fuzzy_matcher
     )
@@ -374,11 +374,10 @@ def get_table_resolver_from_duckdb(db_path: str,
     Returns:
         TableResolver initialized with available tables
     """
-    import duckdb
+    from core.data.connection_manager import get_connection_manager
     from .sql_security import validate_table_name, add_table_to_whitelist
 
-    conn = duckdb.connect(db_path, read_only=True)
-    try:
+    with get_connection_manager(db_path).read() as conn:
         # Get all tables
         tables = conn.execute(
             "SELECT table_name FROM information_schema.tables WHERE table_schema = 'main'"
@@ -399,6 +398,4 @@ def get_table_resolver_from_duckdb(db_path: str,
             else:
                 logger.warning(f"Skipping table with invalid name pattern: {table_name}")
 
-        return TableResolver(available_tables, config)
-    finally:
-        conn.close()
+    return TableResolver(available_tables, config)
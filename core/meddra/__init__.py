@@ -6,7 +6,8 @@ MedDRA (Medical Dictionary for Regulatory Activities) library management.
 Provides:
 - Loading MedDRA from SAS7BDAT files
 - Term lookup with hierarchy
-- Search functionality
+- In-memory hierarchy cache for navigation
+- Ranked, typo-tolerant full-text term search
 - Abbreviation resolution
 
 MedDRA Hierarchy:
@@ -24,6 +25,14 @@ from .loader import (
     MedDRAHierarchy,
 )
 
+from .hierarchy import (
+    MedDRAHierarchyCache,
+    get_hierarchy_cache,
+    invalidate_hierarchy_cache,
+)
+
+from .search import MedDRASearchIndex
+
 from .lookup import (
     MedDRALookup,
     SearchResult,
@@ -38,6 +47,14 @@ __all__ = [
     "MedDRATerm",
     "MedDRAHierarchy",
 
+    # Hierarchy cache
+    "MedDRAHierarchyCache",
+    "get_hierarchy_cache",
+    "invalidate_hierarchy_cache",
+
+    # Search index
+    "MedDRASearchIndex",
+
     # Lookup
     "MedDRALookup",
     "SearchResult",
@@ -0,0 +1,288 @@
+# SAGE MedDRA Hierarchy Cache
+# ============================
+"""
+In-memory MedDRA hierarchy.
+
+The meddra_hierarchy table is read once per database and kept as
+integer-coded NumPy arrays:
+
+- One row per hierarchy path, holding the SOC/HLGT/HLT/PT/LLT index of
+  each level (-1 where a level is missing)
+- Per level: codes, an index into a shared (interned) name table, the
+  first path each term appears on, and its parent on that path
+- Children and SOC -> PT memberships as CSR arrays (offsets + members)
+
+Hierarchy lookups, children and SOC/PT browsing are then dictionary and
+array lookups instead of DuckDB queries, and term search uses a
+MedDRASearchIndex built from the same arrays. Results follow the level tables
+written by MedDRALoader: a term's hierarchy and parent come from the first
+path it appears on.
+
+Example:
+    cache = get_hierarchy_cache("data/database/clinical.duckdb")
+    if cache:
+        hierarchy = cache.hierarchy_for_pt("10019211")
+"""
+
+import logging
+import threading
+from pathlib import Path
+from typing import Optional, List, Dict, Tuple
+
+import duckdb
+import numpy as np
+import pandas as pd
+
+from .loader import MedDRATerm, MedDRAHierarchy
+from .search import MedDRASearchIndex
+from core.data.connection_manager import get_connection_manager
+
+logger = logging.getLogger(__name__)
+
+# Hierarchy levels, top to bottom
+LEVELS = ("SOC", "HLGT", "HLT", "PT", "LLT")
+
+
+class MedDRAHierarchyCache:
+    """Integer-coded copy of meddra_hierarchy."""
+
+    def __init__(self, df: pd.DataFrame):
+        """
+        Build the arrays.
+
+        Args:
+            df: meddra_hierarchy rows (soc_code, soc_name, ..., llt_code, llt_name)
+        """
+        self.path_count = len(df)
+        self._search_index: Optional[MedDRASearchIndex] = None
+        self._search_lock = threading.Lock()
+
+        # Interned name table shared by all levels
+        name_columns = [f"{level.lower()}_name" for level in LEVELS]
+        name_ids, self._names = pd.factorize(pd.concat([df[c] for c in name_columns], ignore_index=True))
+        self._path_names = name_ids.reshape(len(LEVELS), self.path_count).astype(np.int32)
+        self._names = list(self._names)
+
+        self._codes: Dict[str, List[str]] = {}
+        self._index: Dict[str, Dict[str, int]] = {}
+        self._name_ids: Dict[str, np.ndarray] = {}
+        self._first_path: Dict[str, np.ndarray] = {}
+        self._paths: Dict[str, np.ndarray] = {}
+
+        for depth, level in enumerate(LEVELS):
+            term_ids, codes = pd.factorize(df[f"{level.lower()}_code"])
+            self._paths[level] = term_ids.astype(np.int32)
+
+            # First path per term (factorize numbers terms in order of appearance)
+            valid = np.flatnonzero(term_ids >= 0)
+            first = valid[np.unique(term_ids[valid], return_index=True)[1]].astype(np.int32)
+
+            self._codes[level] = [str(c) for c in codes]
+            self._index[level] = {code: i for i, code in enumerate(self._codes[level])}
+            self._first_path[level] = first
+            self._name_ids[level] = self._path_names[depth][first]
+
+        # Parent of each term on its first path, and children grouped by parent
+        self._parents: Dict[str, np.ndarray] = {}
+        self._children: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        for parent_level, level in zip(LEVELS, LEVELS[1:]):
+            parents = self._paths[parent_level][self._first_path[level]]
+            self._parents[level] = parents
+            self._children[parent_level] = self._group(parents, len(self._codes[parent_level]))
+
+        # Every PT under each SOC (any path), ordered by PT name
+        soc_pt = pd.DataFrame({"soc": self._paths["SOC"], "pt": self._paths["PT"]})
+        soc_pt = soc_pt[(soc_pt["soc"] >= 0) & (soc_pt["pt"] >= 0)].drop_duplicates()
+        pt_names = np.array([self._name(i) for i in self._name_ids["PT"]], dtype=object)
+        soc_pt["name"] = pt_names[soc_pt["pt"].to_numpy()] if len(soc_pt) else []
+        soc_pt = soc_pt.sort_values(["soc", "name"], kind="stable")
+        self._soc_pts = self._group(soc_pt["soc"].to_numpy(np.int32), len(self._codes["SOC"]),
+                                    members=soc_pt["pt"].to_numpy(np.int32))
+
+    @staticmethod
+    def _group(keys: np.ndarray, key_count: int,
+               members: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        CSR grouping of members by key, keeping member order within a key.
+
+        Members default to positions in keys; keys of -1 are dropped.
+        """
+        if members is None:
+            members = np.arange(len(keys), dtype=np.int32)
+        valid = keys >= 0
+        keys, members = keys[valid], members[valid]
+        order = np.argsort(keys, kind="stable")
+        offsets = np.zeros(key_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(keys, minlength=key_count), out=offsets[1:])
+        return offsets, members[order]
+
+    @classmethod
+    def from_database(cls, db_path) -> "MedDRAHierarchyCache":
+        """Read meddra_hierarchy from a database."""
+        with get_connection_manager(db_path).read() as conn:
+            df = conn.execute("""
+                SELECT soc_code, soc_name, hlgt_code, hlgt_name, hlt_code, hlt_name,
+                       pt_code, pt_name, llt_code, llt_name
+                FROM meddra_hierarchy
+            """).df()
+        return cls(df)
+
+    def _name(self, name_id: int) -> Optional[str]:
+        return self._names[name_id] if name_id >= 0 else None
+
+    def _term(self, level: str, term_id: int) -> MedDRATerm:
+        return MedDRATerm(
+            code=self._codes[level][term_id],
+            name=self._name(self._name_ids[level][term_id]),
+            level=level
+        )
+
+    def _path_hierarchy(self, path: int, include_llt: bool) -> MedDRAHierarchy:
+        """MedDRAHierarchy for one path; parents are the codes on that path."""
+        terms = {}
+        parent_code = None
+        for depth, level in enumerate(LEVELS if include_llt else LEVELS[:-1]):
+            term_id = self._paths[level][path]
+            code = self._codes[level][term_id] if term_id >= 0 else None
+            name = self._name(self._path_names[depth][path])
+            terms[level.lower()] = MedDRATerm(code=code, name=name, level=level, parent_code=parent_code)
+            parent_code = code
+        return MedDRAHierarchy(**terms)
+
+    def term_id(self, level: str, code: str) -> Optional[int]:
+        """Index of a code within a level (None if absent)."""
+        return self._index[level].get(code)
+
+    def term(self, level: str, code: str) -> Optional[MedDRATerm]:
+        """Term by level and code."""
+        term_id = self.term_id(level, code)
+        return None if term_id is None else self._term(level, term_id)
+
+    def hierarchy_for_pt(self, pt_code: str) -> Optional[MedDRAHierarchy]:
+        """Hierarchy (SOC to PT) for a PT code."""
+        term_id = self.term_id("PT", pt_code)
+        if term_id is None:
+            return None
+        return self._path_hierarchy(self._first_path["PT"][term_id], include_llt=False)
+
+    def hierarchy_for_llt(self, llt_code: str) -> Optional[MedDRAHierarchy]:
+        """Hierarchy (SOC to LLT) for an LLT code."""
+        term_id = self.term_id("LLT", llt_code)
+        if term_id is None:
+            return None
+        return self._path_hierarchy(self._first_path["LLT"][term_id], include_llt=True)
+
+    def hierarchy_for(self, level: str, code: str) -> Optional[MedDRAHierarchy]:
+        """
+        Hierarchy down to a term at any level.
+
+        Levels below the term are blank terms (code and name ""), as returned
+        for SOC search results.
+        """
+        if level == "PT":
+            return self.hierarchy_for_pt(code)
+        if level == "LLT":
+            return self.hierarchy_for_llt(code)
+
+        term_id = self.term_id(level, code)
+        if term_id is None:
+            return None
+        hierarchy = self._path_hierarchy(self._first_path[level][term_id], include_llt=False)
+        for lower in LEVELS[LEVELS.index(level) + 1:-1]:
+            setattr(hierarchy, lower.lower(), MedDRATerm(code="", name="", level=lower))
+        return hierarchy
+
+    def children(self, level: str, code: str) -> List[MedDRATerm]:
+        """Terms one level below a term, in load order."""
+        term_id = self.term_id(level, code)
+        if term_id is None or level == "LLT":
+            return []
+        offsets, members = self._children[level]
+        child_level = LEVELS[LEVELS.index(level) + 1]
+        return [self._term(child_level, c) for c in members[offsets[term_id]:offsets[term_id + 1]]]
+
+    def pts_by_soc(self, soc_code: str) -> List[MedDRATerm]:
+        """PTs on any path under a SOC, ordered by name."""
+        term_id = self.term_id("SOC", soc_code)
+        if term_id is None:
+            return []
+        offsets, members = self._soc_pts
+        return [self._term("PT", p) for p in members[offsets[term_id]:offsets[term_id + 1]]]
+
+    def search_index(self) -> MedDRASearchIndex:
+        """Full-text index over all term names, built on first use."""
+        index = self._search_index
+        if index is None:
+            with self._search_lock:
+                index = self._search_index
+                if index is None:
+                    terms = [
+                        (level, code, self._name(name_id))
+                        for level in LEVELS
+                        for code, name_id in zip(self._codes[level], self._name_ids[level])
+                    ]
+                    index = MedDRASearchIndex(terms, LEVELS)
+                    self._search_index = index
+                    logger.info(f"Built MedDRA search index: {index.get_stats()}")
+        return index
+
+    def get_stats(self) -> Dict[str, int]:
+        """Term counts per level."""
+        stats = {level.lower(): len(self._codes[level]) for level in LEVELS}
+        stats["paths"] = self.path_count
+        stats["names"] = len(self._names)
+        return stats
+
+
+# ============================================================================
+# Process-wide cache registry
+# ============================================================================
+
+# None records a database without MedDRA, so it is not re-queried per lookup
+_caches: Dict[str, Optional[MedDRAHierarchyCache]] = {}
+_caches_lock = threading.Lock()
+
+
+def _cache_key(db_path) -> str:
+    return str(Path(db_path).resolve())
+
+
+def build_hierarchy_cache(db_path) -> MedDRAHierarchyCache:
+    """(Re)build the hierarchy cache for a database from meddra_hierarchy."""
+    cache = MedDRAHierarchyCache.from_database(db_path)
+    with _caches_lock:
+        _caches[_cache_key(db_path)] = cache
+    logger.info(f"Built MedDRA hierarchy cache: {cache.get_stats()}")
+    return cache
+
+
+def get_hierarchy_cache(db_path) -> Optional[MedDRAHierarchyCache]:
+    """
+    Hierarchy cache for a database, built on first use.
+
+    Returns None when MedDRA is not loaded (no meddra_hierarchy table);
+    that answer is cached too, until the loader invalidates it.
+    """
+    key = _cache_key(db_path)
+    with _caches_lock:
+        if key in _caches:
+            return _caches[key]
+
+    if not Path(db_path).exists():
+        return None
+    try:
+        return build_hierarchy_cache(db_path)
+    except duckdb.CatalogException as e:
+        logger.debug(f"MedDRA not loaded in {db_path}: {e}")
+        with _caches_lock:
+            _caches[key] = None
+        return None
+    except Exception as e:
+        logger.debug(f"MedDRA hierarchy cache unavailable for {db_path}: {e}")
+        return None
+
+
+def invalidate_hierarchy_cache(db_path) -> None:
+    """Drop the cached hierarchy for a database (after reload or delete)."""
+    with _caches_lock:
+        _caches.pop(_cache_key(db_path), None)
@@ -26,9 +26,10 @@ from datetime import datetime
 from typing import Optional, Dict, List, Any, Tuple
 from dataclasses import dataclass, asdict
 
-import duckdb
 import pandas as pd
 
+from core.data.connection_manager import get_connection_manager
+
 logger = logging.getLogger(__name__)
 
 # Column mappings for different MedDRA file formats
@@ -136,6 +137,10 @@ class MedDRALoader:
         # Load data
         version = self._load_data(df, str(sas_path))
 
+        # Preload the in-memory hierarchy and search index used by MedDRALookup
+        from .hierarchy import build_hierarchy_cache
+        build_hierarchy_cache(self.db_path).search_index()
+
         # Save status
         self._save_status(version)
 
@@ -159,9 +164,9 @@ class MedDRALoader:
 
     def _create_tables(self):
         """Create MedDRA tables in DuckDB."""
-        conn = duckdb.connect(str(self.db_path))
-
-        try:
+        from .hierarchy import invalidate_hierarchy_cache
+        invalidate_hierarchy_cache(self.db_path)
+        with get_connection_manager(self.db_path, writable=True).write() as conn:
             # Drop existing tables
             conn.execute("DROP TABLE IF EXISTS meddra_hierarchy")
             conn.execute("DROP TABLE IF EXISTS meddra_soc")
@@ -230,14 +235,9 @@ class MedDRALoader:
                 )
             """)
 
-        finally:
-            conn.close()
-
     def _load_data(self, df: pd.DataFrame, file_path: str) -> MedDRAVersion:
         """Load data into DuckDB tables."""
-        conn = duckdb.connect(str(self.db_path))
-
-        try:
+        with get_connection_manager(self.db_path, writable=True).write() as conn:
             # Ensure all required columns exist
             required_cols = ['soc_code', 'soc_name', 'hlgt_code', 'hlgt_name',
                            'hlt_code', 'hlt_name', 'pt_code', 'pt_name']
@@ -347,9 +347,6 @@ class MedDRALoader:
                 file_path=file_path
             )
 
-        finally:
-            conn.close()
-
     def _detect_version(self, file_path: str, df: pd.DataFrame) -> str:
         """Try to detect MedDRA version from filename or data."""
         file_name = Path(file_path).name.lower()
@@ -397,17 +394,16 @@ class MedDRALoader:
 
     def delete_version(self):
         """Delete current MedDRA version."""
-        conn = duckdb.connect(str(self.db_path))
-
-        try:
+        with get_connection_manager(self.db_path, writable=True).write() as conn:
             conn.execute("DROP TABLE IF EXISTS meddra_hierarchy")
             conn.execute("DROP TABLE IF EXISTS meddra_soc")
             conn.execute("DROP TABLE IF EXISTS meddra_hlgt")
             conn.execute("DROP TABLE IF EXISTS meddra_hlt")
             conn.execute("DROP TABLE IF EXISTS meddra_pt")
             conn.execute("DROP TABLE IF EXISTS meddra_llt")
-        finally:
-            conn.close()
+
+        from .hierarchy import invalidate_hierarchy_cache
+        invalidate_hierarchy_cache(self.db_path)
 
         if self.status_path.exists():
             self.status_path.unlink()
@@ -419,15 +415,12 @@ class MedDRALoader:
         if not self.db_path.exists():
             return False
 
-        # Don't use read_only=True as it conflicts with write connections during loading
-        conn = duckdb.connect(str(self.db_path))
         try:
-            result = conn.execute("""
-                SELECT COUNT(*) FROM information_schema.tables
-                WHERE table_name = 'meddra_pt'
-            """).fetchone()
+            with get_connection_manager(self.db_path).read() as conn:
+                result = conn.execute("""
+                    SELECT COUNT(*) FROM information_schema.tables
+                    WHERE table_name = 'meddra_pt'
+                """).fetchone()
             return result[0] > 0
         except Exception:
             return False
-        finally:
-            conn.close()
@@ -15,9 +15,9 @@ from pathlib import Path
 from typing import Optional, List, Dict, Any, Tuple
 from dataclasses import dataclass, asdict
 
-import duckdb
-
 from .loader import MedDRATerm, MedDRAHierarchy
+from .hierarchy import get_hierarchy_cache
+from core.data.connection_manager import get_connection_manager
 
 logger = logging.getLogger(__name__)
 
@@ -79,10 +79,14 @@ class MedDRALookup:
         """
         self.db_path = Path(db_path)
 
-    def _connect(self) -> duckdb.DuckDBPyConnection:
-        """Get database connection."""
-        # Don't use read_only=True as it conflicts with write connections during loading
-        return duckdb.connect(str(self.db_path))
+    def _connect(self):
+        """Read this thread's cursor on the shared database handle."""
+        # The manager shares the handle (and its mode) with MedDRALoader writes
+        return get_connection_manager(self.db_path).read()
+
+    def _hierarchy_cache(self):
+        """In-memory hierarchy for this database (None if MedDRA is not loaded)."""
+        return get_hierarchy_cache(self.db_path)
 
     def _normalize_code(self, code: str) -> str:
         """Normalize code by removing .0 suffix from float conversion."""
@@ -149,9 +153,7 @@ class MedDRALookup:
 
     def _lookup_exact(self, term_upper: str) -> LookupResult:
         """Look up exact term match."""
-        conn = self._connect()
-
-        try:
+        with self._connect() as conn:
             # Check PT first (most common)
             result = conn.execute("""
                 SELECT code, name FROM meddra_pt
@@ -202,32 +204,38 @@ class MedDRALookup:
                 message="No exact match found"
             )
 
-        finally:
-            conn.close()
-
     def search(
         self,
         query: str,
         level: Optional[str] = None,
-        limit: int = 20
+        limit: int = 20,
+        offset: int = 0
     ) -> List[SearchResult]:
         """
         Search for MedDRA terms.
 
+        Uses the in-memory search index when MedDRA is loaded (ranked,
+        typo-tolerant, any level); otherwise LIKE queries over PT/LLT/SOC.
+
         Args:
             query: Search query
-            level: Filter by level (SOC, HLGT, HLT, PT, LLT)
+            level: Filter by level (SOC, HLGT, HLT, PT, LLT); PT and LLT if None
             limit: Maximum results
+            offset: Results to skip (paging)
 
         Returns:
             List of SearchResult
         """
+        cache = self._hierarchy_cache()
+        if cache is not None:
+            return self._search_cached(cache, query, level, limit, offset)
+
         query_upper = query.strip().upper()
         results = []
+        # Each table contributes up to offset + limit rows before the page is cut
+        fetch = offset + limit
 
-        conn = self._connect()
-
-        try:
+        with self._connect() as conn:
             # Search PT level
             if level is None or level == "PT":
                 pts = conn.execute("""
@@ -242,7 +250,7 @@ class MedDRALookup:
                     WHERE name_upper LIKE ?
                     ORDER BY score DESC, name
                     LIMIT ?
-                """, [query_upper, f"{query_upper}%", f"% {query_upper}%", f"%{query_upper}%", limit]).fetchall()
+                """, [query_upper, f"{query_upper}%", f"% {query_upper}%", f"%{query_upper}%", fetch]).fetchall()
 
                 for row in pts:
                     term = MedDRATerm(code=row[0], name=row[1], level="PT")
@@ -267,7 +275,7 @@ class MedDRALookup:
                     WHERE name_upper LIKE ?
                     ORDER BY score DESC, name
                     LIMIT ?
-                """, [query_upper, f"{query_upper}%", f"% {query_upper}%", f"%{query_upper}%", limit]).fetchall()
+                """, [query_upper, f"{query_upper}%", f"% {query_upper}%", f"%{query_upper}%", fetch]).fetchall()
 
                 for row in llts:
                     term = MedDRATerm(code=row[0], name=row[1], level="LLT", parent_code=row[2])
@@ -284,7 +292,7 @@ class MedDRALookup:
                     SELECT code, name FROM meddra_soc
                     WHERE UPPER(name) LIKE ?
                     LIMIT ?
-                """, [f"%{query_upper}%", limit]).fetchall()
+                """, [f"%{query_upper}%", fetch]).fetchall()
 
                 for row in socs:
                     term = MedDRATerm(code=row[0], name=row[1], level="SOC")
@@ -301,18 +309,74 @@ class MedDRALookup:
 
             # Sort by score and limit
             results.sort(key=lambda x: x.match_score, reverse=True)
-            return results[:limit]
+            return results[offset:fetch]
+
+    def _search_cached(self, cache, query: str, level: Optional[str],
+                       limit: int, offset: int) -> List[SearchResult]:
+        """Search through the hierarchy cache's full-text index."""
+        levels = (level,) if level else ("PT", "LLT")
+        results = []
+        for hit_level, code, score in cache.search_index().search(query, levels, limit, offset):
+            hierarchy = cache.hierarchy_for(hit_level, code)
+            # LLT results carry their PT as parent, like the SQL search
+            term = hierarchy.llt if hit_level == "LLT" else cache.term(hit_level, code)
+            results.append(SearchResult(term=term, match_score=score, hierarchy=hierarchy))
+        return results
+
+    def search_exact_many(self, queries: List[str]) -> Dict[str, SearchResult]:
+        """
+        Exact (case-insensitive) PT/LLT matches for several terms in one query.
+
+        For each term this gives the top result search(term, limit=1) would
+        return when the term is an exact PT or LLT name: the PT if one
+        exists, otherwise the LLT.
 
-        finally:
-            conn.close()
+        Args:
+            queries: Terms to match
+
+        Returns:
+            {term upper-cased: SearchResult} for terms with an exact match
+        """
+        names = sorted({q.strip().upper() for q in queries if q and q.strip()})
+        if not names:
+            return {}
+
+        placeholders = ", ".join("?" for _ in names)
+        with self._connect() as conn:
+            rows = conn.execute(f"""
+                SELECT name_upper, code, name, NULL AS pt_code, 'PT' AS level, 0 AS priority
+                FROM meddra_pt
+                WHERE name_upper IN ({placeholders})
+                UNION ALL
+                SELECT name_upper, code, name, pt_code, 'LLT' AS level, 1 AS priority
+                FROM meddra_llt
+                WHERE name_upper IN ({placeholders})
+                ORDER BY priority, name
+            """, names + names).fetchall()
+
+        results: Dict[str, SearchResult] = {}
+        for name_upper, code, name, pt_code, level, _ in rows:
+            if name_upper in results:
+                continue
+            if level == "PT":
+                term = MedDRATerm(code=code, name=name, level="PT")
+                hierarchy = self.get_hierarchy(code)
+            else:
+                term = MedDRATerm(code=code, name=name, level="LLT", parent_code=pt_code)
+                hierarchy = self.get_hierarchy_for_llt(code)
+            results[name_upper] = SearchResult(term=term, match_score=100, hierarchy=hierarchy)
+        return results
 
     def get_hierarchy(self, pt_code: str) -> Optional[MedDRAHierarchy]:
         """Get full hierarchy for a PT code."""
-        conn = self._connect()
         # Normalize code to handle .0 suffix
         pt_code = self._normalize_code(pt_code)
 
-        try:
+        cache = self._hierarchy_cache()
+        if cache is not None:
+            return cache.hierarchy_for_pt(pt_code)
+
+        with self._connect() as conn:
             result = conn.execute("""
                 SELECT
                     soc_code, soc_name,
@@ -334,16 +398,16 @@ class MedDRALookup:
                 pt=MedDRATerm(code=result[6], name=result[7], level="PT", parent_code=result[4])
             )
 
-        finally:
-            conn.close()
-
     def get_hierarchy_for_llt(self, llt_code: str) -> Optional[MedDRAHierarchy]:
         """Get full hierarchy for an LLT code."""
-        conn = self._connect()
         # Normalize code to handle .0 suffix
         llt_code = self._normalize_code(llt_code)
 
-        try:
+        cache = self._hierarchy_cache()
+        if cache is not None:
+            return cache.hierarchy_for_llt(llt_code)
+
+        with self._connect() as conn:
             result = conn.execute("""
                 SELECT
                     h.soc_code, h.soc_name,
@@ -367,16 +431,24 @@ class MedDRALookup:
                 llt=MedDRATerm(code=result[8], name=result[9], level="LLT", parent_code=result[6])
             )
 
-        finally:
-            conn.close()
-
     def get_term_by_code(self, code: str) -> Tuple[Optional[MedDRATerm], Optional[MedDRAHierarchy]]:
         """Get term and hierarchy by code."""
-        conn = self._connect()
         # Normalize code to handle .0 suffix
         code = self._normalize_code(code)
 
-        try:
+        cache = self._hierarchy_cache()
+        if cache is not None:
+            for level in ("PT", "LLT", "SOC", "HLGT", "HLT"):
+                term = cache.term(level, code)
+                if term:
+                    if level == "PT":
+                        return term, cache.hierarchy_for_pt(code)
+                    if level == "LLT":
+                        return term, cache.hierarchy_for_llt(code)
+                    return term, None
+            return None, None
+
+        with self._connect() as conn:
             # Check each level
             for table, level in [
                 ("meddra_pt", "PT"),
@@ -404,16 +476,20 @@ class MedDRALookup:
 
             return None, None
 
-        finally:
-            conn.close()
-
     def get_children(self, code: str) -> Tuple[Optional[MedDRATerm], List[MedDRATerm]]:
         """Get children of a term."""
-        conn = self._connect()
         # Normalize code to handle .0 suffix
         code = self._normalize_code(code)
 
-        try:
+        cache = self._hierarchy_cache()
+        if cache is not None:
+            for level in ("SOC", "HLGT", "HLT", "PT"):
+                parent = cache.term(level, code)
+                if parent:
+                    return parent, cache.children(level, code)
+            return None, []
+
+        with self._connect() as conn:
             # Determine level and get children
             # Check SOC
             result = conn.execute("""
@@ -465,14 +541,9 @@ class MedDRALookup:
 
             return None, []
 
-        finally:
-            conn.close()
-
     def get_all_socs(self) -> List[MedDRATerm]:
         """Get all System Organ Classes."""
-        conn = self._connect()
-
-        try:
+        with self._connect() as conn:
             results = conn.execute("""
                 SELECT code, name, pt_count FROM meddra_soc
                 ORDER BY name
@@ -480,14 +551,9 @@ class MedDRALookup:
 
             return [MedDRATerm(code=r[0], name=r[1], level="SOC") for r in results]
 
-        finally:
-            conn.close()
-
     def get_statistics(self) -> Dict[str, Any]:
         """Get MedDRA statistics."""
-        conn = self._connect()
-
-        try:
+        with self._connect() as conn:
             stats = {
                 "soc": conn.execute("SELECT COUNT(*) FROM meddra_soc").fetchone()[0],
                 "hlgt": conn.execute("SELECT COUNT(*) FROM meddra_hlgt").fetchone()[0],
@@ -509,18 +575,19 @@ class MedDRALookup:
                 "top_socs": [{"name": s[0], "pt_count": s[1]} for s in top_socs]
             }
 
-        finally:
-            conn.close()
-
     def get_pts_by_soc(self, soc_code: str) -> Tuple[Optional[MedDRATerm], List[MedDRATerm]]:
         """
         Get all Preferred Terms (PTs) under a System Organ Class.
         Skips HLGT and HLT levels for simplified browsing.
         """
-        conn = self._connect()
         soc_code = self._normalize_code(soc_code)
 
-        try:
+        cache = self._hierarchy_cache()
+        if cache is not None:
+            soc = cache.term("SOC", soc_code)
+            return (soc, cache.pts_by_soc(soc_code)) if soc else (None, [])
+
+        with self._connect() as conn:
             # Get SOC info
             soc_result = conn.execute("""
                 SELECT code, name FROM meddra_soc WHERE code = ?
@@ -543,17 +610,20 @@ class MedDRALookup:
 
             return soc, pt_terms
 
-        finally:
-            conn.close()
-
     def get_llts_by_pt(self, pt_code: str) -> Tuple[Optional[MedDRATerm], List[MedDRATerm]]:
         """
         Get all Lowest Level Terms (LLTs) under a Preferred Term.
         """
-        conn = self._connect()
         pt_code = self._normalize_code(pt_code)
 
-        try:
+        cache = self._hierarchy_cache()
+        if cache is not None:
+            pt = cache.term("PT", pt_code)
+            if not pt:
+                return None, []
+            return pt, sorted(cache.children("PT", pt_code), key=lambda t: t.name or "")
+
+        with self._connect() as conn:
             # Get PT info
             pt_result = conn.execute("""
                 SELECT code, name FROM meddra_pt WHERE code = ?
@@ -575,6 +645,3 @@ class MedDRALookup:
             llt_terms = [MedDRATerm(code=l[0], name=l[1], level="LLT") for l in llts]
 
             return pt, llt_terms
-
-        finally:
-            conn.close()
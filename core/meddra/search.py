@@ -0,0 +1,268 @@
+# SAGE MedDRA Search Index
+# =========================
+"""
+In-memory full-text index over MedDRA term names.
+
+Every term of every level is indexed as:
+
+- Word tokens, in three sorted token tables (first word, words after a
+  space, all words). Postings are stored in token order, so all terms with
+  a word starting with a prefix form one contiguous slice of a table.
+- Padded character trigrams, as an inverted index (CSR offsets + postings)
+
+A query is answered from these instead of a LIKE scan over meddra_pt and
+meddra_llt. Matches are ranked in tiers compatible with the SQL search:
+
+    100  exact name
+     90  name starts with the query
+     80  a word (after a space) starts with the query
+     70  name contains the query
+     60  every query word starts a word of the name, in any order
+    <60  typo-tolerant: trigram candidates scored with RapidFuzz
+
+Tiers are computed top-down and stop once the requested page is full, so
+the typo-tolerant tier only runs when the others run out. Ties are broken
+by level order, then name. Queries shorter than a trigram only match on
+word prefixes.
+
+Example:
+    index = cache.search_index()
+    hits = index.search("headach", levels=("PT", "LLT"), limit=20)
+"""
+
+import re
+import math
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from rapidfuzz import fuzz, process
+
+# Word tokens within an upper-cased name
+TOKEN_PATTERN = re.compile(r"[A-Z0-9]+")
+
+# Sorts after any character a token can contain
+_PREFIX_END = "\U0010ffff"
+
+_EMPTY = np.empty(0, dtype=np.int64)
+
+
+def trigrams(value: str) -> set:
+    """Padded character trigrams of an upper-cased value."""
+    padded = f"  {value} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TokenTable:
+    """Sorted (token, term id) pairs supporting prefix lookups."""
+
+    def __init__(self, pairs: List[Tuple[str, int]]):
+        pairs.sort()
+        self.tokens = [token for token, _ in pairs]
+        self.postings = np.fromiter((i for _, i in pairs), dtype=np.int64, count=len(pairs))
+
+    def prefix(self, prefix: str) -> np.ndarray:
+        """Terms with a token starting with prefix (ascending, unique)."""
+        lo = bisect_left(self.tokens, prefix)
+        hi = bisect_left(self.tokens, prefix + _PREFIX_END, lo)
+        return np.unique(self.postings[lo:hi])
+
+
+class MedDRASearchIndex:
+    """Token-prefix and trigram index over (level, code, name) terms."""
+
+    # Fraction of the query's trigrams a typo candidate must share
+    TRIGRAM_MIN_OVERLAP = 0.5
+
+    # Most typo candidates scored per query (those sharing the most trigrams)
+    MAX_FUZZY_CANDIDATES = 500
+
+    # Minimum RapidFuzz WRatio for a typo match, and its scale below tier 60
+    FUZZY_THRESHOLD = 75.0
+    FUZZY_WEIGHT = 0.59
+
+    def __init__(self, terms: Sequence[Tuple[str, str, str]], levels: Sequence[str]):
+        """
+        Build the index.
+
+        Args:
+            terms: (level, code, name) for every term; unnamed terms are skipped
+            levels: All levels, in tie-break order
+        """
+        self.levels = tuple(levels)
+        terms = [t for t in terms if t[2]]
+        self.size = len(terms)
+
+        self._level_ids = np.fromiter((self.levels.index(t[0]) for t in terms),
+                                      dtype=np.int8, count=self.size)
+        self._codes = [t[1] for t in terms]
+        self._names = [t[2].upper() for t in terms]
+
+        # Position of each term in (level, name) order, for tie-breaking
+        order = sorted(range(self.size), key=lambda i: (self._level_ids[i], terms[i][2]))
+        self._rank = np.empty(self.size, dtype=np.int64)
+        self._rank[order] = np.arange(self.size)
+
+        self._exact: Dict[str, List[int]] = {}
+        first, after_space, every = [], [], []
+        for i, name in enumerate(self._names):
+            self._exact.setdefault(name, []).append(i)
+            for match in TOKEN_PATTERN.finditer(name):
+                token, start = match.group(), match.start()
+                every.append((token, i))
+                if start == 0:
+                    first.append((token, i))
+                elif name[start - 1] == " ":
+                    after_space.append((token, i))
+        self._first_words = TokenTable(first)
+        self._space_words = TokenTable(after_space)
+        self._words = TokenTable(every)
+
+        # Trigrams: inverted index with per-trigram offsets
+        vocab: Dict[str, int] = {}
+        gram_codes: List[int] = []
+        gram_counts = np.empty(self.size, dtype=np.int64)
+        for i, name in enumerate(self._names):
+            grams = trigrams(name)
+            gram_counts[i] = len(grams)
+            gram_codes.extend(vocab.setdefault(g, len(vocab)) for g in grams)
+
+        codes_np = np.asarray(gram_codes, dtype=np.int64)
+        term_ids = np.repeat(np.arange(self.size, dtype=np.int32), gram_counts)
+        self._vocab = vocab
+        self._gram_postings = term_ids[np.argsort(codes_np, kind="stable")]
+        self._gram_offsets = np.zeros(len(vocab) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(codes_np, minlength=len(vocab)), out=self._gram_offsets[1:])
+
+    def _gram_counts(self, grams) -> Optional[np.ndarray]:
+        """Per-term count of shared trigrams (None if no trigram is indexed)."""
+        postings = [
+            self._gram_postings[self._gram_offsets[code]:self._gram_offsets[code + 1]]
+            for code in (self._vocab.get(g) for g in grams)
+            if code is not None
+        ]
+        if not postings:
+            return None
+        return np.bincount(np.concatenate(postings), minlength=self.size)
+
+    def _substring_ids(self, query: str) -> np.ndarray:
+        """Terms whose name contains the query (queries of 3+ characters)."""
+        grams = {query[i:i + 3] for i in range(len(query) - 2)}
+        if not grams or any(g not in self._vocab for g in grams):
+            return _EMPTY
+        ids = np.flatnonzero(self._gram_counts(grams) == len(grams))
+        return np.array([i for i in ids.tolist() if query in self._names[i]], dtype=np.int64)
+
+    def _word_tiers(self, query: str):
+        """Tiers 100-70 for a single-word query, from the token tables."""
+        yield 100, np.array(self._exact.get(query, []), dtype=np.int64)
+        yield 90, self._first_words.prefix(query)
+        yield 80, self._space_words.prefix(query)
+        yield 70, self._substring_ids(query) if len(query) >= 3 else self._words.prefix(query)
+
+    def _phrase_tiers(self, query: str, words: List[str]):
+        """Tiers 100-60 for any other query, scored per candidate."""
+        word_ids = _EMPTY
+        if words:
+            word_ids = self._words.prefix(words[0])
+            for word in words[1:]:
+                word_ids = np.intersect1d(word_ids, self._words.prefix(word), assume_unique=True)
+
+        tiers: Dict[int, List[int]] = {100: [], 90: [], 80: [], 70: [], 60: []}
+        for i in np.union1d(self._substring_ids(query), word_ids).tolist():
+            name = self._names[i]
+            if name == query:
+                tiers[100].append(i)
+            elif name.startswith(query):
+                tiers[90].append(i)
+            elif f" {query}" in name:
+                tiers[80].append(i)
+            elif query in name:
+                tiers[70].append(i)
+            else:
+                tiers[60].append(i)
+        for score, ids in tiers.items():
+            yield score, np.array(ids, dtype=np.int64)
+
+    def _fuzzy_hits(self, query: str, allowed: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Typo-tolerant matches as (term ids, scores), scored below tier 60."""
+        grams = trigrams(query)
+        counts = self._gram_counts(grams)
+        if counts is None:
+            return _EMPTY, np.empty(0)
+
+        needed = max(1, math.ceil(len(grams) * self.TRIGRAM_MIN_OVERLAP))
+        ids = np.flatnonzero((counts >= needed) & allowed)
+        if len(ids) > self.MAX_FUZZY_CANDIDATES:
+            top = np.argpartition(-counts[ids], self.MAX_FUZZY_CANDIDATES - 1)[:self.MAX_FUZZY_CANDIDATES]
+            ids = ids[top]
+        if not len(ids):
+            return _EMPTY, np.empty(0)
+
+        scores = process.cdist([query], [self._names[i] for i in ids],
+                               scorer=fuzz.WRatio, dtype=np.float64)[0]
+        keep = scores >= self.FUZZY_THRESHOLD
+        return ids[keep], np.round(scores[keep] * self.FUZZY_WEIGHT, 1)
+
+    def search(
+        self,
+        query: str,
+        levels: Optional[Sequence[str]] = None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> List[Tuple[str, str, float]]:
+        """
+        Ranked matches for a query.
+
+        Args:
+            query: Search text (case insensitive)
+            levels: Levels to search (all levels if None)
+            limit: Maximum results
+            offset: Results to skip (paging)
+
+        Returns:
+            List of (level, code, score), best first
+        """
+        query = query.strip().upper()
+        if not query or limit <= 0 or not self.size:
+            return []
+
+        level_ids = [self.levels.index(level) for level in (levels or self.levels)]
+        allowed = np.isin(self._level_ids, level_ids)
+        wanted = offset + limit
+
+        words = TOKEN_PATTERN.findall(query)
+        tiers = self._word_tiers(query) if words == [query] else self._phrase_tiers(query, words)
+
+        # Each term keeps its best tier; stop once the page is full
+        taken = ~allowed
+        found_ids, found_scores = [], []
+        found = 0
+        for score, ids in tiers:
+            ids = ids[~taken[ids]]
+            taken[ids] = True
+            found_ids.append(ids)
+            found_scores.append(np.full(len(ids), float(score)))
+            found += len(ids)
+            if found >= wanted:
+                break
+        else:
+            ids, scores = self._fuzzy_hits(query, ~taken)
+            found_ids.append(ids)
+            found_scores.append(scores)
+
+        ids = np.concatenate(found_ids)
+        scores = np.concatenate(found_scores)
+        page = np.lexsort((self._rank[ids], -scores))[offset:wanted]
+        return [
+            (self.levels[self._level_ids[i]], self._codes[i], float(score))
+            for i, score in zip(ids[page].tolist(), scores[page].tolist())
+        ]
+
+    def get_stats(self) -> Dict[str, int]:
+        """Index sizes."""
+        return {
+            "terms": self.size,
+            "tokens": len(self._words.tokens),
+            "trigrams": len(self._vocab),
+        }
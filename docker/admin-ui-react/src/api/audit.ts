@@ -61,6 +61,8 @@ export interface AuditLogsListResponse {
   page: number;
   page_size: number;
   total_pages: number;
+  total_exact?: boolean;
+  next_cursor?: string | null;
 }
 
 export interface AuditUser {
@@ -70,12 +72,13 @@ export interface AuditUser {
 
 export const auditApi = {
   /**
-   * Get paginated audit logs with filters
+   * Get paginated audit logs with filters (cursor: next_cursor of the previous page)
    */
   getLogs: async (
     filter?: AuditLogFilter,
     page: number = 1,
-    pageSize: number = 50
+    pageSize: number = 50,
+    cursor?: string
   ): Promise<AuditLogsListResponse> => {
     const response = await apiClient.get<AuditLogsListResponse>("/audit/logs", {
       params: {
@@ -89,6 +92,7 @@ export const auditApi = {
         search_text: filter?.searchText,
         page,
         page_size: pageSize,
+        cursor,
       },
     });
     return response.data;
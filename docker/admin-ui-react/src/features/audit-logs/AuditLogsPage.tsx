@@ -33,6 +33,8 @@ export function AuditLogsPage() {
   const [showFilters, setShowFilters] = useState(false);
   const [showExportMenu, setShowExportMenu] = useState(false);
   const [page, setPage] = useState(1);
+  // cursors[i] reads page i + 1 (keyset pagination; page 1 has none)
+  const [cursors, setCursors] = useState<(string | undefined)[]>([undefined]);
   const [selectedLog, setSelectedLog] = useState<AuditLogEntry | null>(null);
   const [queryDetails, setQueryDetails] = useState<QueryAuditDetails | null>(null);
   const [showDetailsModal, setShowDetailsModal] = useState(false);
@@ -40,10 +42,24 @@ export function AuditLogsPage() {
   const toast = useToast();
 
   const { data: logsResponse, isLoading } = useQuery({
-    queryKey: ["auditLogs", filter, page, pageSize],
-    queryFn: () => auditApi.getLogs(filter, page, pageSize),
+    queryKey: ["auditLogs", filter, page, pageSize, cursors[page - 1]],
+    queryFn: () => auditApi.getLogs(filter, page, pageSize, cursors[page - 1]),
   });
 
+  // A new filter starts again from the first page
+  const updateFilter = (next: AuditLogFilter) => {
+    setFilter(next);
+    setPage(1);
+    setCursors([undefined]);
+  };
+
+  const goToNextPage = () => {
+    const next = logsResponse?.next_cursor;
+    if (!next) return;
+    setCursors([...cursors.slice(0, page), next]);
+    setPage(page + 1);
+  };
+
   const { data: actions } = useQuery({
     queryKey: ["auditActions"],
     queryFn: auditApi.getActions,
@@ -195,14 +211,16 @@ export function AuditLogsPage() {
   ];
 
   const clearFilters = () => {
-    setFilter({});
-    setPage(1);
+    updateFilter({});
   };
 
   // Extract logs array from response
   const logs = logsResponse?.logs || [];
   const totalLogs = logsResponse?.total || 0;
   const totalPages = logsResponse?.total_pages || 1;
+  // Large filtered results are counted up to a limit
+  const totalExact = logsResponse?.total_exact ?? true;
+  const totalLabel = `${totalLogs.toLocaleString()}${totalExact ? "" : "+"}`;
 
   return (
     <div className="space-y-5">
@@ -340,7 +358,7 @@ export function AuditLogsPage() {
                 placeholder="Filter by username"
                 value={filter.username || ""}
                 onChange={(e) =>
-                  setFilter({ ...filter, username: e.target.value || undefined })
+                  updateFilter({ ...filter, username: e.target.value || undefined })
                 }
                 className="input"
               />
@@ -350,7 +368,7 @@ export function AuditLogsPage() {
               <select
                 value={filter.action || ""}
                 onChange={(e) =>
-                  setFilter({ ...filter, action: e.target.value || undefined })
+                  updateFilter({ ...filter, action: e.target.value || undefined })
                 }
                 className="select"
               >
@@ -367,7 +385,7 @@ export function AuditLogsPage() {
               <select
                 value={filter.resourceType || ""}
                 onChange={(e) =>
-                  setFilter({ ...filter, resourceType: e.target.value || undefined })
+                  updateFilter({ ...filter, resourceType: e.target.value || undefined })
                 }
                 className="select"
               >
@@ -384,7 +402,7 @@ export function AuditLogsPage() {
               <select
                 value={filter.status || ""}
                 onChange={(e) =>
-                  setFilter({
+                  updateFilter({
                     ...filter,
                     status: e.target.value || undefined,
                   })
@@ -403,7 +421,7 @@ export function AuditLogsPage() {
                 type="date"
                 value={filter.startDate || ""}
                 onChange={(e) =>
-                  setFilter({ ...filter, startDate: e.target.value || undefined })
+                  updateFilter({ ...filter, startDate: e.target.value || undefined })
                 }
                 className="input"
               />
@@ -414,7 +432,7 @@ export function AuditLogsPage() {
                 type="date"
                 value={filter.endDate || ""}
                 onChange={(e) =>
-                  setFilter({ ...filter, endDate: e.target.value || undefined })
+                  updateFilter({ ...filter, endDate: e.target.value || undefined })
                 }
                 className="input"
               />
@@ -426,7 +444,7 @@ export function AuditLogsPage() {
                 placeholder="Search in paths, errors..."
                 value={filter.searchText || ""}
                 onChange={(e) =>
-                  setFilter({ ...filter, searchText: e.target.value || undefined })
+                  updateFilter({ ...filter, searchText: e.target.value || undefined })
                 }
                 className="input"
               />
@@ -442,7 +460,7 @@ export function AuditLogsPage() {
 
       {/* Logs Table */}
       <WPBox
-        title={`Audit Log Entries (${totalLogs.toLocaleString()} total)`}
+        title={`Audit Log Entries (${totalLabel} total)`}
       >
         {isLoading ? (
           <div className="flex items-center justify-center py-8">
@@ -453,11 +471,11 @@ export function AuditLogsPage() {
             <DataTable columns={columns} data={logs} pageSize={logs.length || 50} />
 
             {/* Pagination */}
-            {totalPages > 1 && (
+            {(totalPages > 1 || page > 1) && (
               <div className="flex items-center justify-between mt-4 pt-4 border-t border-gray-200 dark:border-gray-700">
                 <div className="text-sm text-[var(--muted)]">
                   Showing {(page - 1) * pageSize + 1} to{" "}
-                  {Math.min(page * pageSize, totalLogs)} of {totalLogs} entries
+                  {(page - 1) * pageSize + logs.length} of {totalLabel} entries
                 </div>
                 <div className="flex items-center gap-2">
                   <button
@@ -468,12 +486,12 @@ export function AuditLogsPage() {
                     Previous
                   </button>
                   <span className="px-3 py-1 text-sm">
-                    Page {page} of {totalPages}
+                    Page {page}{totalExact && ` of ${totalPages}`}
                   </span>
                   <button
                     className="btn btn-secondary btn-sm"
-                    onClick={() => setPage(page + 1)}
-                    disabled={page >= totalPages}
+                    onClick={goToNextPage}
+                    disabled={!logsResponse?.next_cursor}
                   >
                     Next
                   </button>
@@ -45,6 +45,27 @@ try:
 except ImportError:
     AUDIT_SERVICE_AVAILABLE = False
 
+# Import pipeline worker pool for shutdown
+try:
+    from core.engine.pipeline_pool import shutdown_pipeline_pool
+    PIPELINE_POOL_AVAILABLE = True
+except ImportError:
+    PIPELINE_POOL_AVAILABLE = False
+
+# Import batch parse pool for shutdown
+try:
+    from core.data.batch_processor import shutdown_parse_pool
+    PARSE_POOL_AVAILABLE = True
+except ImportError:
+    PARSE_POOL_AVAILABLE = False
+
+# Import DuckDB connection registry for shutdown
+try:
+    from core.data.connection_manager import close_all_connection_managers
+    DUCKDB_MANAGER_AVAILABLE = True
+except ImportError:
+    DUCKDB_MANAGER_AVAILABLE = False
+
 # Import user migration
 try:
     from core.users import migrate_from_env_user
@@ -81,10 +102,30 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     print("SAGE API shutting down...")
+    if PIPELINE_POOL_AVAILABLE:
+        try:
+            shutdown_pipeline_pool(wait=True)
+        except Exception as e:
+            print(f"Warning: Could not shut down pipeline worker pool: {e}")
+
+    if PARSE_POOL_AVAILABLE:
+        try:
+            shutdown_parse_pool(wait=False)
+        except Exception as e:
+            print(f"Warning: Could not shut down batch parse pool: {e}")
+
+    if DUCKDB_MANAGER_AVAILABLE:
+        try:
+            close_all_connection_managers()
+        except Exception as e:
+            print(f"Warning: Could not close DuckDB connections: {e}")
+
     if AUDIT_SERVICE_AVAILABLE:
         try:
             audit_service = get_audit_service()
             audit_service.log_system_shutdown(reason="normal")
+            # Write events still queued for the background writer
+            audit_service.close()
         except Exception as e:
             print(f"Warning: Could not log shutdown to audit: {e}")
 
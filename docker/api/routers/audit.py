@@ -4,15 +4,18 @@
 Audit log endpoints for 21 CFR Part 11 compliance.
 
 Provides:
-- Audit log search and retrieval
+- Audit log search (cursor pagination, full-text search) and retrieval
 - Statistics and reporting
 - Excel/PDF/CSV export
-- Integrity verification
+- Integrity verification (single records and the whole hash chain)
 - Electronic signatures
+- Background writer metrics
 """
 
 import os
 import sys
+import time
+import asyncio
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, List
@@ -25,7 +28,7 @@ from fastapi.responses import FileResponse
 project_root = Path(os.environ.get('APP_ROOT', '/app'))
 sys.path.insert(0, str(project_root))
 
-from .auth import get_current_user
+from .auth import get_current_user, require_permission
 
 # Import audit service
 try:
@@ -36,6 +39,7 @@ try:
         AuditStatistics,
         QueryAuditDetails,
         IntegrityCheckResult,
+        ChainVerificationResult,
         ElectronicSignature,
     )
     AUDIT_AVAILABLE = True
@@ -45,6 +49,12 @@ except ImportError as e:
 
 router = APIRouter()
 
+# Whole-chain verification reads every row: one run at a time, and at most
+# one run per interval
+VERIFY_CHAIN_INTERVAL = float(os.getenv("AUDIT_VERIFY_CHAIN_INTERVAL", "60"))
+_verify_chain_lock = asyncio.Lock()
+_verify_chain_last: Optional[float] = None
+
 
 # ============================================================================
 # Response Models
@@ -86,6 +96,8 @@ class AuditLogsListResponse(BaseModel):
     page: int
     page_size: int
     total_pages: int
+    total_exact: bool = True
+    next_cursor: Optional[str] = None
 
 
 class AuditStatisticsResponse(BaseModel):
@@ -197,12 +209,15 @@ async def get_audit_logs(
     search_text: Optional[str] = Query(None, description="Search in paths and error messages"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(50, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page (faster than page)"),
     current_user: dict = Depends(get_current_user)
 ):
     """
     Get paginated audit logs with filters.
 
     Returns a list of audit log entries matching the specified filters.
+    Pass the response's next_cursor to get the following page; total is a
+    lower bound when total_exact is false.
     """
     check_audit_available()
 
@@ -217,19 +232,26 @@ async def get_audit_logs(
         search_text=search_text,
         page=page,
         page_size=page_size,
+        cursor=cursor,
     )
 
     audit_service = get_audit_service()
-    logs, total = audit_service.search_logs(filters)
+    try:
+        result = await asyncio.to_thread(audit_service.search_logs_page, filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
+    total = result.total
     total_pages = (total + page_size - 1) // page_size if total > 0 else 1
 
     return AuditLogsListResponse(
-        logs=[log_to_response(log) for log in logs],
+        logs=[log_to_response(log) for log in result.logs],
         total=total,
         page=page,
         page_size=page_size,
         total_pages=total_pages,
+        total_exact=result.total_exact,
+        next_cursor=result.next_cursor,
     )
 
 
@@ -376,6 +398,56 @@ async def get_available_resource_types(
     return audit_service.get_available_resource_types()
 
 
+@router.get("/writer")
+async def get_writer_stats(
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Get background audit writer metrics.
+
+    Returns queue size, lag of the oldest unwritten event, batch sizes,
+    and counts of written, failed and dropped events.
+    """
+    check_audit_available()
+
+    audit_service = get_audit_service()
+    return audit_service.get_writer_stats()
+
+
+@router.get("/verify-chain", response_model=ChainVerificationResult)
+async def verify_audit_chain(
+    resume: bool = Query(True, description="Start after the last verified checkpoint"),
+    current_user: dict = Depends(require_permission("user_admin"))
+):
+    """
+    Verify the hash chain of the whole audit trail.
+
+    Recomputes every row's checksum and chain link in parallel and records
+    checkpoints, so later runs only verify the rows added since.
+
+    Requires audit access (user_admin). Runs one at a time and at most once
+    per AUDIT_VERIFY_CHAIN_INTERVAL seconds; otherwise returns 429.
+    """
+    global _verify_chain_last
+    check_audit_available()
+
+    retry_after = 0.0
+    if _verify_chain_last is not None:
+        retry_after = VERIFY_CHAIN_INTERVAL - (time.monotonic() - _verify_chain_last)
+    if _verify_chain_lock.locked() or retry_after > 0:
+        raise HTTPException(
+            status_code=429,
+            detail={"code": "TOO_MANY_REQUESTS",
+                    "message": "Audit chain verification already ran recently or is running"},
+            headers={"Retry-After": str(max(1, int(retry_after + 0.5)))}
+        )
+
+    async with _verify_chain_lock:
+        _verify_chain_last = time.monotonic()
+        audit_service = get_audit_service()
+        return await asyncio.to_thread(audit_service.verify_chain, resume)
+
+
 @router.get("/logs/{log_id}/verify", response_model=IntegrityCheckResponse)
 async def verify_audit_integrity(
     log_id: int,
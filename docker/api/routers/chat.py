@@ -16,7 +16,7 @@ from typing import Optional, List, Dict, Any
 from pathlib import Path
 
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query, Request
-from fastapi.responses import StreamingResponse
+from fastapi.responses import StreamingResponse, Response
 from pydantic import BaseModel
 
 # Import auth dependency
@@ -33,9 +33,14 @@ try:
         PipelineConfig,
         create_pipeline,
         PipelineResult,
-        get_confidence_color
+        get_confidence_color,
+        get_pipeline_pool,
+        PipelineSaturatedError
     )
     from core.engine.clinical_naming import get_naming_service, ClinicalNamingService
+    from core.engine.columnar import (
+        ARROW_AVAILABLE, ARROW_STREAM_MEDIA_TYPE, json_default, rows_for_json, to_arrow_ipc
+    )
     PIPELINE_AVAILABLE = True
 except ImportError as e:
     PIPELINE_AVAILABLE = False
@@ -207,14 +212,16 @@ def get_pipeline() -> Optional[InferencePipeline]:
             db_path = os.getenv("DUCKDB_PATH", "/app/data/clinical.duckdb")
             metadata_path = os.getenv("METADATA_PATH", "/app/knowledge/golden_metadata.json")
             use_mock = os.getenv("USE_MOCK_PIPELINE", "false").lower() == "true"
+            single_shot = os.getenv("PIPELINE_SINGLE_SHOT", "false").lower() == "true"
+            columnar = os.getenv("PIPELINE_COLUMNAR_RESULTS", "false").lower() == "true"
 
             # Factory 3 fuzzy index path
             knowledge_dir = os.getenv("KNOWLEDGE_DIR", "/app/knowledge")
-            fuzzy_index_path = os.path.join(knowledge_dir, "fuzzy_index.pkl")
+            fuzzy_index_path = os.path.join(knowledge_dir, "fuzzy_index.idx")
 
-            # Get available tables and shared connection to avoid lock conflicts
-            from routers.data import get_duckdb_connection
-            db_conn = get_duckdb_connection()
+            # Get available tables and the shared connection manager to avoid lock conflicts
+            from routers.data import get_duckdb_manager
+            db_manager = get_duckdb_manager()
             available_tables = get_available_tables_from_connection()
 
             _pipeline_instance = create_pipeline(
@@ -224,7 +231,9 @@ def get_pipeline() -> Optional[InferencePipeline]:
                 fuzzy_index_path=fuzzy_index_path,
                 auto_load_factory3=True,  # Enable Factory 3/3.5 integration
                 available_tables=available_tables,
-                db_connection=db_conn
+                db_connection_manager=db_manager,
+                enable_single_shot=single_shot,
+                enable_columnar_results=columnar
             )
             logger.info("Inference pipeline initialized successfully with Claude + Factory 3/3.5")
         except Exception as e:
@@ -236,6 +245,58 @@ def get_pipeline() -> Optional[InferencePipeline]:
     return _pipeline_instance
 
 
+def reserve_pipeline_slot(user_id: str):
+    """
+    Reserve a worker pool slot for a pipeline query.
+
+    Raises HTTP 429 with a Retry-After header when the pool or the user's
+    concurrency limit is saturated. Must be called before any response
+    (including SSE streams) has started.
+    """
+    try:
+        return get_pipeline_pool().reserve(user_id)
+    except PipelineSaturatedError as e:
+        logger.warning(f"Pipeline saturated for user {user_id}: {e}")
+        raise HTTPException(
+            status_code=429,
+            detail={"code": "TOO_MANY_REQUESTS", "message": str(e), "reason": e.reason},
+            headers={"Retry-After": str(e.retry_after)}
+        )
+
+
+class PipelineStreamingResponse(StreamingResponse):
+    """
+    SSE response holding a reserved pipeline slot.
+
+    The slot is returned when the response ends, however it ends: a client
+    that disconnects before the first event never runs the generator (or its
+    finally block), and Starlette skips background tasks on a disconnect.
+    Releasing is a no-op once the query has been submitted to the pool.
+    """
+
+    def __init__(self, content, ticket=None, **kwargs):
+        super().__init__(content, **kwargs)
+        self.ticket = ticket
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            if self.ticket:
+                self.ticket.release()
+
+
+async def run_pipeline_query(pipeline, ticket, query: str, conv_id: str) -> PipelineResult:
+    """Run pipeline.process_with_session on the worker pool, off the event loop."""
+    return await get_pipeline_pool().run(
+        ticket.user_id,
+        pipeline.process_with_session,
+        query,
+        session_id=conv_id,
+        ticket=ticket
+    )
+
+
 def get_client_ip(request: Request) -> str:
     """Extract client IP address from request."""
     # Check for forwarded headers (behind proxy)
@@ -267,7 +328,9 @@ def log_audit_event(
     """
     Log an audit event for compliance.
 
-    Returns the audit log ID from the persistent store if available.
+    The persistent record (with query details, if any) is queued for the
+    background audit writer, so None is returned unless async audit writes
+    are disabled.
     """
     event = {
         "id": str(uuid.uuid4()),
@@ -290,7 +353,7 @@ def log_audit_event(
     if audit_path:
         try:
             with open(audit_path, "a") as f:
-                f.write(json.dumps(event) + "\n")
+                f.write(json.dumps(event, default=json_default) + "\n")
         except Exception as e:
             logger.error(f"Failed to write audit log: {e}")
 
@@ -307,7 +370,12 @@ def log_audit_event(
             elif result and isinstance(result, dict):
                 duration_ms = result.get("execution_time_ms")
 
-            # Log query to persistent store
+            # Detailed query information, written together with the query event
+            details = None
+            if pipeline_result is not None:
+                details = build_query_audit_details(query, pipeline_result)
+
+            # Queue query for the persistent store
             audit_id = audit_service.log_query(
                 user_id=user_id,
                 username=user_id,
@@ -316,31 +384,26 @@ def log_audit_event(
                 error_message=error,
                 duration_ms=duration_ms,
                 ip_address=ip_address,
-                resource_id=resource_id
+                resource_id=resource_id,
+                details=details,
+                background=True
             )
 
-            # If we have a pipeline result, log the detailed query information
-            if audit_id and pipeline_result is not None:
-                log_query_details_to_audit(audit_id, query, pipeline_result)
-
         except Exception as e:
             logger.warning(f"Failed to log to persistent audit: {e}")
 
     return audit_id
 
 
-def log_query_details_to_audit(
-    audit_id: int,
+def build_query_audit_details(
     original_question: str,
     pipeline_result: Any
-) -> None:
-    """Log detailed query/LLM information to the persistent audit store."""
+) -> Optional["QueryAuditDetails"]:
+    """Collect detailed query/LLM information for the persistent audit store."""
     if not AUDIT_AVAILABLE:
-        return
+        return None
 
     try:
-        audit_service = get_audit_service()
-
         # Extract details from pipeline result
         details = QueryAuditDetails(
             original_question=original_question,
@@ -399,14 +462,15 @@ def log_query_details_to_audit(
             if isinstance(conf, dict) and "breakdown" in conf:
                 details.confidence_breakdown = json.dumps(conf["breakdown"])
 
-        audit_service.log_query_details(audit_id, details)
+        return details
 
     except Exception as e:
-        logger.warning(f"Failed to log query details to audit: {e}")
+        logger.warning(f"Failed to collect query details for audit: {e}")
+        return None
 
 
-def format_pipeline_response(result: PipelineResult) -> Dict[str, Any]:
-    """Format pipeline result for API response."""
+def format_pipeline_response(result: PipelineResult, include_data: bool = True) -> Dict[str, Any]:
+    """Format pipeline result for API response (rows omitted if include_data is False)."""
     response = {
         "success": result.success,
         "answer": result.answer,
@@ -415,7 +479,8 @@ def format_pipeline_response(result: PipelineResult) -> Dict[str, Any]:
 
     # Add data if present
     if result.data:
-        response["data"] = result.data
+        if include_data:
+            response["data"] = rows_for_json(result.data)
         response["row_count"] = result.row_count
         columns = list(result.data[0].keys()) if result.data else []
         response["columns"] = columns
@@ -466,6 +531,31 @@ def format_pipeline_response(result: PipelineResult) -> Dict[str, Any]:
     return response
 
 
+def arrow_query_response(result: PipelineResult, formatted: Dict[str, Any],
+                         conversation_id: str, message_id: str) -> Response:
+    """
+    Query result as an Arrow IPC stream.
+
+    The rows are the IPC body; the rest of the formatted response is JSON in
+    the schema metadata under "sage".
+    """
+    details = {**formatted, "conversation_id": conversation_id, "message_id": message_id}
+    body = to_arrow_ipc(
+        result.data,
+        columns=formatted.get("columns"),
+        metadata={"sage": json.dumps(details, default=json_default)}
+    )
+    return Response(
+        content=body,
+        media_type=ARROW_STREAM_MEDIA_TYPE,
+        headers={
+            "X-Row-Count": str(result.row_count),
+            "X-Conversation-Id": conversation_id,
+            "X-Message-Id": message_id
+        }
+    )
+
+
 def get_confidence_color_name(level: str) -> str:
     """Get color name for confidence level."""
     colors = {
@@ -649,11 +739,16 @@ async def send_message(
     user_id = current_user.get("sub", "anonymous")
     client_ip = get_client_ip(request)
 
+    if data.conversation_id and data.conversation_id not in conversations_db:
+        raise HTTPException(status_code=404, detail="Conversation not found")
+
+    # Reserve a worker slot before touching conversation state (429 when saturated)
+    pipeline = get_pipeline()
+    ticket = reserve_pipeline_slot(user_id) if pipeline else None
+
     # Create or get conversation
     if data.conversation_id:
         conv_id = data.conversation_id
-        if conv_id not in conversations_db:
-            raise HTTPException(status_code=404, detail="Conversation not found")
     else:
         conv_id = str(uuid.uuid4())
         now = datetime.now().isoformat()
@@ -675,14 +770,13 @@ async def send_message(
     messages_db[conv_id].append(user_msg)
 
     # Process through InferencePipeline
-    pipeline = get_pipeline()
     metadata = {}
 
     if pipeline:
         # Use the inference pipeline for clinical data queries
         try:
             # Pass conversation ID for session context (enables follow-up questions)
-            result = pipeline.process_with_session(data.message, session_id=conv_id)
+            result = await run_pipeline_query(pipeline, ticket, data.message, conv_id)
 
             # Log audit event with full pipeline details
             log_audit_event(
@@ -722,7 +816,7 @@ async def send_message(
                 "confidence": result.confidence,
                 "methodology": result.methodology,
                 "sql": result.sql,  # Available in Details for technical users
-                "data": result.data,
+                "data": rows_for_json(result.data),
                 "row_count": result.row_count,
                 "columns": columns,
                 "column_labels": column_labels,
@@ -779,11 +873,16 @@ async def send_message_stream(
     user_id = current_user.get("sub", "anonymous")
     client_ip = get_client_ip(request)
 
+    if data.conversation_id and data.conversation_id not in conversations_db:
+        raise HTTPException(status_code=404, detail="Conversation not found")
+
+    # Reserve a worker slot before touching conversation state (429 when saturated)
+    pipeline = get_pipeline()
+    ticket = reserve_pipeline_slot(user_id) if pipeline else None
+
     # Create or get conversation
     if data.conversation_id:
         conv_id = data.conversation_id
-        if conv_id not in conversations_db:
-            raise HTTPException(status_code=404, detail="Conversation not found")
     else:
         conv_id = str(uuid.uuid4())
         now = datetime.now().isoformat()
@@ -812,16 +911,14 @@ async def send_message_stream(
         metadata = {}
 
         try:
-            pipeline = get_pipeline()
-
             if pipeline:
                 # Send processing status
                 yield f"data: {json.dumps({'type': 'status', 'status': 'Processing query...'})}\n\n"
                 await asyncio.sleep(0)
 
-                # Process through pipeline (not streaming - pipeline returns complete result)
+                # Process through pipeline on the worker pool (pipeline returns complete result)
                 # Pass conversation ID for session context (enables follow-up questions)
-                result = pipeline.process_with_session(data.message, session_id=conv_id)
+                result = await run_pipeline_query(pipeline, ticket, data.message, conv_id)
 
                 # Log audit event with full pipeline details
                 log_audit_event(
@@ -850,7 +947,7 @@ async def send_message_stream(
                     "confidence": result.confidence,
                     "methodology": result.methodology,
                     "sql": result.sql,
-                    "data": result.data,
+                    "data": rows_for_json(result.data),
                     "row_count": result.row_count,
                     "warnings": result.warnings,
                     "execution_time_ms": result.total_time_ms,
@@ -900,8 +997,14 @@ async def send_message_stream(
             logger.error(f"Stream error: {e}")
             yield f"data: {json.dumps({'type': 'error', 'error': str(e)})}\n\n"
 
-    return StreamingResponse(
+        finally:
+            # Free the slot if the stream ended before the query was submitted
+            if ticket:
+                ticket.release()
+
+    return PipelineStreamingResponse(
         event_generator(),
+        ticket=ticket,
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -956,6 +1059,7 @@ class QueryRequest(BaseModel):
     query: str
     conversation_id: Optional[str] = None
     use_pipeline: bool = True  # Use inference pipeline vs direct LLM
+    format: str = "json"  # "json" or "arrow" (Arrow IPC stream of the result rows)
 
 
 class QueryResponse(BaseModel):
@@ -1003,15 +1107,31 @@ async def execute_query(
     - SQL query used
     - Confidence score with explanation
     - Methodology transparency
+
+    With format="arrow" the rows are returned as an Arrow IPC stream
+    (application/vnd.apache.arrow.stream) and the other fields as JSON in the
+    schema metadata.
     """
     user_id = current_user.get("sub", "anonymous")
     client_ip = get_client_ip(http_request)
 
+    if request.format not in ("json", "arrow"):
+        raise HTTPException(status_code=400, detail="format must be 'json' or 'arrow'")
+    if request.format == "arrow" and not ARROW_AVAILABLE:
+        raise HTTPException(status_code=501, detail="Arrow output requires pyarrow")
+
+    if request.conversation_id and request.conversation_id not in conversations_db:
+        raise HTTPException(status_code=404, detail="Conversation not found")
+
+    # Reserve a worker slot before touching conversation state (429 when saturated)
+    pipeline = get_pipeline()
+    ticket = None
+    if pipeline is not None and request.use_pipeline:
+        ticket = reserve_pipeline_slot(user_id)
+
     # Get or create conversation (moved up to have conv_id for audit)
     if request.conversation_id:
         conv_id = request.conversation_id
-        if conv_id not in conversations_db:
-            raise HTTPException(status_code=404, detail="Conversation not found")
     else:
         conv_id = str(uuid.uuid4())
         now = datetime.now().isoformat()
@@ -1041,9 +1161,6 @@ async def execute_query(
     }
     messages_db[conv_id].append(user_msg)
 
-    # Get pipeline
-    pipeline = get_pipeline()
-
     if pipeline is None or not request.use_pipeline:
         # Fall back to direct Claude if pipeline not available
         logger.warning("Pipeline not available, falling back to direct Claude")
@@ -1083,8 +1200,8 @@ async def execute_query(
     # Execute through pipeline
     try:
         # Pass conversation ID for session context (enables follow-up questions)
-        result = pipeline.process_with_session(request.query, session_id=conv_id)
-        formatted = format_pipeline_response(result)
+        result = await run_pipeline_query(pipeline, ticket, request.query, conv_id)
+        formatted = format_pipeline_response(result, include_data=request.format == "json")
 
         # Add assistant message with full metadata
         message_id = str(uuid.uuid4())
@@ -1121,11 +1238,14 @@ async def execute_query(
             resource_id=conv_id
         )
 
+        if request.format == "arrow":
+            return arrow_query_response(result, formatted, conv_id, message_id)
+
         return QueryResponse(
             success=result.success,
             answer=result.answer,
             query=result.query,
-            data=result.data,
+            data=formatted.get("data") or rows_for_json(result.data),
             row_count=result.row_count,
             columns=formatted.get("columns"),
             column_labels=formatted.get("column_labels"),
@@ -1173,11 +1293,16 @@ async def execute_query_stream(
     user_id = current_user.get("sub", "anonymous")
     client_ip = get_client_ip(http_request)
 
+    if request.conversation_id and request.conversation_id not in conversations_db:
+        raise HTTPException(status_code=404, detail="Conversation not found")
+
+    # Reserve a worker slot before the stream starts (429 when saturated)
+    pipeline = get_pipeline()
+    ticket = reserve_pipeline_slot(user_id) if pipeline else None
+
     # Get or create conversation
     if request.conversation_id:
         conv_id = request.conversation_id
-        if conv_id not in conversations_db:
-            raise HTTPException(status_code=404, detail="Conversation not found")
     else:
         conv_id = str(uuid.uuid4())
         now = datetime.now().isoformat()
@@ -1201,7 +1326,6 @@ async def execute_query_stream(
     async def event_generator():
         """Generate SSE events for pipeline execution."""
         message_id = str(uuid.uuid4())
-        pipeline = get_pipeline()
 
         try:
             # Send start event
@@ -1247,9 +1371,9 @@ async def execute_query_stream(
                 yield f"data: {json.dumps({'type': 'stage', 'stage': stage_id, 'message': stage_msg})}\n\n"
                 await asyncio.sleep(0.05)  # Small delay for UI feedback
 
-            # Execute pipeline (blocking)
+            # Execute pipeline on the worker pool
             # Pass conversation ID for session context (enables follow-up questions)
-            result = pipeline.process_with_session(request.query, session_id=conv_id)
+            result = await run_pipeline_query(pipeline, ticket, request.query, conv_id)
 
             # Stream the answer
             yield f"data: {json.dumps({'type': 'content', 'content': result.answer})}\n\n"
@@ -1299,8 +1423,14 @@ async def execute_query_stream(
             )
             yield f"data: {json.dumps({'type': 'error', 'error': str(e)})}\n\n"
 
-    return StreamingResponse(
+        finally:
+            # Free the slot if the stream ended before the query was submitted
+            if ticket:
+                ticket.release()
+
+    return PipelineStreamingResponse(
         event_generator(),
+        ticket=ticket,
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -1322,10 +1452,13 @@ async def get_pipeline_status(current_user: dict = Depends(get_current_user)):
         }
 
     status = pipeline.is_ready()
+    intent_classifier = getattr(pipeline, "intent_classifier", None)
     return {
         "available": True,
         "components": status,
-        "ready": all(status.values())
+        "ready": all(status.values()),
+        "worker_pool": get_pipeline_pool().get_stats(),
+        "intent_classifier": intent_classifier.get_stats() if intent_classifier else None
     }
 
 
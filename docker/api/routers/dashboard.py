@@ -5,11 +5,16 @@
 import os
 import sys
 import json
+import time
+import asyncio
+import logging
 import sqlite3
 import shutil
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Callable, Tuple
 
 from fastapi import APIRouter, HTTPException, Query, Depends
 
@@ -21,14 +26,22 @@ from .auth import get_current_user
 from .data import get_duckdb_connection
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 # Configuration
 DATA_DIR = Path(os.getenv("DATA_DIR", project_root / "data"))
 KNOWLEDGE_DIR = Path(os.getenv("KNOWLEDGE_DIR", project_root / "knowledge"))
 
 
+# Audit actions counted as queries
+QUERY_ACTIONS = ('QUERY', 'chat_query', 'query')
+
+# Days of queries behind the averages, confidence distribution and top tables
+QUERY_STATS_DAYS = 30
+
+
 def _get_audit_stats() -> Dict[str, Any]:
-    """Get query statistics from audit database."""
+    """Get query statistics from the audit rollups."""
     audit_db_path = DATA_DIR / "audit.db"
 
     if not audit_db_path.exists():
@@ -42,84 +55,35 @@ def _get_audit_stats() -> Dict[str, Any]:
         }
 
     try:
-        conn = sqlite3.connect(str(audit_db_path))
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+        from core.audit import get_audit_service
+        audit_service = get_audit_service()
 
-        # Get today's date range
+        # Day-aligned ranges read whole-day rollup rows only
         today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        today_iso = today_start.isoformat()
-
-        # Queries today (count chat/query actions - uppercase QUERY)
-        cursor.execute("""
-            SELECT COUNT(*) as count FROM audit_logs
-            WHERE action IN ('QUERY', 'chat_query', 'query')
-            AND timestamp >= ?
-        """, (today_iso,))
-        queries_today = cursor.fetchone()["count"]
-
-        # Total queries
-        cursor.execute("""
-            SELECT COUNT(*) as count FROM audit_logs
-            WHERE action IN ('QUERY', 'chat_query', 'query')
-        """)
-        queries_total = cursor.fetchone()["count"]
-
-        # Average confidence score (from query_audit_details table - joined by audit_log_id)
-        cursor.execute("""
-            SELECT qad.confidence_score, qad.execution_time_ms
-            FROM query_audit_details qad
-            JOIN audit_logs al ON qad.audit_log_id = al.id
-            WHERE al.action IN ('QUERY', 'chat_query', 'query')
-            AND qad.confidence_score IS NOT NULL
-            ORDER BY al.timestamp DESC
-            LIMIT 100
-        """)
-
-        confidence_scores = []
-        execution_times = []
-        for row in cursor.fetchall():
-            if row["confidence_score"] is not None:
-                confidence_scores.append(float(row["confidence_score"]))
-            if row["execution_time_ms"] is not None:
-                execution_times.append(float(row["execution_time_ms"]))
-
-        avg_confidence = sum(confidence_scores) / len(confidence_scores) if confidence_scores else 0
-        avg_execution_time = sum(execution_times) / len(execution_times) if execution_times else 0
-
-        # Confidence distribution
-        high = sum(1 for c in confidence_scores if c >= 90)
-        medium = sum(1 for c in confidence_scores if 70 <= c < 90)
-        low = sum(1 for c in confidence_scores if c < 70)
-        total_scores = len(confidence_scores) or 1
-
-        # Top tables queried (from query_audit_details table)
-        cursor.execute("""
-            SELECT qad.tables_accessed
-            FROM query_audit_details qad
-            JOIN audit_logs al ON qad.audit_log_id = al.id
-            WHERE al.action IN ('QUERY', 'chat_query', 'query')
-            AND qad.tables_accessed IS NOT NULL
-            ORDER BY al.timestamp DESC
-            LIMIT 500
-        """)
-
-        table_counts = {}
-        for row in cursor.fetchall():
-            try:
-                # tables_accessed is stored as JSON string like '["ADSL"]'
-                tables_str = row["tables_accessed"]
-                if tables_str:
-                    tables = json.loads(tables_str) if tables_str.startswith('[') else [tables_str]
-                    for table in tables:
-                        if table:
-                            table_counts[table] = table_counts.get(table, 0) + 1
-            except (json.JSONDecodeError, ValueError):
-                pass
-
-        top_tables = [{"table": k, "count": v} for k, v in sorted(table_counts.items(), key=lambda x: x[1], reverse=True)[:5]]
-
-        conn.close()
+        recent_start = today_start - timedelta(days=QUERY_STATS_DAYS)
+
+        actions_today = audit_service.get_rollup_totals(['action'], start_date=today_start)['action']
+        actions_total = audit_service.get_rollup_totals(['action'])['action']
+        recent = audit_service.get_rollup_totals(
+            ['confidence', 'query_time', 'table'], start_date=recent_start
+        )
+
+        queries_today = sum(actions_today[a].events for a in QUERY_ACTIONS if a in actions_today)
+        queries_total = sum(actions_total[a].events for a in QUERY_ACTIONS if a in actions_total)
+
+        confidence = recent['confidence']
+        confidence_measured = sum(bucket.measure_count for bucket in confidence.values())
+        avg_confidence = (
+            sum(bucket.measure_sum for bucket in confidence.values()) / confidence_measured
+            if confidence_measured else 0
+        )
+        timed = sum(bucket.measure_count for bucket in recent['query_time'].values())
+        avg_execution_time = (
+            sum(bucket.measure_sum for bucket in recent['query_time'].values()) / timed if timed else 0
+        )
+
+        tables = sorted(recent['table'].items(), key=lambda item: (-item[1].events, item[0]))[:5]
+        top_tables = [{"table": table, "count": total.events} for table, total in tables]
 
         return {
             "today": queries_today,
@@ -127,9 +91,8 @@ def _get_audit_stats() -> Dict[str, Any]:
             "avg_confidence": round(avg_confidence, 1),
             "avg_execution_time_ms": round(avg_execution_time, 1),
             "confidence_distribution": {
-                "high": high,
-                "medium": medium,
-                "low": low
+                level: confidence[level].events if level in confidence else 0
+                for level in ("high", "medium", "low")
             },
             "top_tables": top_tables
         }
@@ -253,7 +216,12 @@ def _get_user_stats() -> Dict[str, Any]:
 
 
 def _get_data_stats() -> Dict[str, Any]:
-    """Get data statistics from DuckDB using shared connection."""
+    """
+    Get data statistics from the DuckDB catalog using the shared connection.
+
+    Row counts are the catalog's estimated_size (exact after a load, not
+    reduced by deletes), so no table is scanned.
+    """
     try:
         conn = get_duckdb_connection()
         if conn is None:
@@ -265,42 +233,38 @@ def _get_data_stats() -> Dict[str, Any]:
                 "error": "DuckDB connection not available"
             }
 
-        # Get table list
-        tables_result = conn.execute("SHOW TABLES").fetchall()
+        # Own cursor: the other dashboard sections run in parallel threads
+        cursor = conn.cursor()
+        try:
+            catalog = cursor.execute("""
+                SELECT table_name, estimated_size, column_count
+                FROM duckdb_tables()
+                WHERE schema_name = 'main' AND NOT internal AND NOT temporary
+            """).fetchall()
+        finally:
+            cursor.close()
+
         tables = []
         total_rows = 0
         total_columns = 0
 
-        for (table_name,) in tables_result:
+        for table_name, row_count, col_count in catalog:
             if table_name.startswith("_"):
                 continue
-            try:
-                count_result = conn.execute(f'SELECT COUNT(*) FROM "{table_name}"').fetchone()
-                row_count = count_result[0] if count_result else 0
-
-                cols_result = conn.execute(f'DESCRIBE "{table_name}"').fetchall()
-                col_count = len(cols_result)
+            row_count = row_count or 0
+            col_count = col_count or 0
 
-                # Estimate table size (rough approximation)
-                size_kb = int((row_count * col_count * 20) / 1024)  # ~20 bytes per cell average
+            # Estimate table size (rough approximation)
+            size_kb = int((row_count * col_count * 20) / 1024)  # ~20 bytes per cell average
 
-                tables.append({
-                    "name": table_name,
-                    "rows": row_count,
-                    "columns": col_count,
-                    "size_kb": size_kb
-                })
-                total_rows += row_count
-                total_columns += col_count
-            except Exception:
-                tables.append({
-                    "name": table_name,
-                    "rows": 0,
-                    "columns": 0,
-                    "size_kb": 0
-                })
-
-        # Don't close - using shared connection
+            tables.append({
+                "name": table_name,
+                "rows": row_count,
+                "columns": col_count,
+                "size_kb": size_kb
+            })
+            total_rows += row_count
+            total_columns += col_count
 
         # Sort by row count descending
         tables.sort(key=lambda x: x["rows"], reverse=True)
@@ -309,6 +273,7 @@ def _get_data_stats() -> Dict[str, Any]:
             "total_tables": len(tables),
             "total_rows": total_rows,
             "total_columns": total_columns,
+            "rows_estimated": True,
             "tables": tables[:10]  # Top 10 tables
         }
     except Exception as e:
@@ -451,7 +416,6 @@ def _get_llm_stats() -> Dict[str, Any]:
 
 def _get_service_health() -> List[Dict[str, Any]]:
     """Get detailed service health - returns a list of services."""
-    import time
     services = []
 
     # DuckDB - use shared connection
@@ -459,7 +423,11 @@ def _get_service_health() -> List[Dict[str, Any]]:
         start = time.time()
         conn = get_duckdb_connection()
         if conn is not None:
-            conn.execute("SELECT 1").fetchone()
+            cursor = conn.cursor()
+            try:
+                cursor.execute("SELECT 1").fetchone()
+            finally:
+                cursor.close()
             latency = round((time.time() - start) * 1000, 1)
             services.append({"name": "DuckDB", "status": "healthy", "latency_ms": latency, "details": None})
         else:
@@ -543,30 +511,158 @@ def _get_system_resources() -> Dict[str, Any]:
     }
 
 
+# ============================================
+# Section Cache
+# ============================================
+
+# Seconds each section is served before it is recomputed
+SECTION_TTLS = {
+    "queries": 30,
+    "users": 30,
+    "data": 60,
+    "metadata": 300,
+    "cache": 10,
+    "llm": 30,
+    "services": 15,
+    "resources": 5,
+}
+
+
+class DashboardStats:
+    """
+    Dashboard sections cached with their own TTL (stale-while-revalidate).
+
+    A section that was never computed (or a forced refresh) is computed
+    before the response, all such sections in parallel threads. A section
+    older than its TTL is returned as is while a background thread
+    recomputes it for the next poll. A section is computed by one thread at
+    a time; concurrent requests wait for the same result.
+    """
+
+    def __init__(self, sections: Dict[str, Tuple[Callable[[], Any], float]]):
+        """
+        Initialize the cache.
+
+        Args:
+            sections: Name -> (function computing the section, TTL in seconds)
+        """
+        self._sections = sections
+        self._values: Dict[str, Tuple[Any, float]] = {}  # name -> (value, computed at)
+        self._pending: Dict[str, Future] = {}
+        # Bumped by clear(): a computation started before it is not cached
+        self._generations: Dict[str, int] = {name: 0 for name in sections}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=len(sections), thread_name_prefix="dashboard-stats")
+
+    def _compute(self, name: str, generation: int) -> Any:
+        compute, _ = self._sections[name]
+        try:
+            value = compute()
+            with self._lock:
+                if self._generations[name] == generation:
+                    self._values[name] = (value, time.monotonic())
+            return value
+        except Exception as e:
+            logger.warning(f"Dashboard section '{name}' failed: {e}")
+            raise
+        finally:
+            with self._lock:
+                if self._generations[name] == generation:
+                    self._pending.pop(name, None)
+
+    def _refresh(self, name: str) -> Future:
+        """Start computing a section unless it is already being computed (call with the lock held)."""
+        future = self._pending.get(name)
+        if future is None:
+            future = self._executor.submit(self._compute, name, self._generations[name])
+            self._pending[name] = future
+        return future
+
+    async def get(self, refresh: bool = False) -> Tuple[Dict[str, Any], Dict[str, float]]:
+        """
+        Get every section.
+
+        Args:
+            refresh: Recompute all sections before returning
+
+        Returns:
+            (sections, age of each section in seconds)
+
+        Raises:
+            The error of a section that has no cached value and fails.
+        """
+        waiting: Dict[str, Future] = {}
+        with self._lock:
+            now = time.monotonic()
+            values = dict(self._values)
+            for name, (_, ttl) in self._sections.items():
+                cached = self._values.get(name)
+                if refresh or cached is None:
+                    waiting[name] = self._refresh(name)
+                elif now - cached[1] >= ttl:
+                    self._refresh(name)
+
+        if waiting:
+            results = await asyncio.gather(*(asyncio.wrap_future(future) for future in waiting.values()))
+            computed_at = time.monotonic()
+            values.update((name, (value, computed_at)) for name, value in zip(waiting, results))
+
+        with self._lock:
+            # Newer values if another request stored them meanwhile; sections
+            # cleared meanwhile keep the values read or computed here
+            values.update(self._values)
+            now = time.monotonic()
+        sections = {name: values[name][0] for name in self._sections}
+        ages = {name: round(now - values[name][1], 1) for name in self._sections}
+        return sections, ages
+
+    def clear(self, *names: str) -> None:
+        """
+        Drop cached sections (all if none are named).
+
+        The next request recomputes them; computations already running are
+        not cached, since they may predate the change.
+        """
+        with self._lock:
+            for name in names or list(self._sections):
+                self._values.pop(name, None)
+                self._pending.pop(name, None)
+                self._generations[name] += 1
+
+
+dashboard_stats = DashboardStats({
+    "queries": (_get_audit_stats, SECTION_TTLS["queries"]),
+    "users": (_get_user_stats, SECTION_TTLS["users"]),
+    "data": (_get_data_stats, SECTION_TTLS["data"]),
+    "metadata": (_get_metadata_stats, SECTION_TTLS["metadata"]),
+    "cache": (_get_cache_stats, SECTION_TTLS["cache"]),
+    "llm": (_get_llm_stats, SECTION_TTLS["llm"]),
+    "services": (_get_service_health, SECTION_TTLS["services"]),
+    "resources": (_get_system_resources, SECTION_TTLS["resources"]),
+})
+
+
 # ============================================
 # Dashboard Endpoints
 # ============================================
 
 @router.get("/stats")
-async def get_dashboard_stats(current_user: dict = Depends(get_current_user)):
+async def get_dashboard_stats(
+    refresh: bool = Query(default=False, description="Recompute all sections instead of serving cached ones"),
+    current_user: dict = Depends(get_current_user)
+):
     """
     Get aggregated dashboard statistics.
 
-    Returns comprehensive stats from all data sources.
+    Returns comprehensive stats from all data sources. Each section is
+    cached for its TTL (SECTION_TTLS) and refreshed in the background once
+    expired; meta.section_age_s gives the age of each section.
     """
+    sections, ages = await dashboard_stats.get(refresh=refresh)
     return {
         "success": True,
-        "data": {
-            "queries": _get_audit_stats(),
-            "users": _get_user_stats(),
-            "data": _get_data_stats(),
-            "metadata": _get_metadata_stats(),
-            "cache": _get_cache_stats(),
-            "llm": _get_llm_stats(),
-            "services": _get_service_health(),
-            "resources": _get_system_resources()
-        },
-        "meta": {"timestamp": datetime.now().isoformat()}
+        "data": sections,
+        "meta": {"timestamp": datetime.now().isoformat(), "section_age_s": ages}
     }
 
 
@@ -650,7 +746,7 @@ async def get_user_activity(current_user: dict = Depends(get_current_user)):
     """
     return {
         "success": True,
-        "data": _get_user_stats(),
+        "data": await asyncio.to_thread(_get_user_stats),
         "meta": {"timestamp": datetime.now().isoformat()}
     }
 
@@ -662,6 +758,6 @@ async def get_services_health(current_user: dict = Depends(get_current_user)):
     """
     return {
         "success": True,
-        "data": {"services": _get_service_health()},
+        "data": {"services": await asyncio.to_thread(_get_service_health)},
         "meta": {"timestamp": datetime.now().isoformat()}
     }
@@ -14,7 +14,7 @@ import json
 
 from fastapi import APIRouter, HTTPException, UploadFile, File, Query, Depends, Body
 from fastapi.responses import JSONResponse, StreamingResponse
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 # Add project root to path
 project_root = Path(__file__).parent.parent.parent.parent
@@ -28,14 +28,15 @@ try:
         UniversalReader, DataFormat, ReadResult,
         SchemaTracker, SchemaDiff, ChangeSeverity,
         FileStore, FileRecord, FileStatus, ProcessingStep,
-        DuckDBLoader
+        DuckDBLoader, BatchProcessor, BatchJob, get_batch_job,
+        get_connection_manager
     )
     MODULES_AVAILABLE = True
 except ImportError as e:
     MODULES_AVAILABLE = False
     import_error = str(e)
 
-# Import cache module for clearing after data loads
+# Import cache module for invalidating after data loads
 try:
     from core.engine.cache import get_query_cache
     CACHE_AVAILABLE = True
@@ -49,6 +50,13 @@ try:
 except ImportError:
     AUDIT_AVAILABLE = False
 
+# Import dictionary maintenance for rescanning loaded tables
+try:
+    from .dictionary import update_dictionary_tables
+    DICTIONARY_UPDATE_AVAILABLE = True
+except ImportError:
+    DICTIONARY_UPDATE_AVAILABLE = False
+
 import logging
 logger = logging.getLogger(__name__)
 
@@ -61,6 +69,14 @@ DATABASE_DIR = DATA_DIR / "database"
 DATABASE_PATH = DATABASE_DIR / "clinical.duckdb"
 KNOWLEDGE_DIR = project_root / "knowledge"
 
+# Files parsed in parallel by batch processing (default: cores, at most 4).
+# Requests are clamped to DATA_PROCESS_MAX_WORKERS (default: cores), the size
+# of the parse pool shared by all batches.
+PROCESS_WORKERS = int(os.getenv("DATA_PROCESS_WORKERS", "0")) or None
+
+# Batches finishing after their request returned (wait=false)
+_background_batches = set()
+
 # Initialize components
 _reader = None
 _schema_tracker = None
@@ -112,6 +128,22 @@ def get_duckdb_connection():
         return None
 
 
+def get_duckdb_manager():
+    """
+    Get the connection manager of the loader's database.
+
+    For long-lived readers (the pipeline): a cursor from
+    get_duckdb_connection() belongs to one thread and dies with its handle.
+    """
+    try:
+        loader = get_db_loader()
+        if loader:
+            return get_connection_manager(loader.db_path)
+        return None
+    except Exception:
+        return None
+
+
 def calculate_file_hash(content: bytes) -> str:
     """Calculate SHA256 hash of file content."""
     return hashlib.sha256(content).hexdigest()
@@ -125,6 +157,8 @@ class ProcessRequest(BaseModel):
     """Request to process specific files."""
     files: Optional[List[str]] = None
     block_on_breaking: bool = True
+    max_workers: Optional[int] = Field(default=None, ge=1, le=32)  # Parse processes
+    wait: bool = True  # False: return the job id at once and poll /process/{job_id}
 
 
 class SchemaCompareRequest(BaseModel):
@@ -379,6 +413,12 @@ async def process_file_stream(filepath: Path, file_store: 'FileStore',
                                block_on_breaking: bool = True) -> AsyncGenerator[str, None]:
     """
     Process a single file with SSE streaming updates.
+
+    The file is read in chunks and streamed into a staging table that
+    replaces the existing table once complete, so memory stays bounded
+    whatever the file size. Loading progress reports the rows processed.
+    The schema check uses the column types as loaded and runs before the
+    swap, so a blocked upload leaves the existing table in place.
     """
     table_name = filepath.stem.upper()
 
@@ -406,7 +446,7 @@ async def process_file_stream(filepath: Path, file_store: 'FileStore',
 
         await asyncio.sleep(0.1)  # Allow event to be sent
 
-        # Step 2: Reading
+        # Step 2: Reading (the file is streamed in chunks, see Step 4)
         yield send_event("progress", {
             "step": "reading",
             "message": f"Reading {filepath.name}...",
@@ -417,42 +457,120 @@ async def process_file_stream(filepath: Path, file_store: 'FileStore',
             record.status = FileStatus.READING
             file_store.save(record)
 
-        read_result = reader.read_file(str(filepath))
-
-        if not read_result.success:
+        chunks = reader.read_chunks(str(filepath))
+        try:
+            first_chunk = await asyncio.to_thread(next, chunks, None)
+            if first_chunk is None:
+                raise ValueError("File contains no data")
+        except Exception as e:
             yield send_event("error", {
                 "step": "reading",
-                "message": f"Failed to read file: {read_result.error}"
+                "message": f"Failed to read file: {e}"
             })
             if record:
                 record.status = FileStatus.FAILED
-                record.error_message = read_result.error
+                record.error_message = str(e)
                 file_store.save(record)
             return
 
-        df = read_result.dataframe
+        total_rows = await asyncio.to_thread(reader.count_rows, str(filepath))
+        schema = schema_tracker.extract_schema(first_chunk)
 
         yield send_event("progress", {
             "step": "reading",
-            "message": f"Read {len(df)} rows, {len(df.columns)} columns",
+            "message": f"Reading {schema['column_count']} columns"
+                       + (f", {total_rows} rows" if total_rows is not None else ""),
             "progress": 40,
             "details": {
-                "rows": len(df),
-                "columns": len(df.columns)
+                "rows": total_rows,
+                "columns": schema['column_count']
             }
         })
 
         await asyncio.sleep(0.1)
 
-        # Step 3: Schema check
+        # Step 3: Transforming (dates are standardized chunk by chunk)
+        yield send_event("progress", {
+            "step": "transforming",
+            "message": "Applying transformations...",
+            "progress": 60
+        })
+
+        if record:
+            record.status = FileStatus.TRANSFORMING
+            file_store.save(record)
+
+        await asyncio.sleep(0.1)
+
+        # Step 4: Streaming chunks into a staging table, swapped in when complete
+        yield send_event("progress", {
+            "step": "loading",
+            "message": f"Loading to DuckDB as table {table_name}...",
+            "progress": 65
+        })
+
+        if record:
+            record.status = FileStatus.LOADING
+            file_store.save(record)
+
+        def all_chunks():
+            yield first_chunk
+            for chunk in chunks:
+                schema_tracker.merge_schema(schema, chunk)
+                yield chunk
+
+        # Schema check on the types as loaded (a later chunk may have widened
+        # a column), before the staging table replaces the current one
+        schema_check = {"diff": None, "blocked": False}
+
+        def check_schema(columns):
+            schema_tracker.apply_loaded_types(schema, columns)
+            schema_check["blocked"], schema_check["diff"] = schema_tracker.should_block_upload(
+                table_name, schema, block_on_breaking
+            )
+            if schema_check["blocked"]:
+                raise ValueError("Blocked: Breaking schema changes")
+
+        loop = asyncio.get_running_loop()
+        rows_loaded = asyncio.Queue()
+
+        def load():
+            try:
+                return db_loader.load_chunks(
+                    all_chunks(), table_name, source_file=str(filepath),
+                    progress_callback=lambda rows: loop.call_soon_threadsafe(rows_loaded.put_nowait, rows),
+                    schema_check=check_schema
+                )
+            finally:
+                loop.call_soon_threadsafe(rows_loaded.put_nowait, None)
+
+        load_task = asyncio.create_task(asyncio.to_thread(load))
+
+        while (rows := await rows_loaded.get()) is not None:
+            progress = 65
+            if total_rows:
+                progress = 65 + int(25 * min(rows / total_rows, 1.0))
+            yield send_event("progress", {
+                "step": "loading",
+                "message": f"Loaded {rows} rows"
+                           + (f" of {total_rows}" if total_rows is not None else ""),
+                "progress": progress,
+                "details": {
+                    "rows_processed": rows,
+                    "total_rows": total_rows
+                }
+            })
+
+        load_result = await load_task
+
+        # Step 5: Schema check (run by the load, before the swap)
         yield send_event("progress", {
             "step": "schema_check",
             "message": "Checking schema compatibility...",
-            "progress": 50
+            "progress": 90
         })
 
-        should_block, diff = schema_tracker.should_block_upload(table_name, df, block_on_breaking)
-
+        diff = schema_check["diff"]
         if diff and diff.has_changes:
             yield send_event("schema_change", {
                 "table": table_name,
@@ -470,49 +588,31 @@ async def process_file_stream(filepath: Path, file_store: 'FileStore',
                 ]
             })
 
-            if should_block:
-                yield send_event("blocked", {
-                    "reason": "Breaking schema changes detected",
-                    "severity": diff.severity.value
-                })
-                if record:
-                    record.status = FileStatus.FAILED
-                    record.error_message = "Blocked: Breaking schema changes"
-                    file_store.save(record)
-                return
-
-        await asyncio.sleep(0.1)
-
-        # Step 4: Transforming
-        yield send_event("progress", {
-            "step": "transforming",
-            "message": "Applying transformations...",
-            "progress": 65
-        })
-
-        if record:
-            record.status = FileStatus.TRANSFORMING
-            file_store.save(record)
-
-        await asyncio.sleep(0.1)
-
-        # Step 5: Loading to DuckDB
-        yield send_event("progress", {
-            "step": "loading",
-            "message": f"Loading to DuckDB as table {table_name}...",
-            "progress": 80
-        })
-
-        if record:
-            record.status = FileStatus.LOADING
-            file_store.save(record)
+        if schema_check["blocked"]:
+            yield send_event("blocked", {
+                "reason": "Breaking schema changes detected",
+                "severity": diff.severity.value
+            })
+            if record:
+                record.status = FileStatus.FAILED
+                record.error_message = "Blocked: Breaking schema changes"
+                file_store.save(record)
+            return
 
-        # Actually load the data
-        db_loader.load_dataframe(df, table_name, if_exists='replace')
+        if not load_result.success:
+            yield send_event("error", {
+                "step": "loading",
+                "message": f"Failed to load table: {load_result.error}"
+            })
+            if record:
+                record.status = FileStatus.FAILED
+                record.error_message = load_result.error
+                file_store.save(record)
+            return
 
         # Record schema version
         schema_version = schema_tracker.record_version(
-            table_name, df, str(filepath),
+            table_name, schema, str(filepath),
             notes=f"Loaded from {filepath.name}"
         )
 
@@ -528,24 +628,33 @@ async def process_file_stream(filepath: Path, file_store: 'FileStore',
         if record:
             record.status = FileStatus.COMPLETED
             record.processed_at = datetime.now().isoformat()
-            record.row_count = len(df)
-            record.column_count = len(df.columns)
-            record.schema_hash = read_result.schema.schema_hash if read_result.schema else None
+            record.row_count = load_result.rows_loaded
+            record.column_count = schema['column_count']
+            record.schema_hash = schema_version.schema_hash
             record.schema_version = schema_version.version
             file_store.save(record)
 
             # Archive previous versions
             file_store.archive_previous(table_name, record.id)
 
-        # Clear query cache after data load (cached results are now stale)
+        # Invalidate cached results that read this table (now stale)
         cache_cleared = 0
         if CACHE_AVAILABLE:
             try:
                 cache = get_query_cache(db_path=str(DATABASE_PATH))
-                cache_cleared = len(cache)
-                cache.clear()
+                cache_cleared = cache.invalidate_tables([table_name])
             except Exception:
-                pass  # Cache clearing is best-effort
+                pass  # Cache invalidation is best-effort
+        _clear_dashboard_data()
+
+        # Rescan the table into the fuzzy index and schema map
+        dictionary_updated = False
+        if DICTIONARY_UPDATE_AVAILABLE:
+            try:
+                summary = await asyncio.to_thread(update_dictionary_tables, [table_name])
+                dictionary_updated = summary is not None
+            except Exception as e:
+                logger.warning(f"Failed to update dictionary for {table_name}: {e}")
 
         # Log successful data load to audit
         if AUDIT_AVAILABLE:
@@ -556,7 +665,7 @@ async def process_file_stream(filepath: Path, file_store: 'FileStore',
                     username="system",
                     filename=filepath.name,
                     file_size=filepath.stat().st_size if filepath.exists() else 0,
-                    row_count=len(df),
+                    row_count=load_result.rows_loaded,
                     success=True
                 )
             except Exception as audit_error:
@@ -564,11 +673,12 @@ async def process_file_stream(filepath: Path, file_store: 'FileStore',
 
         yield send_event("complete", {
             "table": table_name,
-            "rows": len(df),
-            "columns": len(df.columns),
+            "rows": load_result.rows_loaded,
+            "columns": schema['column_count'],
             "schema_version": schema_version.version,
             "progress": 100,
-            "cache_cleared": cache_cleared
+            "cache_cleared": cache_cleared,
+            "dictionary_updated": dictionary_updated
         })
 
     except Exception as e:
@@ -676,8 +786,13 @@ async def process_files(
     """
     Process data files to DuckDB (batch mode).
 
-    If files list is empty, processes all pending files.
-    Returns job info for tracking.
+    If files list is empty, processes all pending files. Files are parsed in
+    parallel (max_workers at a time, default DATA_PROCESS_WORKERS, at most
+    DATA_PROCESS_MAX_WORKERS) in a process pool shared by all batches, and
+    loaded by a single DuckDB writer. With wait=false the job id is returned
+    at once; per-file progress is available from /process/{job_id} either
+    way, and the job turns "completed" only once audit, cache and
+    dictionary updates are done.
     """
     if not MODULES_AVAILABLE:
         raise HTTPException(
@@ -685,163 +800,116 @@ async def process_files(
             detail={"code": "MODULES_UNAVAILABLE", "message": f"Core modules not available: {import_error}"}
         )
 
-    job_id = str(uuid.uuid4())[:8]
-
     # Get files to process
     file_list = request.files if request.files else []
 
     if not file_list:
         # Get all pending files from raw directory
-        for filepath in RAW_DIR.glob("*"):
+        for filepath in sorted(RAW_DIR.glob("*")):
             if filepath.is_file() and filepath.suffix.lower() in ['.sas7bdat', '.xpt', '.csv', '.parquet']:
                 file_list.append(filepath.name)
 
-    results = []
-    reader = get_reader()
-    schema_tracker = get_schema_tracker()
-    file_store = get_file_store()
-    db_loader = get_db_loader()
-
-    for filename in file_list:
-        filepath = RAW_DIR / filename
-        if not filepath.exists():
-            results.append({
-                "filename": filename,
-                "status": "error",
-                "error": "File not found"
-            })
-            continue
-
-        try:
-            table_name = filepath.stem.upper()
-
-            # Read file
-            read_result = reader.read_file(str(filepath))
-            if not read_result.success:
-                results.append({
-                    "filename": filename,
-                    "table_name": table_name,
-                    "status": "error",
-                    "error": read_result.error
-                })
-                continue
-
-            df = read_result.dataframe
+    processor = BatchProcessor(
+        get_db_loader(),
+        get_schema_tracker(),
+        get_file_store(),
+        max_workers=request.max_workers or PROCESS_WORKERS
+    )
+    job = processor.start([str(RAW_DIR / filename) for filename in file_list],
+                          request.block_on_breaking, defer_completion=True)
 
-            # Check schema
-            should_block, diff = schema_tracker.should_block_upload(
-                table_name, df, request.block_on_breaking
-            )
+    finish = asyncio.create_task(_finish_batch(job, current_user))
+    if not request.wait:
+        _background_batches.add(finish)
+        finish.add_done_callback(_background_batches.discard)
+        return {
+            "success": True,
+            "data": job.to_dict(),
+            "meta": {"timestamp": datetime.now().isoformat()}
+        }
 
-            if should_block:
-                results.append({
-                    "filename": filename,
-                    "table_name": table_name,
-                    "status": "blocked",
-                    "reason": "Breaking schema changes",
-                    "schema_diff": {
-                        "severity": diff.severity.value,
-                        "removed_columns": diff.removed_columns
-                    }
-                })
-                continue
+    await finish
 
-            # Load to DuckDB
-            db_loader.load_dataframe(df, table_name, if_exists='replace')
+    return {
+        "success": True,
+        "data": job.to_dict(),
+        "meta": {"timestamp": datetime.now().isoformat()}
+    }
 
-            # Record schema version
-            schema_version = schema_tracker.record_version(
-                table_name, df, str(filepath)
-            )
 
-            # Update file store
-            with open(filepath, 'rb') as f:
-                file_hash = calculate_file_hash(f.read())
+def _clear_dashboard_data() -> None:
+    """Drop the dashboard's cached data section after tables changed."""
+    try:
+        from .dashboard import dashboard_stats  # dashboard imports this module
+        dashboard_stats.clear("data")
+    except Exception as e:
+        logger.warning(f"Failed to clear dashboard data stats: {e}")
 
-            record = FileRecord(
-                id=str(uuid.uuid4()),
-                filename=filename,
-                table_name=table_name,
-                file_format=filepath.suffix.lower()[1:],
-                file_size=filepath.stat().st_size,
-                file_hash=file_hash,
-                status=FileStatus.COMPLETED,
-                processed_at=datetime.now().isoformat(),
-                row_count=len(df),
-                column_count=len(df.columns),
-                schema_version=schema_version.version
-            )
-            file_store.save(record)
-            file_store.archive_previous(table_name, record.id)
 
-            results.append({
-                "filename": filename,
-                "table_name": table_name,
-                "status": "completed",
-                "rows": len(df),
-                "columns": len(df.columns),
-                "schema_version": schema_version.version
-            })
+async def _finish_batch(job: 'BatchJob', current_user: dict):
+    """Wait for a batch's files, audit them, refresh caches, then complete the job."""
+    await asyncio.to_thread(job.wait_loaded)
+    try:
+        await _after_batch_loaded(job, current_user)
+    finally:
+        job.complete()
 
-        except Exception as e:
-            results.append({
-                "filename": filename,
-                "status": "error",
-                "error": str(e)
-            })
 
-    completed = len([r for r in results if r.get("status") == "completed"])
-    failed = len([r for r in results if r.get("status") in ["error", "blocked"]])
+async def _after_batch_loaded(job: 'BatchJob', current_user: dict):
+    """Audit a loaded batch and refresh caches for the loaded tables."""
+    completed = [f for f in job.files if f.status == "completed"]
 
     # Log batch processing results to audit
     if AUDIT_AVAILABLE:
         try:
             audit_service = get_audit_service()
-            for result in results:
-                if result.get("status") == "completed":
+            for result in job.files:
+                if result.status == "completed":
                     audit_service.log_data_upload(
                         user_id=current_user.get("sub", "anonymous"),
                         username=current_user.get("sub", "anonymous"),
-                        filename=result.get("filename"),
-                        file_size=0,  # Size not tracked in batch results
-                        row_count=result.get("rows"),
+                        filename=result.filename,
+                        file_size=result.file_size,
+                        row_count=result.rows,
                         success=True
                     )
                 else:
                     audit_service.log_data_upload(
                         user_id=current_user.get("sub", "anonymous"),
                         username=current_user.get("sub", "anonymous"),
-                        filename=result.get("filename"),
-                        file_size=0,
+                        filename=result.filename,
+                        file_size=result.file_size,
                         success=False,
-                        error_message=result.get("error") or result.get("reason")
+                        error_message=result.error or result.reason
                     )
         except Exception as e:
             logger.warning(f"Failed to log batch processing to audit: {e}")
 
-    # Clear query cache if any files were successfully loaded
+    # Invalidate cached results that read the loaded tables
     cache_cleared = 0
-    if completed > 0 and CACHE_AVAILABLE:
+    if completed and CACHE_AVAILABLE:
         try:
             cache = get_query_cache(db_path=str(DATABASE_PATH))
-            cache_cleared = len(cache)
-            cache.clear()
+            cache_cleared = cache.invalidate_tables(f.table_name for f in completed)
         except Exception:
-            pass  # Cache clearing is best-effort
+            pass  # Cache invalidation is best-effort
+    if completed:
+        _clear_dashboard_data()
+
+    # Rescan the loaded tables into the fuzzy index and schema map
+    dictionary_updated = False
+    if completed and DICTIONARY_UPDATE_AVAILABLE:
+        loaded_tables = [f.table_name for f in completed]
+        try:
+            summary = await asyncio.to_thread(update_dictionary_tables, loaded_tables)
+            dictionary_updated = summary is not None
+        except Exception as e:
+            logger.warning(f"Failed to update dictionary for {loaded_tables}: {e}")
 
-    return {
-        "success": True,
-        "data": {
-            "job_id": job_id,
-            "status": "completed",
-            "total": len(results),
-            "completed": completed,
-            "failed": failed,
-            "cache_cleared": cache_cleared,
-            "results": results
-        },
-        "meta": {"timestamp": datetime.now().isoformat()}
-    }
+    job.details.update({
+        "cache_cleared": cache_cleared,
+        "dictionary_updated": dictionary_updated
+    })
 
 
 @router.get("/process/{job_id}")
@@ -850,18 +918,21 @@ async def get_processing_status(
     current_user: dict = Depends(get_current_user)
 ):
     """
-    Get processing job status.
+    Get batch processing job status, with per-file progress.
+
+    Single-file processing reports its progress over SSE
+    (/process/stream/{filename}) instead.
     """
-    # For streaming jobs, status is tracked via SSE
-    # This endpoint is for backwards compatibility
+    job = get_batch_job(job_id) if MODULES_AVAILABLE else None
+    if job is None:
+        raise HTTPException(
+            status_code=404,
+            detail={"code": "NOT_FOUND", "message": f"Processing job not found: {job_id}"}
+        )
+
     return {
         "success": True,
-        "data": {
-            "job_id": job_id,
-            "status": "completed",
-            "progress": 100.0,
-            "message": "Use /process/stream/{filename} for real-time progress"
-        },
+        "data": job.to_dict(),
         "meta": {"timestamp": datetime.now().isoformat()}
     }
 
@@ -1409,6 +1480,21 @@ async def drop_table(
         if schema_tracker:
             schema_tracker.delete_table_history(table_name)
 
+    # Invalidate cached results that read the table
+    if CACHE_AVAILABLE:
+        try:
+            get_query_cache(db_path=str(DATABASE_PATH)).invalidate_tables([table_name])
+        except Exception:
+            pass  # Cache invalidation is best-effort
+    _clear_dashboard_data()
+
+    # Remove the table from the fuzzy index and schema map
+    if DICTIONARY_UPDATE_AVAILABLE:
+        try:
+            await asyncio.to_thread(update_dictionary_tables, [table_name])
+        except Exception as e:
+            logger.warning(f"Failed to update dictionary for {table_name}: {e}")
+
     return {
         "success": True,
         "data": {
@@ -35,6 +35,8 @@ try:
         SchemaMapper,
         TermResolver,
         create_term_resolver,
+        update_dictionary,
+        dictionary_lock,
     )
     DICTIONARY_AVAILABLE = True
 except ImportError as e:
@@ -57,7 +59,7 @@ DATA_DIR = Path(os.getenv("DATA_DIR", project_root / "data"))
 DATABASE_PATH = DATA_DIR / "database" / "clinical.duckdb"
 KNOWLEDGE_DIR = Path(os.getenv("KNOWLEDGE_DIR", project_root / "knowledge"))
 METADATA_PATH = KNOWLEDGE_DIR / "golden_metadata.json"
-FUZZY_INDEX_PATH = KNOWLEDGE_DIR / "fuzzy_index.pkl"
+FUZZY_INDEX_PATH = KNOWLEDGE_DIR / "fuzzy_index.idx"
 SCHEMA_MAP_PATH = KNOWLEDGE_DIR / "schema_map.json"
 STATUS_PATH = KNOWLEDGE_DIR / "dictionary_status.json"
 
@@ -172,7 +174,7 @@ def get_fuzzy_matcher() -> Optional['FuzzyMatcher']:
     """Get or create FuzzyMatcher instance."""
     global _fuzzy_matcher
     if _fuzzy_matcher is None and DICTIONARY_AVAILABLE:
-        if FUZZY_INDEX_PATH.exists():
+        if FuzzyMatcher.index_exists(str(FUZZY_INDEX_PATH)):
             try:
                 _fuzzy_matcher = FuzzyMatcher.load(str(FUZZY_INDEX_PATH))
                 logger.info(f"Loaded fuzzy index with {len(_fuzzy_matcher)} entries")
@@ -228,10 +230,30 @@ def _update_progress(progress: int, step: str):
 
 async def run_dictionary_build(request: BuildRequest):
     """Run dictionary build in background."""
-    global _build_in_progress, _build_progress, _build_step
+    global _build_in_progress, _build_step
 
     try:
         _build_in_progress = True
+        await asyncio.to_thread(_build_dictionary)
+    except Exception as e:
+        logger.error(f"Dictionary build failed: {e}")
+        _build_step = f"Error: {str(e)}"
+        raise
+    finally:
+        _build_in_progress = False
+
+
+def _build_dictionary():
+    """
+    Scan every table and save the fuzzy index and schema map.
+
+    Holds dictionary_lock throughout, so an incremental update never writes
+    the files while they are being built and saved; one that is waiting
+    runs afterwards and rescans its tables again.
+    """
+    global _build_progress, _build_step
+
+    with dictionary_lock:
         _build_progress = 0
         _build_step = "Initializing..."
         start_time = datetime.now()
@@ -297,12 +319,61 @@ async def run_dictionary_build(request: BuildRequest):
         _update_progress(100, "Build complete!")
         logger.info(f"Dictionary build completed in {duration:.1f}s")
 
-    except Exception as e:
-        logger.error(f"Dictionary build failed: {e}")
-        _build_step = f"Error: {str(e)}"
-        raise
-    finally:
-        _build_in_progress = False
+
+def update_dictionary_tables(tables: List[str]) -> Optional[Dict[str, Any]]:
+    """
+    Splice changed tables into the built dictionary and reload it.
+
+    Called after tables are loaded or dropped, so only those tables are
+    rescanned. Nothing is done before the first full build, or while one
+    is running (it will pick the tables up itself). An update that starts
+    just before a build waits for it on dictionary_lock.
+
+    Args:
+        tables: Tables that were loaded, replaced or dropped
+
+    Returns:
+        Update summary, or None if the dictionary was not updated
+    """
+    if not DICTIONARY_AVAILABLE or _build_in_progress:
+        return None
+    if not FuzzyMatcher.index_exists(str(FUZZY_INDEX_PATH)):
+        return None
+
+    with dictionary_lock:
+        start_time = datetime.now()
+        summary = update_dictionary(
+            str(DATABASE_PATH), tables, str(FUZZY_INDEX_PATH), str(SCHEMA_MAP_PATH)
+        )
+        end_time = datetime.now()
+
+        status = {}
+        if STATUS_PATH.exists():
+            try:
+                with open(STATUS_PATH, 'r') as f:
+                    status = json.load(f)
+            except Exception:
+                pass
+        status["last_update"] = {
+            "time": end_time.isoformat(),
+            "duration_seconds": (end_time - start_time).total_seconds(),
+            "tables": summary["tables"]
+        }
+        status["fuzzy_index"] = {
+            "path": str(FUZZY_INDEX_PATH),
+            "entries": summary["fuzzy_entries"]
+        }
+        status["schema_map"] = {
+            "path": str(SCHEMA_MAP_PATH),
+            "tables": summary["schema_tables"]
+        }
+
+        with open(STATUS_PATH, 'w') as f:
+            json.dump(status, f, indent=2)
+
+        reload_indexes()
+        logger.info(f"Dictionary updated for {', '.join(summary['tables'])}")
+    return summary
 
 
 # ============================================================================
@@ -352,6 +423,7 @@ async def trigger_dictionary_build(
     background_tasks: BackgroundTasks
 ) -> Dict[str, Any]:
     """Trigger dictionary rebuild."""
+    global _build_in_progress
     if not DICTIONARY_AVAILABLE:
         raise HTTPException(
             status_code=503,
@@ -370,7 +442,8 @@ async def trigger_dictionary_build(
             detail="Database not found. Run Factory 1 first."
         )
 
-    # Start background build
+    # Start background build; set here so a second request gets 409
+    _build_in_progress = True
     background_tasks.add_task(run_dictionary_build, request)
 
     return {
@@ -95,6 +95,7 @@ class MedDRASearchResponse(BaseModel):
     """MedDRA search response."""
     query: str
     level_filter: Optional[str]
+    offset: int = 0
     count: int
     results: List[MedDRASearchResultResponse]
 
@@ -354,7 +355,8 @@ async def delete_version() -> Dict[str, Any]:
 async def search_terms(
     query: str = Query(..., min_length=1),
     level: Optional[str] = Query(None, regex="^(SOC|HLGT|HLT|PT|LLT)$"),
-    limit: int = Query(20, ge=1, le=100)
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0)
 ) -> MedDRASearchResponse:
     """Search MedDRA terms."""
     if not MEDDRA_AVAILABLE:
@@ -371,11 +373,12 @@ async def search_terms(
             detail="MedDRA not loaded. Upload a MedDRA dictionary first."
         )
 
-    results = lookup.search(query, level, limit)
+    results = lookup.search(query, level, limit, offset)
 
     return MedDRASearchResponse(
         query=query,
         level_filter=level,
+        offset=offset,
         count=len(results),
         results=[
             MedDRASearchResultResponse(
@@ -78,12 +78,11 @@ async def detailed_health_check(current_user: dict = Depends(get_current_user)):
 
     # Check DuckDB
     try:
-        import duckdb
+        from core.data.connection_manager import get_connection_manager
         db_path = DATA_DIR / "database" / "clinical.duckdb"
         if db_path.exists():
-            conn = duckdb.connect(str(db_path), read_only=True)
-            conn.execute("SELECT 1").fetchone()
-            conn.close()
+            with get_connection_manager(db_path).read() as conn:
+                conn.execute("SELECT 1").fetchone()
             services["duckdb"] = "healthy"
         else:
             services["duckdb"] = "not_configured"
@@ -128,11 +127,19 @@ async def detailed_health_check(current_user: dict = Depends(get_current_user)):
     unhealthy = [k for k, v in services.items() if "unhealthy" in str(v)]
     overall = "unhealthy" if unhealthy else "healthy"
 
+    # DuckDB cursor utilization
+    try:
+        from core.data.connection_manager import get_connection_stats
+        duckdb_connections = get_connection_stats()
+    except Exception:
+        duckdb_connections = []
+
     return {
         "success": True,
         "data": {
             "status": overall,
             "services": services,
+            "duckdb_connections": duckdb_connections,
             "uptime": get_uptime()
         },
         "meta": {"timestamp": datetime.now().isoformat()}
@@ -613,12 +620,13 @@ async def get_cache_stats(current_user: dict = Depends(get_current_user)):
     Returns cache size, hit rate, and data version information.
     """
     try:
-        from core.engine.cache import get_query_cache
+        from core.engine.cache import get_query_cache, get_intent_cache
 
         # Get or create cache with DuckDB path
         db_path = str(DATA_DIR / "database" / "clinical.duckdb")
         cache = get_query_cache(db_path=db_path)
         stats = cache.get_stats()
+        stats['intent_cache'] = get_intent_cache().get_stats()
 
         return {
             "success": True,
@@ -0,0 +1,151 @@
+"""
+SAGE Fuzzy Matcher Benchmark
+============================
+Compares the per-value scan FuzzyMatcher.match used before indexing (four
+rapidfuzz scores for every unique value) with the trigram-indexed match on
+synthetic dictionaries of clinical-looking terms, and reports how often both
+return the same best match.
+
+Queries are dictionary values with one or two typos, so the exact-match
+shortcut never fires and every query goes through fuzzy scoring.
+
+Usage:
+    py scripts/benchmark_fuzzy_matcher.py                       # 10k, 100k, 1M values
+    py scripts/benchmark_fuzzy_matcher.py --sizes 10000 100000 --queries 200
+    py scripts/benchmark_fuzzy_matcher.py --scan-queries 0      # skip the slow scan
+"""
+
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+from typing import List, Optional
+
+from rapidfuzz import fuzz
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.dictionary.fuzzy_matcher import FuzzyMatcher
+
+SYLLABLES = [
+    "ab", "ac", "al", "an", "ar", "ba", "ca", "cer", "chi", "co", "cra", "da", "der", "di",
+    "do", "el", "en", "er", "fa", "fi", "ga", "gen", "ha", "he", "hy", "ia", "in", "is",
+    "ka", "la", "le", "li", "lo", "ma", "me", "mi", "mo", "na", "ne", "no", "ol", "on",
+    "or", "pa", "per", "pho", "ra", "re", "ri", "ro", "sa", "se", "si", "so", "ta", "te",
+    "ti", "to", "tra", "um", "ur", "va", "xi", "zo",
+]
+SUFFIXES = ["", "", "ITIS", "OSIS", "ALGIA", "EMIA", "OMA", "PATHY", "INE", "OL", "ATE"]
+QUALIFIERS = ["", "", "", "ACUTE", "CHRONIC", "SEVERE", "MILD", "LEFT", "RIGHT", "UPPER", "LOWER"]
+
+
+def make_values(count: int, seed: int = 7) -> List[str]:
+    """Unique terms built from syllables, with suffixes and qualifier words."""
+    rng = random.Random(seed)
+    values = set()
+    while len(values) < count:
+        word = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).upper()
+        word += rng.choice(SUFFIXES)
+        qualifier = rng.choice(QUALIFIERS)
+        if qualifier:
+            word = f"{qualifier} {word}" if rng.random() < 0.5 else f"{word} {qualifier}"
+        if rng.random() < 0.2:
+            word += " " + "".join(rng.choice(SYLLABLES) for _ in range(2)).upper()
+        values.add(word)
+    return sorted(values)
+
+
+def make_queries(values: List[str], count: int, seed: int = 11) -> List[str]:
+    """Values with one or two character edits."""
+    rng = random.Random(seed)
+    known = {v.lower() for v in values}
+    queries = []
+    while len(queries) < count:
+        chars = list(rng.choice(values))
+        for _ in range(rng.randint(1, 2)):
+            pos = rng.randrange(len(chars))
+            edit = rng.random()
+            if edit < 0.4:
+                chars[pos] = rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+            elif edit < 0.7 and len(chars) > 4:
+                del chars[pos]
+            else:
+                chars.insert(pos, rng.choice("AEIOU"))
+        query = "".join(chars).strip()
+        if query and query.lower() not in known:
+            queries.append(query)
+    return queries
+
+
+def scan_best(matcher: FuzzyMatcher, query: str, threshold: float) -> Optional[str]:
+    """Best value from the per-value smart-score scan (the pre-index match loop)."""
+    query_len = len(query)
+    best = None
+    for value in matcher._all_values:
+        value_len = len(value)
+        len_ratio = value_len / query_len
+        if (len_ratio < 0.4 or len_ratio > 3.0) and query_len > 3:
+            continue
+
+        ratio_score = fuzz.ratio(query, value)
+        partial_score = fuzz.partial_ratio(query, value) if query_len >= 4 else ratio_score
+        if query_len >= 4 and value_len < query_len * 0.5:
+            partial_score *= 0.5
+        score = (ratio_score * 0.40 + fuzz.token_sort_ratio(query, value) * 0.30 +
+                 fuzz.token_set_ratio(query, value) * 0.20 + partial_score * 0.10)
+        score *= 0.9 + 0.1 * (1 - abs(query_len - value_len) / max(query_len, value_len))
+
+        if score >= threshold:
+            key = (-score, -ratio_score, value)
+            if best is None or key < best:
+                best = key
+    return best[2] if best else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-value scan vs trigram-indexed fuzzy matching")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000],
+                        help="Dictionary sizes (unique values)")
+    parser.add_argument("--queries", type=int, default=200, help="Indexed queries per size")
+    parser.add_argument("--scan-queries", type=int, default=5,
+                        help="Queries timed with the per-value scan (0 to skip)")
+    parser.add_argument("--threshold", type=float, default=70.0, help="Match threshold")
+    args = parser.parse_args()
+
+    print(f"\n{'values':>10} {'build s':>8} {'indexed ms/query':>17} {'scan ms/query':>14} "
+          f"{'speedup':>8} {'same best':>10}")
+    for size in args.sizes:
+        values = make_values(size)
+        queries = make_queries(values, args.queries)
+
+        matcher = FuzzyMatcher()
+        start = time.perf_counter()
+        matcher.build_index({"DICT": {"TERM": values}})
+        matcher._search_index()
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        indexed = [matcher.match(q, threshold=args.threshold, limit=1) for q in queries]
+        indexed_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+        scan_cell, speedup_cell, agree_cell = "-", "-", "-"
+        scan_count = min(args.scan_queries, len(queries))
+        if scan_count:
+            start = time.perf_counter()
+            scanned = [scan_best(matcher, q, args.threshold) for q in queries[:scan_count]]
+            scan_ms = (time.perf_counter() - start) * 1000 / scan_count
+
+            agree = sum(
+                (found[0].value if found else None) == best
+                for found, best in zip(indexed, scanned)
+            )
+            scan_cell = f"{scan_ms:,.1f}"
+            speedup_cell = f"{scan_ms / indexed_ms:.0f}x"
+            agree_cell = f"{agree}/{scan_count}"
+
+        print(f"{size:>10,} {build:>8.1f} {indexed_ms:>17,.2f} {scan_cell:>14} "
+              f"{speedup_cell:>8} {agree_cell:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+SAGE Single-Shot A/B Benchmark
+==============================
+Compares the multi-call pipeline path (QueryAnalyzer call + SQL generator call)
+with single-shot mode (analysis JSON + SQL from one call) on the same questions.
+
+By default the LLM is simulated: every call costs a fixed round trip plus a
+per-output-token time, which is where the two modes differ. With --live the
+configured provider (LLMConfig.from_env) is used for both modes.
+
+Usage:
+    py scripts/benchmark_single_shot.py                       # simulated provider
+    py scripts/benchmark_single_shot.py --rtt-ms 500 --ms-per-token 15
+    py scripts/benchmark_single_shot.py --live --repeat 1     # real provider (costs tokens)
+"""
+
+import sys
+import json
+import time
+import argparse
+import statistics
+import threading
+from pathlib import Path
+from typing import Dict, List, Any
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.engine.pipeline import (
+    InferencePipeline, PipelineConfig, ClaudeSQLGenerator, SINGLE_SHOT_INSTRUCTIONS
+)
+from core.engine.query_analyzer import QueryAnalyzer
+from core.engine.llm_providers import LLMConfig, LLMResponse, create_llm_provider
+
+# Standalone golden questions (follow-ups always use the multi-call path)
+QUESTIONS = [
+    "How many subjects are in the Safety Population?",
+    "How many female patients are there?",
+    "How many subjects are age 65 or older?",
+    "How many subjects had serious adverse events?",
+    "How many subjects had Grade 3 or higher adverse events?",
+    "What are the most common adverse events?",
+    "How many subjects had treatment-related adverse events?",
+    "How many female subjects over 60 had serious adverse events?",
+]
+
+TABLES = {
+    'ADSL': ['USUBJID', 'AGE', 'SEX', 'RACE', 'SAFFL', 'ITTFL', 'TRT01A'],
+    'ADAE': ['USUBJID', 'AEDECOD', 'AEBODSYS', 'AESEV', 'AESER', 'AEREL', 'ATOXGR', 'TRTEMFL', 'SAFFL'],
+}
+
+ANALYSIS = {
+    "intent": "COUNT_SUBJECTS", "subject": "SUBJECTS", "conditions": [],
+    "group_by": None, "limit": None, "ambiguities": [],
+    "understanding_confidence": 0.95, "suggested_table": "ADAE",
+    "suggested_population": "Safety", "suggested_clarification": None
+}
+SQL = "SELECT COUNT(DISTINCT USUBJID) AS subject_count FROM ADAE WHERE SAFFL = 'Y'"
+
+
+class SimulatedProvider:
+    """LLM stand-in with a round-trip + per-output-token latency model."""
+
+    def __init__(self, rtt_ms: float, ms_per_token: float):
+        self.rtt_ms = rtt_ms
+        self.ms_per_token = ms_per_token
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+
+    def generate(self, request):
+        if SINGLE_SHOT_INSTRUCTIONS.strip() in request.prompt:
+            content = f"```json\n{json.dumps(ANALYSIS, indent=2)}\n```\n```sql\n{SQL}\n```"
+        elif "Analyze this clinical data question" in request.prompt:
+            content = json.dumps(ANALYSIS, indent=2)
+        else:
+            content = f"```sql\n{SQL}\n```"
+
+        # Rough token estimate: 4 characters per token
+        in_tokens = (len(request.prompt) + len(request.system_prompt or "")) // 4
+        out_tokens = len(content) // 4
+        time.sleep((self.rtt_ms + out_tokens * self.ms_per_token) / 1000)
+
+        with self._lock:
+            self.calls += 1
+            self.input_tokens += in_tokens
+            self.output_tokens += out_tokens
+
+        return LLMResponse(content=content, model="simulated", provider="mock",
+                           generation_time_ms=0, tokens_used=in_tokens + out_tokens)
+
+    def reset(self):
+        self.calls = self.input_tokens = self.output_tokens = 0
+
+
+def build_pipeline(provider, single_shot: bool) -> InferencePipeline:
+    config = PipelineConfig(
+        db_path="",
+        metadata_path="",
+        use_mock=True,
+        available_tables=TABLES,
+        enable_cache=False,
+        enable_single_shot=single_shot
+    )
+    pipeline = InferencePipeline(config)
+    pipeline.sql_generator = ClaudeSQLGenerator(provider=provider)
+    pipeline.query_analyzer = QueryAnalyzer(llm_provider=provider)
+    return pipeline
+
+
+def run_mode(provider, single_shot: bool, repeat: int) -> Dict[str, Any]:
+    pipeline = build_pipeline(provider, single_shot)
+    if hasattr(provider, 'reset'):
+        provider.reset()
+
+    latencies: List[float] = []
+    for i in range(repeat):
+        for n, question in enumerate(QUESTIONS):
+            start = time.time()
+            # Fresh session per question so every query is standalone
+            pipeline.process(question, session_id=f"bench-{single_shot}-{i}-{n}")
+            latencies.append((time.time() - start) * 1000)
+
+    queries = len(latencies)
+    latencies.sort()
+    result = {
+        'mode': 'single-shot' if single_shot else 'multi-call',
+        'queries': queries,
+        'median_ms': statistics.median(latencies),
+        'p95_ms': latencies[min(queries - 1, int(queries * 0.95))],
+    }
+    if hasattr(provider, 'calls'):
+        result['llm_calls_per_query'] = provider.calls / queries
+        result['input_tokens_per_query'] = provider.input_tokens / queries
+        result['output_tokens_per_query'] = provider.output_tokens / queries
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="A/B benchmark: multi-call vs single-shot")
+    parser.add_argument("--live", action="store_true", help="Use the configured LLM provider")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the question set")
+    parser.add_argument("--rtt-ms", type=float, default=400, help="Simulated round trip per call")
+    parser.add_argument("--ms-per-token", type=float, default=10, help="Simulated output token time")
+    args = parser.parse_args()
+
+    if args.live:
+        provider = create_llm_provider(LLMConfig.from_env())
+    else:
+        provider = SimulatedProvider(args.rtt_ms, args.ms_per_token)
+
+    results = [run_mode(provider, False, args.repeat), run_mode(provider, True, args.repeat)]
+
+    print(f"\n{'mode':<12} {'queries':>8} {'median ms':>10} {'p95 ms':>10} {'calls/q':>8} {'in tok/q':>9} {'out tok/q':>10}")
+    for r in results:
+        print(f"{r['mode']:<12} {r['queries']:>8} {r['median_ms']:>10.0f} {r['p95_ms']:>10.0f} "
+              f"{r.get('llm_calls_per_query', float('nan')):>8.2f} "
+              f"{r.get('input_tokens_per_query', float('nan')):>9.0f} "
+              f"{r.get('output_tokens_per_query', float('nan')):>10.0f}")
+
+    multi, single = results
+    saved = multi['median_ms'] - single['median_ms']
+    print(f"\nSingle-shot median saving: {saved:.0f} ms per standalone query "
+          f"({saved / multi['median_ms'] * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -292,16 +292,15 @@ class DataPipeline:
             report.save(str(report_path))
             logger.info(f"Saved validation report: {report_path}")
 
-        # Clear query cache after data load (cached results are now stale)
-        successful = sum(1 for r in self.results if r['status'] == 'success')
-        if successful > 0:
+        # Invalidate cached results that read the loaded tables (now stale)
+        loaded_tables = [r['table_name'] for r in self.results if r['status'] == 'success']
+        if loaded_tables:
             try:
                 cache = get_query_cache(db_path=str(self.output_db))
-                entries_cleared = len(cache)
-                cache.clear()
-                logger.info(f"Query cache cleared ({entries_cleared} entries) - data has changed")
+                entries_cleared = cache.invalidate_tables(loaded_tables)
+                logger.info(f"Query cache invalidated ({entries_cleared} entries) - data has changed")
             except Exception as e:
-                logger.warning(f"Could not clear query cache: {e}")
+                logger.warning(f"Could not invalidate query cache: {e}")
 
         # Summary
         total_duration = (datetime.now() - start_time).total_seconds()
@@ -19,6 +19,10 @@ Usage:
     python scripts/factory3_dictionary.py --rebuild
     python scripts/factory3_dictionary.py --table AE DM
     python scripts/factory3_dictionary.py --test
+
+With --table (and without --rebuild), an existing dictionary is updated in
+place: only the named tables are rescanned and spliced into the fuzzy index
+and schema map.
 """
 
 import argparse
@@ -38,6 +42,7 @@ from core.dictionary import (
     ValueScanner,
     FuzzyMatcher,
     SchemaMapper,
+    update_dictionary,
 )
 
 # Configure logging
@@ -57,7 +62,7 @@ class DictionaryPipeline:
     - Variable definitions from metadata (Factory 2)
 
     Outputs:
-    - fuzzy_index.pkl for RapidFuzz matching
+    - fuzzy_index.idx for RapidFuzz matching
     - schema_map.json for column lookups
     - dictionary_status.json for status tracking
     """
@@ -81,7 +86,7 @@ class DictionaryPipeline:
         self.knowledge_dir = Path(knowledge_dir)
 
         # Output paths
-        self.fuzzy_index_path = self.knowledge_dir / "fuzzy_index.pkl"
+        self.fuzzy_index_path = self.knowledge_dir / "fuzzy_index.idx"
         self.schema_map_path = self.knowledge_dir / "schema_map.json"
         self.status_path = self.knowledge_dir / "dictionary_status.json"
 
@@ -206,6 +211,30 @@ class DictionaryPipeline:
         finally:
             mapper.close()
 
+    def update_tables(self, tables: List[str]) -> Dict[str, Any]:
+        """
+        Rescan tables and splice them into the existing dictionary.
+
+        Args:
+            tables: Tables to rescan (dropped tables are removed)
+
+        Returns:
+            Update summary from update_dictionary
+        """
+        logger.info("=" * 60)
+        logger.info(f"Updating dictionary for {', '.join(tables)}")
+        logger.info("=" * 60)
+
+        metadata_path = str(self.metadata_path) if self.metadata_path.exists() else None
+
+        return update_dictionary(
+            str(self.db_path),
+            tables,
+            str(self.fuzzy_index_path),
+            str(self.schema_map_path),
+            metadata_path,
+        )
+
     def save_status(
         self,
         fuzzy_count: int,
@@ -245,7 +274,8 @@ class DictionaryPipeline:
 
         Args:
             rebuild: Clear and rebuild all indexes
-            tables: Optional list of tables to process
+            tables: Optional list of tables to process (updated in place
+                when a dictionary already exists, unless rebuild is set)
 
         Returns:
             True if successful
@@ -260,6 +290,14 @@ class DictionaryPipeline:
         if not self.verify_inputs():
             return False
 
+        # Only the given tables changed: leave the others as indexed
+        if tables and not rebuild and FuzzyMatcher.index_exists(str(self.fuzzy_index_path)):
+            summary = self.update_tables(tables)
+            self.save_status(summary["fuzzy_entries"], summary["schema_tables"],
+                             time.time() - start_time)
+            logger.info(f"Dictionary updated for {', '.join(summary['tables'])}")
+            return True
+
         # Step 1: Scan values
         scan_results = self.scan_values(tables)
 
@@ -294,8 +332,8 @@ def test_fuzzy_matching():
     """Quick test of fuzzy matching."""
     logger.info("Testing fuzzy matching...")
 
-    index_path = Path("knowledge/fuzzy_index.pkl")
-    if not index_path.exists():
+    index_path = Path("knowledge/fuzzy_index.idx")
+    if not FuzzyMatcher.index_exists(str(index_path)):
         logger.error("Fuzzy index not found. Run build first.")
         return False
 
@@ -330,7 +368,7 @@ def test_fuzzy_matching():
 
 def show_statistics():
     """Show dictionary statistics."""
-    index_path = Path("knowledge/fuzzy_index.pkl")
+    index_path = Path("knowledge/fuzzy_index.idx")
     schema_path = Path("knowledge/schema_map.json")
     status_path = Path("knowledge/dictionary_status.json")
 
@@ -348,7 +386,7 @@ def show_statistics():
         logger.warning("Status file not found")
 
     # Fuzzy index
-    if index_path.exists():
+    if FuzzyMatcher.index_exists(str(index_path)):
         matcher = FuzzyMatcher.load(str(index_path))
         stats = matcher.get_statistics()
         logger.info("")
@@ -384,7 +422,7 @@ def main():
 Examples:
   python scripts/factory3_dictionary.py                    # Full build
   python scripts/factory3_dictionary.py --rebuild          # Force rebuild
-  python scripts/factory3_dictionary.py --table AE DM      # Specific tables
+  python scripts/factory3_dictionary.py --table AE DM      # Update specific tables
   python scripts/factory3_dictionary.py --test             # Test fuzzy matching
   python scripts/factory3_dictionary.py --stats            # Show statistics
         """
@@ -417,7 +455,7 @@ Examples:
     parser.add_argument(
         "--table",
         nargs="+",
-        help="Specific tables to process"
+        help="Specific tables to process (updates an existing dictionary in place)"
     )
 
     parser.add_argument(
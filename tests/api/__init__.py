@@ -0,0 +1 @@
+# API router tests
@@ -0,0 +1,139 @@
+"""
+Tests for the dashboard statistics cache.
+
+Tests DashboardStats from the dashboard router:
+- TTL expiry (stale-while-revalidate)
+- One computation per section at a time
+- Failures and clearing
+"""
+
+import sys
+import time
+import asyncio
+import threading
+from concurrent.futures import wait
+from pathlib import Path
+
+import pytest
+
+# Add project root and API directory to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "docker" / "api"))
+
+from routers.dashboard import DashboardStats
+
+
+class Counter:
+    """Section function returning how often it ran."""
+
+    def __init__(self, delay=0.0, fail=0):
+        self.calls = 0
+        self.delay = delay
+        self.fail = fail
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+            calls = self.calls
+        time.sleep(self.delay)
+        if calls <= self.fail:
+            raise RuntimeError("section unavailable")
+        return calls
+
+
+def wait_refreshes(stats):
+    """Wait for background recomputations to finish."""
+    with stats._lock:
+        pending = list(stats._pending.values())
+    wait(pending)
+
+
+class TestDashboardStats:
+    """Tests for per-section caching."""
+
+    def test_cached_within_ttl(self):
+        """Sections are computed once and served from cache within the TTL."""
+        section = Counter()
+        stats = DashboardStats({"a": (section, 60)})
+
+        assert asyncio.run(stats.get())[0] == {"a": 1}
+        assert asyncio.run(stats.get())[0] == {"a": 1}
+        assert section.calls == 1
+
+    def test_expired_refreshed_in_background(self):
+        """An expired section is served stale while it is recomputed."""
+        section = Counter()
+        stats = DashboardStats({"a": (section, 0.05)})
+        asyncio.run(stats.get())
+
+        time.sleep(0.1)
+        sections, ages = asyncio.run(stats.get())
+        assert sections == {"a": 1}
+        assert ages["a"] >= 0.1
+
+        wait_refreshes(stats)
+        assert section.calls == 2
+        assert asyncio.run(stats.get())[0] == {"a": 2}
+
+    def test_one_computation_per_section(self):
+        """Concurrent requests wait for the same computation."""
+        section = Counter(delay=0.2)
+        stats = DashboardStats({"a": (section, 60)})
+
+        async def main():
+            return await asyncio.gather(*(stats.get() for _ in range(5)))
+
+        results = asyncio.run(main())
+        assert [sections for sections, _ in results] == [{"a": 1}] * 5
+        assert section.calls == 1
+
+    def test_failure_on_first_compute(self):
+        """A section that fails without a cached value fails the request; the next one retries."""
+        failing = Counter(fail=1)
+        other = Counter()
+        stats = DashboardStats({"a": (failing, 60), "b": (other, 60)})
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(stats.get())
+
+        sections, _ = asyncio.run(stats.get())
+        assert sections == {"a": 2, "b": 1}
+        assert (failing.calls, other.calls) == (2, 1)
+
+    def test_failed_refresh_keeps_value(self):
+        """A failed background refresh keeps serving the cached value."""
+        section = Counter()
+        stats = DashboardStats({"a": (section, 0.05)})
+        asyncio.run(stats.get())
+
+        section.fail = 2
+        time.sleep(0.1)
+        assert asyncio.run(stats.get())[0] == {"a": 1}
+        wait_refreshes(stats)
+        assert section.calls == 2
+        assert asyncio.run(stats.get())[0] == {"a": 1}
+
+    def test_clear_recomputes_section(self):
+        """Cleared sections are recomputed; a computation running at the time is not cached."""
+        release = threading.Event()
+        data = Counter()
+        other = Counter()
+
+        def slow():
+            release.wait(5)
+            return data()
+
+        stats = DashboardStats({"data": (slow, 60), "other": (other, 60)})
+
+        async def main():
+            first = asyncio.ensure_future(stats.get())
+            await asyncio.sleep(0.05)
+            stats.clear("data")
+            release.set()
+            return await first
+
+        assert asyncio.run(main())[0] == {"data": 1, "other": 1}
+        assert asyncio.run(stats.get())[0] == {"data": 2, "other": 1}
+        assert other.calls == 1
@@ -119,6 +119,94 @@ class TestAuditDatabase:
             assert len(results) == 3  # 3 LOGIN actions
 
 
+class TestLogSearch:
+    """Tests for cursor pagination, full-text search and search counts."""
+
+    def _db(self, tmpdir, rows=7):
+        """Rows with ids 1..rows; rows 2-4 share a timestamp."""
+        from core.audit import AuditDB, AuditEvent, AuditAction, AuditStatus
+
+        db = AuditDB(os.path.join(tmpdir, "test_audit.db"))
+        for i in range(1, rows + 1):
+            db.insert_log(AuditEvent(
+                timestamp=datetime(2026, 1, 1, 12, 0, 3 if 2 <= i <= 4 else i),
+                user_id="user1",
+                username="user1",
+                action=AuditAction.API_REQUEST,
+                status=AuditStatus.FAILURE if i % 2 else AuditStatus.SUCCESS,
+                request_path=f"/api/v1/Patients/{i}",
+                error_message="Connection timed out" if i == 5 else None,
+                details={"table": "ADVERSE_EVENTS"} if i == 6 else None,
+            ))
+        return db
+
+    def test_cursor_pages(self):
+        """Cursor pages cover every row once, newest first, ties by id."""
+        from core.audit import AuditFilters
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db = self._db(tmpdir)
+
+            ids, cursor = [], None
+            for _ in range(3):
+                page = db.search_logs_page(AuditFilters(page_size=3, cursor=cursor))
+                assert (page.total, page.total_exact) == (7, True)
+                ids.extend(log.id for log in page.logs)
+                cursor = page.next_cursor
+            assert ids == [7, 6, 5, 4, 3, 2, 1]
+            assert cursor is None
+
+            # Offset pages give the same order
+            page = db.search_logs_page(AuditFilters(page=2, page_size=3))
+            assert [log.id for log in page.logs] == [4, 3, 2]
+
+            with pytest.raises(ValueError):
+                db.search_logs_page(AuditFilters(cursor="not-a-cursor"))
+
+    def test_full_text_search(self):
+        """Substring search over path, error message and details, any case."""
+        from core.audit import AuditDB, AuditFilters
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db = self._db(tmpdir)
+            assert db._fts_enabled
+
+            def found(text):
+                return sorted(log.id for log in db.search_logs(AuditFilters(search_text=text))[0])
+
+            assert found("patients/3") == [3]
+            assert found("TIMED") == [5]
+            assert found("adverse_ev") == [6]
+            assert found('"quoted"') == []
+            assert found("/6") == [6]   # Too short for the index: LIKE
+
+            # An existing database is indexed on open
+            with db._get_connection() as conn:
+                conn.execute("DROP TABLE audit_logs_fts")
+            db = AuditDB(db.db_path)
+            assert found("timed") == [5]
+
+    def test_counts(self, monkeypatch):
+        """Counts follow new rows; filtered counts stop at the limit."""
+        from core.audit import AuditFilters, AuditEvent, AuditAction, AuditStatus
+        from core.audit import database
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db = self._db(tmpdir)
+            failures = AuditFilters(status="failure")
+            assert db.search_logs(failures)[1] == 4
+
+            db.insert_log(AuditEvent(user_id="user1", username="user1",
+                                     action=AuditAction.API_REQUEST, status=AuditStatus.FAILURE))
+            assert db.search_logs(failures)[1] == 5
+            assert db.search_logs(AuditFilters())[1] == 8
+
+            monkeypatch.setattr(database, "COUNT_LIMIT", 2)
+            page = db.search_logs_page(AuditFilters(status="success"))
+            assert (page.total, page.total_exact) == (2, False)
+            assert db.search_logs(AuditFilters())[1] == 8
+
+
 class TestAuditService:
     """Tests for the AuditService class."""
 
@@ -321,6 +409,380 @@ class TestQueryAuditDetails:
             assert retrieved.confidence_score == 0.85
 
 
+class TestAuditWriter:
+    """Tests for the batched background audit writer."""
+
+    def _event(self, i=0):
+        from core.audit import AuditEvent, AuditAction, AuditStatus
+        return AuditEvent(
+            user_id=f"user{i}",
+            username=f"user{i}",
+            action=AuditAction.API_REQUEST,
+            status=AuditStatus.SUCCESS,
+            request_method="GET",
+            request_path=f"/api/v1/items/{i}",
+        )
+
+    def _count(self, db):
+        with db._get_connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM audit_logs").fetchone()[0]
+
+    def test_batched_writes(self):
+        """Queued events are written in batches and keep valid checksums."""
+        from core.audit import AuditDB, AuditWriter
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db = AuditDB(os.path.join(tmpdir, "test_audit.db"))
+            writer = AuditWriter(db, batch_size=10, flush_interval=1.0)
+
+            for i in range(25):
+                assert writer.submit(self._event(i)) is True
+            assert writer.flush() is True
+
+            stats = writer.get_stats()
+            assert self._count(db) == 25
+            assert (stats['submitted'], stats['written'], stats['dropped']) == (25, 25, 0)
+            assert 3 <= stats['batches'] <= 25
+            assert stats['queued'] == 0 and stats['lag_ms'] == 0.0
+            assert db.verify_integrity(25).integrity_valid
+
+            writer.close()
+            with db._get_connection() as conn:
+                assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_query_with_details_in_background(self):
+        """A background query event is written with its linked details."""
+        from core.audit import AuditService, QueryAuditDetails, AuditFilters
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            service = AuditService(db_path=os.path.join(tmpdir, "test_audit.db"), async_writes=True)
+
+            log_id = service.log_query(
+                "user1", "user1", "How many patients?", duration_ms=120,
+                details=QueryAuditDetails(original_question="How many patients?",
+                                          generated_sql="SELECT COUNT(*) FROM DM"),
+                background=True
+            )
+            assert log_id is None
+            assert service.log_api_request("user1", "user1", "GET", "/api/v1/x", 200, 5) is None
+
+            service.close()
+            logs, total = service.search_logs(AuditFilters())
+            assert total == 2
+            query_log = next(log for log in logs if log.action == "QUERY")
+            assert service.get_query_details(query_log.id).generated_sql == "SELECT COUNT(*) FROM DM"
+
+    def test_full_queue_drops_and_close_writes(self):
+        """Events beyond the queue size are dropped; close() writes the rest."""
+        from core.audit import AuditDB, AuditWriter
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db = AuditDB(os.path.join(tmpdir, "test_audit.db"))
+            writer = AuditWriter(db, max_queue=2)
+            writer._ensure_started = lambda: None  # No writer thread: the queue only fills
+
+            results = [writer.submit(self._event(i)) for i in range(3)]
+
+            stats = writer.get_stats()
+            assert results == [True, True, False]
+            assert (stats['queued'], stats['dropped'], stats['running']) == (2, 1, False)
+            assert stats['lag_ms'] >= 0
+
+            writer.close()
+            assert self._count(db) == 2
+
+            # After close, events are written synchronously
+            assert writer.submit(self._event(9)) is True
+            assert self._count(db) == 3
+
+    def test_submit_racing_close_not_lost(self):
+        """An event being queued while close() runs is still written."""
+        import threading
+        from core.audit import AuditDB, AuditWriter
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db = AuditDB(os.path.join(tmpdir, "test_audit.db"))
+            writer = AuditWriter(db)
+            writer.submit(self._event(0))
+            assert writer.flush() is True
+
+            entered, release = threading.Event(), threading.Event()
+            put_nowait = writer._queue.put_nowait
+
+            def slow_put(item):
+                entered.set()
+                release.wait(5)
+                put_nowait(item)
+
+            writer._queue.put_nowait = slow_put
+            submitter = threading.Thread(target=writer.submit, args=(self._event(1),))
+            submitter.start()
+            assert entered.wait(5)
+
+            closer = threading.Thread(target=writer.close)
+            closer.start()
+            closer.join(0.2)
+            assert closer.is_alive()  # Waits for the submit in progress
+
+            release.set()
+            submitter.join(5)
+            closer.join(5)
+            assert self._count(db) == 2
+
+    def test_sync_mode(self):
+        """With async writes off, background events are written immediately."""
+        from core.audit import AuditService
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            service = AuditService(db_path=os.path.join(tmpdir, "test_audit.db"), async_writes=False)
+
+            log_id = service.log_api_request("user1", "user1", "GET", "/api/v1/x", 200, 5)
+            assert service.get_log(log_id).request_path == "/api/v1/x"
+            assert service.get_writer_stats() == {"enabled": False}
+
+
+class TestHashChain:
+    """Tests for the audit hash chain and its verification."""
+
+    def _db(self, tmpdir, rows=12):
+        from core.audit import AuditDB, AuditEvent, AuditAction, AuditStatus
+
+        db = AuditDB(os.path.join(tmpdir, "test_audit.db"))
+        for i in range(rows):
+            db.insert_log(AuditEvent(
+                user_id=f"user{i}",
+                username=f"user{i}",
+                action=AuditAction.QUERY,
+                status=AuditStatus.SUCCESS,
+            ))
+        return db
+
+    def _execute(self, db, sql, params=()):
+        with db._get_connection() as conn:
+            conn.execute(sql, params)
+
+    def test_chain_and_checkpoints(self):
+        """Rows are chained; closed segments are checkpointed and skipped on resume."""
+        from core.audit import verify_chain
+        from core.audit.database import GENESIS_HASH, chain_link
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db = self._db(tmpdir)
+            first, second = db.get_log(1), db.get_log(2)
+            assert first.chain_hash == chain_link(GENESIS_HASH, first.checksum)
+            assert second.chain_hash == chain_link(first.chain_hash, second.checksum)
+
+            result = verify_chain(db, segment_size=5)
+            assert result.chain_valid
+            assert (result.rows_verified, result.segments_verified, result.checkpoints_created) == (12, 3, 2)
+
+            # Checkpointed segments are skipped; the open one is verified again
+            result = verify_chain(db, segment_size=5)
+            assert result.chain_valid
+            assert (result.segments_skipped, result.rows_verified, result.resumed_from_id) == (2, 2, 11)
+
+    def test_tampered_row_detected(self):
+        """A changed row fails its checksum, also within a checkpointed segment."""
+        from core.audit import verify_chain
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db = self._db(tmpdir)
+            assert verify_chain(db, segment_size=5).checkpoints_created == 2
+
+            self._execute(db, "UPDATE audit_logs SET username = 'mallory' WHERE id = 3")
+            assert not db.verify_integrity(3).integrity_valid
+
+            # Resume trusts the checkpoint; a full run re-checks every row
+            assert verify_chain(db, segment_size=5).chain_valid
+            result = verify_chain(db, resume=False, segment_size=5)
+            assert not result.chain_valid
+            assert result.failures == [{"log_id": 3, "reason": "Checksum mismatch"}]
+
+    def test_rechained_rows_detected(self):
+        """Rewriting rows with recomputed hashes no longer matches the checkpoints."""
+        from core.audit import verify_chain
+        from core.audit.database import GENESIS_HASH, CHECKSUM_FIELDS, compute_checksum, chain_link
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db = self._db(tmpdir)
+            assert verify_chain(db, segment_size=5).checkpoints_created == 2
+
+            with db._get_connection() as conn:
+                conn.execute("UPDATE audit_logs SET username = 'mallory' WHERE id = 3")
+                previous = GENESIS_HASH
+                for row in conn.execute("SELECT * FROM audit_logs ORDER BY id").fetchall():
+                    checksum = compute_checksum({name: row[name] for name in CHECKSUM_FIELDS})
+                    previous = chain_link(previous, checksum)
+                    conn.execute("UPDATE audit_logs SET checksum = ?, chain_hash = ? WHERE id = ?",
+                                 (checksum, previous, row['id']))
+            assert db.verify_integrity(3).integrity_valid
+
+            result = verify_chain(db, segment_size=5)
+            assert result.failures == [
+                {"log_id": 5, "reason": "Checkpoint mismatch"},
+                {"log_id": 10, "reason": "Checkpoint mismatch"},
+            ]
+
+    def test_deleted_row_detected(self):
+        """Removing a row breaks the chain at the next row."""
+        from core.audit import verify_chain
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db = self._db(tmpdir)
+            self._execute(db, "DELETE FROM audit_logs WHERE id = 7")
+
+            result = verify_chain(db, segment_size=5)
+            assert result.failures == [{"log_id": 8, "reason": "Chain hash mismatch"}]
+            assert result.checkpoints_created == 0
+            assert "Chain hash mismatch" in db.verify_integrity(8).discrepancy_details
+
+    def test_parallel_workers(self):
+        """Segments verified in worker processes give the same result."""
+        from core.audit import verify_chain
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db = self._db(tmpdir)
+            self._execute(db, "UPDATE audit_logs SET action = 'LOGIN' WHERE id = 9")
+
+            result = verify_chain(db, max_workers=2, segment_size=5)
+            assert result.segments_verified == 3
+            assert result.failures == [{"log_id": 9, "reason": "Checksum mismatch"}]
+
+    def test_existing_database_migrated(self):
+        """Rows written before the chain existed are chained on open."""
+        from core.audit import AuditDB, verify_chain
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db = self._db(tmpdir, rows=4)
+            self._execute(db, "ALTER TABLE audit_logs DROP COLUMN chain_hash")
+
+            db = AuditDB(db.db_path)
+            assert db.get_log(4).chain_hash is not None
+            assert db.verify_integrity(4).integrity_valid
+            assert verify_chain(db).chain_valid
+
+
+class TestAuditRollups:
+    """Tests for the pre-aggregated statistics."""
+
+    def _db(self, tmpdir):
+        """Events over three days at uneven times; every third one a query with details."""
+        from datetime import timedelta
+        from core.audit import AuditDB, AuditEvent, AuditAction, AuditStatus, QueryAuditDetails
+
+        db = AuditDB(os.path.join(tmpdir, "test_audit.db"))
+        start = datetime(2026, 3, 1, 22, 15)
+        for i in range(60):
+            is_query = i % 3 == 0
+            log_id = db.insert_log(AuditEvent(
+                timestamp=start + timedelta(minutes=67 * i),
+                user_id=f"user{i % 4}",
+                username=f"user{i % 4}",
+                action=AuditAction.QUERY if is_query else AuditAction.API_REQUEST,
+                status=AuditStatus.FAILURE if i % 7 == 0 else AuditStatus.SUCCESS,
+                resource_type="chat" if is_query else None,
+                duration_ms=None if i % 5 == 0 else 40 * i,
+            ))
+            if is_query:
+                db.insert_query_details(log_id, QueryAuditDetails(
+                    original_question=f"Question {i}",
+                    confidence_score=None if i % 9 == 0 else 50 + i % 50,
+                    execution_time_ms=30 * i,
+                    tables_accessed=["ADSL", "ADAE"] if i % 2 else ["ADSL"],
+                ))
+        return db
+
+    def _scan(self, db, start=None, end=None):
+        """Statistics computed from the log rows."""
+        from collections import Counter
+
+        with db._get_connection() as conn:
+            rows = [dict(row) for row in conn.execute('''
+                SELECT a.*, q.confidence_score FROM audit_logs a
+                LEFT JOIN query_audit_details q ON q.audit_log_id = a.id
+            ''')]
+        rows = [r for r in rows
+                if (start is None or r['timestamp'] >= start.isoformat())
+                and (end is None or r['timestamp'] <= end.isoformat())]
+        durations = [r['duration_ms'] for r in rows if r['duration_ms'] is not None]
+        scores = [r['confidence_score'] for r in rows if r['confidence_score'] is not None]
+        return {
+            'total': len(rows),
+            'by_action': dict(Counter(r['action'] for r in rows)),
+            'by_status': dict(Counter(r['status'] for r in rows)),
+            'by_user': dict(Counter(r['username'] for r in rows)),
+            'by_resource_type': dict(Counter(r['resource_type'] for r in rows if r['resource_type'])),
+            'duration': round(sum(durations) / len(durations), 2) if durations else None,
+            'confidence': round(sum(scores) / len(scores), 2) if scores else None,
+        }
+
+    def _assert_matches_scan(self, db, start=None, end=None):
+        stats = db.get_statistics(start, end)
+        expected = self._scan(db, start, end)
+        assert stats.total_events == expected['total']
+        assert stats.by_action == expected['by_action']
+        assert stats.by_status == expected['by_status']
+        assert stats.by_user == expected['by_user']
+        assert stats.by_resource_type == expected['by_resource_type']
+        assert stats.average_duration_ms == expected['duration']
+        assert stats.average_query_confidence == expected['confidence']
+
+    def test_statistics_match_log(self):
+        """Statistics from rollups equal a scan, for whole and partial hours and days."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db = self._db(tmpdir)
+            for start, end in [
+                (None, None),
+                (datetime(2026, 3, 2), datetime(2026, 3, 3, 23, 59, 59)),
+                (datetime(2026, 3, 1, 23, 40), datetime(2026, 3, 3, 5, 10)),
+                (datetime(2026, 3, 2, 10, 5), datetime(2026, 3, 2, 17, 0)),
+                (datetime(2026, 3, 2, 10, 5), datetime(2026, 3, 2, 10, 50)),
+                (datetime(2026, 3, 3, 4, 30), None),
+                (None, datetime(2026, 3, 2, 6, 0)),
+            ]:
+                self._assert_matches_scan(db, start, end)
+
+    def test_dimensions_and_backfill(self):
+        """Query dimensions are rolled up; an existing database is backfilled on open."""
+        from core.audit import AuditDB
+        from core.audit import rollups
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db = self._db(tmpdir)
+
+            def read():
+                with db._get_connection() as conn:
+                    return rollups.read_totals(conn, ['table', 'confidence', 'query_time', 'duration'])
+
+            totals = read()
+            assert {name: t.events for name, t in totals['table'].items()} == {'ADSL': 20, 'ADAE': 10}
+            assert sum(t.events for t in totals['confidence'].values()) == 13   # Scored queries
+            assert sum(t.events for t in totals['query_time'].values()) == 20
+            assert totals['query_time']['0-100'].events == 2   # Queries 0 and 3: 0 and 90 ms
+            assert set(totals['duration']) <= set(rollups.histogram_labels())
+
+            with db._get_connection() as conn:
+                conn.execute("DROP TABLE audit_rollups")
+            db = AuditDB(db.db_path)
+            assert read() == totals
+            self._assert_matches_scan(db)
+
+    def test_background_writes_rolled_up(self):
+        """Events written by the background writer reach the statistics."""
+        from core.audit import AuditService
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            service = AuditService(db_path=os.path.join(tmpdir, "test_audit.db"), async_writes=True)
+            for i in range(5):
+                service.log_api_request("user1", "user1", "GET", f"/api/v1/x/{i}", 200, 10 * i)
+            service.flush()
+
+            stats = service.get_statistics()
+            assert stats.by_action == {"API_REQUEST": 5}
+            assert stats.average_duration_ms == 20.0
+            service.close()
+
+
 class TestExportFunctions:
     """Tests for export functionality."""
 
@@ -0,0 +1,95 @@
+"""
+Tests for BatchProcessor - Parallel multi-file ingestion.
+"""
+
+import pytest
+import pandas as pd
+
+from core.data import BatchProcessor, get_batch_job
+from core.data.batch_processor import MAX_PARSE_WORKERS
+
+
+@pytest.fixture
+def raw_dir(tmp_path):
+    """Directory with three small CSV datasets."""
+    for name, rows in [('dm', 3), ('ae', 5), ('lb', 4)]:
+        pd.DataFrame({
+            'USUBJID': [f'S{i}' for i in range(rows)],
+            'VALUE': list(range(rows)),
+        }).to_csv(tmp_path / f'{name}.csv', index=False)
+    return tmp_path
+
+
+@pytest.fixture
+def processor(duckdb_loader, schema_tracker, file_store):
+    """Two parse workers, two-row chunks."""
+    return BatchProcessor(duckdb_loader, schema_tracker, file_store, max_workers=2,
+                          reader_options={'chunk_size': 2})
+
+
+class TestBatchProcessor:
+    """Test parallel parsing with a single writer."""
+
+    def test_batch_loads_all_files(self, processor, raw_dir, duckdb_loader):
+        """Every file is loaded; missing files are reported per file."""
+        files = [str(raw_dir / n) for n in ('dm.csv', 'ae.csv', 'missing.csv', 'lb.csv')]
+        job = processor.start(files)
+
+        assert get_batch_job(job.job_id) is job
+        assert job.wait(timeout=120)
+
+        status = job.to_dict()
+        assert status['status'] == 'completed'
+        assert status['progress'] == 100.0
+        assert (status['total'], status['completed'], status['failed']) == (4, 3, 1)
+
+        results = {r['filename']: r for r in status['results']}
+        assert results['ae.csv']['rows'] == 5
+        assert results['ae.csv']['schema_version'] == 1
+        assert results['missing.csv']['error'] == 'File not found'
+
+        assert duckdb_loader.list_tables() == ['AE', 'DM', 'LB']
+        assert duckdb_loader.get_table_info('AE').row_count == 5
+        assert processor.file_store.get_by_table('LB')[0].row_count == 4
+
+    def test_breaking_change_blocked(self, processor, raw_dir, duckdb_loader):
+        """A file with removed columns is blocked and the table kept."""
+        processor.run([str(raw_dir / 'dm.csv')])
+
+        pd.DataFrame({'USUBJID': ['X1']}).to_csv(raw_dir / 'dm.csv', index=False)
+        job = processor.run([str(raw_dir / 'dm.csv')])
+
+        result = job.to_dict()['results'][0]
+        assert result['status'] == 'blocked'
+        assert result['schema_diff']['removed_columns'] == ['VALUE']
+        assert duckdb_loader.get_table_info('DM').row_count == 3
+
+    def test_schema_checked_on_loaded_types(self, processor, raw_dir, duckdb_loader):
+        """A later part widening a column is checked as widened, not as the first part."""
+        pd.DataFrame({'USUBJID': ['S0', 'S1'], 'VALUE': [0.5, 1.5]}).to_csv(raw_dir / 'vs.csv', index=False)
+        processor.run([str(raw_dir / 'vs.csv')])
+
+        # First two-row part is all integers, the next has decimals
+        pd.DataFrame({'USUBJID': ['S0', 'S1', 'S2'], 'VALUE': [1, 2, 2.5]}).to_csv(
+            raw_dir / 'vs.csv', index=False, float_format='%g')
+        job = processor.run([str(raw_dir / 'vs.csv')])
+
+        assert job.to_dict()['results'][0]['status'] == 'completed'
+        assert duckdb_loader.get_table_info('VS').row_count == 3
+
+    def test_deferred_completion(self, processor, raw_dir):
+        """With deferred completion the job stays finalizing until completed."""
+        job = processor.start([str(raw_dir / 'dm.csv')], defer_completion=True)
+
+        assert job.wait_loaded(timeout=120)
+        assert job.to_dict()['status'] == 'finalizing'
+        assert not job.wait(timeout=0)
+
+        job.complete()
+        assert job.wait(timeout=0)
+        assert job.to_dict()['status'] == 'completed'
+
+    def test_workers_clamped_to_pool(self, duckdb_loader, schema_tracker, file_store):
+        """Requested workers never exceed the shared pool's size."""
+        processor = BatchProcessor(duckdb_loader, schema_tracker, file_store, max_workers=10_000)
+        assert processor.max_workers == MAX_PARSE_WORKERS
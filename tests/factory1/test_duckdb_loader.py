@@ -270,6 +270,92 @@ class TestDuckDBLoaderParquet:
         assert 'not found' in result.error.lower()
 
 
+class TestDuckDBLoaderStreaming:
+    """Test chunked loading through a staging table."""
+
+    def test_load_chunks(self, duckdb_loader, sample_df):
+        """Chunks are appended in order and progress reports rows loaded."""
+        progress = []
+        chunks = [sample_df.iloc[:2], sample_df.iloc[2:]]
+        result = duckdb_loader.load_chunks(iter(chunks), 'stream_table', progress_callback=progress.append)
+
+        assert result.success is True
+        assert result.rows_loaded == 3
+        assert progress == [2, 3]
+        loaded = duckdb_loader.query("SELECT USUBJID FROM STREAM_TABLE")
+        assert list(loaded['USUBJID']) == ['SUBJ001', 'SUBJ002', 'SUBJ003']
+        assert duckdb_loader.list_tables() == ['STREAM_TABLE']
+
+    def test_load_chunks_widens_types(self, duckdb_loader):
+        """Later chunks with decimals or text widen the first chunk's types."""
+        chunks = [
+            pd.DataFrame({'AVAL': [1, 2], 'AVALC': [1, 2]}),
+            pd.DataFrame({'AVAL': [2.5, None], 'AVALC': ['<LLOQ', None]}),
+        ]
+        result = duckdb_loader.load_chunks(iter(chunks), 'widened')
+        assert result.success is True
+
+        loaded = duckdb_loader.query("SELECT * FROM WIDENED")
+        assert loaded['AVAL'].tolist()[:3] == [1.0, 2.0, 2.5]
+        assert loaded['AVALC'].tolist()[:3] == ['1', '2', '<LLOQ']
+
+    def test_load_chunks_types_null_columns(self, duckdb_loader):
+        """A column that is all NULL in the first chunk takes a later chunk's type."""
+        chunks = [
+            pd.DataFrame({'USUBJID': ['A'], 'TRTSDTM': [None]}),
+            pd.DataFrame({'USUBJID': ['B'], 'TRTSDTM': pd.to_datetime(['2024-01-02 08:30'])}),
+        ]
+        result = duckdb_loader.load_chunks(iter(chunks), 'null_first')
+        assert result.success is True
+
+        types = dict(duckdb_loader.query("DESCRIBE NULL_FIRST")[['column_name', 'column_type']].values)
+        assert types['TRTSDTM'] == 'TIMESTAMP'
+        assert duckdb_loader.get_table_info('null_first').columns[1]['dtype'] == 'datetime64[ns]'
+
+    def test_schema_check_sees_loaded_types(self, duckdb_loader, sample_df):
+        """The schema check gets the widened types and can keep the old table."""
+        duckdb_loader.load_dataframe(sample_df, 'checked')
+        seen = []
+
+        def reject(columns):
+            seen.extend(columns)
+            raise ValueError("Blocked: Breaking schema changes")
+
+        chunks = [sample_df.iloc[:2], sample_df.iloc[2:].assign(AGE=58.5)]
+        result = duckdb_loader.load_chunks(iter(chunks), 'checked', schema_check=reject)
+
+        assert result.success is False
+        assert {c['name']: c['dtype'] for c in seen}['AGE'] == 'float64'
+        assert duckdb_loader.get_table_info('checked').row_count == 3
+        assert duckdb_loader.query("SELECT AGE FROM CHECKED")['AGE'].tolist() == [45, 32, 58]
+
+    def test_stale_staging_dropped_on_open(self, duckdb_loader, temp_duckdb_path):
+        """Staging tables left by a dead load are dropped by the next loader."""
+        stale = f"{DuckDBLoader.STAGING_PREFIX}ADAE_deadbeef"
+        duckdb_loader.execute(f"CREATE TABLE {stale} (x INTEGER)")
+
+        DuckDBLoader(temp_duckdb_path)
+
+        tables = duckdb_loader.query("SELECT table_name FROM information_schema.tables")
+        assert stale not in tables['table_name'].tolist()
+
+    def test_failed_load_keeps_table(self, duckdb_loader, sample_df):
+        """A load that fails midway leaves the previous table in place."""
+        duckdb_loader.load_dataframe(sample_df, 'kept_table')
+
+        def chunks():
+            yield sample_df.iloc[:1]
+            raise IOError("truncated file")
+
+        result = duckdb_loader.load_chunks(chunks(), 'kept_table')
+        assert result.success is False
+        assert 'truncated' in result.error
+
+        assert duckdb_loader.get_table_info('kept_table').row_count == 3
+        tables = duckdb_loader.query("SELECT table_name FROM information_schema.tables")
+        assert not any(t.startswith(DuckDBLoader.STAGING_PREFIX) for t in tables['table_name'])
+
+
 class TestDuckDBLoaderExport:
     """Test export functionality."""
 
@@ -241,6 +241,35 @@ class TestSchemaTrackerChangeDetection:
         assert diff.severity == ChangeSeverity.BREAKING
 
 
+    def test_chunked_schema(self, schema_tracker, sample_df, temp_csv_file):
+        """Test versions recorded from a schema merged over chunks."""
+        schema = schema_tracker.extract_schema(sample_df.iloc[:2])
+        chunk = sample_df.iloc[2:].assign(RACE=None)
+        schema_tracker.merge_schema(schema, chunk)
+
+        assert schema['row_count'] == 3
+        assert {c['name']: c['nullable'] for c in schema['columns']}['RACE'] is True
+
+        should_block, diff = schema_tracker.should_block_upload('chunked_table', schema)
+        assert should_block is False
+        assert diff.new_row_count == 3
+
+        version = schema_tracker.record_version('chunked_table', schema, temp_csv_file)
+        assert version.row_count == 3
+        assert version.schema_hash == schema_tracker.calculate_schema_hash(sample_df)
+
+    def test_apply_loaded_types(self, schema_tracker, sample_df):
+        """Loaded column types replace those of the first chunk."""
+        schema = schema_tracker.extract_schema(sample_df)
+        loaded = [{'name': c['name'], 'dtype': 'float64' if c['name'] == 'AGE' else c['dtype']}
+                  for c in schema['columns']]
+        schema_tracker.apply_loaded_types(schema, loaded)
+
+        assert {c['name']: c['dtype'] for c in schema['columns']}['AGE'] == 'float64'
+        assert schema['column_count'] == 4
+        assert all(c['nullable'] is False for c in schema['columns'])
+
+
 class TestSchemaTrackerPersistence:
     """Test database persistence."""
 
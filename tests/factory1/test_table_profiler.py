@@ -0,0 +1,148 @@
+# Tests for the Table Profiler
+"""
+Test suite for single-scan table profiling.
+
+These tests verify that:
+- Profiles match per-column COUNT / DISTINCT / GROUP BY queries
+- Distinct values keep the column's sort order (numeric for numbers)
+- Top-k frequencies, null-only columns and empty tables are handled
+- Several tables are profiled in parallel, in input order
+- ValueScanner and DataKnowledgeLearner report the same statistics
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+duckdb = pytest.importorskip("duckdb")
+
+from core.data.table_profiler import TableProfiler, ColumnProfile
+from core.dictionary.value_scanner import ValueScanner
+from core.engine.data_knowledge import DataKnowledgeLearner
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "clinical.duckdb"
+    conn = duckdb.connect(str(path))
+    conn.execute("""
+        CREATE TABLE ADAE AS
+        SELECT
+            'S' || (i % 50) AS USUBJID,
+            ['Headache', 'Nausea', 'Fatigue', 'Rash', NULL][i % 5 + 1] AS AEDECOD,
+            CASE WHEN i % 3 = 0 THEN 'MILD' WHEN i % 3 = 1 THEN 'MODERATE' END AS AESEV,
+            (i % 12) * 5 AS ADY,
+            CAST(NULL AS VARCHAR) AS AECOMM
+        FROM range(200) t(i)
+    """)
+    conn.execute("CREATE TABLE ADSL (USUBJID VARCHAR, SEX VARCHAR)")
+    conn.execute("INSERT INTO ADSL VALUES ('S1', 'M'), ('S2', 'F'), ('S3', 'F')")
+    conn.execute("CREATE TABLE EMPTY (X VARCHAR)")
+    conn.close()
+    yield str(path)
+
+
+def reference(conn, table, column, limit):
+    """The per-column queries the profiler replaces."""
+    total, unique, nulls = conn.execute(f'''
+        SELECT COUNT(*), COUNT(DISTINCT "{column}"), COUNT(*) - COUNT("{column}") FROM {table}
+    ''').fetchone()
+    values = [str(r[0]) for r in conn.execute(f'''
+        SELECT DISTINCT "{column}" FROM {table} WHERE "{column}" IS NOT NULL
+        ORDER BY "{column}" LIMIT {limit}
+    ''').fetchall()]
+    frequencies = dict((str(r[0]), r[1]) for r in conn.execute(f'''
+        SELECT "{column}", COUNT(*) FROM {table} WHERE "{column}" IS NOT NULL GROUP BY "{column}"
+    ''').fetchall())
+    return total, unique, nulls, values, frequencies
+
+
+class TestTableProfiler:
+    """Profiles of single tables."""
+
+    @pytest.mark.parametrize("max_grouped", [TableProfiler.MAX_GROUPED_DISTINCT, 10])
+    def test_matches_per_column_queries(self, db_path, max_grouped):
+        profiler = TableProfiler(db_path, max_values=7, top_k=3)
+        profiler.MAX_GROUPED_DISTINCT = max_grouped  # 10: USUBJID and ADY ranked on their own
+        profiles = profiler.profile_table("ADAE")
+        assert list(profiles) == ["USUBJID", "AEDECOD", "AESEV", "ADY", "AECOMM"]
+
+        conn = duckdb.connect(db_path, read_only=True)
+        try:
+            for column, profile in profiles.items():
+                total, unique, nulls, values, frequencies = reference(conn, "ADAE", column, 7)
+                assert isinstance(profile, ColumnProfile)
+                assert (profile.total_rows, profile.distinct_count, profile.null_count) == (total, unique, nulls)
+                assert profile.values == values
+
+                # Most frequent first; ties at the cut-off may pick any value
+                counts = sorted(frequencies.values(), reverse=True)[:3]
+                assert [n for _, n in profile.top_values] == counts
+                assert all(frequencies[value] == n for value, n in profile.top_values)
+        finally:
+            conn.close()
+
+    def test_numeric_values_in_numeric_order(self, db_path):
+        profile = TableProfiler(db_path, max_values=4).profile_table("ADAE", ["ady"])["ADY"]
+        assert profile.data_type in ("INTEGER", "BIGINT")
+        assert profile.values == ["0", "5", "10", "15"]
+        assert profile.top_values == []
+
+    def test_null_only_and_empty(self, db_path):
+        profiler = TableProfiler(db_path, max_values=10, top_k=10)
+
+        comm = profiler.profile_table("ADAE", ["AECOMM"])["AECOMM"]
+        assert (comm.distinct_count, comm.null_count, comm.values) == (0, 200, [])
+
+        empty = profiler.profile_table("EMPTY")["X"]
+        assert (empty.total_rows, empty.distinct_count, empty.values) == (0, 0, [])
+
+    def test_unknown_columns_skipped(self, db_path):
+        profiles = TableProfiler(db_path).profile_table("ADSL", ["sex", "NOPE"])
+        assert list(profiles) == ["SEX"]
+        assert profiles["SEX"].distinct_count == 2
+
+    def test_profile_tables_parallel(self, db_path):
+        profiler = TableProfiler(db_path, top_k=1, max_workers=3)
+        results = profiler.profile_tables({"ADSL": None, "MISSING": None, "ADAE": ["AESEV"]})
+
+        assert list(results) == ["ADSL", "ADAE"]
+        assert results["ADSL"]["SEX"].top_values == [("F", 2)]
+        assert results["ADAE"]["AESEV"].null_count == 66
+
+
+class TestProfilerConsumers:
+    """ValueScanner and DataKnowledgeLearner built on the profiler."""
+
+    def test_scan_column(self, db_path):
+        with ValueScanner(db_path) as scanner:
+            result = scanner.scan_column("ADAE", "AEDECOD")
+
+        assert result.values == ["Fatigue", "Headache", "Nausea", "Rash"]
+        assert (result.total_rows, result.unique_count, result.null_count) == (200, 4, 40)
+
+    def test_scan_all_tables(self, db_path):
+        with ValueScanner(db_path) as scanner:
+            results = scanner.scan_all_tables()
+
+        # ADAE uses the predefined columns; ADSL falls back to text columns
+        assert list(results) == ["ADAE", "ADSL"]
+        assert list(results["ADAE"]) == ["AEDECOD"]
+        assert results["ADSL"]["SEX"].values == ["F", "M"]
+
+    def test_learner(self, db_path):
+        knowledge = DataKnowledgeLearner(db_path).learn()
+
+        aesev = knowledge.columns["ADAE"]["AESEV"]
+        assert aesev.distinct_count == 2
+        assert aesev.value_frequencies == {"MILD": 67, "MODERATE": 67}
+        assert aesev.has_nulls and round(aesev.null_percentage) == 33
+        assert knowledge.find_column_for_value("Headache") == [("ADAE", "AEDECOD", 1.0)]
+
+        quick = DataKnowledgeLearner(db_path).quick_learn(["adae", "MISSING"])
+        assert list(quick.columns) == ["adae"]
+        assert set(quick.columns["adae"]) == {"AEDECOD", "AESEV"}
@@ -171,6 +171,31 @@ class TestUniversalReaderEdgeCases:
         finally:
             os.unlink(parquet_path)
 
+    def test_read_chunks(self, temp_csv_file, temp_parquet_file, sample_df):
+        """Test reading files in bounded chunks."""
+        reader = UniversalReader(chunk_size=2)
+        for path in (temp_csv_file, temp_parquet_file):
+            chunks = list(reader.read_chunks(path))
+            assert [len(c) for c in chunks] == [2, 1]
+            combined = pd.concat(chunks, ignore_index=True)
+            assert list(combined['USUBJID']) == list(sample_df['USUBJID'])
+
+        assert reader.count_rows(temp_parquet_file) == 3
+        assert reader.count_rows(temp_csv_file) is None
+
+    def test_read_chunks_unsupported(self, universal_reader):
+        """Test chunked reading of missing and unsupported files."""
+        with pytest.raises(FileNotFoundError):
+            list(universal_reader.read_chunks('/nonexistent/file.csv'))
+
+        with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as f:
+            temp_path = f.name
+        try:
+            with pytest.raises(ValueError):
+                list(universal_reader.read_chunks(temp_path))
+        finally:
+            os.unlink(temp_path)
+
     def test_get_supported_formats(self, universal_reader):
         """Test getting list of supported formats."""
         formats = universal_reader.get_supported_formats()
@@ -0,0 +1,76 @@
+# Pytest configuration for Factory 3 tests
+"""
+Fixtures for Factory 3 tests.
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+# Word pool for synthetic MedDRA term names
+_STEMS = [
+    "cardi", "hepat", "nephr", "neur", "gastr", "derm", "pulmon", "oste", "arthr", "myel",
+    "enceph", "angi", "lymph", "thromb", "haem", "col", "cyst", "rhin", "pharyng", "laryng",
+    "ot", "ophthalm", "my", "vascul", "pancreat", "oesophag", "duoden", "ile", "append", "prostat",
+]
+_SUFFIXES = ["itis", "opathy", "algia", "osis", "oma", "ectasia", "plasia", "rrhage", "spasm", "megaly"]
+_MODIFIERS = [
+    "acute", "chronic", "congenital", "infective", "allergic", "toxic", "post procedural",
+    "viral", "bacterial", "fungal", "recurrent", "primary", "secondary", "neonatal", "drug induced",
+]
+_NOUNS = ["disorder", "infection", "pain", "neoplasm", "injury", "haemorrhage", "obstruction",
+          "stenosis", "failure", "syndrome", "abscess", "ulcer", "fistula", "cyst", "oedema"]
+
+
+def synthetic_meddra_rows(socs=27, hlgts=337, hlts=1737, pts=24000, llts=80000, seed=0):
+    """
+    Rows for meddra_hierarchy with the size of a full MedDRA release.
+
+    Every PT has an LLT of the same name; the remaining LLTs are spread over
+    random PTs. About 10% of PTs also sit on a secondary SOC path.
+    """
+    rng = random.Random(seed)
+
+    def name():
+        words = [rng.choice(_STEMS) + rng.choice(_SUFFIXES)]
+        if rng.random() < 0.6:
+            words.insert(0, rng.choice(_MODIFIERS))
+        if rng.random() < 0.5:
+            words.append(rng.choice(_NOUNS))
+        return " ".join(words).capitalize()
+
+    soc = [(str(10000000 + i), f"{rng.choice(_STEMS).capitalize()} disorders {i}") for i in range(socs)]
+    hlgt = [(str(10100000 + i), name() + f" {i}", soc[i % socs]) for i in range(hlgts)]
+    hlt = [(str(10200000 + i), name() + " NEC", hlgt[i % hlgts]) for i in range(hlts)]
+    pt = [(str(10300000 + i), name(), hlt[rng.randrange(hlts)]) for i in range(pts)]
+
+    rows = []
+    llt_by_pt = [[(code, pt_name)] for code, pt_name, _ in pt]
+    for i in range(llts - pts):
+        llt_by_pt[rng.randrange(pts)].append((str(10500000 + i), name()))
+
+    for (pt_code, pt_name, (hlt_code, hlt_name, (hlgt_code, hlgt_name, (soc_code, soc_name)))), llt_list in zip(pt, llt_by_pt):
+        for llt_code, llt_name in llt_list:
+            rows.append((soc_code, soc_name, hlgt_code, hlgt_name, hlt_code, hlt_name,
+                         pt_code, pt_name, llt_code, llt_name))
+        if rng.random() < 0.1:
+            other_hlt_code, other_hlt_name, (other_hlgt_code, other_hlgt_name, (other_soc_code, other_soc_name)) = hlt[rng.randrange(hlts)]
+            rows.append((other_soc_code, other_soc_name, other_hlgt_code, other_hlgt_name,
+                         other_hlt_code, other_hlt_name, pt_code, pt_name, pt_code, pt_name))
+    return rows
+
+
+@pytest.fixture(scope="session")
+def synthetic_meddra():
+    """meddra_hierarchy DataFrame sized like a full MedDRA release (~80k LLTs)."""
+    import pandas as pd
+
+    columns = ["soc_code", "soc_name", "hlgt_code", "hlgt_name", "hlt_code", "hlt_name",
+               "pt_code", "pt_name", "llt_code", "llt_name"]
+    return pd.DataFrame(synthetic_meddra_rows(), columns=columns)
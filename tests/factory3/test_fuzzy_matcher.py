@@ -229,6 +229,99 @@ class TestFuzzyMatcherPersistence:
             assert len(results) > 0
             assert results[0].value == "HEADACHE"
 
+    @pytest.fixture
+    def mixed_matcher(self):
+        """Matcher with repeated values across columns and case variants."""
+        matcher = FuzzyMatcher()
+        matcher.build_index({
+            "AE": {"AETERM": ["HEADACHE", "Nausea", "MIGRAINE HEADACHE", "NAUSEA"],
+                   "AEDECOD": ["Headache", "NAUSEA", "Vomiting"]},
+            "CM": {"CMTRT": ["TYLENOL", "ASPIRIN"] + [f"TERM{i:05d}QX" for i in range(3000)]},
+            "ae": {"aeterm": ["Dizziness"]},
+        })
+        return matcher
+
+    def test_loaded_matches_in_memory(self, mixed_matcher, tmp_path):
+        """Test a mapped index gives the same results as the one it was saved from."""
+        path = tmp_path / "fuzzy_index.idx"
+        mixed_matcher.save(str(path))
+        loaded = FuzzyMatcher.load(str(path))
+
+        queries = ["headache", "HEADACH", "nausea", "VOMITTING", "TYLENL", "TERM0012QX", "dizzines"]
+        for query in queries:
+            assert [m.to_dict() for m in loaded.match(query, threshold=60.0)] == \
+                [m.to_dict() for m in mixed_matcher.match(query, threshold=60.0)]
+            assert [m.to_dict() for m in loaded.match_multi_strategy(query)] == \
+                [m.to_dict() for m in mixed_matcher.match_multi_strategy(query)]
+        assert [[m.to_dict() for m in r] for r in loaded.match_many(queries)] == \
+            [[m.to_dict() for m in r] for r in mixed_matcher.match_many(queries)]
+        assert [m.to_dict() for m in loaded.match_in_column("headach", "AE", "AEDECOD")] == \
+            [m.to_dict() for m in mixed_matcher.match_in_column("headach", "AE", "AEDECOD")]
+        assert loaded.get_statistics() == mixed_matcher.get_statistics()
+        assert list(loaded._index) == list(mixed_matcher._index)
+
+    def test_resave_mapped_index(self, mixed_matcher, tmp_path):
+        """Test saving over the file a matcher was loaded from."""
+        path = tmp_path / "fuzzy_index.idx"
+        mixed_matcher.save(str(path))
+        loaded = FuzzyMatcher.load(str(path))
+
+        loaded.save(str(path))
+        reloaded = FuzzyMatcher.load(str(path))
+        assert reloaded.get_statistics() == mixed_matcher.get_statistics()
+        assert loaded.match("NAUSEA")[0].value == "Nausea"
+
+    def test_migrates_legacy_pickle(self, mixed_matcher, tmp_path):
+        """Test a fuzzy_index.pkl next to a missing index file is converted."""
+        import pickle
+
+        legacy = tmp_path / "fuzzy_index.pkl"
+        with open(legacy, "wb") as f:
+            pickle.dump({
+                "index": mixed_matcher._index,
+                "values_by_table": dict(mixed_matcher._values_by_table),
+                "all_values": mixed_matcher._all_values,
+                "value_to_entries": dict(mixed_matcher._value_to_entries),
+            }, f)
+
+        path = tmp_path / "fuzzy_index.idx"
+        assert FuzzyMatcher.index_exists(str(path))
+        loaded = FuzzyMatcher.load(str(path))
+        assert path.exists()
+        assert loaded.get_statistics() == mixed_matcher.get_statistics()
+
+        path.unlink()
+        assert FuzzyMatcher.load(str(legacy)).match("TYLENL", threshold=70.0)[0].value == "TYLENOL"
+        assert path.exists()
+
+    def test_legacy_pickle_rejects_other_types(self, tmp_path):
+        """Test migration does not unpickle arbitrary objects."""
+        import pickle
+
+        class Payload:
+            def __reduce__(self):
+                return (os.system, ("echo pwned",))
+
+        legacy = tmp_path / "fuzzy_index.pkl"
+        with open(legacy, "wb") as f:
+            pickle.dump({"index": [Payload()], "all_values": []}, f)
+
+        with pytest.raises(pickle.UnpicklingError):
+            FuzzyMatcher.load(str(legacy))
+
+    def test_rejects_newer_format(self, mixed_matcher, tmp_path):
+        """Test files from a newer format version are refused."""
+        from core.dictionary.fuzzy_index_file import FuzzyIndexFormatError, FORMAT_VERSION
+
+        path = tmp_path / "fuzzy_index.idx"
+        mixed_matcher.save(str(path))
+        data = bytearray(path.read_bytes())
+        data[8:12] = (FORMAT_VERSION + 1).to_bytes(4, "little")
+        path.write_bytes(bytes(data))
+
+        with pytest.raises(FuzzyIndexFormatError):
+            FuzzyMatcher.load(str(path))
+
     def test_statistics(self):
         """Test getting statistics."""
         matcher = FuzzyMatcher()
@@ -248,6 +341,140 @@ class TestFuzzyMatcherPersistence:
         assert stats["tables"] == 2
 
 
+class TestFuzzyMatcherUpdateTable:
+    """Test splicing one table's values into an index."""
+
+    VALUES = {
+        "ADAE": {"AEDECOD": ["HEADACHE", "NAUSEA"], "AESOC": ["NERVOUS SYSTEM DISORDERS"]},
+        "ADCM": {"CMTRT": ["TYLENOL", "ASPIRIN"]},
+        "ADSL": {"SEX": ["M", "F"], "RACE": ["WHITE", "ASIAN"]},
+    }
+
+    def _summary(self, matcher):
+        return [(e.value, e.table, e.column) for e in matcher._index]
+
+    def test_matches_full_build(self):
+        """Replacing a table gives the same index as building from scratch."""
+        matcher = FuzzyMatcher()
+        matcher.build_index(self.VALUES)
+        new_adcm = {"CMTRT": ["IBUPROFEN", "ASPIRIN"], "CMDECOD": ["PARACETAMOL"]}
+        count = matcher.update_table("adcm", new_adcm)
+
+        expected = FuzzyMatcher()
+        expected.build_index({**self.VALUES, "ADCM": new_adcm})
+
+        assert count == len(expected)
+        assert self._summary(matcher) == self._summary(expected)
+        assert matcher.get_statistics() == expected.get_statistics()
+        assert matcher.match("IBUPROFN", threshold=80.0)[0].value == "IBUPROFEN"
+        assert matcher.match("TYLENOL", threshold=95.0) == []
+
+    def test_add_and_remove_table(self):
+        """A new table is appended; an empty one is removed."""
+        matcher = FuzzyMatcher()
+        matcher.build_index(self.VALUES)
+
+        matcher.update_table("ADVS", {"PARAM": ["Systolic Blood Pressure"]})
+        assert matcher.match_in_column("systolic blood presure", "ADVS", "PARAM")[0].value == "Systolic Blood Pressure"
+
+        matcher.update_table("ADAE", {})
+        assert "ADAE" not in matcher._values_by_table
+        assert all(e.table != "ADAE" for e in matcher._index)
+        assert matcher.match("HEADACHE", threshold=95.0) == []
+
+    def test_several_tables_rebuild_once(self, monkeypatch):
+        """Changing several tables at once builds the index once."""
+        matcher = FuzzyMatcher()
+        matcher.build_index(self.VALUES)
+        builds = []
+        build_index = matcher.build_index
+        monkeypatch.setattr(matcher, "build_index", lambda values: builds.append(1) or build_index(values))
+
+        new_adcm = {"CMTRT": ["IBUPROFEN"]}
+        matcher.update_tables({"adcm": new_adcm, "ADAE": {}, "ADVS": {"PARAM": ["Pulse Rate"]}})
+
+        expected = FuzzyMatcher()
+        expected.build_index({"ADCM": new_adcm, "ADSL": self.VALUES["ADSL"],
+                              "ADVS": {"PARAM": ["Pulse Rate"]}})
+        assert builds == [1]
+        assert self._summary(matcher) == self._summary(expected)
+
+    def test_update_loaded_index(self):
+        """A memory-mapped index can be updated and saved over itself."""
+        matcher = FuzzyMatcher()
+        matcher.build_index(self.VALUES)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "fuzzy_index.idx")
+            matcher.save(path)
+
+            loaded = FuzzyMatcher.load(path)
+            loaded.update_table("ADAE", {"AEDECOD": ["DIZZINESS"]})
+            loaded.save(path)
+
+            reloaded = FuzzyMatcher.load(path)
+            assert reloaded.match("DIZZINES", threshold=80.0)[0].value == "DIZZINESS"
+            assert reloaded.match("HEADACHE", threshold=95.0) == []
+            assert reloaded.match("TYLENOL", threshold=95.0)[0].table == "ADCM"
+
+
+class TestFuzzyMatcherIndexedRetrieval:
+    """Test trigram candidate retrieval for large dictionaries."""
+
+    @pytest.fixture
+    def large_matcher(self):
+        """Matcher over 5000 filler codes plus a few clinical terms."""
+        terms = ["HEADACHE", "MIGRAINE HEADACHE", "NAUSEA", "VOMITING", "MYOCARDIAL INFARCTION"]
+        filler = [f"TERM{i:05d}QX" for i in range(5000)]
+        matcher = FuzzyMatcher()
+        matcher.build_index({"AE": {"AETERM": terms + filler}})
+        return matcher
+
+    def test_trigram_candidates(self):
+        """Test trigram index returns values sharing trigrams."""
+        from core.dictionary.fuzzy_matcher import TrigramIndex
+
+        index = TrigramIndex(["HEADACHE", "NAUSEA", "HEAD PAIN"])
+        ids, shared = index.candidates("headach", 0.6)
+        assert list(ids) == [0]
+        ids, shared = index.candidates("head", 0.25)
+        assert list(ids) == [0, 2]
+        assert list(index.lengths) == [8, 6, 9]
+
+    def test_large_dictionary_uses_candidates(self, large_matcher):
+        """Test only trigram candidates are scored above FULL_SCAN_LIMIT."""
+        candidates = large_matcher._candidate_ids("HEADACH")
+        values = {large_matcher._all_values[i] for i in candidates}
+        assert "HEADACHE" in values
+        assert len(candidates) < 10
+
+    def test_same_results_as_full_scan(self, large_matcher, monkeypatch):
+        """Test indexed matching returns the full-scan results."""
+        queries = ["HEADACH", "NAUSEAA", "MYOCARDIAL INFARCT", "VOMITTING", "TERM0012QX"]
+        indexed = {q: [m.to_dict() for m in large_matcher.match(q, threshold=60.0)] for q in queries}
+
+        monkeypatch.setattr(FuzzyMatcher, "FULL_SCAN_LIMIT", 10**9)
+        for query in queries:
+            full = [m.to_dict() for m in large_matcher.match(query, threshold=60.0)]
+            assert indexed[query] == full
+
+    def test_candidate_cap(self, large_matcher, monkeypatch):
+        """Test candidates are capped to those sharing the most trigrams."""
+        monkeypatch.setattr(FuzzyMatcher, "MAX_CANDIDATES", 50)
+        candidates = large_matcher._candidate_ids("TERM0001QX")
+        assert len(candidates) == 50
+        assert list(candidates) == sorted(candidates)
+
+    def test_index_rebuilt_after_build_index(self, large_matcher):
+        """Test the trigram index follows a rebuilt dictionary."""
+        large_matcher.match("HEADACH")
+        large_matcher.build_index({"CM": {"CMTRT": ["ASPIRIN", "TYLENOL"]}})
+
+        results = large_matcher.match("ASPIRN", threshold=70.0)
+        assert results[0].value == "ASPIRIN"
+        assert large_matcher._search_index().size == 2
+
+
 class TestFuzzyMatch:
     """Test FuzzyMatch dataclass."""
 
@@ -0,0 +1,149 @@
+# Tests for incremental dictionary updates
+# =========================================
+
+import pytest
+import tempfile
+import threading
+import os
+from pathlib import Path
+
+import sys
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import duckdb
+from core.data.connection_manager import get_connection_manager
+from core.dictionary import (
+    ValueScanner,
+    FuzzyMatcher,
+    SchemaMapper,
+    update_dictionary,
+    dictionary_lock,
+)
+
+
+def full_build(db_path, index_path, schema_path):
+    """Scan every table and build both files, as the dictionary build does."""
+    with ValueScanner(db_path) as scanner:
+        scan_results = scanner.scan_all_tables()
+    matcher = FuzzyMatcher()
+    matcher.build_index({
+        table: {column: result.values for column, result in columns.items()}
+        for table, columns in scan_results.items()
+    })
+    matcher.save(index_path)
+
+    with SchemaMapper(db_path) as mapper:
+        schema_map = mapper.build_schema_map()
+        mapper.save_schema_map(schema_map, schema_path)
+    return matcher, schema_map
+
+
+def entries(matcher):
+    return [(e.value, e.table, e.column) for e in matcher._index]
+
+
+class TestUpdateDictionary:
+    """Test rescanning single tables into a built dictionary."""
+
+    @pytest.fixture
+    def workspace(self):
+        """Database with ADAE and ADSL, plus paths for the dictionary files."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = os.path.join(tmpdir, "test.duckdb")
+            conn = duckdb.connect(db_path)
+
+            conn.execute("CREATE TABLE ADAE (USUBJID VARCHAR, AEDECOD VARCHAR, AESOC VARCHAR)")
+            conn.execute("""
+                INSERT INTO ADAE VALUES
+                ('U1', 'Headache', 'Nervous system disorders'),
+                ('U2', 'Nausea', 'Gastrointestinal disorders')
+            """)
+            conn.execute("CREATE TABLE ADSL (USUBJID VARCHAR, RACE VARCHAR, TRT01A VARCHAR)")
+            conn.execute("INSERT INTO ADSL VALUES ('U1', 'WHITE', 'Placebo'), ('U2', 'ASIAN', 'Drug A')")
+
+            conn.close()
+            yield (
+                db_path,
+                os.path.join(tmpdir, "fuzzy_index.idx"),
+                os.path.join(tmpdir, "schema_map.json"),
+            )
+
+    def _execute(self, db_path, sql):
+        with get_connection_manager(db_path, writable=True).write() as conn:
+            conn.execute(sql)
+
+    def test_replaced_table_matches_full_build(self, workspace):
+        """Only the replaced table is rescanned; the result equals a full build."""
+        db_path, index_path, schema_path = workspace
+        full_build(db_path, index_path, schema_path)
+
+        self._execute(db_path, "DELETE FROM ADAE")
+        self._execute(db_path, "INSERT INTO ADAE VALUES ('U3', 'Dizziness', 'Nervous system disorders')")
+
+        summary = update_dictionary(db_path, ["adae"], index_path, schema_path)
+        assert summary["tables"] == ["ADAE"]
+
+        updated = FuzzyMatcher.load(index_path)
+        expected, expected_map = full_build(db_path, index_path + ".full", schema_path + ".full")
+        assert entries(updated) == entries(expected)
+        assert summary["fuzzy_entries"] == len(expected)
+        assert updated.match("Dizzines", threshold=80.0)[0].value == "Dizziness"
+        assert updated.match("Headache", threshold=95.0) == []
+
+        schema_map = SchemaMapper.load_schema_map(schema_path)
+        assert schema_map.tables["ADAE"].row_count == 1
+        assert set(schema_map.tables) == set(expected_map.tables)
+
+    def test_other_tables_not_rescanned(self, workspace, monkeypatch):
+        """Unchanged tables keep their indexed values without a scan."""
+        db_path, index_path, schema_path = workspace
+        full_build(db_path, index_path, schema_path)
+
+        scanned = []
+        original = ValueScanner.scan_table
+        monkeypatch.setattr(
+            ValueScanner, "scan_table",
+            lambda self, table, *args: scanned.append(table) or original(self, table, *args)
+        )
+
+        update_dictionary(db_path, ["ADAE"], index_path, schema_path)
+        assert scanned == ["ADAE"]
+        assert FuzzyMatcher.load(index_path).match("Placebo", threshold=95.0)[0].table == "ADSL"
+
+    def test_dropped_table_removed(self, workspace):
+        """A dropped table leaves the fuzzy index and schema map."""
+        db_path, index_path, schema_path = workspace
+        full_build(db_path, index_path, schema_path)
+
+        self._execute(db_path, "DROP TABLE ADAE")
+        summary = update_dictionary(db_path, ["ADAE"], index_path, schema_path)
+
+        assert summary["schema_tables"] == 1
+        assert all(e.table == "ADSL" for e in FuzzyMatcher.load(index_path)._index)
+        assert "AEDECOD" not in SchemaMapper.load_schema_map(schema_path).columns
+
+    def test_requires_built_index(self, workspace):
+        """Nothing is updated before a full build."""
+        db_path, index_path, schema_path = workspace
+
+        with pytest.raises(FileNotFoundError):
+            update_dictionary(db_path, ["ADAE"], index_path, schema_path)
+
+    def test_waits_for_full_build(self, workspace):
+        """An update does not write the files while a full build holds the lock."""
+        db_path, index_path, schema_path = workspace
+        full_build(db_path, index_path, schema_path)
+
+        with dictionary_lock:
+            updater = threading.Thread(
+                target=update_dictionary, args=(db_path, ["ADAE"], index_path, schema_path)
+            )
+            before = os.path.getmtime(index_path)
+            updater.start()
+            updater.join(0.5)
+            assert updater.is_alive()
+            assert os.path.getmtime(index_path) == before
+
+        updater.join(10)
+        assert not updater.is_alive()
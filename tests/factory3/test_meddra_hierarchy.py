@@ -0,0 +1,152 @@
+# Tests for the MedDRA Hierarchy Cache
+"""
+Test suite for the in-memory MedDRA hierarchy.
+
+These tests verify that:
+- Hierarchy, children, term and SOC/PT lookups match the SQL queries
+- PTs on secondary SOC paths are listed under both SOCs
+- The cache is built when MedDRALoader finishes a load
+- delete_version and reloading the tables invalidate the cache
+"""
+
+import sys
+import pytest
+import pandas as pd
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+pytest.importorskip("duckdb")
+
+from core.data.connection_manager import close_connection_manager
+from core.meddra import MedDRALoader, MedDRALookup
+from core.meddra import hierarchy as hierarchy_module
+from core.meddra.hierarchy import get_hierarchy_cache, MedDRAHierarchyCache
+
+COLUMNS = ["soc_code", "soc_name", "hlgt_code", "hlgt_name", "hlt_code", "hlt_name",
+           "pt_code", "pt_name", "llt_code", "llt_name"]
+
+ROWS = [
+    ("100", "Nervous system disorders", "200", "Headaches", "300", "Headaches NEC",
+     "400", "Headache", "400", "Headache"),
+    ("100", "Nervous system disorders", "200", "Headaches", "300", "Headaches NEC",
+     "400", "Headache", "401", "Head pain"),
+    ("100", "Nervous system disorders", "201", "Neurological disorders NEC", "301", "Dizziness NEC",
+     "410", "Dizziness", "410", "Dizziness"),
+    ("110", "Gastrointestinal disorders", "210", "GI signs", "310", "Nausea and vomiting",
+     "420", "Vomiting", "421", "Emesis"),
+    ("110", "Gastrointestinal disorders", "210", "GI signs", "310", "Nausea and vomiting",
+     "420", "Vomiting", "420", "Vomiting"),
+    ("110", "Gastrointestinal disorders", "210", "GI signs", "310", "Nausea and vomiting",
+     "422", "Nausea", "422", "Nausea"),
+    # Secondary path: Dizziness also under the ear SOC
+    ("120", "Ear disorders", "220", "Inner ear disorders", "320", "Inner ear signs",
+     "410", "Dizziness", "411", "Giddiness"),
+    # PT without LLT rows
+    ("120", "Ear disorders", "220", "Inner ear disorders", "320", "Inner ear signs",
+     "430", "Vertigo", None, None),
+]
+
+CODES = ["100", "110", "120", "200", "201", "210", "220", "300", "310", "320",
+         "400", "401", "410", "411", "420", "421", "422", "430", "999", "400.0"]
+
+
+@pytest.fixture
+def meddra(tmp_path):
+    db_path = tmp_path / "meddra.duckdb"
+    loader = MedDRALoader(str(db_path), str(tmp_path / "knowledge"))
+    loader._create_tables()
+    loader._load_data(pd.DataFrame(ROWS, columns=COLUMNS), "meddra_27_0.sas7bdat")
+    yield loader, MedDRALookup(str(db_path))
+    hierarchy_module.invalidate_hierarchy_cache(db_path)
+    close_connection_manager(db_path)
+
+
+@pytest.fixture
+def sql_lookup(meddra, monkeypatch):
+    """Lookup that always queries DuckDB."""
+    lookup = MedDRALookup(str(meddra[0].db_path))
+    monkeypatch.setattr(lookup, "_hierarchy_cache", lambda: None)
+    return lookup
+
+
+class TestCacheMatchesSQL:
+    """Cached lookups return what the SQL queries return."""
+
+    @pytest.mark.parametrize("method", [
+        "get_hierarchy", "get_hierarchy_for_llt", "get_term_by_code",
+        "get_children", "get_pts_by_soc", "get_llts_by_pt",
+    ])
+    def test_method(self, meddra, sql_lookup, method):
+        _, lookup = meddra
+        for code in CODES:
+            assert getattr(lookup, method)(code) == getattr(sql_lookup, method)(code), code
+
+    def test_search(self, meddra, sql_lookup):
+        _, lookup = meddra
+        for query in ["head", "DIZZ", "vomiting", "xyz"]:
+            assert lookup.search(query) == sql_lookup.search(query)
+
+    def test_no_queries_after_build(self, meddra, monkeypatch):
+        _, lookup = meddra
+        get_hierarchy_cache(lookup.db_path)
+        monkeypatch.setattr(lookup, "_connect", lambda: pytest.fail("queried DuckDB"))
+
+        assert lookup.get_hierarchy("400").hlt.name == "Headaches NEC"
+        assert lookup.get_children("210")[1][0].name == "Nausea and vomiting"
+
+
+class TestHierarchyCache:
+    """Cache structure and lifecycle."""
+
+    def test_secondary_soc_path(self, meddra):
+        _, lookup = meddra
+        _, ear_pts = lookup.get_pts_by_soc("120")
+        _, nervous_pts = lookup.get_pts_by_soc("100")
+
+        assert [t.name for t in ear_pts] == ["Dizziness", "Vertigo"]
+        assert [t.name for t in nervous_pts] == ["Dizziness", "Headache"]
+        assert lookup.get_hierarchy("410").soc.name == "Nervous system disorders"
+        assert lookup.get_hierarchy_for_llt("411").soc.name == "Ear disorders"
+
+    def test_interned_names(self):
+        cache = MedDRAHierarchyCache(pd.DataFrame(ROWS, columns=COLUMNS))
+        stats = cache.get_stats()
+
+        assert stats["pt"] == 5
+        assert stats["llt"] == 7
+        assert stats["paths"] == len(ROWS)
+        assert stats["names"] < sum(stats[level] for level in ("soc", "hlgt", "hlt", "pt", "llt"))
+
+    def test_delete_version_invalidates(self, meddra):
+        loader, lookup = meddra
+        assert get_hierarchy_cache(lookup.db_path) is not None
+
+        loader.delete_version()
+        assert get_hierarchy_cache(lookup.db_path) is None
+
+    def test_unavailable_is_cached(self, meddra, monkeypatch):
+        loader, lookup = meddra
+        loader.delete_version()
+        assert get_hierarchy_cache(lookup.db_path) is None
+
+        monkeypatch.setattr(MedDRAHierarchyCache, "from_database",
+                            classmethod(lambda cls, db_path: pytest.fail("queried DuckDB")))
+        assert get_hierarchy_cache(lookup.db_path) is None
+        monkeypatch.undo()
+
+        loader._create_tables()
+        loader._load_data(pd.DataFrame(ROWS, columns=COLUMNS), "meddra_27_0.sas7bdat")
+        assert get_hierarchy_cache(lookup.db_path) is not None
+
+    def test_reload_rebuilds(self, meddra):
+        loader, lookup = meddra
+        assert lookup.get_hierarchy("400").pt.name == "Headache"
+
+        loader._create_tables()
+        renamed = [r[:7] + ("Cephalgia",) + r[8:] if r[6] == "400" else r for r in ROWS]
+        loader._load_data(pd.DataFrame(renamed, columns=COLUMNS), "meddra_27_1.sas7bdat")
+
+        assert lookup.get_hierarchy("400").pt.name == "Cephalgia"
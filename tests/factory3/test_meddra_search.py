@@ -0,0 +1,189 @@
+# Tests for the MedDRA Search Index
+"""
+Test suite for the in-memory MedDRA term search.
+
+These tests verify that:
+- Indexed search returns what the SQL LIKE search returns
+- Results are ranked by tier, level and name, with typo-tolerant matches last
+- Paging and level filters work, including HLGT/HLT
+- Work per query stays bounded on a MedDRA-sized hierarchy
+"""
+
+import sys
+import pytest
+import pandas as pd
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+pytest.importorskip("duckdb")
+np = pytest.importorskip("numpy")
+
+from core.data.connection_manager import close_connection_manager
+from core.meddra import MedDRALoader, MedDRALookup, MedDRASearchIndex
+from core.meddra.hierarchy import MedDRAHierarchyCache, LEVELS, invalidate_hierarchy_cache
+
+COLUMNS = ["soc_code", "soc_name", "hlgt_code", "hlgt_name", "hlt_code", "hlt_name",
+           "pt_code", "pt_name", "llt_code", "llt_name"]
+
+ROWS = [
+    ("100", "Nervous system disorders", "200", "Headaches", "300", "Headaches NEC",
+     "400", "Headache", "400", "Headache"),
+    ("100", "Nervous system disorders", "200", "Headaches", "300", "Headaches NEC",
+     "400", "Headache", "401", "Head pain"),
+    ("100", "Nervous system disorders", "200", "Headaches", "300", "Headaches NEC",
+     "402", "Tension headache", "402", "Tension headache"),
+    ("100", "Nervous system disorders", "200", "Headaches", "300", "Headaches NEC",
+     "403", "Post-traumatic headache", "403", "Post-traumatic headache"),
+    ("110", "Gastrointestinal disorders", "210", "GI signs", "310", "Nausea and vomiting",
+     "420", "Vomiting", "421", "Emesis"),
+    ("110", "Gastrointestinal disorders", "210", "GI signs", "310", "Nausea and vomiting",
+     "420", "Vomiting", "420", "Vomiting"),
+    ("110", "Gastrointestinal disorders", "210", "GI signs", "310", "Nausea and vomiting",
+     "422", "Nausea", "422", "Nausea"),
+    ("110", "Gastrointestinal disorders", "211", "GI pain", "311", "Abdominal pain NEC",
+     "430", "Abdominal pain upper", "431", "Pain abdominal upper"),
+]
+
+
+@pytest.fixture
+def lookups(tmp_path, monkeypatch):
+    """(indexed lookup, SQL-only lookup) over the same database."""
+    db_path = tmp_path / "meddra.duckdb"
+    loader = MedDRALoader(str(db_path), str(tmp_path / "knowledge"))
+    loader._create_tables()
+    loader._load_data(pd.DataFrame(ROWS, columns=COLUMNS), "meddra_27_0.sas7bdat")
+
+    sql_lookup = MedDRALookup(str(db_path))
+    monkeypatch.setattr(sql_lookup, "_hierarchy_cache", lambda: None)
+    yield MedDRALookup(str(db_path)), sql_lookup
+    invalidate_hierarchy_cache(db_path)
+    close_connection_manager(db_path)
+
+
+def names(results):
+    return [(r.term.level, r.term.name) for r in results]
+
+
+class TestMatchesSQL:
+    """Exact, prefix, word and substring matches agree with the LIKE search."""
+
+    @pytest.mark.parametrize("query", ["headache", "HEAD", "pain", "ache", "vomit", "emesis", "xyz"])
+    def test_same_results(self, lookups, query):
+        lookup, sql_lookup = lookups
+        assert lookup.search(query) == sql_lookup.search(query)
+
+    @pytest.mark.parametrize("level", ["PT", "LLT"])
+    def test_same_results_with_level(self, lookups, level):
+        lookup, sql_lookup = lookups
+        assert lookup.search("head", level=level) == sql_lookup.search("head", level=level)
+
+    def test_same_pages(self, lookups):
+        lookup, sql_lookup = lookups
+        for offset in (0, 2, 4):
+            assert lookup.search("head", limit=2, offset=offset) == sql_lookup.search("head", limit=2, offset=offset)
+
+
+class TestRanking:
+    """Tiers, typo tolerance, paging and level filters."""
+
+    def test_tiers(self, lookups):
+        lookup, _ = lookups
+        results = lookup.search("headache", level="PT")
+
+        assert [(r.term.name, r.match_score) for r in results] == [
+            ("Headache", 100), ("Post-traumatic headache", 80), ("Tension headache", 80),
+        ]
+        assert lookup.search("traumatic", level="PT")[0].match_score == 70
+
+    def test_reordered_words(self, lookups):
+        lookup, _ = lookups
+        results = lookup.search("upper abdominal pain")
+
+        assert names(results) == [("PT", "Abdominal pain upper"), ("LLT", "Pain abdominal upper")]
+        assert {r.match_score for r in results} == {60}
+
+    def test_typo(self, lookups):
+        lookup, _ = lookups
+        results = lookup.search("hedache")
+
+        assert results[0].term.name == "Headache"
+        assert all(r.match_score < 60 for r in results)
+
+    def test_exact_matches_skip_typo_tier(self, lookups):
+        lookup, _ = lookups
+        assert names(lookup.search("Nausea", limit=2)) == [("PT", "Nausea"), ("LLT", "Nausea")]
+
+    def test_paging(self, lookups):
+        lookup, _ = lookups
+        full = lookup.search("head", limit=10)
+        pages = lookup.search("head", limit=2) + lookup.search("head", limit=2, offset=2) \
+            + lookup.search("head", limit=6, offset=4)
+
+        assert len(full) == 7
+        assert pages == full
+
+    def test_llt_parent(self, lookups):
+        lookup, _ = lookups
+        result = lookup.search("emesis")[0]
+
+        assert result.term.parent_code == "420"
+        assert result.hierarchy.pt.name == "Vomiting"
+
+    @pytest.mark.parametrize("level,name,blank", [
+        ("SOC", "Gastrointestinal disorders", ("hlgt", "hlt", "pt")),
+        ("HLGT", "GI signs", ("hlt", "pt")),
+        ("HLT", "Nausea and vomiting", ("pt",)),
+    ])
+    def test_upper_levels(self, lookups, level, name, blank):
+        lookup, _ = lookups
+        result = lookup.search(name, level=level)[0]
+
+        assert (result.term.level, result.term.name) == (level, name)
+        assert result.hierarchy.soc.name == "Gastrointestinal disorders"
+        assert all(getattr(result.hierarchy, b).code == "" for b in blank)
+
+    def test_short_query_matches_word_prefixes(self):
+        index = MedDRASearchIndex([("PT", "1", "Ear pain"), ("PT", "2", "Year"), ("PT", "3", "Earache")], LEVELS)
+        assert [code for _, code, _ in index.search("ea")] == ["1", "3"]
+
+
+class TestScaling:
+    """Work per query on a synthetic MedDRA-sized hierarchy."""
+
+    QUERIES = ["cardi", "hepatitis", "pain", "a", "my", "derm", "itis", "disorder", "acute",
+               "chronic nephr", "nephrosis disorder", "hepatits", "cardiopathy disordr", "xyz"]
+
+    @pytest.fixture
+    def scored(self, monkeypatch):
+        """Number of names each typo-tolerant pass scores."""
+        from core.meddra import search
+        calls = []
+        cdist = search.process.cdist
+
+        def counting_cdist(queries, choices, **kwargs):
+            calls.append(len(choices))
+            return cdist(queries, choices, **kwargs)
+
+        monkeypatch.setattr(search.process, "cdist", counting_cdist)
+        return calls
+
+    def test_fuzzy_scoring_bounded(self, synthetic_meddra, scored):
+        index = MedDRAHierarchyCache(synthetic_meddra).search_index()
+        assert index.get_stats()["terms"] > 100000
+
+        for query in self.QUERIES:
+            index.search(query, ("PT", "LLT"), limit=20)
+
+        assert scored
+        assert max(scored) <= MedDRASearchIndex.MAX_FUZZY_CANDIDATES
+
+    def test_fuzzy_skipped_when_page_full(self, synthetic_meddra, scored):
+        index = MedDRAHierarchyCache(synthetic_meddra).search_index()
+
+        for query in ["pain", "a", "disorder"]:
+            assert len(index.search(query, ("PT", "LLT"), limit=20)) == 20
+
+        assert scored == []
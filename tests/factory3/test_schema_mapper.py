@@ -12,6 +12,7 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 import duckdb
+from core.data.connection_manager import get_connection_manager
 from core.dictionary.schema_mapper import (
     SchemaMapper,
     SchemaMap,
@@ -248,6 +249,103 @@ class TestSchemaMapPersistence:
             assert "USUBJID" in loaded.columns
 
 
+class TestSchemaMapUpdate:
+    """Test refreshing one table of a schema map."""
+
+    @pytest.fixture
+    def temp_db(self):
+        """Create a temporary DuckDB database."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = os.path.join(tmpdir, "test.duckdb")
+            conn = duckdb.connect(db_path)
+
+            conn.execute("CREATE TABLE DM (STUDYID VARCHAR, USUBJID VARCHAR, SEX VARCHAR)")
+            conn.execute("INSERT INTO DM VALUES ('S1', 'U1', 'M'), ('S1', 'U2', 'F')")
+            conn.execute("CREATE TABLE AE (STUDYID VARCHAR, USUBJID VARCHAR, AETERM VARCHAR)")
+            conn.execute("""
+                INSERT INTO AE VALUES
+                ('S1', 'U1', 'HEADACHE'), ('S1', 'U2', 'NAUSEA'),
+                ('S1', 'U3', 'RASH'), ('S1', 'U4', 'FATIGUE')
+            """)
+
+            conn.close()
+            yield db_path
+
+    def _without_samples(self, schema_map):
+        data = schema_map.to_dict()
+        for column in data["columns"].values():
+            column.pop("sample_values")
+        return data["columns"], data["tables"]
+
+    def _execute(self, db_path, sql):
+        with get_connection_manager(db_path, writable=True).write() as conn:
+            conn.execute(sql)
+
+    def test_replaced_table_matches_full_build(self, temp_db):
+        """Updating a replaced table gives the same map as a full build."""
+        with SchemaMapper(temp_db) as mapper:
+            schema_map = mapper.build_schema_map()
+
+        self._execute(temp_db, "DROP TABLE AE")
+        self._execute(temp_db, "CREATE TABLE AE (USUBJID VARCHAR, AEDECOD VARCHAR, AESEQ INTEGER)")
+        self._execute(temp_db, "INSERT INTO AE VALUES ('U1', 'Headache', 1)")
+
+        with SchemaMapper(temp_db) as mapper:
+            updated = mapper.update_schema_map(schema_map, "ae")
+            expected = mapper.build_schema_map()
+
+        assert self._without_samples(updated) == self._without_samples(expected)
+        assert updated.tables["AE"].row_count == 1
+        assert updated.tables["AE"].key_columns == ["USUBJID", "AESEQ"]
+        assert updated.columns["STUDYID"].tables == ["DM"]
+        assert updated.columns["USUBJID"].unique_values_count == 2
+        assert "AETERM" not in updated.columns
+
+    def test_dropped_table_removed(self, temp_db):
+        """A table no longer in the database is removed."""
+        with SchemaMapper(temp_db) as mapper:
+            schema_map = mapper.build_schema_map()
+
+        self._execute(temp_db, "DROP TABLE AE")
+
+        with SchemaMapper(temp_db) as mapper:
+            mapper.update_schema_map(schema_map, "AE")
+
+        assert set(schema_map.tables) == {"DM"}
+        assert "AETERM" not in schema_map.columns
+        assert schema_map.columns["USUBJID"].tables == ["DM"]
+        assert schema_map.columns["USUBJID"].unique_values_count == 2
+        assert set(schema_map.columns["USUBJID"].sample_values) <= {"U1", "U2"}
+
+    def test_replaced_table_samples_pruned(self, temp_db):
+        """Samples of a replaced table's old rows leave shared columns."""
+        with SchemaMapper(temp_db) as mapper:
+            schema_map = mapper.build_schema_map()
+
+        self._execute(temp_db, "DELETE FROM AE WHERE USUBJID IN ('U3', 'U4')")
+
+        with SchemaMapper(temp_db) as mapper:
+            mapper.update_schema_map(schema_map, "AE")
+
+        assert set(schema_map.columns["USUBJID"].sample_values) <= {"U1", "U2"}
+        assert set(schema_map.columns["AETERM"].sample_values) == {"HEADACHE", "NAUSEA"}
+
+    def test_new_table_added(self, temp_db):
+        """A table missing from the map is added."""
+        with SchemaMapper(temp_db) as mapper:
+            schema_map = mapper.build_schema_map()
+
+        self._execute(temp_db, "CREATE TABLE VS (USUBJID VARCHAR, VSTEST VARCHAR)")
+        self._execute(temp_db, "INSERT INTO VS VALUES ('U9', 'Pulse Rate')")
+
+        with SchemaMapper(temp_db) as mapper:
+            mapper.update_schema_map(schema_map, "VS")
+
+        assert schema_map.tables["VS"].columns == ["USUBJID", "VSTEST"]
+        assert schema_map.columns["USUBJID"].tables == ["AE", "DM", "VS"]
+        assert schema_map.columns["VSTEST"].sample_values == ["Pulse Rate"]
+
+
 class TestBuildSchemaMapFunction:
     """Test the convenience function."""
 
@@ -648,72 +648,90 @@ class TestPipelineSessionSwitching:
         # Should be the same session object
         assert mock_pipeline.session is first_session
 
-    def test_process_with_session_switches(self, mock_pipeline):
-        """process_with_session should switch to specified session."""
+    def test_process_with_session_uses_requested_session(self, mock_pipeline):
+        """process_with_session should run in the specified session."""
+        original_session = mock_pipeline.session_id
         result = mock_pipeline.process_with_session(
             "How many patients had headaches?",
             session_id="conversation-456"
         )
-        assert mock_pipeline.session_id == "conversation-456"
         assert result is not None
+        session = get_session_manager().get_session("conversation-456")
+        assert len(session.history) == 1
+        # The shared default session is not mutated by per-request sessions
+        assert mock_pipeline.session_id == original_session
 
     def test_process_with_session_none_uses_current(self, mock_pipeline):
         """process_with_session with None session uses current session."""
         original_session = mock_pipeline.session_id
         result = mock_pipeline.process_with_session("How many patients?")
         assert mock_pipeline.session_id == original_session
+        assert len(mock_pipeline.session.history) == 1
 
     def test_session_context_persists_across_calls(self, mock_pipeline):
-        """Session ID should persist across multiple calls with same conversation."""
+        """Turns with the same conversation ID accumulate in one session."""
         session_id = "persistent-session"
 
-        # First call with session
         mock_pipeline.process_with_session(
             "How many patients had headaches?",
             session_id=session_id
         )
+        first_session = get_session_manager().get_session(session_id)
 
-        # Verify we're using the right session
-        assert mock_pipeline.session_id == session_id
-        first_session = mock_pipeline.session
-
-        # Second call with same session
         mock_pipeline.process_with_session(
-            "List them",
+            "How many patients had nausea?",
             session_id=session_id
         )
 
         # Should still be using same session (not created a new one)
-        assert mock_pipeline.session_id == session_id
-        assert mock_pipeline.session is first_session
+        assert get_session_manager().get_session(session_id) is first_session
+        assert len(first_session.history) == 2
 
     def test_different_sessions_isolated(self, mock_pipeline):
         """Different conversation IDs should use different sessions."""
-        # Call with session A
         mock_pipeline.process_with_session(
             "How many patients had headaches?",
             session_id="session-A"
         )
-        session_a = mock_pipeline.session
-
-        # Call with session B
         mock_pipeline.process_with_session(
             "Show lab values",
             session_id="session-B"
         )
-        session_b = mock_pipeline.session
 
-        # Sessions should be different
-        assert session_a is not session_b
-        assert mock_pipeline.session_id == "session-B"
+        session_a = get_session_manager().get_session("session-A")
+        session_b = get_session_manager().get_session("session-B")
 
-        # Switch back to A
-        mock_pipeline.process_with_session(
-            "Any more?",
-            session_id="session-A"
-        )
-        # Should get back session A
-        assert mock_pipeline.session is session_a
+        assert session_a is not session_b
+        assert session_a.history[-1].query == "How many patients had headaches?"
+        assert session_b.history[-1].query == "Show lab values"
+
+    def test_start_run_binds_session_per_request(self, mock_pipeline):
+        """Each run carries its own session and stage state."""
+        run_a = mock_pipeline.start_run("q1", session_id="run-A")
+        run_b = mock_pipeline.start_run("q2", session_id="run-B")
+
+        assert run_a.session_id == "run-A"
+        assert run_b.session_id == "run-B"
+        assert run_a.pipeline_stages is not run_b.pipeline_stages
+
+    def test_concurrent_sessions_do_not_leak(self, mock_pipeline):
+        """Concurrent requests for different conversations stay isolated."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        queries = {
+            f"concurrent-{i}": f"How many patients had event {i}?"
+            for i in range(8)
+        }
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(
+                lambda item: mock_pipeline.process_with_session(item[1], session_id=item[0]),
+                queries.items()
+            ))
+
+        for sid, query in queries.items():
+            session = get_session_manager().get_session(sid)
+            assert [turn.query for turn in session.history] == [query]
 
 
 # =============================================================================
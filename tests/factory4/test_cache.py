@@ -332,6 +332,102 @@ class TestCacheInvalidation:
         assert cache.get("Query 2") is None
 
 
+class TestTableScopedInvalidation:
+    """Test that data changes only evict entries reading the changed tables."""
+
+    @pytest.fixture
+    def db_path(self, tmp_path):
+        """Database with ADAE, ADSL and LB."""
+        duckdb = pytest.importorskip("duckdb")
+        path = str(tmp_path / "clinical.duckdb")
+        conn = duckdb.connect(path)
+        conn.execute("CREATE TABLE ADAE AS SELECT range AS ID FROM range(5)")
+        conn.execute("CREATE TABLE ADSL AS SELECT range AS ID FROM range(3)")
+        conn.execute("CREATE TABLE LB AS SELECT range AS ID FROM range(2)")
+        conn.close()
+        return path
+
+    def _execute(self, db_path, sql):
+        from core.data.connection_manager import get_connection_manager
+        with get_connection_manager(db_path, writable=True).write() as conn:
+            conn.execute(sql)
+
+    def _populate(self, cache):
+        cache.set("AE count", {"data": 1}, tables=["adae"])
+        cache.set("Demographics", {"data": 2}, tables=["ADSL"])
+        cache.set("AE by sex", {"data": 3}, tables=["ADAE", "ADSL"])
+        cache.set("Unknown tables", {"data": 4})
+
+    def test_data_change_evicts_dependent_entries(self, db_path):
+        """A changed table evicts its entries (and ones with unknown tables) only."""
+        cache = QueryCache(db_path=db_path)
+        self._populate(cache)
+
+        self._execute(db_path, "INSERT INTO LB VALUES (99)")
+        cache._version_tracker.expire()
+
+        assert cache.get("Unknown tables") is None
+        assert cache.get("AE count") is not None
+        assert cache.get("AE by sex") is not None
+
+        self._execute(db_path, "DELETE FROM ADSL WHERE ID = 0")
+        cache._version_tracker.expire()
+
+        assert cache.get("Demographics") is None
+        assert cache.get("AE by sex") is None
+        assert cache.get("AE count") is not None
+        assert cache.get_stats()['data_invalidations'] == 3
+
+    def test_invalidate_tables(self, db_path):
+        """invalidate_tables evicts entries reading the named tables."""
+        cache = QueryCache(db_path=db_path)
+        self._populate(cache)
+
+        removed = cache.invalidate_tables(["adsl"])
+
+        assert removed == 3
+        assert len(cache) == 1
+        assert cache.get("AE count") is not None
+        assert cache.get_entries()[0]['tables'] == ["ADAE"]
+
+    def test_per_table_stats(self, db_path):
+        """Hits, misses and invalidations are broken down by table."""
+        cache = QueryCache(db_path=db_path)
+        self._populate(cache)
+        cache.get("AE count")
+        cache.get("AE by sex")
+        cache.get("Demographics")
+        cache.invalidate_tables(["ADSL"])
+
+        tables = cache.get_stats()['tables']
+
+        assert tables['ADAE'] == {
+            'entries': 1, 'hits': 2, 'misses': 2, 'invalidations': 1, 'hit_rate': 50.0
+        }
+        assert tables['ADSL']['entries'] == 0
+        assert tables['ADSL']['invalidations'] == 2
+        assert 'LB' not in tables
+        assert cache.get_detailed_stats()['tables'] == tables
+
+    def test_table_versions(self, db_path):
+        """Each user table has its own version; a reload changes only its own."""
+        from core.data import DuckDBLoader
+        from core.engine.cache import DataVersionTracker
+        import pandas as pd
+
+        tracker = DataVersionTracker(db_path)
+        before = tracker.get_table_versions()
+        assert sorted(before) == ["ADAE", "ADSL", "LB"]
+
+        # Same row count, but a new load version in _sage_metadata
+        DuckDBLoader(db_path).load_dataframe(pd.DataFrame({"ID": [1, 2]}), "LB")
+        after = tracker.get_table_versions(force=True)
+
+        assert sorted(after) == ["ADAE", "ADSL", "LB"]
+        assert after["LB"] != before["LB"]
+        assert {t: after[t] for t in ("ADAE", "ADSL")} == {t: before[t] for t in ("ADAE", "ADSL")}
+
+
 class TestGlobalCache:
     """Test global cache singleton pattern."""
 
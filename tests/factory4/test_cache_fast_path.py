@@ -0,0 +1,192 @@
+# Tests for the Cache Fast Path
+"""
+Tests for the pre-LLM cache fast path.
+
+These tests verify that:
+1. The query cache is checked before the LLM intent classifier
+2. Context-free answers are shared across sessions
+3. Follow-ups in a session with context are not served from the shared key
+4. Intent classifications are cached by normalized query
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.engine.cache import (
+    IntentCache, QueryCache, get_intent_cache, reset_intent_cache, reset_query_cache
+)
+from core.engine.pipeline import InferencePipeline, PipelineConfig
+from core.engine.llm_providers import LLMResponse
+
+
+class CountingProvider:
+    """Minimal provider that records how often it is called."""
+
+    def __init__(self, content: str = "CLINICAL_DATA"):
+        self.content = content
+        self.calls = 0
+
+    def generate(self, request):
+        self.calls += 1
+        return LLMResponse(
+            content=self.content, model="counting", provider="mock", generation_time_ms=0
+        )
+
+
+class TestIntentCache:
+    """Test the intent classification cache."""
+
+    def test_set_and_get_normalized(self):
+        """Intent lookups use the normalized query."""
+        cache = IntentCache()
+        cache.set("How many patients?", "CLINICAL_DATA")
+
+        assert cache.get("  how many   PATIENTS ") == "CLINICAL_DATA"
+        assert cache.get("Show labs") is None
+
+        stats = cache.get_stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+
+    def test_lru_eviction(self):
+        """Least recently used intents are evicted first."""
+        cache = IntentCache(max_size=2)
+        cache.set("a", "GREETING")
+        cache.set("b", "HELP")
+        cache.get("a")
+        cache.set("c", "CLINICAL_DATA")
+
+        assert cache.get("a") == "GREETING"
+        assert cache.get("b") is None
+        assert cache.get_stats()['evictions'] == 1
+
+    def test_global_instance(self):
+        """get_intent_cache returns a singleton until reset."""
+        reset_intent_cache()
+        try:
+            assert get_intent_cache() is get_intent_cache()
+        finally:
+            reset_intent_cache()
+
+
+class TestQueryCacheProbe:
+    """Test miss accounting for multi-key probes."""
+
+    def test_get_without_recording_miss(self):
+        """record_miss=False leaves the miss counter untouched."""
+        cache = QueryCache()
+        cache.get("How many patients?", session_id="s1", record_miss=False)
+        assert cache.stats['misses'] == 0
+
+        cache.get("How many patients?")
+        assert cache.stats['misses'] == 1
+
+
+class TestPipelineFastPath:
+    """Test that cache lookups happen before any LLM stage."""
+
+    @pytest.fixture(autouse=True)
+    def reset_caches(self):
+        """Start each test with empty global caches."""
+        reset_query_cache()
+        reset_intent_cache()
+        yield
+        reset_query_cache()
+        reset_intent_cache()
+
+    @pytest.fixture
+    def pipeline(self, mock_available_tables):
+        """Create a mock pipeline with caching and session memory."""
+        config = PipelineConfig(
+            db_path="",
+            metadata_path="",
+            use_mock=True,
+            available_tables=mock_available_tables,
+            enable_session_memory=True
+        )
+        return InferencePipeline(config)
+
+    def test_cache_hit_skips_intent_classifier(self, pipeline, monkeypatch):
+        """A repeated question is answered without classifying intent."""
+        pipeline.process("How many patients had headaches?", session_id="fast-1")
+
+        def fail(query):
+            raise AssertionError("intent classifier should not run on a cache hit")
+
+        monkeypatch.setattr(pipeline, "_classify_intent", fail)
+        result = pipeline.process("How many patients had headaches?", session_id="fast-1")
+
+        assert result.metadata.get('cache_hit') is True
+
+    def test_context_free_answer_shared_across_sessions(self, pipeline):
+        """A first question in a new conversation reuses another session's answer."""
+        first = pipeline.process("How many patients had headaches?", session_id="share-A")
+        second = pipeline.process("how many patients had headaches", session_id="share-B")
+
+        assert not first.metadata.get('cache_hit')
+        assert second.metadata.get('cache_hit') is True
+        assert second.metadata['session_id'] == "share-B"
+        assert second.answer == first.answer
+
+    def test_shared_answer_not_scoped_by_user(self, pipeline):
+        """The shared key holds only the question: sessions of other users hit it too."""
+        pipeline.process("How many patients had headaches?", session_id="user1-conv")
+
+        assert pipeline.cache.get("How many patients had headaches?") is not None
+        assert pipeline.cache._hash("How many patients had headaches?") == \
+            pipeline.cache._hash("how many patients had headaches")
+
+    def test_cache_hit_records_session_turn(self, pipeline):
+        """Cache hits still add the turn so follow-ups have context."""
+        from core.engine.session_memory import get_session_manager
+
+        pipeline.process("How many patients had headaches?", session_id="turn-A")
+        pipeline.process("How many patients had headaches?", session_id="turn-B")
+
+        session = get_session_manager().get_session("turn-B")
+        assert len(session.history) == 1
+        assert session.history[0].query == "How many patients had headaches?"
+
+    def test_follow_up_not_served_from_shared_key(self, pipeline):
+        """A session with context only uses its own session-scoped entries."""
+        pipeline.process("How many patients had headaches?", session_id="follow-A")
+        pipeline.process("How many patients had nausea?", session_id="follow-B")
+
+        result = pipeline.process("How many patients had headaches?", session_id="follow-B")
+
+        assert not result.metadata.get('cache_hit')
+
+    def test_repeated_question_in_same_session_hits(self, pipeline):
+        """Re-asking an earlier question in the same conversation hits the cache."""
+        pipeline.process("How many patients had headaches?", session_id="repeat-A")
+        pipeline.process("How many patients had nausea?", session_id="repeat-A")
+
+        result = pipeline.process("How many patients had headaches?", session_id="repeat-A")
+
+        assert result.metadata.get('cache_hit') is True
+
+    def test_intent_classification_cached(self, pipeline):
+        """The LLM classifier runs once per normalized question."""
+        pipeline.intent_classifier = None
+        provider = CountingProvider("GREETING")
+        pipeline.sql_generator._provider = provider
+
+        assert pipeline._classify_intent("Who are you?")[0] == "GREETING"
+        assert pipeline._classify_intent("who are you")[0] == "GREETING"
+        assert provider.calls == 1
+
+    def test_failed_classification_not_cached(self, pipeline):
+        """Fallbacks from classifier errors are not remembered."""
+        class FailingProvider:
+            def generate(self, request):
+                raise RuntimeError("provider down")
+
+        pipeline.intent_classifier = None
+        pipeline.sql_generator._provider = FailingProvider()
+        assert pipeline._classify_intent("Who are you?")[0] == "CLINICAL_DATA"
+        assert pipeline.intent_cache.get("Who are you?") is None
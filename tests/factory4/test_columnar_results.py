@@ -0,0 +1,136 @@
+# Tests for Columnar (Arrow) Query Results
+"""
+Test suite for the Arrow result path in SQLExecutor.
+
+These tests verify that:
+- Columnar mode returns ColumnarRows backed by an Arrow table
+- ColumnarRows behaves like the list of dicts it replaces
+- max_rows and truncation match the row path
+- Results serialize to JSON rows and to Arrow IPC
+- The answer verifier reads NULL counts from Arrow metadata
+"""
+
+import json
+import pytest
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+duckdb = pytest.importorskip("duckdb")
+pa = pytest.importorskip("pyarrow")
+
+from core.engine.executor import SQLExecutor, ExecutorConfig
+from core.engine.columnar import (
+    ColumnarRows, json_default, rows_for_json, to_arrow_ipc
+)
+from core.engine.answer_verifier import AnswerVerifier
+
+
+@pytest.fixture
+def connection():
+    conn = duckdb.connect()
+    conn.execute("""
+        CREATE TABLE ADAE AS
+        SELECT 'S' || (i % 50) AS USUBJID,
+               CASE WHEN i % 3 = 0 THEN 'NAUSEA' ELSE 'HEADACHE' END AS AEDECOD,
+               CASE WHEN i % 4 = 0 THEN NULL ELSE (i % 5) + 1 END AS ATOXGR
+        FROM range(20000) t(i)
+    """)
+    yield conn
+    conn.close()
+
+
+def run(connection, sql, **config):
+    executor = SQLExecutor("", ExecutorConfig(**config), connection=connection)
+    return executor.execute(sql)
+
+
+class TestColumnarExecution:
+    """Test the executor's Arrow fetch."""
+
+    def test_returns_columnar_rows(self, connection):
+        result = run(connection, "SELECT USUBJID, AEDECOD FROM ADAE LIMIT 100", columnar=True)
+
+        assert result.success
+        assert isinstance(result.data, ColumnarRows)
+        assert result.arrow_table.num_rows == 100
+        assert result.row_count == 100
+        assert result.columns == ['USUBJID', 'AEDECOD']
+
+    def test_same_rows_as_row_mode(self, connection):
+        sql = "SELECT USUBJID, AEDECOD, ATOXGR FROM ADAE ORDER BY USUBJID, AEDECOD, ATOXGR LIMIT 500"
+        rows = run(connection, sql)
+        columnar = run(connection, sql, columnar=True)
+
+        assert columnar.data == rows.data
+        assert list(columnar.data) == rows.data
+        assert columnar.data[0] == rows.data[0]
+        assert columnar.data[-1] == rows.data[-1]
+        assert columnar.data[10:20] == rows.data[10:20]
+
+    def test_max_rows_and_truncation(self, connection):
+        result = run(connection, "SELECT * FROM ADAE", columnar=True, max_rows=10000)
+
+        assert len(result.data) == 10000
+        assert result.truncated
+
+    def test_row_mode_is_default(self, connection):
+        result = run(connection, "SELECT COUNT(*) AS n FROM ADAE")
+
+        assert isinstance(result.data, list)
+        assert result.arrow_table is None
+
+    def test_empty_result(self, connection):
+        result = run(connection, "SELECT * FROM ADAE WHERE 1 = 0", columnar=True)
+
+        assert result.success
+        assert not result.data
+        assert result.row_count == 0
+        assert result.arrow_table.column_names == ['USUBJID', 'AEDECOD', 'ATOXGR']
+
+
+class TestSerialization:
+    """Test serialization at the API edge."""
+
+    def test_rows_for_json(self, connection):
+        result = run(connection, "SELECT COUNT(*) AS n FROM ADAE", columnar=True)
+
+        assert rows_for_json(result.data) == [{'n': 20000}]
+        assert rows_for_json([{'n': 1}]) == [{'n': 1}]
+        assert json.dumps({'data': result.data}, default=json_default) == '{"data": [{"n": 20000}]}'
+
+    def test_arrow_ipc_round_trip(self, connection):
+        result = run(connection, "SELECT USUBJID, ATOXGR FROM ADAE LIMIT 25", columnar=True)
+
+        body = to_arrow_ipc(result.data, metadata={"sage": '{"answer": "ok"}'})
+        table = pa.ipc.open_stream(body).read_all()
+
+        assert table.num_rows == 25
+        assert table.column_names == ['USUBJID', 'ATOXGR']
+        assert json.loads(table.schema.metadata[b"sage"]) == {"answer": "ok"}
+
+    def test_arrow_ipc_from_rows(self):
+        table = pa.ipc.open_stream(to_arrow_ipc([{'n': 1}, {'n': 2}])).read_all()
+        assert table.column('n').to_pylist() == [1, 2]
+
+        empty = pa.ipc.open_stream(to_arrow_ipc([], columns=['n'])).read_all()
+        assert empty.column_names == ['n']
+
+
+class TestVerifierNullRatio:
+    """Test the Arrow fast path in the data quality check."""
+
+    def test_null_ratio_matches_row_mode(self, connection):
+        sql = "SELECT ATOXGR, NULL AS X FROM ADAE LIMIT 1000"
+        verifier = AnswerVerifier()
+
+        row_check = verifier._verify_data_quality(run(connection, sql))
+        columnar_check = verifier._verify_data_quality(run(connection, sql, columnar=True))
+
+        assert row_check.passed == columnar_check.passed
+        assert row_check.score == columnar_check.score
+        assert row_check.issue == columnar_check.issue
+        assert "NULL" in columnar_check.issue
@@ -0,0 +1,240 @@
+# Tests for the DuckDB Connection Manager
+"""
+Test suite for shared DuckDB handles.
+
+These tests verify that:
+- Each thread reads on its own cursor of one shared handle
+- Reads run in parallel across threads
+- Writers are serialized and rejected on read-only handles
+- A read-only handle is upgraded when a writer is requested
+- Loader and executor share the same handle, and closing a loader keeps it open
+- Utilization metrics are reported
+"""
+
+import threading
+import pytest
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+duckdb = pytest.importorskip("duckdb")
+pd = pytest.importorskip("pandas")
+
+from core.data.connection_manager import (
+    DuckDBConnectionManager, get_connection_manager, close_connection_manager,
+    get_connection_stats
+)
+from core.data.duckdb_loader import DuckDBLoader
+from core.engine.executor import SQLExecutor, ExecutorConfig
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "clinical.duckdb"
+    conn = duckdb.connect(str(path))
+    conn.execute("CREATE TABLE ADSL AS SELECT 'S' || i AS USUBJID, i AS AGE FROM range(100) t(i)")
+    conn.close()
+    yield path
+    close_connection_manager(path)
+
+
+class TestCursors:
+    """Test per-thread cursors."""
+
+    def test_same_thread_reuses_cursor(self, db_path):
+        manager = get_connection_manager(db_path)
+        assert manager.cursor() is manager.cursor()
+
+    def test_threads_get_distinct_cursors(self, db_path):
+        manager = get_connection_manager(db_path)
+        barrier = threading.Barrier(3)
+        cursors = []
+
+        def grab():
+            cursors.append(manager.cursor())
+            barrier.wait(timeout=5)
+
+        threads = [threading.Thread(target=grab) for _ in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len({id(c) for c in cursors}) == 3
+
+    def test_registry_returns_same_manager(self, db_path):
+        assert get_connection_manager(db_path) is get_connection_manager(str(db_path))
+
+    def test_parallel_reads(self, db_path):
+        """Several threads are inside read() at the same time."""
+        manager = get_connection_manager(db_path)
+        barrier = threading.Barrier(4)
+        results = []
+
+        def query():
+            with manager.read() as conn:
+                barrier.wait(timeout=5)
+                results.append(conn.execute("SELECT COUNT(*) FROM ADSL").fetchone()[0])
+
+        threads = [threading.Thread(target=query) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert results == [100] * 4
+        assert manager.get_stats()['peak_active_reads'] == 4
+
+
+class TestWriter:
+    """Test the serialized writer."""
+
+    def test_read_only_rejects_writes(self, db_path):
+        manager = get_connection_manager(db_path)
+        with pytest.raises(PermissionError):
+            with manager.write():
+                pass
+
+    def test_upgrade_to_writable(self, db_path):
+        reader = get_connection_manager(db_path)
+        assert not reader.writable
+
+        writer = get_connection_manager(db_path, writable=True)
+        assert writer is reader and writer.writable
+
+        with writer.write() as conn:
+            conn.execute("INSERT INTO ADSL VALUES ('S100', 100)")
+        with writer.read() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM ADSL").fetchone()[0] == 101
+
+    def test_writers_serialized(self, db_path):
+        manager = get_connection_manager(db_path, writable=True)
+        active = []
+        overlap = []
+
+        def write(i):
+            with manager.write() as conn:
+                active.append(i)
+                overlap.append(len(active))
+                conn.execute(f"INSERT INTO ADSL VALUES ('W{i}', {i})")
+                active.remove(i)
+
+        threads = [threading.Thread(target=write, args=(i,)) for i in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert max(overlap) == 1
+        assert manager.get_stats()['writes'] == 5
+
+    def test_write_is_reentrant(self, db_path):
+        manager = get_connection_manager(db_path, writable=True)
+        with manager.write() as outer:
+            with manager.write() as inner:
+                assert inner is outer
+            assert manager.cursor() is outer
+
+
+class TestSharing:
+    """Test that components share one handle."""
+
+    def test_loader_and_executor_share_handle(self, db_path):
+        loader = DuckDBLoader(str(db_path))
+        loader.load_dataframe(pd.DataFrame({'USUBJID': ['A', 'B'], 'AEDECOD': ['X', 'Y']}), 'ADAE')
+
+        executor = SQLExecutor(str(db_path), ExecutorConfig())
+        result = executor.execute("SELECT COUNT(*) AS n FROM ADAE")
+
+        assert result.success
+        assert result.data == [{'n': 2}]
+        assert len([s for s in get_connection_stats() if s['db_path'] == str(db_path.resolve())]) == 1
+
+    def test_closed_manager_replaced(self, db_path):
+        first = get_connection_manager(db_path)
+        first.close()
+
+        second = get_connection_manager(db_path)
+        assert second is not first
+        with second.read() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM ADSL").fetchone()[0] == 100
+
+    def test_loader_close_keeps_shared_handle(self, db_path):
+        """Closing one loader does not close the handle other readers use."""
+        executor = SQLExecutor(str(db_path), ExecutorConfig(), connection_manager=get_connection_manager(db_path))
+        loader = DuckDBLoader(str(db_path))
+        loader.close()
+
+        assert not get_connection_manager(db_path).closed
+        assert executor.execute("SELECT COUNT(*) AS n FROM ADSL").data == [{'n': 100}]
+
+    def test_executor_manager_replaced(self, db_path):
+        """An executor given a manager reads through its replacement once it is closed."""
+        manager = get_connection_manager(db_path)
+        executor = SQLExecutor(str(db_path), ExecutorConfig(), connection_manager=manager)
+        assert executor.execute("SELECT COUNT(*) AS n FROM ADSL").success
+
+        close_connection_manager(db_path)
+
+        assert executor.execute("SELECT COUNT(*) AS n FROM ADSL").data == [{'n': 100}]
+        assert executor._connection_manager is get_connection_manager(db_path)
+
+    def test_components_survive_upgrade(self, db_path):
+        from core.dictionary.schema_mapper import SchemaMapper
+        from core.dictionary.value_scanner import ValueScanner
+        from core.engine.synonym_resolver import create_synonym_resolver
+
+        mapper = SchemaMapper(str(db_path))
+        scanner = ValueScanner(str(db_path))
+        resolver = create_synonym_resolver(str(db_path))
+        assert mapper.get_tables() == ['ADSL']
+        assert scanner.get_tables() == ['ADSL']
+
+        # A loader in the same process upgrades the shared handle
+        get_connection_manager(db_path, writable=True)
+
+        assert mapper.get_row_count('ADSL') == 100
+        assert scanner.get_tables() == ['ADSL']
+        assert resolver.get_all_values('USUBJID', 'ADSL')
+
+    def test_read_only_executor_rejects_writes(self, db_path):
+        # The handle is writable, the executor is not
+        get_connection_manager(db_path, writable=True)
+        executor = SQLExecutor(str(db_path), ExecutorConfig(read_only=True))
+
+        for sql in ("DROP TABLE ADSL", "INSERT INTO ADSL VALUES ('X', 1)",
+                    "SELECT 1; DELETE FROM ADSL"):
+            result = executor.execute(sql)
+            assert not result.success
+            assert "Read-only executor" in result.error_message
+
+        assert not executor.execute_with_params("DELETE FROM ADSL WHERE AGE = $age", {'age': 1}).success
+        assert executor.execute("SELECT COUNT(*) AS n FROM ADSL").data == [{'n': 100}]
+
+
+class TestStats:
+    """Test utilization metrics."""
+
+    def test_stats_fields(self, db_path):
+        manager = DuckDBConnectionManager(str(db_path))
+        try:
+            with manager.read() as conn:
+                conn.execute("SELECT 1").fetchone()
+                stats = manager.get_stats()
+
+            assert stats['active_reads'] == 1
+            assert stats['open_cursors'] == 1
+            assert stats['utilization'] == 100.0
+            assert manager.get_stats()['reads'] == 1
+            assert manager.get_stats()['active_reads'] == 0
+        finally:
+            manager.close()
+
+    def test_closed_manager_raises(self, db_path):
+        manager = DuckDBConnectionManager(str(db_path))
+        manager.close()
+        with pytest.raises(RuntimeError):
+            manager.cursor()
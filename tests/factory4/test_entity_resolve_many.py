@@ -0,0 +1,142 @@
+# Tests for Batched Entity Resolution
+"""
+Test suite for EntityExtractor.resolve_many.
+
+These tests verify that:
+- resolve_many returns the same EntityMatch per term as _resolve_term
+- FuzzyMatcher.match_many equals match() for every query
+- MedDRA exact names are resolved with one batched lookup (PT before LLT)
+- Terms without an exact MedDRA name still use the per-term search
+"""
+
+import sys
+import pytest
+import pandas as pd
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+pytest.importorskip("duckdb")
+
+from core.data.connection_manager import close_connection_manager
+from core.dictionary.fuzzy_matcher import FuzzyMatcher
+from core.engine.entity_extractor import EntityExtractor, SimpleEntityExtractor
+from core.meddra.loader import MedDRALoader
+from core.meddra.lookup import MedDRALookup
+
+
+HIERARCHY = [
+    # soc, hlgt, hlt, pt, llt
+    ("10029205", "Nervous system disorders", "10019231", "Headaches", "10019233", "Headaches NEC",
+     "10019211", "Headache", "10019211", "Headache"),
+    ("10029205", "Nervous system disorders", "10019231", "Headaches", "10019233", "Headaches NEC",
+     "10019211", "Headache", "10019214", "Head pain"),
+    ("10017947", "Gastrointestinal disorders", "10017969", "GI signs", "10028817", "Nausea and vomiting",
+     "10028813", "Nausea", "10028813", "Nausea"),
+    ("10017947", "Gastrointestinal disorders", "10017969", "GI signs", "10028817", "Nausea and vomiting",
+     "10047700", "Vomiting", "10047708", "Emesis"),
+    ("10038738", "Respiratory disorders", "10011224", "Coughing", "10011225", "Coughing NEC",
+     "10011224", "Cough", "10011224", "Cough"),
+]
+
+COLUMNS = ["soc_code", "soc_name", "hlgt_code", "hlgt_name", "hlt_code", "hlt_name",
+           "pt_code", "pt_name", "llt_code", "llt_name"]
+
+
+@pytest.fixture
+def meddra(tmp_path):
+    db_path = tmp_path / "meddra.duckdb"
+    loader = MedDRALoader(str(db_path), str(tmp_path / "knowledge"))
+    loader._create_tables()
+    loader._load_data(pd.DataFrame(HIERARCHY, columns=COLUMNS), "meddra_27_0.sas7bdat")
+    yield MedDRALookup(str(db_path))
+    close_connection_manager(db_path)
+
+
+@pytest.fixture
+def fuzzy_matcher():
+    matcher = FuzzyMatcher()
+    matcher.build_index({
+        "ADAE": {"AEDECOD": ["HEADACHE", "DIZZINESS", "FATIGUE", "RASH PRURITIC"]},
+        "ADCM": {"CMTRT": ["TYLENOL", "IBUPROFEN"]},
+    })
+    return matcher
+
+
+TERMS = [
+    "headache", "dizzyness", "fatige", "tylenl", "emesis", "cough", "nausea",
+    "head pain", "vomitting", "belly pain", "asprin", "population", "ibuprofen",
+]
+
+
+class TestResolveMany:
+    """Batched resolution matches per-term resolution."""
+
+    def test_same_as_resolve_term(self, fuzzy_matcher, meddra):
+        extractor = EntityExtractor(fuzzy_matcher, meddra)
+
+        assert extractor.resolve_many(TERMS) == [extractor._resolve_term(t) for t in TERMS]
+
+    def test_priority_order(self, fuzzy_matcher, meddra):
+        extractor = EntityExtractor(fuzzy_matcher, meddra)
+        matches = dict(zip(TERMS, extractor.resolve_many(TERMS)))
+
+        assert matches["belly pain"].match_type == "medical_synonym"
+        assert matches["tylenl"].matched_term == "TYLENOL"
+        assert matches["emesis"].match_type == "meddra"
+        assert matches["emesis"].meddra_level == "LLT"
+        assert matches["asprin"].match_type == "typo_dictionary"
+        assert matches["population"] is None
+
+    def test_fuzzy_matcher_called_once(self, fuzzy_matcher, meddra, monkeypatch):
+        extractor = EntityExtractor(fuzzy_matcher, meddra)
+        monkeypatch.setattr(fuzzy_matcher, "match", lambda *a, **k: pytest.fail("per-term match"))
+
+        extractor.resolve_many(TERMS)
+
+    def test_exact_meddra_names_skip_search(self, meddra):
+        extractor = EntityExtractor(None, meddra)
+        searched = []
+        original_search = meddra.search
+        meddra.search = lambda term, **kwargs: searched.append(term) or original_search(term, **kwargs)
+
+        extractor.resolve_many(["emesis", "cough", "coughing fits"])
+        assert searched == ["coughing fits"]
+
+    def test_extract_uses_batch(self, fuzzy_matcher, meddra):
+        extractor = EntityExtractor(fuzzy_matcher, meddra)
+        query = "How many patients had headake or dizzyness with grade 3 tylenl use?"
+        result = extractor.extract(query)
+
+        candidates = extractor._extract_candidates(query)
+        per_term = [m for m in (extractor._resolve_term(t) for t in candidates) if m]
+        assert result.entities[1:] == per_term
+        assert result.entities[0].match_type == "grade"
+
+    def test_simple_extractor(self):
+        extractor = SimpleEntityExtractor()
+        assert extractor.resolve_many(["headake", "xyz"])[0].matched_term == "HEADACHE"
+
+
+class TestBatchedLookups:
+    """Batched fuzzy and MedDRA lookups."""
+
+    def test_match_many_equals_match(self, fuzzy_matcher):
+        queries = ["HEADACH", "tylenol", "DIZY", "", "RASH", "IBUPROFIN"]
+        batched = fuzzy_matcher.match_many(queries, threshold=50.0, limit=3)
+
+        assert batched == [fuzzy_matcher.match(q, threshold=50.0, limit=3) for q in queries]
+
+    def test_search_exact_many(self, meddra):
+        exact = meddra.search_exact_many(["headache", "Emesis ", "cough", "unknown", ""])
+
+        assert set(exact) == {"HEADACHE", "EMESIS", "COUGH"}
+        assert exact["HEADACHE"].term.level == "PT"
+        assert exact["EMESIS"].term.parent_code == "10047700"
+        assert exact["EMESIS"].hierarchy.pt.name == "Vomiting"
+
+        for name in exact:
+            top = meddra.search(name, limit=1)[0]
+            assert (top.term, top.match_score) == (exact[name].term, exact[name].match_score)
@@ -0,0 +1,134 @@
+# Tests for SQL Executor Timeouts
+"""
+Test suite for statement deadlines in SQLExecutor.
+
+These tests verify that:
+- Queries past ExecutorConfig.timeout_seconds are interrupted
+- Timeouts get a distinct error code
+- A shared connection stays usable after a cancelled query
+- The self-correction loop asks the LLM for a cheaper query on timeout
+"""
+
+import time
+import pytest
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+duckdb = pytest.importorskip("duckdb")
+
+from core.engine.executor import SQLExecutor, ExecutorConfig
+from core.engine.models import ExecutionResult, ExecutionErrorCode
+from core.engine.pipeline import InferencePipeline, PipelineConfig, SQL_TIMEOUT_GUIDANCE
+from core.engine.sql_generator import GenerationResult
+
+SLOW_SQL = "SELECT COUNT(*) FROM range(100000000) a, range(100000) b"
+
+
+@pytest.fixture
+def connection():
+    conn = duckdb.connect()
+    conn.execute("CREATE TABLE ADSL AS SELECT 'S' || i AS USUBJID, i AS AGE FROM range(10) t(i)")
+    yield conn
+    conn.close()
+
+
+class TestStatementTimeout:
+    """Test the interrupt watchdog."""
+
+    def test_slow_query_is_cancelled(self, connection):
+        """A cross join past the deadline returns a TIMEOUT result."""
+        executor = SQLExecutor("", ExecutorConfig(timeout_seconds=1), connection=connection)
+
+        start = time.time()
+        result = executor.execute(SLOW_SQL)
+
+        assert time.time() - start < 10
+        assert not result.success
+        assert result.timed_out
+        assert result.error_code == ExecutionErrorCode.TIMEOUT
+        assert "timed out" in result.error_message
+        assert result.to_dict()['error_code'] == "timeout"
+
+    def test_shared_connection_usable_after_timeout(self, connection):
+        """The cancelled query does not poison the shared connection."""
+        executor = SQLExecutor("", ExecutorConfig(timeout_seconds=1), connection=connection)
+        executor.execute(SLOW_SQL)
+
+        result = executor.execute("SELECT COUNT(*) AS n FROM ADSL")
+
+        assert result.success
+        assert result.data == [{'n': 10}]
+
+    def test_fast_query_unaffected(self, connection):
+        executor = SQLExecutor("", ExecutorConfig(timeout_seconds=5), connection=connection)
+        result = executor.execute("SELECT MAX(AGE) AS m FROM ADSL")
+
+        assert result.success
+        assert result.error_code is None
+
+    def test_other_errors_have_codes(self, connection):
+        executor = SQLExecutor("", ExecutorConfig(), connection=connection)
+
+        assert executor.execute("SELECT * FROM MISSING").error_code == ExecutionErrorCode.CATALOG
+        assert executor.execute("SELEC 1").error_code == ExecutionErrorCode.SYNTAX
+        assert executor.execute("").error_code == ExecutionErrorCode.EMPTY_QUERY
+
+
+class TimeoutOnceExecutor:
+    """Executor stub that times out on the first query only."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def execute(self, sql):
+        self.calls += 1
+        if self.calls == 1:
+            return ExecutionResult(
+                success=False, error_message="Query timed out",
+                sql_executed=sql, error_code=ExecutionErrorCode.TIMEOUT
+            )
+        return ExecutionResult(success=True, data=[{'n': 1}], columns=['n'], row_count=1, sql_executed=sql)
+
+
+class RecordingGenerator:
+    """SQL generator stub recording correction requests."""
+
+    def __init__(self):
+        self.errors = []
+
+    def generate(self, context):
+        return GenerationResult(sql="SELECT COUNT(*) AS n FROM ADSL, ADAE", success=True, model_used="stub")
+
+    def generate_correction(self, original_query, failed_sql, error, context):
+        self.errors.append(error)
+        return GenerationResult(sql="SELECT COUNT(*) AS n FROM ADSL", success=True, model_used="stub")
+
+
+class TestTimeoutSelfCorrection:
+    """Test that timeouts feed the self-correction loop."""
+
+    def test_timeout_requests_cheaper_query(self, mock_available_tables):
+        config = PipelineConfig(
+            db_path="",
+            metadata_path="",
+            use_mock=True,
+            available_tables=mock_available_tables,
+            enable_cache=False
+        )
+        pipeline = InferencePipeline(config)
+        pipeline.executor = TimeoutOnceExecutor()
+        pipeline.sql_generator = RecordingGenerator()
+
+        _, execution, final_sql, info = pipeline._execute_with_self_correction(
+            "How many subjects?", context=None, pipeline_stages={}
+        )
+
+        assert execution.success
+        assert final_sql.startswith("SELECT COUNT(*) AS n FROM ADSL")
+        assert "ADAE" not in final_sql
+        assert info['timeouts'] == 1
+        assert SQL_TIMEOUT_GUIDANCE in pipeline.sql_generator.errors[0]
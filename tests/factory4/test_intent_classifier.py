@@ -0,0 +1,228 @@
+# Tests for Local Intent Classifier
+"""
+Test suite for the in-process intent classifier.
+
+These tests verify that:
+- Golden suite clinical questions are routed locally without the LLM
+- Obvious conversational queries are classified locally
+- Ambiguous queries fall back to the LLM
+- Data questions with conversational words never get a canned answer
+- Confidence and fallback metrics are tracked
+- The pipeline only calls the provider on low confidence
+"""
+
+import ast
+import pytest
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.engine.intent_classifier import LocalIntentClassifier, IntentPrediction
+from core.engine.pipeline import InferencePipeline, PipelineConfig
+from core.engine.llm_providers import LLMResponse
+
+GOLDEN_QUESTIONS_PATH = project_root / "tests" / "_archive" / "golden_questions.py"
+
+
+def load_golden_questions():
+    """Read (question, category) pairs from the golden suite without importing it."""
+    tree = ast.parse(GOLDEN_QUESTIONS_PATH.read_text(encoding="utf-8"))
+    pairs = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call) and getattr(node.func, "id", None) == "TestQuestion":
+            kwargs = {
+                kw.arg: kw.value.value for kw in node.keywords
+                if isinstance(kw.value, ast.Constant)
+            }
+            if "question" in kwargs and "category" in kwargs:
+                pairs.append((kwargs["question"], kwargs["category"]))
+    return pairs
+
+
+@pytest.fixture(scope="module")
+def classifier():
+    return LocalIntentClassifier()
+
+
+class TestGoldenSuiteRouting:
+    """Test routing of the golden question suite."""
+
+    def test_golden_questions_loaded(self):
+        """The golden suite provides clinical and non-clinical questions."""
+        pairs = load_golden_questions()
+        assert len(pairs) > 30
+        assert any(category == "Non-Clinical" for _, category in pairs)
+
+    def test_clinical_golden_questions_route_locally(self, classifier):
+        """Every clinical golden question is CLINICAL_DATA with high confidence."""
+        for question, category in load_golden_questions():
+            if category == "Non-Clinical":
+                continue
+            prediction = classifier.predict(question)
+            assert prediction.intent == "CLINICAL_DATA", question
+            assert prediction.confident, question
+
+    def test_non_clinical_golden_questions(self, classifier):
+        """Non-clinical golden questions are never confidently CLINICAL_DATA."""
+        for question, category in load_golden_questions():
+            if category != "Non-Clinical":
+                continue
+            prediction = classifier.predict(question)
+            assert not (prediction.confident and prediction.intent == "CLINICAL_DATA"), question
+
+
+class TestLocalPredictions:
+    """Test individual predictions and fallback behaviour."""
+
+    @pytest.mark.parametrize("query,intent", [
+        ("Hi", "GREETING"),
+        ("Thanks!", "FAREWELL"),
+        ("Goodbye", "FAREWELL"),
+        ("Ping", "STATUS"),
+        ("How many subjects discontinued?", "CLINICAL_DATA"),
+        ("Which treatment arm had more rash?", "CLINICAL_DATA"),
+        ("of those, how many are over 70", "CLINICAL_DATA"),
+    ])
+    def test_confident_predictions(self, classifier, query, intent):
+        """Clear-cut queries are decided locally."""
+        prediction = classifier.predict(query)
+        assert prediction.intent == intent
+        assert prediction.confident
+
+    @pytest.mark.parametrize("query", [
+        "",
+        "xyzzy plugh",
+        "What can you tell me about adverse events?",
+    ])
+    def test_uncertain_queries_fall_back(self, classifier, query):
+        """Unknown or mixed wording defers to the LLM."""
+        assert not classifier.predict(query).confident
+
+    @pytest.mark.parametrize("query", [
+        "test results for glucose",
+        "Who made the protocol deviations?",
+        "Is the system showing lab results?",
+        "Thanks for the lab listing, now show the vitals",
+    ])
+    def test_data_questions_never_get_canned_answers(self, classifier, query):
+        """Conversational words inside a data question do not trigger a canned answer."""
+        prediction = classifier.predict(query)
+        assert prediction.intent == "CLINICAL_DATA" or not prediction.confident
+
+    def test_trained_from_golden_suite(self):
+        """CLINICAL_DATA examples come from the golden suite file."""
+        from core.engine.intent_classifier import GOLDEN_QUESTIONS_PATH, load_training_examples
+        import json
+
+        golden = [q["question"] for q in json.loads(GOLDEN_QUESTIONS_PATH.read_text(encoding="utf-8"))]
+        examples = load_training_examples()
+        assert examples["CLINICAL_DATA"] == golden
+        assert "GREETING" in examples
+
+    def test_missing_golden_suite_defers_clinical(self, tmp_path):
+        """Without golden questions, clinical queries are left to the LLM."""
+        from core.engine.intent_classifier import load_training_examples
+
+        classifier = LocalIntentClassifier(examples=load_training_examples(tmp_path / "missing.json"))
+        prediction = classifier.predict("How many subjects had nausea?")
+        assert not (prediction.intent != "CLINICAL_DATA" and prediction.confident)
+        assert classifier.predict("Hi").intent == "GREETING"
+
+    def test_prediction_to_dict(self, classifier):
+        """Predictions serialize with rounded scores."""
+        data = classifier.predict("How many patients had nausea?").to_dict()
+        assert data["intent"] == "CLINICAL_DATA"
+        assert set(data["scores"]) >= {"CLINICAL_DATA", "GREETING"}
+
+    def test_custom_training_examples(self):
+        """The classifier can be trained on custom labelled examples."""
+        custom = LocalIntentClassifier(examples={
+            "CLINICAL_DATA": ["count the subjects", "list the events"],
+            "GREETING": ["hello", "hi there"],
+        })
+        assert custom.predict("hello").intent == "GREETING"
+
+
+class TestClassifierMetrics:
+    """Test confidence and fallback metrics."""
+
+    def test_fallback_rate(self):
+        """classify() records local decisions and fallbacks."""
+        classifier = LocalIntentClassifier()
+        classifier.classify("How many patients had nausea?")
+        classifier.classify("xyzzy plugh")
+
+        stats = classifier.get_stats()
+        assert stats["predictions"] == 2
+        assert stats["local"] == 1
+        assert stats["fallbacks"] == 1
+        assert stats["fallback_rate"] == 50.0
+        assert 0 < stats["avg_confidence"] < 1
+        assert stats["by_intent"] == {"CLINICAL_DATA": 1}
+
+        classifier.reset_stats()
+        assert classifier.get_stats()["predictions"] == 0
+
+
+class CountingProvider:
+    """Provider stub that records calls."""
+
+    def __init__(self, content: str):
+        self.content = content
+        self.calls = 0
+
+    def generate(self, request):
+        self.calls += 1
+        return LLMResponse(content=self.content, model="stub", provider="mock", generation_time_ms=0)
+
+
+class TestPipelineIntegration:
+    """Test the classifier inside Step 0."""
+
+    @pytest.fixture
+    def pipeline(self, mock_available_tables):
+        config = PipelineConfig(
+            db_path="",
+            metadata_path="",
+            use_mock=True,
+            available_tables=mock_available_tables,
+            enable_cache=False
+        )
+        return InferencePipeline(config)
+
+    def test_confident_query_skips_llm(self, pipeline):
+        """Confident local predictions never call the provider."""
+        provider = CountingProvider("GREETING")
+        pipeline.sql_generator._provider = provider
+
+        intent, _ = pipeline._classify_intent("How many subjects had serious adverse events?")
+
+        assert intent == "CLINICAL_DATA"
+        assert provider.calls == 0
+
+    def test_low_confidence_falls_back_to_llm(self, pipeline):
+        """Uncertain predictions are resolved by the provider."""
+        provider = CountingProvider("GENERAL")
+        pipeline.sql_generator._provider = provider
+
+        intent, _ = pipeline._classify_intent("xyzzy plugh")
+
+        assert intent == "GENERAL"
+        assert provider.calls == 1
+        assert pipeline.intent_classifier.get_stats()["fallbacks"] == 1
+
+    def test_local_intent_can_be_disabled(self, mock_available_tables):
+        """enable_local_intent=False restores LLM-only classification."""
+        config = PipelineConfig(
+            db_path="",
+            metadata_path="",
+            use_mock=True,
+            available_tables=mock_available_tables,
+            enable_cache=False,
+            enable_local_intent=False
+        )
+        pipeline = InferencePipeline(config)
+        assert pipeline.intent_classifier is None
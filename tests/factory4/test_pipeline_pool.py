@@ -0,0 +1,169 @@
+# Tests for Pipeline Worker Pool
+"""
+Test suite for the pipeline worker pool.
+
+These tests verify that:
+- Blocking calls run off the event loop
+- Per-user and global limits reject with PipelineSaturatedError
+- Slots are released after completion, failure and unused reservations
+- Utilization statistics are reported
+"""
+
+import pytest
+import time
+import asyncio
+import threading
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.engine.pipeline_pool import (
+    PipelinePoolConfig, PipelineWorkerPool, PipelineSaturatedError,
+    get_pipeline_pool, shutdown_pipeline_pool
+)
+
+
+@pytest.fixture
+def pool():
+    """Create a small pool for each test."""
+    p = PipelineWorkerPool(PipelinePoolConfig(
+        max_workers=2, max_in_flight=3, per_user_limit=2, retry_after_seconds=7
+    ))
+    yield p
+    p.shutdown(wait=True)
+
+
+class TestPipelinePoolExecution:
+    """Test running blocking calls on the pool."""
+
+    def test_run_returns_result(self, pool):
+        """Test that run() returns the callable's result."""
+        result = asyncio.run(pool.run("alice", lambda x, y=0: x + y, 2, y=3))
+        assert result == 5
+
+    def test_runs_off_event_loop_thread(self, pool):
+        """Test that the call executes on a worker thread."""
+        async def main():
+            loop_thread = threading.get_ident()
+            worker_thread = await pool.run("alice", threading.get_ident)
+            return loop_thread, worker_thread
+
+        loop_thread, worker_thread = asyncio.run(main())
+        assert loop_thread != worker_thread
+
+    def test_event_loop_stays_responsive(self, pool):
+        """Test that other coroutines progress while a job blocks."""
+        ticks = []
+
+        async def ticker():
+            for _ in range(5):
+                ticks.append(time.time())
+                await asyncio.sleep(0.01)
+
+        async def main():
+            await asyncio.gather(pool.run("alice", time.sleep, 0.2), ticker())
+
+        asyncio.run(main())
+        assert len(ticks) == 5
+
+    def test_exception_propagates_and_releases(self, pool):
+        """Test that failures propagate and free the slot."""
+        def boom():
+            raise ValueError("bad query")
+
+        with pytest.raises(ValueError):
+            asyncio.run(pool.run("alice", boom))
+
+        stats = pool.get_stats()
+        assert stats['in_flight'] == 0
+        assert stats['failed'] == 1
+
+
+class TestPipelinePoolAdmission:
+    """Test backpressure and concurrency limits."""
+
+    def test_per_user_limit(self, pool):
+        """Test that a user cannot exceed their concurrency limit."""
+        pool.reserve("alice")
+        pool.reserve("alice")
+
+        with pytest.raises(PipelineSaturatedError) as exc_info:
+            pool.reserve("alice")
+
+        assert exc_info.value.reason == 'user_limit'
+        assert exc_info.value.retry_after == 7
+        # Other users are unaffected
+        pool.reserve("bob")
+
+    def test_global_limit(self, pool):
+        """Test that the pool rejects once max_in_flight is reached."""
+        pool.reserve("alice")
+        pool.reserve("bob")
+        pool.reserve("carol")
+
+        with pytest.raises(PipelineSaturatedError) as exc_info:
+            pool.reserve("dave")
+
+        assert exc_info.value.reason == 'pool_full'
+        assert pool.get_stats()['rejected_pool_full'] == 1
+
+    def test_unused_ticket_release(self, pool):
+        """Test that releasing an unused ticket frees the slot once."""
+        ticket = pool.reserve("alice")
+        ticket.release()
+        ticket.release()
+
+        stats = pool.get_stats()
+        assert stats['in_flight'] == 0
+        assert stats['active_users'] == 0
+
+    def test_release_is_noop_after_submit(self, pool):
+        """Test that a submitted ticket is only released by the job."""
+        gate = threading.Event()
+        ticket = pool.reserve("alice")
+        future = pool.submit(ticket, gate.wait, 5)
+
+        ticket.release()
+        assert pool.get_stats()['in_flight'] == 1
+
+        gate.set()
+        future.result(timeout=5)
+        time.sleep(0.01)
+        assert pool.get_stats()['in_flight'] == 0
+
+    def test_queue_depth_reported(self, pool):
+        """Test that queued jobs beyond the worker count show as queue depth."""
+        gate = threading.Event()
+        futures = [pool.submit(pool.reserve(user), gate.wait, 5) for user in ("a", "b", "c")]
+        time.sleep(0.05)
+
+        stats = pool.get_stats()
+        assert stats['running'] == 2
+        assert stats['queue_depth'] == 1
+
+        gate.set()
+        for f in futures:
+            f.result(timeout=5)
+
+
+class TestPipelinePoolGlobal:
+    """Test the global pool singleton."""
+
+    def test_singleton(self):
+        """Test that get_pipeline_pool returns the same instance."""
+        shutdown_pipeline_pool()
+        try:
+            assert get_pipeline_pool() is get_pipeline_pool()
+        finally:
+            shutdown_pipeline_pool()
+
+    def test_config_from_env(self, monkeypatch):
+        """Test configuration from environment variables."""
+        monkeypatch.setenv("PIPELINE_MAX_WORKERS", "3")
+        monkeypatch.setenv("PIPELINE_PER_USER_LIMIT", "1")
+        config = PipelinePoolConfig.from_env()
+        assert config.max_workers == 3
+        assert config.per_user_limit == 1
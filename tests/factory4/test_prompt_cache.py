@@ -0,0 +1,298 @@
+# Tests for Prompt-Prefix Caching
+"""
+Test suite for provider-level prompt caching.
+
+These tests verify that:
+- LLMContext puts the static system prompt first and per-query rules after it
+- Caching does not change what the model is sent
+- The cacheable prefix is identical across different queries
+- ClaudeProvider marks prefixes with cache_control and reads cache usage
+- Prefixes below the minimum cacheable length are not cached
+- MockProvider simulates cache writes and reads offline
+- SQL generation calls reuse the cached prefix
+"""
+
+import pytest
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.engine.context_builder import ContextBuilder
+from core.engine.table_resolver import TableResolution, ColumnResolution
+from core.engine.clinical_config import QueryDomain, PopulationType
+from core.engine.llm_providers import (
+    LLMConfig, LLMProvider, LLMRequest, ClaudeProvider, MockProvider
+)
+from core.engine.pipeline import ClaudeSQLGenerator
+
+
+def make_resolution(table='ADAE', grade_column='ATOXGR', assumptions=None):
+    """Table resolution for the ADAE/ADSL study."""
+    columns_resolved = {}
+    if grade_column:
+        columns_resolved['toxicity_grade'] = ColumnResolution(
+            concept='toxicity_grade', column_name=grade_column, reason='test'
+        )
+    return TableResolution(
+        selected_table=table,
+        table_type='ADaM',
+        domain=QueryDomain.ADVERSE_EVENTS,
+        selection_reason='test',
+        population=PopulationType.SAFETY,
+        population_filter="SAFFL = 'Y'",
+        population_name='Safety Population',
+        columns_resolved=columns_resolved,
+        fallback_used=False,
+        available_tables=['ADAE', 'ADSL'],
+        table_columns=['USUBJID', 'AEDECOD', 'ATOXGR', 'AETOXGR', 'SAFFL'],
+        assumptions=assumptions or []
+    )
+
+
+@pytest.fixture
+def mock_provider():
+    return MockProvider(LLMConfig(provider=LLMProvider.MOCK, enable_safety_audit=False))
+
+
+class TestContextOrdering:
+    """Test the static-first layout of LLMContext."""
+
+    def test_prefix_identical_across_queries(self):
+        """Different questions and grade columns share one cacheable prefix."""
+        builder = ContextBuilder()
+        first = builder.build("How many had nausea?", make_resolution(), [])
+        second = builder.build(
+            "Of those, how many are grade 3?",
+            make_resolution(grade_column='AETOXGR', assumptions=['Safety population']),
+            [],
+            accumulated_filters="SAFFL = 'Y'",
+            preserve_filters=True
+        )
+
+        assert first.cacheable_prefix == second.cacheable_prefix
+        assert first.full_system_prompt != second.full_system_prompt
+
+    def test_full_system_prompt_starts_with_prefix(self):
+        """Per-query rules (grade column, follow-up filters) come after the static prompt."""
+        context = ContextBuilder().build(
+            "How many had nausea?", make_resolution(), [],
+            accumulated_filters="SAFFL = 'Y'", preserve_filters=True
+        )
+
+        assert context.full_system_prompt.startswith(context.cacheable_prefix)
+        assert "For toxicity/grade queries, use ATOXGR" not in context.cacheable_prefix
+        assert "For toxicity/grade queries, use ATOXGR" in context.full_system_prompt
+        assert "FOLLOW-UP QUERY" not in context.cacheable_prefix
+        assert "Include these filters: SAFFL = 'Y'" in context.full_system_prompt
+
+    def test_prompt_content_unchanged_by_caching(self):
+        """Schema and clinical rules stay out of the system prompt, as before caching."""
+        context = ContextBuilder().build("How many had nausea?", make_resolution(), [])
+
+        assert "COLUMN GUIDE" not in context.full_system_prompt
+        assert context.clinical_rules not in context.full_system_prompt
+
+        from core.engine.sql_generator import UnifiedSQLGenerator
+        prompt = UnifiedSQLGenerator._build_full_prompt(None, context)
+        assert context.schema_context in prompt
+        assert context.clinical_rules in prompt
+        assert prompt.startswith(context.prompt_prefix)
+
+    def test_prefix_meets_cache_minimum(self):
+        """The system prompt plus schema and clinical rules is long enough to cache."""
+        context = ContextBuilder().build("How many had nausea?", make_resolution(), [])
+        cached = context.full_system_prompt + context.prompt_prefix
+
+        assert len(cached) // 4 >= LLMConfig().prompt_cache_min_tokens
+
+
+class TestLLMRequestPrefix:
+    """Test splitting the system prompt."""
+
+    def test_split_with_prefix(self):
+        request = LLMRequest(prompt="q", system_prompt="STATIC\nDYNAMIC", cache_prefix="STATIC")
+        assert request.split_system_prompt() == ("STATIC", "\nDYNAMIC")
+
+    def test_prefix_must_lead_system_prompt(self):
+        """A prefix that is not at the start is not cacheable."""
+        request = LLMRequest(prompt="q", system_prompt="DYNAMIC STATIC", cache_prefix="STATIC")
+        assert request.split_system_prompt() == (None, "DYNAMIC STATIC")
+
+    def test_breakpoints_below_minimum(self):
+        """Only prefixes reaching the minimum are cache breakpoints."""
+        request = LLMRequest(
+            prompt="SCHEMA" * 400 + "\nQ: how many",
+            system_prompt="STATIC" * 400 + "\nDYNAMIC",
+            cache_prefix="STATIC" * 400,
+            prompt_cache_prefix="SCHEMA" * 400
+        )
+
+        assert set(request.cache_breakpoints(500)) == {"system", "prompt"}
+        assert set(request.cache_breakpoints(1024)) == {"prompt"}
+        assert request.cache_breakpoints(5000) == {}
+
+
+class TestMockProviderCache:
+    """Test the offline prompt cache simulation."""
+
+    def test_write_then_read(self, mock_provider):
+        """The first request writes the prefix, later requests read it."""
+        prefix = "S" * 8000
+        request = LLMRequest(prompt="how many", system_prompt=prefix + " rules", cache_prefix=prefix)
+
+        first = mock_provider.generate(request)
+        second = mock_provider.generate(request)
+
+        assert (first.cache_write_tokens, first.cache_read_tokens) == (2000, 0)
+        assert (second.cache_write_tokens, second.cache_read_tokens) == (0, 2000)
+
+    def test_short_prefix_not_cached(self, mock_provider):
+        """A prefix below the minimum cacheable length never reads the cache."""
+        prefix = "S" * 2000
+        request = LLMRequest(prompt="how many", system_prompt=prefix + " rules", cache_prefix=prefix)
+
+        mock_provider.generate(request)
+        second = mock_provider.generate(request)
+
+        assert second.cache_read_tokens == second.cache_write_tokens == 0
+
+    def test_prompt_prefix_extends_cache(self, mock_provider):
+        """A longer prefix reads the cached part and writes the rest."""
+        system = "S" * 8000
+        short = LLMRequest(prompt="how many", system_prompt=system, cache_prefix=system)
+        long = LLMRequest(prompt="T" * 4000 + "\nhow many", system_prompt=system,
+                          cache_prefix=system, prompt_cache_prefix="T" * 4000)
+
+        mock_provider.generate(short)
+        extended = mock_provider.generate(long)
+
+        assert (extended.cache_read_tokens, extended.cache_write_tokens) == (2000, 1000)
+        assert mock_provider.generate(long).cache_read_tokens == 3000
+
+    def test_no_prefix_no_cache(self, mock_provider):
+        response = mock_provider.generate(LLMRequest(prompt="how many", system_prompt="sys"))
+        assert response.cache_read_tokens == response.cache_write_tokens == 0
+
+    def test_cache_disabled(self):
+        provider = MockProvider(LLMConfig(
+            provider=LLMProvider.MOCK, enable_safety_audit=False, enable_prompt_cache=False
+        ))
+        request = LLMRequest(prompt="q", system_prompt="prefix", cache_prefix="prefix")
+        provider.generate(request)
+        assert provider.generate(request).cache_read_tokens == 0
+
+
+class FakeMessages:
+    """Records Messages API calls and returns cache usage."""
+
+    def __init__(self):
+        self.calls = []
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        return SimpleNamespace(
+            content=[SimpleNamespace(text="```sql\nSELECT 1\n```")],
+            usage=SimpleNamespace(
+                input_tokens=20, output_tokens=10,
+                cache_read_input_tokens=1500, cache_creation_input_tokens=0
+            )
+        )
+
+
+class TestClaudeProviderCache:
+    """Test cache_control blocks and usage parsing."""
+
+    @pytest.fixture
+    def provider(self):
+        provider = ClaudeProvider(LLMConfig(anthropic_api_key="test", enable_safety_audit=False))
+        provider._client = SimpleNamespace(messages=FakeMessages())
+        return provider
+
+    def test_prefix_sent_as_cached_block(self, provider):
+        static = "STATIC" * 800
+        request = LLMRequest(prompt="q", system_prompt=static + "\nDYNAMIC", cache_prefix=static)
+        response = provider.generate(request)
+
+        system = provider._client.messages.calls[0]['system']
+        assert system[0] == {"type": "text", "text": static, "cache_control": {"type": "ephemeral"}}
+        assert system[1] == {"type": "text", "text": "\nDYNAMIC"}
+        assert response.cache_read_tokens == 1500
+        assert response.cache_write_tokens == 0
+        assert response.tokens_used == 1530
+
+    def test_plain_system_without_prefix(self, provider):
+        provider.generate(LLMRequest(prompt="q", system_prompt="sys"))
+        assert provider._client.messages.calls[0]['system'] == "sys"
+
+    def test_short_prefix_sent_without_cache_control(self, provider):
+        """A prefix below the minimum is sent as plain text."""
+        provider.generate(LLMRequest(prompt="q", system_prompt="STATIC\nDYNAMIC", cache_prefix="STATIC"))
+
+        call = provider._client.messages.calls[0]
+        assert call['system'] == "STATIC\nDYNAMIC"
+        assert call['messages'][0]['content'] == "q"
+
+    def test_prompt_prefix_sent_as_cached_block(self, provider):
+        """The schema prefix of the prompt carries the breakpoint for a short system prompt."""
+        schema = "SCHEMA" * 800
+        provider.generate(LLMRequest(
+            prompt=schema + "\nQ: how many", system_prompt="STATIC\nDYNAMIC",
+            cache_prefix="STATIC", prompt_cache_prefix=schema
+        ))
+
+        call = provider._client.messages.calls[0]
+        assert call['system'] == "STATIC\nDYNAMIC"
+        assert call['messages'][0]['content'] == [
+            {"type": "text", "text": schema, "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": "\nQ: how many"},
+        ]
+
+
+class RecordingMockProvider(MockProvider):
+    """MockProvider keeping its responses."""
+
+    def __init__(self, config):
+        super().__init__(config)
+        self.responses = []
+
+    def generate(self, request):
+        response = super().generate(request)
+        self.responses.append(response)
+        return response
+
+
+class TestGeneratorCacheReuse:
+    """Test which generators reach the cached prefix."""
+
+    def test_generation_reads_cache(self):
+        """Queries on the same tables read the schema prefix from the cache."""
+        from core.engine.sql_generator import UnifiedSQLGenerator
+
+        provider = RecordingMockProvider(LLMConfig(provider=LLMProvider.MOCK, enable_safety_audit=False))
+        generator = UnifiedSQLGenerator(provider=provider)
+        builder = ContextBuilder()
+
+        generator.generate(builder.build("How many had nausea?", make_resolution(), []))
+        generator.generate(builder.build("How many had headache?", make_resolution(), []))
+
+        first, second = provider.responses
+        assert first.cache_write_tokens > 0 and first.cache_read_tokens == 0
+        assert second.cache_read_tokens == first.cache_write_tokens
+
+    def test_schemaless_prompt_not_cached(self, mock_provider):
+        """The pipeline's prompts carry no schema and stay below the cache minimum."""
+        context = ContextBuilder().build("How many had nausea?", make_resolution(), [])
+        generator = ClaudeSQLGenerator(provider=mock_provider)
+
+        generator.generate(context)
+        second = generator.generate(context)
+        correction = generator.generate_correction(
+            "How many had nausea?", second.sql, "Binder Error", context
+        )
+
+        assert second.cache_read_tokens == second.cache_write_tokens == 0
+        assert correction.cache_read_tokens == 0
@@ -0,0 +1,187 @@
+# Tests for Single-Shot Pipeline Mode
+"""
+Test suite for single-shot analysis + SQL generation.
+
+These tests verify that:
+- Single-shot mode makes one LLM call instead of analyzer + generator calls
+- The analysis is returned as the usual QueryAnalysis for downstream stages
+- Clarification still triggers on low-confidence analysis
+- Follow-ups with conversation context use the multi-call path
+- Unparseable analysis JSON degrades to SQL-only
+"""
+
+import json
+import pytest
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.engine.pipeline import (
+    InferencePipeline, PipelineConfig, ClaudeSQLGenerator, SINGLE_SHOT_INSTRUCTIONS
+)
+from core.engine.query_analyzer import QueryAnalyzer, QueryAnalysis, QueryIntent
+from core.engine.llm_providers import LLMResponse
+
+ANALYSIS = {
+    "intent": "COUNT_SUBJECTS",
+    "subject": "SUBJECTS",
+    "conditions": [{
+        "original_text": "headache", "cdisc_concept": "Preferred Term",
+        "column": "AEDECOD", "operator": "=", "values": ["HEADACHE"], "confidence": 0.95
+    }],
+    "ambiguities": [],
+    "understanding_confidence": 0.95,
+    "suggested_table": "ADAE",
+    "suggested_population": "Safety"
+}
+SQL = "SELECT COUNT(DISTINCT USUBJID) AS n FROM ADAE WHERE AEDECOD = 'HEADACHE'"
+
+
+class ScriptedProvider:
+    """Provider stub answering analysis, SQL and single-shot prompts."""
+
+    def __init__(self, analysis=None, single_shot_json=True):
+        self.analysis = analysis or ANALYSIS
+        self.single_shot_json = single_shot_json
+        self.calls = []
+
+    def generate(self, request):
+        if SINGLE_SHOT_INSTRUCTIONS.strip() in request.prompt:
+            kind = "single_shot"
+            analysis = f"```json\n{json.dumps(self.analysis)}\n```\n" if self.single_shot_json else ""
+            content = f"{analysis}```sql\n{SQL}\n```"
+        elif "Analyze this clinical data question" in request.prompt:
+            kind = "analysis"
+            content = json.dumps(self.analysis)
+        else:
+            kind = "sql"
+            content = f"```sql\n{SQL}\n```"
+        self.calls.append(kind)
+        return LLMResponse(content=content, model="scripted", provider="mock", generation_time_ms=0)
+
+
+def build_pipeline(mock_available_tables, provider, single_shot=True):
+    """Mock pipeline wired to a scripted provider for analysis and SQL."""
+    config = PipelineConfig(
+        db_path="",
+        metadata_path="",
+        use_mock=True,
+        available_tables=mock_available_tables,
+        enable_cache=False,
+        enable_single_shot=single_shot
+    )
+    pipeline = InferencePipeline(config)
+    pipeline.sql_generator = ClaudeSQLGenerator(provider=provider)
+    pipeline.query_analyzer = QueryAnalyzer(llm_provider=provider)
+    return pipeline
+
+
+class TestSingleShotGenerator:
+    """Test ClaudeSQLGenerator.generate_single_shot parsing."""
+
+    def test_returns_analysis_and_sql(self):
+        """Both blocks are parsed from one response."""
+        provider = ScriptedProvider()
+        generator = ClaudeSQLGenerator(provider=provider)
+
+        class Context:
+            system_prompt = "system"
+            user_prompt = "How many subjects had headache?"
+
+        analysis, generated = generator.generate_single_shot(Context())
+
+        assert analysis["intent"] == "COUNT_SUBJECTS"
+        assert generated.sql == SQL
+        assert generated.success
+        assert provider.calls == ["single_shot"]
+
+    def test_missing_analysis_returns_none(self):
+        """A response with only SQL still yields the SQL."""
+        generator = ClaudeSQLGenerator(provider=ScriptedProvider(single_shot_json=False))
+
+        class Context:
+            system_prompt = "system"
+            user_prompt = "How many subjects had headache?"
+
+        analysis, generated = generator.generate_single_shot(Context())
+
+        assert analysis is None
+        assert generated.sql == SQL
+
+
+class TestSingleShotPipeline:
+    """Test the pipeline in single-shot mode."""
+
+    def test_one_llm_call_for_analysis_and_sql(self, mock_available_tables):
+        """Single-shot replaces the analyzer and generator calls."""
+        provider = ScriptedProvider()
+        pipeline = build_pipeline(mock_available_tables, provider)
+
+        result = pipeline.process("How many subjects had headache?", session_id="single-1")
+
+        assert result.success
+        assert provider.calls == ["single_shot"]
+        assert result.sql.startswith("SELECT COUNT(DISTINCT USUBJID)")
+        assert result.pipeline_stages['query_analysis']['single_shot'] is True
+        assert result.pipeline_stages['sql_generation']['single_shot'] is True
+        assert result.metadata['query_intent'] == QueryIntent.COUNT_SUBJECTS.value
+
+    def test_multi_call_path_when_disabled(self, mock_available_tables):
+        """With the flag off, analysis and SQL are separate calls."""
+        provider = ScriptedProvider()
+        pipeline = build_pipeline(mock_available_tables, provider, single_shot=False)
+
+        result = pipeline.process("How many subjects had headache?", session_id="multi-1")
+
+        assert result.success
+        assert provider.calls == ["analysis", "sql"]
+
+    def test_low_confidence_analysis_asks_for_clarification(self, mock_available_tables):
+        """Clarification is still offered when the analysis is unsure."""
+        unclear = dict(ANALYSIS, intent="UNCLEAR", understanding_confidence=0.2,
+                       suggested_clarification="Which events do you mean?")
+        provider = ScriptedProvider(analysis=unclear)
+        pipeline = build_pipeline(mock_available_tables, provider)
+
+        result = pipeline.process("How many had the thing?", session_id="single-2")
+
+        assert provider.calls == ["single_shot"]
+        assert result.metadata['response_type'] == 'clarification'
+
+    def test_follow_up_uses_multi_call_path(self, mock_available_tables):
+        """Queries with conversation context keep the separate analysis call."""
+        provider = ScriptedProvider()
+        pipeline = build_pipeline(mock_available_tables, provider)
+
+        pipeline.process("How many subjects had headache?", session_id="single-3")
+        provider.calls.clear()
+        pipeline.process("How many subjects had nausea?", session_id="single-3")
+
+        assert provider.calls[0] == "analysis"
+        assert "single_shot" not in provider.calls
+
+    def test_missing_analysis_continues_without_it(self, mock_available_tables):
+        """An unusable analysis block does not fail the query."""
+        provider = ScriptedProvider(single_shot_json=False)
+        pipeline = build_pipeline(mock_available_tables, provider)
+
+        result = pipeline.process("How many subjects had headache?", session_id="single-4")
+
+        assert result.success
+        assert result.pipeline_stages['query_analysis']['success'] is False
+        assert provider.calls == ["single_shot"]
+
+
+class TestAnalysisFromDict:
+    """Test QueryAnalyzer.analysis_from_dict."""
+
+    def test_applies_clarification_flags(self):
+        """Low confidence marks the analysis as needing clarification."""
+        analyzer = QueryAnalyzer(llm_provider=ScriptedProvider())
+        analysis = analyzer.analysis_from_dict("q", dict(ANALYSIS, understanding_confidence=0.3))
+
+        assert isinstance(analysis, QueryAnalysis)
+        assert analysis.needs_clarification
@@ -16,7 +16,7 @@ from pathlib import Path
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from core.engine.sql_validator import SQLValidator, ValidatorConfig
+from core.engine.sql_validator import SQLValidator, ValidatorConfig, referenced_tables
 
 
 class TestBasicValidation:
@@ -193,6 +193,36 @@ class TestTableVerification:
         assert "ADAE" in result.tables_verified
         assert "ADSL" in result.tables_verified
 
+    def test_tables_read_include_subqueries(self):
+        """Subqueries, comma joins and CTE bodies are read; CTE names are not tables."""
+        sql = """
+            WITH safety AS (SELECT USUBJID FROM ADSL WHERE SAFFL = 'Y')
+            SELECT COUNT(*) FROM ADAE a, safety s
+            WHERE a.USUBJID = s.USUBJID
+              AND a.USUBJID IN (SELECT USUBJID FROM ADLB)
+        """
+        assert referenced_tables(sql) == ['ADAE', 'ADLB', 'ADSL']
+
+        result = self.validator.validate(
+            "SELECT COUNT(*) FROM ADAE a, ADSL s WHERE a.USUBJID = s.USUBJID "
+            "AND a.USUBJID IN (SELECT USUBJID FROM ADSL WHERE SAFFL = 'Y')"
+        )
+        assert result.is_valid is True
+        assert result.tables_read == ['ADAE', 'ADSL']
+
+    def test_subquery_table_verified(self):
+        """A missing table inside a subquery is reported."""
+        result = self.validator.validate(
+            "SELECT * FROM ADAE WHERE USUBJID IN (SELECT USUBJID FROM NONEXISTENT)"
+        )
+        assert result.is_valid is False
+        assert "Table not found: NONEXISTENT" in result.errors
+
+    def test_tables_read_unknown(self):
+        """Unparseable SQL or table functions leave the tables read unknown."""
+        assert referenced_tables("SELEC * FROM ADAE") is None
+        assert referenced_tables("SELECT * FROM read_parquet('adae.parquet')") is None
+
 
 class TestQueryComplexity:
     """Test query complexity checks."""